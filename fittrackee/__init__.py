@@ -1,6 +1,7 @@
 import logging
 import os
 import re
+from functools import lru_cache
 from importlib import import_module, reload
 from typing import TYPE_CHECKING, Any, Dict, Tuple
 
@@ -82,11 +83,6 @@ bcrypt = Bcrypt()
 migrate = Migrate()
 email_service = EmailService()
 redis_client = redis.from_url(REDIS_URL)
-redis_available = True
-try:
-    redis_client.ping()
-except redis.exceptions.ConnectionError:
-    redis_available = False
 
 limiter = Limiter(
     key_func=get_remote_address,
@@ -102,14 +98,24 @@ limiter = Limiter(
 )
 if not API_RATE_LIMITS:
     limiter.enabled = False
-elif not redis_available:
-    limiter.enabled = False
-    appLog.warning("Redis not available, API rate limits are disabled.")
 
 backend = backends.RedisBackend(client=redis_client)
 abortable = Abortable(backend=backend)
 
 
+@lru_cache(maxsize=1)
+def is_redis_available() -> bool:
+    """
+    Check Redis connectivity on first call (and not on package import, to
+    avoid delaying workers startup).
+    """
+    try:
+        redis_client.ping()
+    except redis.exceptions.ConnectionError:
+        return False
+    return True
+
+
 class CustomFlask(Flask):
     # add custom Request to handle user-agent parsing
     # (removed in Werkzeug 2.1)
@@ -138,6 +144,9 @@ def create_app(init_email: bool = True) -> Flask:
     db.init_app(app)
     bcrypt.init_app(app)
     migrate.init_app(app, db)
+    if limiter.enabled and not is_redis_available():
+        limiter.enabled = False
+        appLog.warning("Redis not available, API rate limits are disabled.")
     limiter.init_app(app)
 
     init_dramatiq_broker(app, abortable, REDIS_URL)
@@ -150,7 +159,7 @@ def create_app(init_email: bool = True) -> Flask:
     # check if dramatiq broker is available
     app.config["TASKS_PROCESSING_AVAILABLE"] = (
         issubclass(app.config["DRAMATIQ_BROKER"], StubBroker)  # tests
-        or redis_available  # dev/prod
+        or is_redis_available()  # dev/prod
     )
 
     # set up email if 'EMAIL_URL' is initialized and redis available
@@ -204,11 +213,13 @@ def create_app(init_email: bool = True) -> Flask:
     from .users.follow_requests import follow_requests_blueprint
     from .users.notifications import notifications_blueprint
     from .users.queued_tasks import queued_tasks_blueprint
+    from .users.social_graph import reset_social_graph_local_cache
     from .users.users import users_blueprint
     from .workouts.records import records_blueprint
     from .workouts.sports import sports_blueprint
     from .workouts.stats import stats_blueprint
     from .workouts.timeline import timeline_blueprint
+    from .workouts.utils.sports import reset_sports_displayed_data_resolvers
     from .workouts.workouts import workouts_blueprint
 
     app.register_blueprint(auth_blueprint, url_prefix="/api")
@@ -231,6 +242,11 @@ def create_app(init_email: bool = True) -> Flask:
     app.register_blueprint(feeds_blueprint, url_prefix="")
     app.register_blueprint(geocode_blueprint, url_prefix="/api")
 
+    # application context may be shared between requests (for instance in
+    # tests), data cached during request must be reset for each request
+    app.before_request(reset_sports_displayed_data_resolvers)
+    app.before_request(reset_social_graph_local_cache)
+
     if app.debug:
         logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
         logging.getLogger("sqlalchemy").handlers = logging.getLogger(
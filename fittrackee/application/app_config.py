@@ -49,6 +49,7 @@ def get_application_config() -> Union[Dict, HttpResponse]:
           "about": null,
           "admin_contact": "admin@example.com",
           "elevation_services":	{
+            "dem": false,
             "open_elevation": false,
             "valhalla": false
           },
@@ -112,6 +113,7 @@ def update_application_config(auth_user: User) -> Union[Dict, HttpResponse]:
           "about": null,
           "admin_contact": "admin@example.com",
           "elevation_services":	{
+            "dem": false,
             "open_elevation": false,
             "valhalla": false
           },
@@ -59,6 +59,7 @@ class AppConfig(BaseModel):
     @property
     def elevation_services(self) -> Dict:
         return {
+            "dem": current_app.config["ELEVATION_DEM_DIR"] != "",
             "open_elevation": (
                 current_app.config["OPEN_ELEVATION_API_URL"] != ""
             ),
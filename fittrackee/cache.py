@@ -0,0 +1,280 @@
+import inspect
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+import redis
+from flask import current_app
+
+from fittrackee import appLog, redis_client
+
+REDIS_KEY_PREFIX = "fittrackee:cache"
+MEMORY_CACHE_MAX_SIZE = 1024
+# maximum duration of value computation before another caller computes it
+LOCK_TIMEOUT = 60
+
+
+class CacheBackend(ABC):
+    """
+    Store serialized values (strings) with a lifetime
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: int) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def lock(self, key: str) -> ContextManager:
+        """
+        Lock preventing concurrent computations of value for a given key
+        """
+        return nullcontext()
+
+
+class NullCacheBackend(CacheBackend):
+    """
+    Backend that does not store anything (value is always computed)
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache, each entry expiring individually
+    """
+
+    def __init__(self, maxsize: int = MEMORY_CACHE_MAX_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._keys_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with self._lock:
+            key_lock = self._keys_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            yield
+        with self._lock:
+            if not key_lock.locked():
+                self._keys_locks.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache shared between processes.
+
+    Redis errors are logged and handled as cache misses.
+    """
+
+    def __init__(self, client: redis.Redis) -> None:
+        self.client = client
+
+    @staticmethod
+    def _get_redis_key(key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{key}"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.client.get(self._get_redis_key(key))
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when getting value from Redis cache: {e}")
+            return None
+        return None if value is None else value.decode()  # type: ignore
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        try:
+            self.client.set(self._get_redis_key(key), value, ex=ttl)
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when storing value in Redis cache: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self._get_redis_key(key))
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when deleting value from Redis cache: {e}")
+
+    def clear(self) -> None:
+        try:
+            keys = list(self.client.scan_iter(match=f"{REDIS_KEY_PREFIX}:*"))
+            if keys:
+                self.client.delete(*keys)
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when clearing Redis cache: {e}")
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        redis_lock = self.client.lock(
+            f"{self._get_redis_key(key)}:lock",
+            timeout=LOCK_TIMEOUT,
+            blocking_timeout=LOCK_TIMEOUT,
+        )
+        try:
+            acquired = redis_lock.acquire()
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when acquiring Redis cache lock: {e}")
+            acquired = False
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    redis_lock.release()
+                except redis.exceptions.RedisError:
+                    # lock expired
+                    pass
+
+
+CACHE_BACKENDS: Dict[str, Callable[[], CacheBackend]] = {
+    "memory": MemoryCacheBackend,
+    "null": NullCacheBackend,
+    "redis": lambda: RedisCacheBackend(redis_client),
+}
+_backends: Dict[str, CacheBackend] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def get_cache_backend() -> CacheBackend:
+    """
+    Return backend set in 'CACHE_BACKEND' (one instance per backend type
+    and process)
+    """
+    backend_name = current_app.config["CACHE_BACKEND"]
+    if backend_name not in _backends:
+        _backends[backend_name] = CACHE_BACKENDS[backend_name]()
+    return _backends[backend_name]
+
+
+def get_cache_stats() -> Dict[str, Dict]:
+    """
+    Return hits and misses count for each namespace (current process)
+    """
+    return {
+        namespace: {
+            **stats,
+            "hit_rate": (
+                stats["hits"] / (stats["hits"] + stats["misses"])
+                if stats["hits"] + stats["misses"]
+                else 0
+            ),
+        }
+        for namespace, stats in _stats.items()
+    }
+
+
+def reset_cache_stats() -> None:
+    _stats.clear()
+
+
+def cached(
+    namespace: str, *, ttl: int, negative_ttl: Optional[int] = None
+) -> Callable:
+    """
+    Cache function result (JSON serializable) in cache backend.
+
+    - key is computed from namespace and arguments ('self' is ignored for
+      methods)
+    - empty results ('None', empty list or dict) are cached with
+      'negative_ttl' if provided
+    - exceptions are not cached
+    - only one caller computes a missing value at once for a given key
+      (depending on backend)
+    """
+
+    def decorator(f: Callable) -> Callable:
+        signature = inspect.signature(f)
+        is_method = next(iter(signature.parameters), None) == "self"
+
+        @wraps(f)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound_arguments = signature.bind(*args, **kwargs)
+            bound_arguments.apply_defaults()
+            key_arguments = list(bound_arguments.arguments.values())
+            if is_method:
+                key_arguments = key_arguments[1:]
+            key = f"{namespace}:{json.dumps(key_arguments, default=str)}"
+
+            backend = get_cache_backend()
+            stats = _stats.setdefault(namespace, {"hits": 0, "misses": 0})
+
+            value = backend.get(key)
+            if value is None:
+                with backend.lock(key):
+                    # value may have been computed by another caller
+                    value = backend.get(key)
+                    if value is None:
+                        stats["misses"] += 1
+                        result = f(*args, **kwargs)
+                        if result:
+                            backend.set(key, json.dumps(result), ttl)
+                        elif negative_ttl:
+                            backend.set(key, json.dumps(result), negative_ttl)
+                        return result
+            stats["hits"] += 1
+            return json.loads(value)
+
+        return wrapper
+
+    return decorator
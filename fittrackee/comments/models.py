@@ -115,6 +115,10 @@ class Comment(BaseModel):
     suspended_at: Mapped[Optional[datetime]] = mapped_column(
         TZDateTime, nullable=True
     )
+    # denormalized counter, updated by listeners
+    likes_count: Mapped[int] = mapped_column(
+        server_default="0", nullable=False
+    )
 
     user: Mapped["User"] = relationship(
         "User", lazy="select", single_parent=True
@@ -302,7 +306,7 @@ class Comment(BaseModel):
                 if display_content
                 else []
             ),
-            "likes_count": self.likes.count() if display_content else 0,
+            "likes_count": self.likes_count if display_content else 0,
             "liked": self.liked_by(user) if user else False,
             **suspension,
         }
@@ -520,10 +524,23 @@ class CommentLike(BaseModel):
         )
 
 
+def update_comment_likes_count(
+    connection: Connection, comment_id: int, increment: int
+) -> None:
+    comments_table = Comment.__table__  # type: ignore
+    connection.execute(
+        comments_table.update()
+        .where(comments_table.c.id == comment_id)
+        .values(likes_count=comments_table.c.likes_count + increment)
+    )
+
+
 @listens_for(CommentLike, "after_insert")
 def on_comment_like_insert(
     mapper: Mapper, connection: Connection, new_comment_like: CommentLike
 ) -> None:
+    update_comment_likes_count(connection, new_comment_like.comment_id, 1)
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Connection) -> None:
         from fittrackee.users.models import Notification, User
@@ -555,6 +572,8 @@ def on_comment_like_insert(
 def on_comment_like_delete(
     mapper: Mapper, connection: Connection, old_comment_like: CommentLike
 ) -> None:
+    update_comment_likes_count(connection, old_comment_like.comment_id, -1)
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Any) -> None:
         from fittrackee.users.models import Notification
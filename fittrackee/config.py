@@ -53,9 +53,42 @@ class BaseConfig:
         ),
         "STATICMAP_SUBDOMAINS": os.environ.get("STATICMAP_SUBDOMAINS", ""),
     }
+    STATICMAP_ASYNC_RENDERING = (
+        os.environ.get("STATICMAP_ASYNC_RENDERING", "false").lower() == "true"
+    )
+    TILE_CACHE_DIR = os.environ.get(
+        "TILE_CACHE_DIR",
+        os.path.join(
+            os.getenv("STATICMAP_CACHE_DIR", ".staticmap_cache"), "tiles"
+        ),
+    )
+    # in MB
+    TILE_CACHE_MAX_SIZE = (
+        int(os.environ.get("TILE_CACHE_MAX_SIZE", "500")) * 1024 * 1024
+    )
+    # in seconds, when tile server does not return max-age
+    TILE_CACHE_TTL = int(os.environ.get("TILE_CACHE_TTL", "604800"))
 
+    ELEVATION_DEM_DIR = os.environ.get("ELEVATION_DEM_DIR", "")
     OPEN_ELEVATION_API_URL = os.environ.get("OPEN_ELEVATION_API_URL", "")
     VALHALLA_API_URL = os.environ.get("VALHALLA_API_URL", "")
+    VECTORIZED_GPX_PROCESSING = (
+        os.environ.get("VECTORIZED_GPX_PROCESSING", "false").lower() == "true"
+    )
+    # in seconds
+    WEATHER_CACHE_TTL = int(os.environ.get("WEATHER_CACHE_TTL", "604800"))
+    WEATHER_ASYNC_PROCESSING = (
+        os.environ.get("WEATHER_ASYNC_PROCESSING", "false").lower() == "true"
+    )
+    WORKOUTS_IMPORT_WORKERS = int(
+        os.environ.get("WORKOUTS_IMPORT_WORKERS", "1")
+    )
+    # 'memory', 'redis' or 'null'
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    # in seconds, 0 to disable verified tokens cache
+    AUTH_TOKEN_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_CACHE_TTL", "0"))
+    # in seconds, 0 to disable sharing social graph through Redis
+    SOCIAL_GRAPH_CACHE_TTL = int(os.environ.get("SOCIAL_GRAPH_CACHE_TTL", "0"))
 
     DRAMATIQ_BROKER = broker
     TASKS_PROCESSING_AVAILABLE = False
@@ -103,8 +136,12 @@ class TestingConfig(BaseConfig):
         os.getenv("UPLOAD_FOLDER", current_app.root_path),
         "uploads" + XDIST_WORKER,
     )
+    # removed with upload folder after each test
+    TILE_CACHE_DIR = os.path.join(UPLOAD_FOLDER, "tiles")
     SECRET_KEY = uuid4().hex
     BCRYPT_LOG_ROUNDS = 4
+    CACHE_BACKEND = "null"
+    WEATHER_CACHE_TTL = 0
     TOKEN_EXPIRATION_DAYS = 0
     TOKEN_EXPIRATION_SECONDS = 60
     PASSWORD_TOKEN_EXPIRATION_SECONDS = 60
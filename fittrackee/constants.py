@@ -12,11 +12,26 @@ class TaskPriority(IntEnum):
 
 class ElevationDataSource(str, Enum):  # to make enum serializable
     FILE = "file"
+    DEM = "dem"
     OPEN_ELEVATION = "open_elevation"
     OPEN_ELEVATION_SMOOTH = "open_elevation_smooth"
     VALHALLA = "valhalla"
 
 
+class MapStatus(str, Enum):  # to make enum serializable
+    PENDING = "pending"
+    READY = "ready"
+    ERROR = "error"
+
+
+class StorageCategory(str, Enum):  # to make enum serializable
+    ORIGINAL_FILES = "original_files"
+    MAPS = "maps"
+    PICTURES = "pictures"
+    EXPORTS = "exports"
+    ARCHIVES = "archives"
+
+
 class PaceSpeedDisplay(str, Enum):
     PACE = "pace"  # min/km
     SPEED = "speed"
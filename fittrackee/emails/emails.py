@@ -9,7 +9,7 @@ from urllib.parse import unquote
 from flask import Flask
 from urllib3.util import parse_url
 
-from fittrackee.templates import I18nTemplate
+from fittrackee.templates import I18nTemplate, get_i18n_template
 
 from .exceptions import InvalidEmailUrlScheme
 
@@ -77,7 +77,8 @@ class EmailService:
         self.username = parsed_url["username"]
         self.password = parsed_url["password"]
         self.sender_email = app.config["SENDER_EMAIL"]
-        self.email_template = EmailTemplate(
+        self.email_template = get_i18n_template(
+            EmailTemplate,
             app.config["EMAILS_TEMPLATES_FOLDER"],
             app.config["TRANSLATIONS_FOLDER"],
             app.config["LANGUAGES"],
@@ -6,6 +6,7 @@ from flask import current_app
 from flask_babel import force_locale, lazy_gettext
 
 from fittrackee.feeds.feeds.feed_item_template import FeedItemTemplate
+from fittrackee.templates import get_i18n_template
 from fittrackee.utils import clean_input
 from fittrackee.visibility_levels import (
     can_view,
@@ -46,7 +47,8 @@ class UserWorkoutsFeedService:
         self.elevation_unit = "ft" if use_imperial_units else "m"
 
         self.feed = self.init_feed()
-        self.feed_template = FeedItemTemplate(
+        self.feed_template = get_i18n_template(
+            FeedItemTemplate,
             current_app.config["FEEDS_TEMPLATES_FOLDER"],
             current_app.config["TRANSLATIONS_FOLDER"],
             current_app.config["LANGUAGES"],
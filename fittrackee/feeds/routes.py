@@ -1,9 +1,15 @@
-from typing import Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from flask import Blueprint, Response, request
 from sqlalchemy import func
 
-from fittrackee.responses import HttpResponse, UserNotFoundErrorResponse
+from fittrackee import VERSION
+from fittrackee.responses import (
+    HttpResponse,
+    UserNotFoundErrorResponse,
+    conditional_response,
+    generate_etag,
+)
 from fittrackee.users.exceptions import UserNotFoundException
 from fittrackee.users.models import User
 from fittrackee.visibility_levels import VisibilityLevel
@@ -11,14 +17,63 @@ from fittrackee.workouts.models import Workout
 
 from .feeds.workouts_feed_service import UserWorkoutsFeedService
 
+if TYPE_CHECKING:
+    from flask_sqlalchemy.query import Query
+
 feeds_blueprint = Blueprint("feeds", __name__)
 
 FEED_ITEMS_LIMIT = 5
 
 
+def get_user_from_user_name(user_name: str) -> Optional[User]:
+    return User.query.filter(
+        func.lower(User.username) == func.lower(user_name),
+    ).first()
+
+
+def get_latest_public_workouts_query(user: User) -> "Query":
+    return Workout.query.filter(
+        Workout.user_id == user.id,
+        Workout.workout_visibility == VisibilityLevel.PUBLIC.value,
+    ).order_by(Workout.workout_date.desc())
+
+
+def get_user_public_workouts_rss_feed_etag(user_name: str) -> Optional[str]:
+    """
+    Get ETag from latest public workouts versions, without loading workouts
+    """
+    try:
+        user = get_user_from_user_name(user_name)
+    except (ValueError, UserNotFoundException):
+        return None
+    if not user:
+        return None
+
+    workouts_versions = (
+        []
+        if user.suspended_at
+        else get_latest_public_workouts_query(user)
+        .with_entities(
+            Workout.uuid, Workout.modification_date, Workout.creation_date
+        )
+        .limit(FEED_ITEMS_LIMIT)
+        .all()
+    )
+    return generate_etag(
+        VERSION,
+        user.username,
+        user.suspended_at,
+        sorted(request.args.items(multi=True)),
+        [tuple(workout_version) for workout_version in workouts_versions],
+    )
+
+
 @feeds_blueprint.route(
     "/users/<string:user_name>/workouts.rss", methods=["GET"]
 )
+@conditional_response(
+    get_user_public_workouts_rss_feed_etag, cache_control="public, no-cache"
+)
 def get_user_public_workouts_rss_feed(
     user_name: str,
 ) -> Union[Response, HttpResponse]:
@@ -49,14 +104,15 @@ def get_user_public_workouts_rss_feed(
     :query boolean description: display workout description if true
            (default: false).
 
+    :reqheader If-None-Match: ETag returned in a previous response
+
     :statuscode 200: ``success``
+    :statuscode 304: ``not modified``
     :statuscode 404: ``user does not exist``
 
     """
     try:
-        user = User.query.filter(
-            func.lower(User.username) == func.lower(user_name),
-        ).first()
+        user = get_user_from_user_name(user_name)
         if not user:
             return UserNotFoundErrorResponse()
     except (ValueError, UserNotFoundException):
@@ -66,13 +122,10 @@ def get_user_public_workouts_rss_feed(
         latest_public_workouts = []
     else:
         latest_public_workouts = (
-            Workout.query.filter(
-                Workout.user_id == user.id,
-                Workout.workout_visibility == VisibilityLevel.PUBLIC.value,
-            )
-            .order_by(Workout.workout_date.desc())
+            get_latest_public_workouts_query(user)
             .limit(FEED_ITEMS_LIMIT)
-        ).all()
+            .all()
+        )
 
     params = request.args.copy()
     lang = params.get("lang", "en")
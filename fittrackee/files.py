@@ -3,7 +3,6 @@ from typing import IO, TYPE_CHECKING, Dict, Union
 from uuid import uuid4
 
 from flask import current_app
-from PIL import Image
 from werkzeug.utils import secure_filename
 
 from fittrackee import appLog
@@ -11,6 +10,7 @@ from fittrackee import appLog
 from .exceptions import FileException
 
 if TYPE_CHECKING:
+    from PIL import Image
     from werkzeug.datastructures import FileStorage
 
 
@@ -120,6 +120,8 @@ def generate_filename(extension: str) -> str:
 
 
 def get_image_without_exif(file: "FileStorage") -> "Image.Image":
+    from PIL import Image
+
     image = Image.open(file.stream)
     image_without_exif = Image.new(image.mode, image.size)
     image_without_exif.putdata(image.get_flattened_data())
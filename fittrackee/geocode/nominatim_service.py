@@ -4,7 +4,7 @@ from typing import Dict, List, Optional
 import requests
 
 from fittrackee import VERSION, appLog
-from fittrackee.utils import TimedLRUCache
+from fittrackee.cache import cached
 
 
 def get_preferred_languages(language: Optional[str]) -> Dict:
@@ -30,7 +30,7 @@ class NominatimService:
         self.params = {"format": "jsonv2"}
         self.headers = {"User-Agent": f"FitTrackee v{VERSION}"}
 
-    @TimedLRUCache(seconds=1800)  # 30 minutes
+    @cached("nominatim:city", ttl=1800, negative_ttl=300)
     def get_locations_from_city(
         self, city: str, language: Optional[str] = None
     ) -> List[Dict]:
@@ -60,7 +60,7 @@ class NominatimService:
             for location in locations
         ]
 
-    @TimedLRUCache(seconds=1800)  # 30 minutes
+    @cached("nominatim:id", ttl=1800, negative_ttl=300)
     def get_location_from_id(
         self, osm_id: str, language: Optional[str] = None
     ) -> Dict:
@@ -0,0 +1,53 @@
+"""add compressed points to workout segments
+
+Revision ID: 3f1c9e7a2b64
+Revises: 84394acbebcf
+Create Date: 2026-10-17 09:12:41.518302
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from fittrackee.workouts.utils.points import SegmentPointsReader
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9e7a2b64'
+down_revision = '84394acbebcf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # existing points are converted with 'ftcli workouts convert_points'
+    with op.batch_alter_table('workout_segments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('points_data', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    connection = op.get_bind()
+    segments = connection.execute(
+        sa.text(
+            """
+            SELECT uuid, points_data FROM workout_segments
+            WHERE points_data IS NOT NULL
+            """
+        )
+    )
+    for segment in segments.mappings().all():
+        points = SegmentPointsReader(segment["points_data"]).get_points()
+        connection.execute(
+            sa.text(
+                """
+                UPDATE workout_segments
+                SET points = CAST(:points AS json)
+                WHERE uuid = :uuid
+                """
+            ),
+            {"points": json.dumps(points), "uuid": segment["uuid"]},
+        )
+
+    with op.batch_alter_table('workout_segments', schema=None) as batch_op:
+        batch_op.drop_column('points_data')
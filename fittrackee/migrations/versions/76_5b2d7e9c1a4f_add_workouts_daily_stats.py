@@ -0,0 +1,88 @@
+"""add workouts daily stats
+
+Revision ID: 5b2d7e9c1a4f
+Revises: 3f1c9e7a2b64
+Create Date: 2026-10-17 14:21:08.417625
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2d7e9c1a4f'
+down_revision = '3f1c9e7a2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "workouts_daily_stats",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("sport_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("total_workouts", sa.Integer(), nullable=False),
+        sa.Column(
+            "distance_sum",
+            sa.Numeric(precision=12, scale=3),
+            nullable=True,
+        ),
+        sa.Column("distance_count", sa.Integer(), nullable=False),
+        sa.Column("moving_sum", sa.Interval(), nullable=True),
+        sa.Column("moving_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "ascent_sum", sa.Numeric(precision=12, scale=3), nullable=True
+        ),
+        sa.Column("ascent_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "descent_sum", sa.Numeric(precision=12, scale=3), nullable=True
+        ),
+        sa.Column("descent_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "ave_speed_sum",
+            sa.Numeric(precision=12, scale=2),
+            nullable=True,
+        ),
+        sa.Column("ave_speed_count", sa.Integer(), nullable=False),
+        sa.Column("ave_pace_sum", sa.Interval(), nullable=True),
+        sa.Column("ave_pace_count", sa.Integer(), nullable=False),
+        sa.Column("calories_sum", sa.BigInteger(), nullable=True),
+        sa.ForeignKeyConstraint(["sport_id"], ["sports.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "sport_id", "day", name="user_sport_daily_stats"
+        ),
+    )
+
+    # workout date is stored without timezone
+    op.execute("""
+        INSERT INTO workouts_daily_stats
+          (user_id, sport_id, day, total_workouts,
+           distance_sum, distance_count, moving_sum, moving_count,
+           ascent_sum, ascent_count, descent_sum, descent_count,
+           ave_speed_sum, ave_speed_count, ave_pace_sum, ave_pace_count,
+           calories_sum)
+        SELECT
+          workouts.user_id,
+          workouts.sport_id,
+          date(timezone(coalesce(users.timezone, 'UTC'),
+                        timezone('Z', workouts.workout_date))) AS day,
+          count(workouts.id),
+          sum(workouts.distance), count(workouts.distance),
+          sum(workouts.moving), count(workouts.moving),
+          sum(workouts.ascent), count(workouts.ascent),
+          sum(workouts.descent), count(workouts.descent),
+          sum(workouts.ave_speed), count(workouts.ave_speed),
+          sum(workouts.ave_pace), count(workouts.ave_pace),
+          sum(workouts.calories)
+        FROM workouts
+        JOIN users ON users.id = workouts.user_id
+        GROUP BY workouts.user_id, workouts.sport_id, day;
+    """)
+
+
+def downgrade():
+    op.drop_table("workouts_daily_stats")
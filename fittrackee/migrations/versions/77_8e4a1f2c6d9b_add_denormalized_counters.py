@@ -0,0 +1,98 @@
+"""add denormalized counters on users, workouts and comments
+
+Revision ID: 8e4a1f2c6d9b
+Revises: 5b2d7e9c1a4f
+Create Date: 2026-10-17 16:02:41.351084
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4a1f2c6d9b'
+down_revision = '5b2d7e9c1a4f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        for column in ['followers_count', 'following_count', 'workouts_count']:
+            batch_op.add_column(
+                sa.Column(
+                    column, sa.Integer(), server_default='0', nullable=False
+                )
+            )
+    with op.batch_alter_table('workouts', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'likes_count', sa.Integer(), server_default='0', nullable=False
+            )
+        )
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'likes_count', sa.Integer(), server_default='0', nullable=False
+            )
+        )
+
+    op.execute(
+        """
+        UPDATE users
+        SET followers_count = (
+              SELECT COUNT(*)
+              FROM follow_requests
+              JOIN users AS other_user
+                ON other_user.id = follow_requests.follower_user_id
+              WHERE follow_requests.followed_user_id = users.id
+                AND follow_requests.is_approved IS TRUE
+                AND other_user.suspended_at IS NULL
+            ),
+            following_count = (
+              SELECT COUNT(*)
+              FROM follow_requests
+              JOIN users AS other_user
+                ON other_user.id = follow_requests.followed_user_id
+              WHERE follow_requests.follower_user_id = users.id
+                AND follow_requests.is_approved IS TRUE
+                AND other_user.suspended_at IS NULL
+            ),
+            workouts_count = (
+              SELECT COUNT(workouts.id)
+              FROM workouts
+              WHERE workouts.user_id = users.id
+            );
+        """
+    )
+    op.execute(
+        """
+        UPDATE workouts
+        SET likes_count = (
+          SELECT COUNT(workout_likes.id)
+          FROM workout_likes
+          WHERE workout_likes.workout_id = workouts.id
+        );
+        """
+    )
+    op.execute(
+        """
+        UPDATE comments
+        SET likes_count = (
+          SELECT COUNT(comment_likes.id)
+          FROM comment_likes
+          WHERE comment_likes.comment_id = comments.id
+        );
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_column('likes_count')
+    with op.batch_alter_table('workouts', schema=None) as batch_op:
+        batch_op.drop_column('likes_count')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('workouts_count')
+        batch_op.drop_column('following_count')
+        batch_op.drop_column('followers_count')
@@ -0,0 +1,31 @@
+"""add elevations cache
+
+Revision ID: 3c9f5a7e2b1d
+Revises: 8e4a1f2c6d9b
+Create Date: 2026-10-17 17:24:08.512736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9f5a7e2b1d'
+down_revision = '8e4a1f2c6d9b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'elevations_cache',
+        sa.Column('source', sa.String(length=50), nullable=False),
+        sa.Column('latitude', sa.Integer(), nullable=False),
+        sa.Column('longitude', sa.Integer(), nullable=False),
+        sa.Column('elevation', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('source', 'latitude', 'longitude'),
+    )
+
+
+def downgrade():
+    op.drop_table('elevations_cache')
@@ -0,0 +1,44 @@
+"""add map status on workouts
+
+Revision ID: 5d1e8b3f7a2c
+Revises: 3c9f5a7e2b1d
+Create Date: 2026-10-17 18:05:31.207458
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1e8b3f7a2c'
+down_revision = '3c9f5a7e2b1d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    map_status = postgresql.ENUM(
+        'PENDING', 'READY', 'ERROR', name='map_status'
+    )
+    map_status.create(op.get_bind(), checkfirst=True)
+
+    with op.batch_alter_table('workouts', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('map_status', map_status, nullable=True)
+        )
+
+    op.execute(
+        """
+        UPDATE workouts
+        SET map_status = 'READY'
+        WHERE map IS NOT NULL AND map_id IS NOT NULL;
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('workouts', schema=None) as batch_op:
+        batch_op.drop_column('map_status')
+
+    op.execute('DROP TYPE map_status')
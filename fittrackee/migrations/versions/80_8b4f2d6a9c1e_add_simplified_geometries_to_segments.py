@@ -0,0 +1,45 @@
+"""add simplified geometries to workout segments
+
+Revision ID: 8b4f2d6a9c1e
+Revises: 5d1e8b3f7a2c
+Create Date: 2026-10-17 19:12:08.540671
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geometry
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4f2d6a9c1e'
+down_revision = '5d1e8b3f7a2c'
+branch_labels = None
+depends_on = None
+
+# see 'SIMPLIFIED_GEOMETRIES' in fittrackee/workouts/constants.py
+SIMPLIFIED_GEOMETRIES = [
+    ('geom_low', 0.001),
+    ('geom_medium', 0.0002),
+    ('geom_high', 0.00005),
+]
+
+
+def upgrade():
+    with op.batch_alter_table('workout_segments', schema=None) as batch_op:
+        for column_name, _ in SIMPLIFIED_GEOMETRIES:
+            batch_op.add_geospatial_column(sa.Column(column_name, Geometry(geometry_type='LINESTRING', srid=4326, dimension=2, spatial_index=False, from_text='ST_GeomFromEWKT', name='geometry'), nullable=True))
+
+    for column_name, tolerance in SIMPLIFIED_GEOMETRIES:
+        op.execute(
+            f"""
+            UPDATE workout_segments
+            SET {column_name} = ST_SimplifyPreserveTopology(geom, {tolerance})
+            WHERE geom IS NOT NULL;
+            """
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('workout_segments', schema=None) as batch_op:
+        for column_name, _ in reversed(SIMPLIFIED_GEOMETRIES):
+            batch_op.drop_geospatial_column(column_name)
@@ -0,0 +1,26 @@
+"""add geography index on workout segments
+
+Revision ID: c7e3a1f9d2b4
+Revises: 8b4f2d6a9c1e
+Create Date: 2026-10-17 21:03:44.182906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e3a1f9d2b4'
+down_revision = '8b4f2d6a9c1e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('workout_segments', schema=None) as batch_op:
+        batch_op.create_index('ix_workout_segments_geom_geography', [sa.text('geography(geom)')], unique=False, postgresql_using='gist')
+
+
+def downgrade():
+    with op.batch_alter_table('workout_segments', schema=None) as batch_op:
+        batch_op.drop_index('ix_workout_segments_geom_geography', postgresql_using='gist')
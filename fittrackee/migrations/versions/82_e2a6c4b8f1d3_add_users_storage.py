@@ -0,0 +1,50 @@
+"""add users storage
+
+Revision ID: e2a6c4b8f1d3
+Revises: c7e3a1f9d2b4
+Create Date: 2026-10-17 22:14:09.618230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a6c4b8f1d3'
+down_revision = 'c7e3a1f9d2b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users_storage',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'category',
+            sa.Enum(
+                'ORIGINAL_FILES',
+                'MAPS',
+                'PICTURES',
+                'EXPORTS',
+                'ARCHIVES',
+                name='storage_categories',
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            'size', sa.BigInteger(), server_default='0', nullable=False
+        ),
+        sa.ForeignKeyConstraint(
+            ['user_id'], ['users.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('user_id', 'category'),
+    )
+    # sizes of existing files are calculated with
+    # 'ftcli users update_storage_usage'
+
+
+def downgrade():
+    op.drop_table('users_storage')
+
+    op.execute('DROP TYPE storage_categories')
@@ -0,0 +1,69 @@
+"""add DEM to elevation data sources
+
+Revision ID: a5d9e3c7b2f4
+Revises: e2a6c4b8f1d3
+Create Date: 2026-10-17 23:05:41.273916
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d9e3c7b2f4'
+down_revision = 'e2a6c4b8f1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "ALTER TYPE elevation_data_source RENAME TO elevation_data_source_old"
+    )
+    op.execute(
+        "CREATE TYPE elevation_data_source AS ENUM('FILE', 'DEM', "
+        "'OPEN_ELEVATION', 'OPEN_ELEVATION_SMOOTH', 'VALHALLA')"
+    )
+    op.execute(
+        """
+        ALTER TABLE users 
+            ALTER COLUMN missing_elevations_processing DROP DEFAULT,
+            ALTER COLUMN missing_elevations_processing TYPE elevation_data_source USING missing_elevations_processing::text::elevation_data_source,
+            ALTER COLUMN missing_elevations_processing SET DEFAULT 'FILE';
+        ALTER TABLE workouts 
+            ALTER COLUMN elevation_data_source DROP DEFAULT,
+            ALTER COLUMN elevation_data_source TYPE elevation_data_source USING elevation_data_source::text::elevation_data_source,
+            ALTER COLUMN elevation_data_source SET DEFAULT 'FILE';
+    """
+    )
+    op.execute("DROP TYPE elevation_data_source_old")
+
+
+def downgrade():
+    op.execute(
+        "UPDATE users SET missing_elevations_processing = 'FILE' "
+        "WHERE missing_elevations_processing = 'DEM';"
+    )
+    op.execute(
+        "UPDATE workouts SET elevation_data_source = 'FILE' "
+        "WHERE elevation_data_source = 'DEM';"
+    )
+    op.execute(
+        "ALTER TYPE elevation_data_source RENAME TO elevation_data_source_old"
+    )
+    op.execute(
+        "CREATE TYPE elevation_data_source AS ENUM('FILE', "
+        "'OPEN_ELEVATION', 'OPEN_ELEVATION_SMOOTH', 'VALHALLA')"
+    )
+    op.execute(
+        """
+        ALTER TABLE users 
+            ALTER COLUMN missing_elevations_processing DROP DEFAULT,
+            ALTER COLUMN missing_elevations_processing TYPE elevation_data_source USING missing_elevations_processing::text::elevation_data_source,
+            ALTER COLUMN missing_elevations_processing SET DEFAULT 'FILE';
+        ALTER TABLE workouts 
+            ALTER COLUMN elevation_data_source DROP DEFAULT,
+            ALTER COLUMN elevation_data_source TYPE elevation_data_source USING elevation_data_source::text::elevation_data_source,
+            ALTER COLUMN elevation_data_source SET DEFAULT 'FILE';
+    """
+    )
+    op.execute("DROP TYPE elevation_data_source_old")
@@ -1,5 +1,5 @@
 from functools import wraps
-from typing import Any, Callable, List, Union
+from typing import Any, Callable, List, Optional, Union
 
 from authlib.integrations.flask_oauth2 import ResourceProtector
 from authlib.oauth2 import OAuth2Error
@@ -7,13 +7,40 @@ from authlib.oauth2.rfc6749.errors import MissingAuthorizationError
 from flask import current_app, request
 from werkzeug.exceptions import RequestEntityTooLarge
 
+from fittrackee import db
 from fittrackee.responses import (
     ForbiddenErrorResponse,
+    HttpResponse,
     PayloadTooLargeErrorResponse,
     UnauthorizedErrorResponse,
 )
 from fittrackee.users.models import User
 from fittrackee.users.roles import UserRole
+from fittrackee.users.tokens_cache import (
+    get_verified_token,
+    invalidate_verified_token,
+    store_verified_token,
+)
+
+
+def get_access_error_response(
+    *,
+    is_active: bool,
+    is_suspended: bool,
+    user_role: int,
+    allow_suspended_user: bool,
+    role: Optional[UserRole],
+) -> Optional[HttpResponse]:
+    if not is_active:
+        return UnauthorizedErrorResponse("provide a valid auth token")
+    if (allow_suspended_user is False and is_suspended) or (
+        role and user_role < role.value
+    ):
+        return ForbiddenErrorResponse(
+            "you do not have permissions"
+            + (", your account is suspended" if is_suspended else "")
+        )
+    return None
 
 
 class CustomResourceProtector(ResourceProtector):
@@ -40,9 +67,28 @@ class CustomResourceProtector(ResourceProtector):
                     # First-party application (Fittrackee front-end)
                     # in this case, scopes will be ignored
                     auth_token = auth_header.split(" ")[1]
-                    resp = User.decode_auth_token(auth_token)
-                    if isinstance(resp, int):
-                        auth_user = User.query.filter_by(id=resp).first()
+                    verified_token = get_verified_token(auth_token)
+                    if verified_token:
+                        error_response = get_access_error_response(
+                            is_active=verified_token.is_active,
+                            is_suspended=verified_token.is_suspended,
+                            user_role=verified_token.role,
+                            allow_suspended_user=allow_suspended_user,
+                            role=role,
+                        )
+                        if error_response:
+                            return error_response
+                        auth_user = db.session.get(
+                            User, verified_token.user_id
+                        )
+                        if not auth_user:
+                            invalidate_verified_token(auth_token)
+                    else:
+                        resp = User.decode_auth_token(auth_token)
+                        if isinstance(resp, int):
+                            auth_user = User.query.filter_by(id=resp).first()
+                            if auth_user:
+                                store_verified_token(auth_token, auth_user)
 
                     # Third-party applications
                     if not auth_user and scopes:
@@ -78,28 +124,21 @@ class CustomResourceProtector(ResourceProtector):
                             else current_token.user
                         )
 
-                if (not optional_auth_user and not auth_user) or (
-                    auth_user and not auth_user.is_active
-                ):
+                if not optional_auth_user and not auth_user:
                     return UnauthorizedErrorResponse(
                         "provide a valid auth token"
                     )
 
-                if auth_user and (
-                    (
-                        allow_suspended_user is False
-                        and auth_user.suspended_at is not None
-                    )
-                    or (role and auth_user.role < role.value)
-                ):
-                    return ForbiddenErrorResponse(
-                        "you do not have permissions"
-                        + (
-                            ", your account is suspended"
-                            if auth_user and auth_user.suspended_at
-                            else ""
-                        )
+                if auth_user:
+                    error_response = get_access_error_response(
+                        is_active=auth_user.is_active,
+                        is_suspended=auth_user.suspended_at is not None,
+                        user_role=auth_user.role,
+                        allow_suspended_user=allow_suspended_user,
+                        role=role,
                     )
+                    if error_response:
+                        return error_response
                 return f(auth_user, *args, **kwargs)
 
             return decorated
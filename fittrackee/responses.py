@@ -1,7 +1,9 @@
+import hashlib
+from functools import wraps
 from json import dumps
-from typing import Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 
-from flask import Request, Response, current_app
+from flask import Request, Response, current_app, make_response, request
 from flask_sqlalchemy import SQLAlchemy
 
 from fittrackee import appLog
@@ -162,6 +164,13 @@ class GoneResponse(HttpResponse):
         super().__init__(status_code=410, response={})
 
 
+class NotModifiedResponse(HttpResponse):
+    def __init__(self, etag: str, cache_control: str) -> None:
+        super().__init__(status_code=304)
+        self.set_etag(etag)
+        self.headers["Cache-Control"] = cache_control
+
+
 class PayloadTooLargeErrorResponse(GenericErrorResponse):
     def __init__(
         self, file_type: str, file_size: Optional[int], max_size: Optional[int]
@@ -246,3 +255,46 @@ def get_error_response_if_file_is_invalid(
         )
 
     return None
+
+
+def generate_etag(*values: Any) -> str:
+    return hashlib.sha256(
+        "|".join(str(value) for value in values).encode()
+    ).hexdigest()
+
+
+def conditional_response(
+    get_etag: Callable[..., Optional[str]],
+    cache_control: str = "private, no-cache",
+) -> Callable:
+    """
+    Return '304 Not Modified' response when request 'If-None-Match' header
+    matches ETag, without calling decorated route.
+
+    'get_etag' is called with route arguments (after 'require_auth' if
+    decorator is placed below it) and must be cheaper than the route.
+    It must return None when ETag cannot be calculated (for instance when
+    resource does not exist or user cannot access it), to let route return
+    an error.
+    ETag is only added to successful responses.
+    """
+
+    def decorator_conditional_response(f: Callable) -> Callable:
+        @wraps(f)
+        def wrapper_conditional_response(*args: Any, **kwargs: Any) -> Any:
+            etag = get_etag(*args, **kwargs)
+            if etag is None:
+                return f(*args, **kwargs)
+
+            if request.if_none_match.contains_weak(etag):
+                return NotModifiedResponse(etag, cache_control)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = cache_control
+            return response
+
+        return wrapper_conditional_response
+
+    return decorator_conditional_response
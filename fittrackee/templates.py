@@ -1,47 +1,98 @@
-from typing import Dict, List
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
 
-from babel.support import Translations
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from babel.support import NullTranslations, Translations
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemLoader,
+    select_autoescape,
+)
+from jinja2.bccache import Bucket
+
+T = TypeVar("T", bound="I18nTemplate")
+
+
+@lru_cache(maxsize=None)
+def get_translations(
+    translations_directory: str, lang: str
+) -> NullTranslations:
+    """
+    Catalogs are only read, they can be shared between templates and threads.
+    """
+    return Translations.load(dirname=translations_directory, locales=[lang])
+
+
+class InMemoryBytecodeCache(BytecodeCache):
+    """
+    Compiled templates do not depend on installed translations, so bytecode
+    is shared between language environments and a template is compiled
+    only once.
+    """
+
+    def __init__(self) -> None:
+        self._bytecodes: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        with self._lock:
+            bytecode = self._bytecodes.get(bucket.key)
+        if bytecode is not None:
+            bucket.bytecode_from_string(bytecode)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        bytecode = bucket.bytecode_to_string()
+        with self._lock:
+            self._bytecodes[bucket.key] = bytecode
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bytecodes.clear()
 
 
 class I18nTemplate:
+    """
+    Each language has its own environment with translations installed on
+    creation, so rendering does not modify shared state and templates can be
+    rendered concurrently.
+    Compiled templates are cached by environments.
+    """
+
     def __init__(
         self,
         template_directory: str,
         translations_directory: str,
         languages: List[str],
     ) -> None:
-        self._translations = self._get_translations(
-            translations_directory, languages
-        )
-        self._env = Environment(
+        self._bytecode_cache = InMemoryBytecodeCache()
+        self._loader = FileSystemLoader(template_directory)
+        self._environments = {
+            language: self._get_environment(
+                get_translations(translations_directory, language)
+            )
+            for language in languages
+        }
+
+    def _get_environment(self, translations: NullTranslations) -> Environment:
+        env = Environment(
             autoescape=select_autoescape(["html", "htm", "xml"]),
-            loader=FileSystemLoader(template_directory),
+            loader=self._loader,
             extensions=["jinja2.ext.i18n"],
+            bytecode_cache=self._bytecode_cache,
         )
-
-    @staticmethod
-    def _get_translations(
-        translations_directory: str, languages: List[str]
-    ) -> Dict:
-        translations = {}
-        for language in languages:
-            translations[language] = Translations.load(
-                dirname=translations_directory, locales=[language]
-            )
-        return translations
-
-    def _load_translation(self, lang: str) -> None:
-        self._env.install_gettext_translations(  # type: ignore
-            self._translations[lang],
+        env.install_gettext_translations(  # type: ignore
+            translations,
             newstyle=True,
         )
+        return env
 
     def get_content(
         self, template_name: str, lang: str, part: str, data: Dict
     ) -> str:
-        self._load_translation(lang)
-        template = self._env.get_template(f"{template_name}/{part}")
+        template = self._environments[lang].get_template(
+            f"{template_name}/{part}"
+        )
         return template.render(data)
 
     def get_all_contents(
@@ -51,3 +102,40 @@ class I18nTemplate:
         for part in parts:
             output[part] = self.get_content(template, lang, part, data)
         return output
+
+
+_templates_registry: Dict[Tuple, "I18nTemplate"] = {}
+_templates_registry_lock = threading.Lock()
+
+
+def get_i18n_template(
+    template_class: Type[T],
+    template_directory: str,
+    translations_directory: str,
+    languages: List[str],
+) -> T:
+    """
+    Return template instance shared by the process (for instance, to avoid
+    loading translations and compiling templates on each feed request).
+    """
+    key = (
+        template_class,
+        template_directory,
+        translations_directory,
+        tuple(languages),
+    )
+    template: Optional[I18nTemplate] = _templates_registry.get(key)
+    if template is None:
+        with _templates_registry_lock:
+            template = _templates_registry.get(key)
+            if template is None:
+                template = template_class(
+                    template_directory, translations_directory, languages
+                )
+                _templates_registry[key] = template
+    return template  # type: ignore[return-value]
+
+
+def clear_templates_registry() -> None:
+    with _templates_registry_lock:
+        _templates_registry.clear()
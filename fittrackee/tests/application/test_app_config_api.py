@@ -154,6 +154,7 @@ class TestUpdateConfig(ApiTestCaseMixin):
         assert "success" in data["status"]
         assert data["data"]["admin_contact"] == admin_email
         assert data["data"]["elevation_services"] == {
+            "dem": False,
             "open_elevation": False,
             "valhalla": False,
         }
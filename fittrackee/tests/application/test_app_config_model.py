@@ -165,6 +165,7 @@ class TestConfigModel:
         serialized_app_config = config.serialize()
 
         assert serialized_app_config["elevation_services"] == {
+            "dem": False,
             "open_elevation": False,
             "valhalla": False,
         }
@@ -177,10 +178,24 @@ class TestConfigModel:
         serialized_app_config = config.serialize()
 
         assert serialized_app_config["elevation_services"] == {
+            "dem": False,
             "open_elevation": True,
             "valhalla": False,
         }
 
+    def test_it_returns_elevation_services_when_dem_dir_is_set(
+        self, app_with_dem_dir: "Flask"
+    ) -> None:
+        config = AppConfig.query.one()
+
+        serialized_app_config = config.serialize()
+
+        assert serialized_app_config["elevation_services"] == {
+            "dem": True,
+            "open_elevation": False,
+            "valhalla": False,
+        }
+
     def test_it_returns_elevation_services_when_valhalla_is_enabled(
         self, app_with_valhalla_url: "Flask"
     ) -> None:
@@ -189,6 +204,7 @@ class TestConfigModel:
         serialized_app_config = config.serialize()
 
         assert serialized_app_config["elevation_services"] == {
+            "dem": False,
             "open_elevation": False,
             "valhalla": True,
         }
@@ -201,6 +217,7 @@ class TestConfigModel:
         serialized_app_config = config.serialize()
 
         assert serialized_app_config["elevation_services"] == {
+            "dem": False,
             "open_elevation": True,
             "valhalla": True,
         }
@@ -213,6 +230,7 @@ class TestConfigModel:
         serialized_app_config = config.serialize()
 
         assert serialized_app_config["elevation_services"] == {
+            "dem": False,
             "open_elevation": False,
             "valhalla": False,
         }
@@ -1,4 +1,5 @@
 import os
+from typing import List
 
 import pytest
 from werkzeug.test import TestResponse
@@ -17,12 +18,32 @@ pytest_plugins = [
     "fittrackee.tests.fixtures.fixtures_app",
     "fittrackee.tests.fixtures.fixtures_emails",
     "fittrackee.tests.fixtures.fixtures_equipments",
-    "fittrackee.tests.fixtures.fixtures_geometries",
     "fittrackee.tests.fixtures.fixtures_workouts",
     "fittrackee.tests.fixtures.fixtures_users",
 ]
 
 pytest.register_assert_rewrite("fittrackee.tests.custom_asserts")
 
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="run tests marked as benchmark",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="need --benchmark option to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 # Prevent pytest from collecting TestResponse as test
 TestResponse.__test__ = False  # type: ignore
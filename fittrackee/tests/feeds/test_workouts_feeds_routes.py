@@ -220,3 +220,83 @@ class TestGetUserPublicWorkoutsFeed(ApiTestCaseMixin):
                 workout_title=workout_cycling_user_1.title,
             )
         )
+
+
+class TestGetUserPublicWorkoutsFeedConditionalRequest(ApiTestCaseMixin):
+    route = "/users/{username}/workouts.rss"
+
+    def test_it_returns_etag(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        workout_cycling_user_1.workout_visibility = VisibilityLevel.PUBLIC
+        client = app.test_client()
+
+        response = client.get(self.route.format(username=user_1.username))
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "public, no-cache"
+
+    def test_it_returns_304_without_generating_feed_when_etag_matches(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        workout_cycling_user_1.workout_visibility = VisibilityLevel.PUBLIC
+        client = app.test_client()
+        url = self.route.format(username=user_1.username)
+        etag = client.get(url).headers["ETag"]
+
+        with patch(
+            "fittrackee.feeds.routes.UserWorkoutsFeedService"
+        ) as feed_service_mock:
+            response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        feed_service_mock.assert_not_called()
+
+    def test_it_returns_feed_when_a_public_workout_is_added(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        sport_2_running: "Sport",
+        workout_cycling_user_1: "Workout",
+        workout_running_user_1: "Workout",
+    ) -> None:
+        workout_cycling_user_1.workout_visibility = VisibilityLevel.PUBLIC
+        client = app.test_client()
+        url = self.route.format(username=user_1.username)
+        etag = client.get(url).headers["ETag"]
+        workout_running_user_1.workout_visibility = VisibilityLevel.PUBLIC
+
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_it_returns_feed_when_query_parameters_change(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        workout_cycling_user_1.workout_visibility = VisibilityLevel.PUBLIC
+        client = app.test_client()
+        url = self.route.format(username=user_1.username)
+        etag = client.get(url).headers["ETag"]
+
+        response = client.get(
+            f"{url}?lang=fr", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
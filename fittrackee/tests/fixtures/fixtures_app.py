@@ -4,11 +4,12 @@ from typing import Generator, Iterator, Optional, Union
 from unittest.mock import MagicMock, patch
 
 import pytest
-from flask import current_app
+from flask import Flask, current_app
 
 from fittrackee import create_app, db, limiter
 from fittrackee.application.models import AppConfig
 from fittrackee.application.utils import update_app_config_from_database
+from fittrackee.cache import get_cache_backend, reset_cache_stats
 from fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service import (  # noqa
     weather_service,
 )
@@ -207,6 +208,16 @@ def app_with_nominatim_url(monkeypatch: pytest.MonkeyPatch) -> Generator:
     yield from get_app(with_config=True)
 
 
+@pytest.fixture
+def app_with_memory_cache(app: Flask) -> Generator:
+    app.config["CACHE_BACKEND"] = "memory"
+    get_cache_backend().clear()
+    reset_cache_stats()
+    yield app
+    get_cache_backend().clear()
+    app.config["CACHE_BACKEND"] = "null"
+
+
 @pytest.fixture
 def app_with_open_elevation_url(monkeypatch: pytest.MonkeyPatch) -> Generator:
     monkeypatch.setenv(
@@ -236,6 +247,14 @@ def app_with_open_elevation_and_valhalla_url(
     yield from get_app(with_config=True)
 
 
+@pytest.fixture
+def app_with_dem_dir(
+    app: Flask, tmp_path_factory: pytest.TempPathFactory
+) -> Generator:
+    app.config["ELEVATION_DEM_DIR"] = str(tmp_path_factory.mktemp("dem"))
+    yield app
+
+
 @pytest.fixture
 def app_with_empty_string_as_open_elevation_and_valhalla_url(
     monkeypatch: pytest.MonkeyPatch,
@@ -1,75 +0,0 @@
-import pytest
-from shapely import Polygon
-
-
-@pytest.fixture()
-def paris_with_10km_buffer() -> Polygon:
-    return Polygon(
-        (
-            (2.362431123843492, 48.85348618457388),
-            (2.362376683159058, 48.85260412906315),
-            (2.3621914976517617, 48.851729841960484),
-            (2.361877357400467, 48.85087174253842),
-            (2.3614372939000803, 48.85003809376014),
-            (2.3608755506302987, 48.84923692274121),
-            (2.3601975419801815, 48.84847594349699),
-            (2.359409800932117, 48.84776248271795),
-            (2.3585199160156343, 48.847103409284585),
-            (2.357536458143191, 48.84650506819859),
-            (2.3564688980357236, 48.845973219562836),
-            (2.3553275150343875, 48.84551298319479),
-            (2.3541232981759137, 48.84512878940347),
-            (2.352867840481537, 48.84482433640062),
-            (2.3515732274729673, 48.844602554753436),
-            (2.350251920982787, 48.844465579218486),
-            (2.348916639370555, 48.84441472822586),
-            (2.3475802352893482, 48.84445049120967),
-            (2.3462555721702842, 48.844572523905505),
-            (2.3449554006044746, 48.84477965166013),
-            (2.3436922358027883, 48.845069880721375),
-            (2.342478237303791, 48.84544041740063),
-            (2.3413250920792525, 48.845887694924905),
-            (2.3402439021549983, 48.84640740772136),
-            (2.3392450778227274, 48.84699455280758),
-            (2.338338237466221, 48.84764347789083),
-            (2.3375321149634742, 48.848347935716944),
-            (2.3368344755552615, 48.849101144148385),
-            (2.3362520409910985, 48.849895851396326),
-            (2.3357904246761776, 48.850724405781705),
-            (2.3354540774484014, 48.85157882935648),
-            (2.3352462445139537, 48.85245089467849),
-            (2.335168933963819, 48.85333220400302),
-            (2.3352228971832982, 48.85421427012996),
-            (2.335407621352846, 48.85508859812885),
-            (2.3357213341225465, 48.855946767155544),
-            (2.336161020425368, 48.856780511571976),
-            (2.336722451277105, 48.8575818005873),
-            (2.3374002242947487, 48.85834291565157),
-            (2.338187815551136, 48.85905652485485),
-            (2.339077642273151, 48.85971575361278),
-            (2.3400611357847176, 48.86031425095466),
-            (2.3411288239953136, 48.86084625077276),
-            (2.3422704226408513, 48.861306627439774),
-            (2.3434749343975185, 48.86169094525505),
-            (2.3447307549113074, 48.8619955012407),
-            (2.3460257847175616, 48.86221736087195),
-            (2.3473475459663953, 48.86235438639535),
-            (2.348683302822128, 48.862405257459756),
-            (2.350020184368339, 48.862369483859744),
-            (2.3513453088251945, 48.86224741026767),
-            (2.352645907872629, 48.862040212908404),
-            (2.353909449871892, 48.861749888209),
-            (2.355123760788927, 48.861379233533334),
-            (2.356277141645912, 48.86093182018901),
-            (2.3573584813618034, 48.86041195896831),
-            (2.358357363888493, 48.85982465855751),
-            (2.359264168605826, 48.85917557721837),
-            (2.3600701630054024, 48.858470968209936),
-            (2.3607675867693834, 48.85771761947954),
-            (2.361349726435341, 48.85692278820765),
-            (2.3618109799308575, 48.85609413083947),
-            (2.362146910360975, 48.85523962928065),
-            (2.3623542885368094, 48.85436751397021),
-            (2.362431123843492, 48.85348618457388),
-        )
-    )
@@ -19,9 +19,7 @@ from fittrackee.workouts.models import (
     Workout,
     WorkoutSegment,
 )
-from fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service import (
-    StaticMap,
-)
+from fittrackee.workouts.services.map_tiles import TileCache
 from fittrackee.workouts.utils.convert import convert_speed_into_pace_duration
 
 from ..utils import random_string
@@ -57,10 +55,17 @@ def update_records_patch(request: pytest.FixtureRequest) -> Iterator[None]:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def static_map_get_mock() -> Generator:
-    # to avoid unnecessary requests calls through staticmap
-    m = Mock(return_value=(200, byte_image))
-    with patch.object(StaticMap, "get", m) as _fixture:
+def tile_server_request_mock() -> Generator:
+    # to avoid unnecessary requests calls to tile server (map tiles proxy and
+    # staticmap)
+    m = Mock(
+        return_value=Mock(
+            status_code=200,
+            content=byte_image,
+            headers={"content-type": "image/png"},
+        )
+    )
+    with patch.object(TileCache, "_request_tile_server", m) as _fixture:
         yield _fixture
 
 
@@ -97,7 +97,9 @@ class TestNominatimServiceGetLocationsFromCity(ResponseMockMixin):
             headers=service.headers,
         )
 
-    def test_it_caches_nominatim_response(self, app: "Flask") -> None:
+    def test_it_caches_nominatim_response(
+        self, app_with_memory_cache: "Flask"
+    ) -> None:
         service = NominatimService()
 
         with patch.object(
@@ -208,7 +210,9 @@ class TestNominatimServiceGetLocationFromId(ResponseMockMixin):
             headers=service.headers,
         )
 
-    def test_it_caches_nominatim_response(self, app: "Flask") -> None:
+    def test_it_caches_nominatim_response(
+        self, app_with_memory_cache: "Flask"
+    ) -> None:
         service = NominatimService()
 
         with patch.object(
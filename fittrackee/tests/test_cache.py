@@ -0,0 +1,191 @@
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+from flask import Flask
+from time_machine import travel
+
+from fittrackee.cache import (
+    MemoryCacheBackend,
+    NullCacheBackend,
+    RedisCacheBackend,
+    cached,
+    get_cache_stats,
+)
+
+
+class TestNullCacheBackend:
+    def test_it_does_not_store_value(self) -> None:
+        backend = NullCacheBackend()
+
+        backend.set("key", "value", ttl=60)
+
+        assert backend.get("key") is None
+
+
+class TestMemoryCacheBackend:
+    def test_it_returns_none_when_key_does_not_exist(self) -> None:
+        backend = MemoryCacheBackend()
+
+        assert backend.get("key") is None
+
+    def test_it_returns_stored_value(self) -> None:
+        backend = MemoryCacheBackend()
+
+        backend.set("key", "value", ttl=60)
+
+        assert backend.get("key") == "value"
+
+    def test_it_expires_entries_individually(self) -> None:
+        backend = MemoryCacheBackend()
+        with travel(0, tick=False) as traveller:
+            backend.set("key_1", "value_1", ttl=60)
+            traveller.shift(30)
+            backend.set("key_2", "value_2", ttl=60)
+
+            traveller.shift(31)
+
+            assert backend.get("key_1") is None
+            assert backend.get("key_2") == "value_2"
+
+    def test_it_evicts_least_recently_used_entry(self) -> None:
+        backend = MemoryCacheBackend(maxsize=2)
+        backend.set("key_1", "value_1", ttl=60)
+        backend.set("key_2", "value_2", ttl=60)
+        backend.get("key_1")
+
+        backend.set("key_3", "value_3", ttl=60)
+
+        assert backend.get("key_1") == "value_1"
+        assert backend.get("key_2") is None
+        assert backend.get("key_3") == "value_3"
+
+    def test_it_deletes_entry(self) -> None:
+        backend = MemoryCacheBackend()
+        backend.set("key", "value", ttl=60)
+
+        backend.delete("key")
+
+        assert backend.get("key") is None
+
+
+class TestRedisCacheBackend:
+    def test_it_stores_value_with_ttl(self) -> None:
+        client = MagicMock()
+        backend = RedisCacheBackend(client)
+
+        backend.set("key", "value", ttl=60)
+
+        client.set.assert_called_once_with(
+            "fittrackee:cache:key", "value", ex=60
+        )
+
+    def test_it_returns_decoded_value(self) -> None:
+        client = MagicMock()
+        client.get.return_value = b"value"
+        backend = RedisCacheBackend(client)
+
+        assert backend.get("key") == "value"
+        client.get.assert_called_once_with("fittrackee:cache:key")
+
+    def test_it_returns_none_on_redis_error(self) -> None:
+        client = MagicMock()
+        client.get.side_effect = redis.exceptions.ConnectionError()
+        backend = RedisCacheBackend(client)
+
+        assert backend.get("key") is None
+
+
+class CachedService:
+    def __init__(self, results: Dict[str, Any]) -> None:
+        self.results = results
+        self.calls: List[str] = []
+
+    @cached("tests:service", ttl=60, negative_ttl=10)
+    def get(self, value: str, language: Optional[str] = None) -> Any:
+        self.calls.append(value)
+        return self.results.get(value)
+
+
+class TestCached:
+    def test_it_does_not_cache_with_null_backend(self, app: Flask) -> None:
+        service = CachedService({"a": ["result"]})
+
+        service.get("a")
+        service.get("a")
+
+        assert service.calls == ["a", "a"]
+
+    def test_it_returns_cached_result(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        service = CachedService({"a": ["result"]})
+
+        first_result = service.get("a")
+        second_result = service.get("a")
+
+        assert first_result == second_result == ["result"]
+        assert service.calls == ["a"]
+
+    def test_it_ignores_instance_in_key(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        CachedService({"a": ["result"]}).get("a")
+        service = CachedService({"a": ["result"]})
+
+        service.get("a")
+
+        assert service.calls == []
+
+    def test_it_uses_arguments_in_key(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        service = CachedService({"a": ["result"]})
+
+        service.get("a", "fr")
+        service.get("a", language="fr")
+        service.get("a", "en")
+
+        assert service.calls == ["a", "a"]
+
+    def test_it_caches_empty_result_with_negative_ttl(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        service = CachedService({})
+        with travel(0, tick=False) as traveller:
+            service.get("a")
+            service.get("a")
+            traveller.shift(11)
+
+            service.get("a")
+
+        assert service.calls == ["a", "a"]
+
+    def test_it_does_not_cache_errors(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        calls = []
+
+        @cached("tests:error", ttl=60)
+        def get_value() -> str:
+            calls.append(1)
+            raise ValueError()
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                get_value()
+
+        assert len(calls) == 2
+
+    def test_it_returns_hit_rate(self, app_with_memory_cache: Flask) -> None:
+        service = CachedService({"a": {"result": 1}})
+
+        for _ in range(4):
+            service.get("a")
+
+        assert get_cache_stats()["tests:service"] == {
+            "hits": 3,
+            "misses": 1,
+            "hit_rate": 0.75,
+        }
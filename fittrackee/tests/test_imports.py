@@ -0,0 +1,75 @@
+import json
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+# modules imported on application startup (see 'create_app')
+APP_MODULES = [
+    "fittrackee",
+    "fittrackee.application.app_config",
+    "fittrackee.comments.comments",
+    "fittrackee.equipments.equipments",
+    "fittrackee.feeds.routes",
+    "fittrackee.geocode.routes",
+    "fittrackee.oauth2.routes",
+    "fittrackee.reports.reports",
+    "fittrackee.users.auth",
+    "fittrackee.users.users",
+    "fittrackee.workouts.records",
+    "fittrackee.workouts.stats",
+    "fittrackee.workouts.tasks",
+    "fittrackee.workouts.timeline",
+    "fittrackee.workouts.workouts",
+]
+# heavy dependencies only needed by some endpoints or tasks
+LAZY_LOADED_MODULES = [
+    "fitdecode",
+    "geopandas",
+    "pandas",
+    "PIL",
+    "pyproj",
+    "staticmap3",
+]
+
+
+def import_in_subprocess(script: str) -> dict:
+    # a new interpreter is needed, since modules are already imported
+    # in tests process
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def app_imported_modules() -> List[str]:
+    return import_in_subprocess(
+        "import json, sys\n"
+        f"for module in {APP_MODULES!r}:\n"
+        "    __import__(module)\n"
+        "print(json.dumps({'modules': sorted(sys.modules)}))\n"
+    )["modules"]
+
+
+class TestAppModulesImport:
+    @pytest.mark.parametrize("input_module", LAZY_LOADED_MODULES)
+    def test_it_does_not_import_heavy_dependency(
+        self, app_imported_modules: List[str], input_module: str
+    ) -> None:
+        assert input_module not in app_imported_modules
+
+    def test_it_does_not_check_redis_connection_on_import(self) -> None:
+        result = import_in_subprocess(
+            "import json, redis\n"
+            "calls = []\n"
+            "redis.Redis.ping = lambda *args, **kwargs: calls.append(1)\n"
+            "import fittrackee\n"
+            "print(json.dumps({'ping_calls': len(calls)}))\n"
+        )
+
+        assert result == {"ping_calls": 0}
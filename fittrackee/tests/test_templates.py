@@ -0,0 +1,134 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from flask import Flask
+from jinja2 import Environment
+
+from fittrackee.emails.emails import EmailTemplate
+from fittrackee.feeds.feeds.feed_item_template import FeedItemTemplate
+from fittrackee.templates import (
+    I18nTemplate,
+    clear_templates_registry,
+    get_i18n_template,
+)
+
+
+class TestI18nTemplate:
+    def test_it_renders_templates_concurrently_in_different_languages(
+        self, app: Flask
+    ) -> None:
+        email_template = EmailTemplate(
+            app.config["EMAILS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+        languages = ["en", "fr"] * 50
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            subjects = list(
+                executor.map(
+                    lambda lang: email_template.get_content(
+                        "password_change", lang, "subject.txt", {}
+                    ),
+                    languages,
+                )
+            )
+
+        assert subjects == [
+            (
+                "FitTrackee - Password changed"
+                if lang == "en"
+                else "FitTrackee - Mot de passe modifié"
+            )
+            for lang in languages
+        ]
+
+    def test_it_compiles_template_only_once_for_all_languages(
+        self, app: Flask
+    ) -> None:
+        email_template = EmailTemplate(
+            app.config["EMAILS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+
+        with patch.object(
+            Environment,
+            "compile",
+            autospec=True,
+            side_effect=Environment.compile,
+        ) as compile_mock:
+            for lang in ["en", "fr", "de"]:
+                for _ in range(3):
+                    email_template.get_content(
+                        "password_change", lang, "subject.txt", {}
+                    )
+
+        compile_mock.assert_called_once()
+
+
+class TestGetI18nTemplate:
+    def test_it_returns_same_instance_for_same_parameters(
+        self, app: Flask
+    ) -> None:
+        clear_templates_registry()
+
+        template = get_i18n_template(
+            FeedItemTemplate,
+            app.config["FEEDS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+
+        assert isinstance(template, FeedItemTemplate)
+        assert template is get_i18n_template(
+            FeedItemTemplate,
+            app.config["FEEDS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+
+    def test_it_returns_different_instances_for_different_parameters(
+        self, app: Flask
+    ) -> None:
+        clear_templates_registry()
+
+        template = get_i18n_template(
+            I18nTemplate,
+            app.config["FEEDS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+
+        assert template is not get_i18n_template(
+            I18nTemplate,
+            app.config["EMAILS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+        assert template is not get_i18n_template(
+            FeedItemTemplate,
+            app.config["FEEDS_TEMPLATES_FOLDER"],
+            app.config["TRANSLATIONS_FOLDER"],
+            app.config["LANGUAGES"],
+        )
+
+    def test_it_creates_only_one_instance_when_called_concurrently(
+        self, app: Flask
+    ) -> None:
+        clear_templates_registry()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            templates = list(
+                executor.map(
+                    lambda _: get_i18n_template(
+                        EmailTemplate,
+                        app.config["EMAILS_TEMPLATES_FOLDER"],
+                        app.config["TRANSLATIONS_FOLDER"],
+                        app.config["LANGUAGES"],
+                    ),
+                    range(20),
+                )
+            )
+
+        assert len({id(template) for template in templates}) == 1
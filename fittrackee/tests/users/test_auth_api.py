@@ -1,5 +1,6 @@
 import json
-from datetime import datetime, timedelta, timezone
+import os
+from datetime import date, datetime, timedelta, timezone
 from io import BytesIO
 from typing import Dict, Optional, Union
 from unittest.mock import ANY, MagicMock, Mock, call, patch
@@ -20,10 +21,11 @@ from fittrackee.users.models import (
     UserTask,
 )
 from fittrackee.users.roles import UserRole
+from fittrackee.users.storage import get_file_size, get_storage_usage
 from fittrackee.users.timezones import TIMEZONES
 from fittrackee.users.utils.tokens import get_user_token
 from fittrackee.visibility_levels import VisibilityLevel
-from fittrackee.workouts.models import Sport, Workout
+from fittrackee.workouts.models import Sport, Workout, WorkoutsDailyStats
 
 from ..comments.mixins import CommentMixin
 from ..mixins import (
@@ -1715,6 +1717,55 @@ class TestUserPreferencesUpdate(ApiTestCaseMixin):
             data["data"]["workouts_visibility"] == VisibilityLevel.PUBLIC.value
         )
 
+    def test_it_rebuilds_daily_stats_when_timezone_changes(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.post(
+            "/api/auth/profile/edit/preferences",
+            content_type="application/json",
+            data=json.dumps(
+                dict(
+                    timezone="America/New_York",
+                    weekm=True,
+                    language="en",
+                    imperial_units=True,
+                    display_ascent=False,
+                    start_elevation_at_zero=False,
+                    use_dark_mode=True,
+                    use_raw_gpx_speed=True,
+                    date_format="yyyy-MM-dd",
+                    map_visibility="private",
+                    analysis_visibility="private",
+                    workouts_visibility="private",
+                    manually_approves_followers=False,
+                    hide_profile_in_users_directory=False,
+                    hr_visibility="private",
+                    segments_creation_event="none",
+                    split_workout_charts=True,
+                    missing_elevations_processing="file",
+                    calories_visibility="private",
+                )
+            ),
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        # workout_date: 'Mon, 01 Jan 2018 00:00:00 GMT'
+        assert [
+            daily_stats.day
+            for daily_stats in WorkoutsDailyStats.query.filter_by(
+                user_id=user_1.id
+            ).all()
+        ] == [date(2017, 12, 31)]
+
     def test_expected_scope_is_profile_write(
         self, app: Flask, user_1: User
     ) -> None:
@@ -2589,6 +2640,30 @@ class TestUserPicture(ApiTestCaseMixin, ImageMixin):
         assert user_1.picture is not None
         assert filename in user_1.picture
 
+    def test_it_updates_user_storage_usage(
+        self, app: Flask, user_1: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        for _ in range(2):
+            client.post(
+                "/api/auth/picture",
+                data=dict(file=(self.get_image_content(app), "avatar.png")),
+                headers=dict(
+                    content_type="multipart/form-data",
+                    Authorization=f"Bearer {auth_token}",
+                ),
+            )
+
+        assert user_1.picture is not None
+        picture_size = get_file_size(
+            os.path.join(app.config["UPLOAD_FOLDER"], user_1.picture)
+        )
+        assert picture_size > 0
+        assert get_storage_usage(user_1.id)["pictures"] == picture_size
+
     def test_suspended_user_can_update_picture(
         self, app: Flask, suspended_user: User
     ) -> None:
@@ -2652,6 +2727,7 @@ class TestUserDeletePicture(ApiTestCaseMixin, ImageMixin):
 
         assert response.status_code == 204
         assert user_1.picture is None
+        assert get_storage_usage(user_1.id)["pictures"] == 0
 
     def test_it_does_not_return_error_when_user_has_no_picture(
         self, app: Flask, user_1: User
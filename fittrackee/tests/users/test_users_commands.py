@@ -579,3 +579,49 @@ class TestCliUserDataExportTask(RandomMixin, UserTaskMixin):
 
         assert result.exit_code == 0
         assert caplog.records[0].message == "\nDone."
+
+
+class TestCliUserUpdateCounters:
+    def test_it_calls_update_counters(
+        self, app: "Flask", caplog: "LogCaptureFixture"
+    ) -> None:
+        runner = CliRunner()
+
+        with patch(
+            "fittrackee.users.commands.update_counters",
+        ) as update_counters_mock:
+            result = runner.invoke(cli, ["users", "update_counters"])
+
+        update_counters_mock.assert_called_once_with()
+        assert result.exit_code == 0
+        assert caplog.records[0].message == "Counters updated."
+
+
+class TestCliUserUpdateStorageUsage:
+    def test_it_calls_update_storage_usage_from_files(
+        self, app: "Flask", caplog: "LogCaptureFixture"
+    ) -> None:
+        runner = CliRunner()
+
+        with patch(
+            "fittrackee.users.commands.update_storage_usage_from_files",
+            return_value={
+                "archives": 0,
+                "exports": 2000,
+                "maps": 1000,
+                "original_files": 5000,
+                "pictures": 0,
+            },
+        ) as update_storage_usage_mock:
+            result = runner.invoke(cli, ["users", "update_storage_usage"])
+
+        update_storage_usage_mock.assert_called_once_with()
+        assert result.exit_code == 0
+        assert [record.message for record in caplog.records] == [
+            "archives: 0 Bytes",
+            "exports: 2.0 kB",
+            "maps: 1.0 kB",
+            "original files: 5.0 kB",
+            "pictures: 0 Bytes",
+            "Total: 8.0 kB.",
+        ]
@@ -0,0 +1,242 @@
+from datetime import datetime, timezone
+
+from flask import Flask
+from sqlalchemy import text
+
+from fittrackee import db
+from fittrackee.comments.models import CommentLike
+from fittrackee.users.counters import decrement_likes_counts, update_counters
+from fittrackee.users.models import FollowRequest, User
+from fittrackee.workouts.models import Sport, Workout, WorkoutLike
+
+from ..comments.mixins import CommentMixin
+
+
+class TestUserFollowCounters:
+    def test_it_does_not_count_pending_follow_request(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        assert user_1.followers_count == 0
+        assert user_2.following_count == 0
+
+    def test_it_updates_counters_when_follow_request_is_approved(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        user_1.approves_follow_request_from(user_2)
+
+        assert user_1.followers_count == 1
+        assert user_1.following_count == 0
+        assert user_2.followers_count == 0
+        assert user_2.following_count == 1
+
+    def test_it_updates_counters_when_user_unfollows(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        user_1.approves_follow_request_from(user_2)
+
+        user_2.unfollows(user_1)
+
+        assert user_1.followers_count == 0
+        assert user_2.following_count == 0
+
+    def test_it_updates_counters_when_follower_is_suspended(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        user_1.approves_follow_request_from(user_2)
+
+        user_2.suspended_at = datetime.now(timezone.utc)
+        db.session.commit()
+
+        assert user_1.followers_count == 0
+        assert user_1.followers_count == user_1.followers.count()
+
+        user_2.suspended_at = None
+        db.session.commit()
+
+        assert user_1.followers_count == 1
+        assert user_1.followers_count == user_1.followers.count()
+
+
+class TestUserWorkoutsCount:
+    def test_it_updates_count_when_workouts_are_added_and_deleted(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        assert user_1.workouts_count == 1
+
+        db.session.delete(workout_cycling_user_1)
+        db.session.commit()
+
+        assert user_1.workouts_count == 0
+
+
+class TestLikesCounts(CommentMixin):
+    def test_it_updates_workout_likes_count(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        like = WorkoutLike(
+            user_id=user_2.id, workout_id=workout_cycling_user_1.id
+        )
+        db.session.add(like)
+        db.session.commit()
+
+        assert workout_cycling_user_1.likes_count == 1
+
+        db.session.delete(like)
+        db.session.commit()
+
+        assert workout_cycling_user_1.likes_count == 0
+
+    def test_it_does_not_update_workout_modification_date(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        modification_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        workout_cycling_user_1.modification_date = modification_date
+        db.session.commit()
+        like = WorkoutLike(
+            user_id=user_2.id, workout_id=workout_cycling_user_1.id
+        )
+        db.session.add(like)
+        db.session.commit()
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.likes_count == 1
+        assert workout_cycling_user_1.modification_date == modification_date
+
+        db.session.delete(like)
+        db.session.commit()
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.likes_count == 0
+        assert workout_cycling_user_1.modification_date == modification_date
+
+    def test_it_does_not_update_workout_modification_date_when_liking_user_is_deleted(  # noqa
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        modification_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        workout_cycling_user_1.modification_date = modification_date
+        db.session.add(
+            WorkoutLike(
+                user_id=user_2.id, workout_id=workout_cycling_user_1.id
+            )
+        )
+        db.session.commit()
+
+        decrement_likes_counts(user_2.id)
+        db.session.commit()
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.likes_count == 0
+        assert workout_cycling_user_1.modification_date == modification_date
+
+    def test_it_updates_comment_likes_count(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        comment = self.create_comment(user_1, workout_cycling_user_1)
+        like = CommentLike(user_id=user_2.id, comment_id=comment.id)
+        db.session.add(like)
+        db.session.commit()
+
+        assert comment.likes_count == 1
+
+        db.session.delete(like)
+        db.session.commit()
+
+        assert comment.likes_count == 0
+
+
+class TestUpdateCounters(CommentMixin):
+    def test_it_recalculates_counters(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        user_1.approves_follow_request_from(user_2)
+        comment = self.create_comment(user_2, workout_cycling_user_1)
+        db.session.add(
+            WorkoutLike(
+                user_id=user_2.id, workout_id=workout_cycling_user_1.id
+            )
+        )
+        db.session.add(CommentLike(user_id=user_1.id, comment_id=comment.id))
+        db.session.commit()
+        # counters out of sync
+        db.session.execute(
+            text(
+                "UPDATE users SET followers_count = 5, following_count = 5, "
+                "workouts_count = 5;"
+                "UPDATE workouts SET likes_count = 5;"
+                "UPDATE comments SET likes_count = 5;"
+            )
+        )
+        db.session.commit()
+
+        update_counters()
+
+        assert user_1.followers_count == 1
+        assert user_1.following_count == 0
+        assert user_1.workouts_count == 1
+        assert user_2.followers_count == 0
+        assert user_2.following_count == 1
+        assert user_2.workouts_count == 0
+        assert workout_cycling_user_1.likes_count == 1
+        assert comment.likes_count == 1
+
+    def test_it_does_not_update_workout_modification_date(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        modification_date = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        workout_cycling_user_1.modification_date = modification_date
+        db.session.commit()
+
+        update_counters()
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.modification_date == modification_date
@@ -0,0 +1,248 @@
+import json
+from datetime import datetime, timezone
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from fittrackee import db
+from fittrackee.users.models import FollowRequest, User
+from fittrackee.users.social_graph import (
+    get_blocked_by_ids,
+    get_blocked_ids,
+    get_followers_ids,
+    get_following_ids,
+)
+
+from ..utils import capture_queries
+
+
+def approve_follow_request(follow_request: FollowRequest) -> None:
+    follow_request.is_approved = True
+    follow_request.updated_at = datetime.now(timezone.utc)
+    db.session.commit()
+
+
+class TestSocialGraphIds:
+    def test_it_returns_empty_sets_when_no_relationships(
+        self, app: Flask, user_1: User
+    ) -> None:
+        assert get_followers_ids(user_1.id) == set()
+        assert get_following_ids(user_1.id) == set()
+        assert get_blocked_ids(user_1.id) == set()
+        assert get_blocked_by_ids(user_1.id) == set()
+
+    def test_it_does_not_return_pending_follow_requests(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        assert get_followers_ids(user_1.id) == set()
+        assert get_following_ids(user_2.id) == set()
+
+    def test_it_returns_followers_and_following_ids(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        user_3: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+        follow_request_from_user_3_to_user_1: FollowRequest,
+        follow_request_from_user_3_to_user_2: FollowRequest,
+    ) -> None:
+        approve_follow_request(follow_request_from_user_2_to_user_1)
+        approve_follow_request(follow_request_from_user_3_to_user_1)
+        approve_follow_request(follow_request_from_user_3_to_user_2)
+
+        assert get_followers_ids(user_1.id) == {user_2.id, user_3.id}
+        assert get_following_ids(user_3.id) == {user_1.id, user_2.id}
+
+    def test_it_returns_blocked_and_blocked_by_ids(
+        self, app: Flask, user_1: User, user_2: User, user_3: User
+    ) -> None:
+        user_1.blocks_user(user_2)
+        user_3.blocks_user(user_2)
+
+        assert get_blocked_ids(user_1.id) == {user_2.id}
+        assert get_blocked_by_ids(user_2.id) == {user_1.id, user_3.id}
+
+
+class TestSocialGraphLocalCache:
+    def test_it_does_not_query_database_again_during_request(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        user_1.blocks_user(user_2)
+
+        with app.test_request_context():
+            get_blocked_by_ids(user_2.id)
+
+            with capture_queries() as statements:
+                is_blocked = user_2.is_blocked_by(user_1)
+
+        assert is_blocked is True
+        assert statements == []
+
+    def test_it_invalidates_sets_when_follow_request_is_approved(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        with app.test_request_context():
+            assert user_1.has_follower(user_2) is False
+
+            user_1.approves_follow_request_from(user_2)
+
+            assert user_1.has_follower(user_2) is True
+            assert get_following_ids(user_2.id) == {user_1.id}
+
+    def test_it_invalidates_sets_when_user_unfollows(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        approve_follow_request(follow_request_from_user_2_to_user_1)
+        with app.test_request_context():
+            assert get_followers_ids(user_1.id) == {user_2.id}
+
+            user_2.unfollows(user_1)
+
+            assert get_followers_ids(user_1.id) == set()
+
+    def test_it_invalidates_sets_when_user_is_blocked_and_unblocked(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        with app.test_request_context():
+            assert user_2.is_blocked_by(user_1) is False
+
+            user_1.blocks_user(user_2)
+
+            assert user_2.is_blocked_by(user_1) is True
+            assert user_1.get_blocked_user_ids() == [user_2.id]
+
+            user_1.unblocks_user(user_2)
+
+            assert user_2.is_blocked_by(user_1) is False
+            assert user_1.get_blocked_user_ids() == []
+
+    def test_it_resets_sets_on_new_request(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        client = app.test_client()
+        with app.test_request_context():
+            assert get_blocked_by_ids(user_2.id) == set()
+        # blocking without invalidation
+        db.session.execute(
+            text(
+                "INSERT INTO blocked_users (user_id, by_user_id, created_at) "
+                "VALUES (:user_id, :by_user_id, now())"
+            ),
+            {"user_id": user_2.id, "by_user_id": user_1.id},
+        )
+        db.session.commit()
+
+        client.get("/api/config")
+
+        with app.test_request_context():
+            assert get_blocked_by_ids(user_2.id) == {user_1.id}
+
+
+class TestUserHasFollower:
+    def test_it_returns_false_when_user_does_not_follow(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        assert user_1.has_follower(user_2) is False
+
+    def test_it_returns_true_when_user_follows(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        approve_follow_request(follow_request_from_user_2_to_user_1)
+
+        assert user_1.has_follower(user_2) is True
+
+    def test_it_returns_false_when_follower_is_suspended(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        follow_request_from_user_2_to_user_1: FollowRequest,
+    ) -> None:
+        approve_follow_request(follow_request_from_user_2_to_user_1)
+        user_2.suspended_at = datetime.now(timezone.utc)
+
+        assert user_1.has_follower(user_2) is False
+
+
+class TestSocialGraphRedisCache:
+    @pytest.fixture(autouse=True)
+    def redis_client_mock(self, app: Flask) -> Generator:
+        app.config["SOCIAL_GRAPH_CACHE_TTL"] = 60
+        with patch(
+            "fittrackee.users.social_graph.redis_client"
+        ) as redis_client_mock:
+            redis_client_mock.get.return_value = None
+            yield redis_client_mock
+        app.config["SOCIAL_GRAPH_CACHE_TTL"] = 0
+
+    def test_it_stores_ids_in_redis(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        redis_client_mock: MagicMock,
+    ) -> None:
+        user_1.blocks_user(user_2)
+        redis_client_mock.reset_mock()
+
+        ids = get_blocked_ids(user_1.id)
+
+        assert ids == {user_2.id}
+        redis_client_mock.set.assert_called_once_with(
+            f"fittrackee:social_graph:{user_1.id}:blocked",
+            json.dumps([user_2.id]),
+            ex=60,
+        )
+
+    def test_it_returns_ids_from_redis(
+        self,
+        app: Flask,
+        user_1: User,
+        redis_client_mock: MagicMock,
+    ) -> None:
+        redis_client_mock.get.return_value = json.dumps([3, 4])
+
+        with capture_queries() as statements:
+            ids = get_followers_ids(user_1.id)
+
+        assert ids == {3, 4}
+        assert statements == []
+
+    def test_it_deletes_ids_from_redis_when_user_is_blocked(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        redis_client_mock: MagicMock,
+    ) -> None:
+        user_1.blocks_user(user_2)
+
+        deleted_keys = {
+            key
+            for call in redis_client_mock.delete.call_args_list
+            for key in call.args
+        }
+        assert {
+            f"fittrackee:social_graph:{user_1.id}:blocked",
+            f"fittrackee:social_graph:{user_2.id}:blocked_by",
+        }.issubset(deleted_keys)
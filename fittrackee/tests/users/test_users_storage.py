@@ -0,0 +1,250 @@
+import os
+import shutil
+from pathlib import Path
+
+from flask import Flask
+
+from fittrackee import db
+from fittrackee.constants import StorageCategory
+from fittrackee.files import get_absolute_file_path
+from fittrackee.users.models import User, UserStorage
+from fittrackee.users.storage import (
+    get_file_size,
+    get_storage_usage,
+    update_storage_usage,
+    update_storage_usage_from_files,
+)
+from fittrackee.workouts.models import Sport, Workout
+
+from ..mixins import UserTaskMixin
+
+EMPTY_STORAGE_USAGE = {
+    "archives": 0,
+    "exports": 0,
+    "maps": 0,
+    "original_files": 0,
+    "pictures": 0,
+}
+
+
+def create_file(relative_path: str, size: int) -> str:
+    file_path = get_absolute_file_path(relative_path)
+    Path(file_path).parent.mkdir(exist_ok=True, parents=True)
+    Path(file_path).write_bytes(b"0" * size)
+    return file_path
+
+
+def remove_users_directories(*user_ids: int) -> None:
+    for user_id in user_ids:
+        for directory in ["exports", "pictures", "workouts"]:
+            shutil.rmtree(
+                get_absolute_file_path(os.path.join(directory, str(user_id))),
+                ignore_errors=True,
+            )
+
+
+class TestGetFileSize:
+    def test_it_returns_0_when_file_does_not_exist(self, app: Flask) -> None:
+        assert get_file_size(get_absolute_file_path("not_existing.png")) == 0
+
+    def test_it_returns_file_size(self, app: Flask) -> None:
+        file_path = create_file("file.txt", 10)
+
+        assert get_file_size(file_path) == 10
+
+
+class TestUpdateStorageUsage:
+    def test_it_creates_user_storage_usage_for_category(
+        self, app: Flask, user_1: User
+    ) -> None:
+        update_storage_usage(
+            db.session.connection(), user_1.id, StorageCategory.MAPS, 100
+        )
+
+        assert get_storage_usage(user_1.id) == {
+            **EMPTY_STORAGE_USAGE,
+            "maps": 100,
+        }
+
+    def test_it_increments_user_storage_usage(
+        self, app: Flask, user_1: User
+    ) -> None:
+        for size in [100, 50]:
+            update_storage_usage(
+                db.session.connection(),
+                user_1.id,
+                StorageCategory.PICTURES,
+                size,
+            )
+
+        assert get_storage_usage(user_1.id)["pictures"] == 150
+
+    def test_it_decrements_user_storage_usage(
+        self, app: Flask, user_1: User
+    ) -> None:
+        for size in [100, -30]:
+            update_storage_usage(
+                db.session.connection(),
+                user_1.id,
+                StorageCategory.EXPORTS,
+                size,
+            )
+
+        assert get_storage_usage(user_1.id)["exports"] == 70
+
+    def test_storage_usage_can_not_be_negative(
+        self, app: Flask, user_1: User
+    ) -> None:
+        for size in [100, -300]:
+            update_storage_usage(
+                db.session.connection(),
+                user_1.id,
+                StorageCategory.ARCHIVES,
+                size,
+            )
+
+        assert get_storage_usage(user_1.id)["archives"] == 0
+
+    def test_it_does_not_create_storage_usage_when_size_is_negative(
+        self, app: Flask, user_1: User
+    ) -> None:
+        update_storage_usage(
+            db.session.connection(), user_1.id, StorageCategory.MAPS, -100
+        )
+
+        assert UserStorage.query.count() == 0
+
+
+class TestGetStorageUsage:
+    def test_it_returns_empty_storage_usage(
+        self, app: Flask, user_1: User
+    ) -> None:
+        assert get_storage_usage() == EMPTY_STORAGE_USAGE
+
+    def test_it_returns_storage_usage_for_all_users(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        connection = db.session.connection()
+        update_storage_usage(connection, user_1.id, StorageCategory.MAPS, 10)
+        update_storage_usage(connection, user_2.id, StorageCategory.MAPS, 20)
+        update_storage_usage(
+            connection, user_2.id, StorageCategory.ORIGINAL_FILES, 30
+        )
+
+        assert get_storage_usage() == {
+            **EMPTY_STORAGE_USAGE,
+            "maps": 30,
+            "original_files": 30,
+        }
+
+    def test_it_returns_storage_usage_for_given_user(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        connection = db.session.connection()
+        update_storage_usage(connection, user_1.id, StorageCategory.MAPS, 10)
+        update_storage_usage(connection, user_2.id, StorageCategory.MAPS, 20)
+
+        assert get_storage_usage(user_2.id) == {
+            **EMPTY_STORAGE_USAGE,
+            "maps": 20,
+        }
+
+    def test_it_deletes_storage_usage_when_user_is_deleted(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        connection = db.session.connection()
+        update_storage_usage(connection, user_1.id, StorageCategory.MAPS, 10)
+        update_storage_usage(connection, user_2.id, StorageCategory.MAPS, 20)
+        db.session.commit()
+
+        db.session.delete(user_2)
+        db.session.commit()
+
+        assert get_storage_usage() == {**EMPTY_STORAGE_USAGE, "maps": 10}
+
+
+class TestUpdateStorageUsageFromFiles:
+    def test_it_calculates_storage_usage_from_users_files(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        remove_users_directories(user_1.id, user_2.id)
+        create_file(f"workouts/{user_1.id}/workout.gpx", 100)
+        create_file(f"workouts/{user_1.id}/workout.fit", 50)
+        create_file(f"workouts/{user_1.id}/workout.png", 30)
+        create_file(f"workouts/{user_1.id}/archive_abc.zip", 20)
+        create_file(f"pictures/{user_1.id}/picture.png", 10)
+        create_file(f"exports/{user_2.id}/archive_def.zip", 5)
+
+        storage_usage = update_storage_usage_from_files()
+
+        assert storage_usage == {
+            "archives": 20,
+            "exports": 5,
+            "maps": 30,
+            "original_files": 150,
+            "pictures": 10,
+        }
+        assert get_storage_usage(user_2.id) == {
+            **EMPTY_STORAGE_USAGE,
+            "exports": 5,
+        }
+
+    def test_it_replaces_existing_storage_usage(
+        self, app: Flask, user_1: User
+    ) -> None:
+        remove_users_directories(user_1.id)
+        update_storage_usage(
+            db.session.connection(), user_1.id, StorageCategory.MAPS, 1000
+        )
+        create_file(f"workouts/{user_1.id}/workout.png", 30)
+
+        storage_usage = update_storage_usage_from_files()
+
+        assert storage_usage == {**EMPTY_STORAGE_USAGE, "maps": 30}
+
+    def test_it_does_not_count_files_of_deleted_users(
+        self, app: Flask, user_1: User
+    ) -> None:
+        remove_users_directories(user_1.id, 100)
+        create_file("workouts/100/workout.gpx", 100)
+
+        storage_usage = update_storage_usage_from_files()
+
+        assert storage_usage == EMPTY_STORAGE_USAGE
+
+
+class TestStorageUsageOnFilesDeletion(UserTaskMixin):
+    def test_it_decrements_storage_usage_when_workout_is_deleted(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        remove_users_directories(user_1.id)
+        workout_cycling_user_1.original_file = f"workouts/{user_1.id}/w.gpx"
+        workout_cycling_user_1.map = f"workouts/{user_1.id}/w.png"
+        create_file(workout_cycling_user_1.original_file, 100)
+        create_file(workout_cycling_user_1.map, 30)
+        update_storage_usage_from_files()
+
+        db.session.delete(workout_cycling_user_1)
+        db.session.commit()
+
+        assert get_storage_usage(user_1.id) == EMPTY_STORAGE_USAGE
+
+    def test_it_decrements_storage_usage_when_export_is_deleted(
+        self, app: Flask, user_1: User
+    ) -> None:
+        remove_users_directories(user_1.id)
+        export_file_path = f"exports/{user_1.id}/archive_abc.zip"
+        create_file(export_file_path, 50)
+        export_task = self.create_user_data_export_task(
+            user_1, progress=100, file_path=export_file_path, file_size=50
+        )
+        update_storage_usage_from_files()
+
+        db.session.delete(export_task)
+        db.session.commit()
+
+        assert get_storage_usage(user_1.id) == EMPTY_STORAGE_USAGE
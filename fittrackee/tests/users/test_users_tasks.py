@@ -3,6 +3,9 @@ from typing import TYPE_CHECKING
 
 import pytest
 
+from fittrackee import db
+from fittrackee.constants import StorageCategory
+from fittrackee.users.storage import get_storage_usage, update_storage_usage
 from fittrackee.users.tasks import update_task_and_clean
 
 from ..mixins import RandomMixin, UserTaskMixin
@@ -44,3 +47,56 @@ class TestUpdateTaskAndClean(UserTaskMixin, RandomMixin):
         update_task_and_clean(task_id=task.id)
 
         assert os.path.isfile(file_path) is False
+
+    def test_it_deletes_export_archive(
+        self, app: "Flask", user_1: "User"
+    ) -> None:
+        file_path = self.generate_temporary_data_export(
+            user_1.id, "archive_abc.zip"
+        )
+        task = self.create_user_data_export_task(
+            user_1, file_path=f"exports/{user_1.id}/archive_abc.zip"
+        )
+
+        update_task_and_clean(task_id=task.id)
+
+        assert os.path.isfile(file_path) is False
+
+    def test_it_decrements_exports_storage_usage(
+        self, app: "Flask", user_1: "User"
+    ) -> None:
+        file_path = self.generate_temporary_data_export(
+            user_1.id, "archive_abc.zip"
+        )
+        task = self.create_user_data_export_task(
+            user_1,
+            file_path=f"exports/{user_1.id}/archive_abc.zip",
+            file_size=os.path.getsize(file_path),
+        )
+        update_storage_usage(
+            db.session.connection(),
+            user_1.id,
+            StorageCategory.EXPORTS,
+            os.path.getsize(file_path),
+        )
+        db.session.commit()
+
+        update_task_and_clean(task_id=task.id)
+
+        assert get_storage_usage(user_1.id)["exports"] == 0
+
+    def test_it_does_not_decrement_storage_usage_when_archive_does_not_exist(
+        self, app: "Flask", user_1: "User"
+    ) -> None:
+        update_storage_usage(
+            db.session.connection(), user_1.id, StorageCategory.EXPORTS, 10
+        )
+        task = self.create_user_data_export_task(
+            user_1,
+            file_path=f"exports/{user_1.id}/archive_abc.zip",
+            file_size=10,
+        )
+
+        update_task_and_clean(task_id=task.id)
+
+        assert get_storage_usage(user_1.id)["exports"] == 10
@@ -0,0 +1,296 @@
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from flask import Flask
+from time_machine import travel
+
+from fittrackee import db
+from fittrackee.users.models import User
+from fittrackee.users.roles import UserRole
+from fittrackee.users.tokens_cache import (
+    VerifiedTokensCache,
+    get_verified_tokens_cache_stats,
+    verified_tokens_cache,
+)
+
+from ..mixins import ApiTestCaseMixin
+from ..utils import capture_queries
+
+
+class VerifiedTokensCacheMixin(ApiTestCaseMixin):
+    @pytest.fixture(autouse=True)
+    def enable_cache(self, app: Flask) -> Generator:
+        app.config["AUTH_TOKEN_CACHE_TTL"] = 60
+        verified_tokens_cache.clear()
+        verified_tokens_cache.reset_stats()
+        # values shared between processes (only 'get' and 'incr' are needed)
+        redis_values: Dict[str, bytes] = {}
+
+        def incr(key: str) -> int:
+            value = int(redis_values.get(key, b"0")) + 1
+            redis_values[key] = str(value).encode()
+            return value
+
+        with patch(
+            "fittrackee.users.tokens_cache.redis_client"
+        ) as redis_client_mock:
+            redis_client_mock.get.side_effect = redis_values.get
+            redis_client_mock.incr.side_effect = incr
+            redis_client_mock.smembers.return_value = set()
+            redis_client_mock.values = redis_values
+            yield redis_client_mock
+        verified_tokens_cache.clear()
+        app.config["AUTH_TOKEN_CACHE_TTL"] = 0
+
+
+class TestVerifiedTokensCache(VerifiedTokensCacheMixin):
+    def test_it_returns_none_when_cache_is_disabled(
+        self, app: Flask, user_1: User
+    ) -> None:
+        app.config["AUTH_TOKEN_CACHE_TTL"] = 0
+        auth_token = user_1.encode_auth_token(user_1.id)
+        verified_tokens_cache.store(auth_token, user_1)
+
+        assert verified_tokens_cache.get(auth_token) is None
+
+    def test_it_returns_user_snapshot(self, app: Flask, user_1: User) -> None:
+        auth_token = user_1.encode_auth_token(user_1.id)
+        verified_tokens_cache.store(auth_token, user_1)
+
+        verified_token = verified_tokens_cache.get(auth_token)
+
+        assert verified_token is not None
+        assert verified_token.user_id == user_1.id
+        assert verified_token.is_active is True
+        assert verified_token.is_suspended is False
+        assert verified_token.role == UserRole.USER.value
+        assert get_verified_tokens_cache_stats() == {
+            "local_hits": 1,
+            "redis_hits": 0,
+            "misses": 0,
+        }
+
+    def test_it_does_not_return_expired_entry(
+        self, app: Flask, user_1: User
+    ) -> None:
+        auth_token = user_1.encode_auth_token(user_1.id)
+        verified_tokens_cache.store(auth_token, user_1)
+
+        with travel(
+            datetime.now(timezone.utc) + timedelta(seconds=61), tick=False
+        ):
+            assert verified_tokens_cache.get(auth_token) is None
+
+        assert get_verified_tokens_cache_stats()["misses"] == 1
+
+    def test_it_evicts_least_recently_used_entries(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        cache = VerifiedTokensCache(maxsize=1)
+        auth_token_1 = user_1.encode_auth_token(user_1.id)
+        auth_token_2 = user_2.encode_auth_token(user_2.id)
+        cache.store(auth_token_1, user_1)
+
+        cache.store(auth_token_2, user_2)
+
+        assert cache.get(auth_token_1) is None
+        assert cache.get(auth_token_2) is not None
+
+    def test_it_returns_token_from_redis(
+        self, app: Flask, user_1: User, enable_cache: MagicMock
+    ) -> None:
+        auth_token = user_1.encode_auth_token(user_1.id)
+        token_hash = verified_tokens_cache._get_token_hash(auth_token)
+        enable_cache.values[f"fittrackee:auth_tokens:{token_hash}"] = (
+            json.dumps(
+                {
+                    "user_id": user_1.id,
+                    "is_active": True,
+                    "is_suspended": False,
+                    "role": UserRole.USER.value,
+                    "expires_at": (
+                        datetime.now(timezone.utc) + timedelta(seconds=30)
+                    ).timestamp(),
+                }
+            )
+        )
+
+        verified_token = verified_tokens_cache.get(auth_token)
+
+        assert verified_token is not None
+        assert verified_token.user_id == user_1.id
+        assert get_verified_tokens_cache_stats()["redis_hits"] == 1
+
+    def test_it_invalidates_user_tokens(
+        self, app: Flask, user_1: User, user_2: User
+    ) -> None:
+        auth_token_1 = user_1.encode_auth_token(user_1.id)
+        auth_token_2 = user_2.encode_auth_token(user_2.id)
+        verified_tokens_cache.store(auth_token_1, user_1)
+        verified_tokens_cache.store(auth_token_2, user_2)
+
+        verified_tokens_cache.invalidate_user(user_1.id)
+
+        assert verified_tokens_cache.get(auth_token_1) is None
+        assert verified_tokens_cache.get(auth_token_2) is not None
+
+    def test_it_does_not_return_token_invalidated_by_another_process(
+        self, app: Flask, user_1: User
+    ) -> None:
+        auth_token = user_1.encode_auth_token(user_1.id)
+        cache_process_1 = VerifiedTokensCache()
+        cache_process_2 = VerifiedTokensCache()
+        cache_process_1.store(auth_token, user_1)
+        cache_process_2.store(auth_token, user_1)
+
+        cache_process_1.invalidate_token(auth_token)
+
+        assert cache_process_2.get(auth_token) is None
+        assert cache_process_2.stats["misses"] == 1
+
+    def test_it_does_not_return_token_of_user_invalidated_by_another_process(
+        self, app: Flask, user_1: User
+    ) -> None:
+        auth_token = user_1.encode_auth_token(user_1.id)
+        cache_process_1 = VerifiedTokensCache()
+        cache_process_2 = VerifiedTokensCache()
+        cache_process_2.store(auth_token, user_1)
+
+        cache_process_1.invalidate_user(user_1.id)
+
+        assert cache_process_2.get(auth_token) is None
+
+    def test_it_does_not_cache_token_when_redis_is_not_available(
+        self, app: Flask, user_1: User, enable_cache: MagicMock
+    ) -> None:
+        auth_token = user_1.encode_auth_token(user_1.id)
+        enable_cache.get.side_effect = redis.exceptions.ConnectionError()
+        verified_tokens_cache.store(auth_token, user_1)
+
+        assert verified_tokens_cache.get(auth_token) is None
+
+
+class TestResourceProtectorWithVerifiedTokensCache(VerifiedTokensCacheMixin):
+    def test_it_does_not_check_blacklisted_tokens_when_token_is_cached(
+        self, app: Flask, user_1: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        client.get(
+            "/api/auth/profile",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        with capture_queries() as statements:
+            response = client.get(
+                "/api/auth/profile",
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        assert response.status_code == 200
+        assert not [
+            statement
+            for statement in statements
+            if "blacklisted_tokens" in statement
+        ]
+
+    def test_it_returns_error_after_logout(
+        self, app: Flask, user_1: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        client.get(
+            "/api/auth/profile",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+        client.post(
+            "/api/auth/logout",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        response = client.get(
+            "/api/auth/profile",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_401(response)
+
+    def test_it_returns_error_when_token_is_blacklisted_in_another_process(
+        self, app: Flask, user_1: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        client.get(
+            "/api/auth/profile",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+        # token is cached in current process
+        assert verified_tokens_cache.get(auth_token) is not None
+        other_process_cache = VerifiedTokensCache()
+
+        # logout handled by another process
+        with patch(
+            "fittrackee.users.tokens_cache.verified_tokens_cache",
+            other_process_cache,
+        ):
+            client.post(
+                "/api/auth/logout",
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        response = client.get(
+            "/api/auth/profile",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+        self.assert_401(response)
+
+    def test_it_returns_error_when_user_is_suspended(
+        self, app: Flask, user_1: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        client.get(
+            "/api/workouts",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+        user_1.suspended_at = datetime.now(timezone.utc)
+        db.session.commit()
+        assert verified_tokens_cache.get(auth_token) is None
+
+        response = client.get(
+            "/api/workouts",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_403(
+            response, "you do not have permissions, your account is suspended"
+        )
+
+    def test_it_returns_error_when_user_role_changes(
+        self, app: Flask, user_1_admin: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1_admin.email
+        )
+        client.get(
+            "/api/users/tasks/queued",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+        user_1_admin.role = UserRole.USER.value
+        db.session.commit()
+        assert verified_tokens_cache.get(auth_token) is None
+
+        response = client.get(
+            "/api/users/tasks/queued",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_403(response)
@@ -1,12 +1,14 @@
 import random
 import string
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from json import dumps, loads
-from typing import Dict, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 from uuid import uuid4
 
 from flask import json as flask_json
 from requests import Response
+from sqlalchemy import event
 
 from fittrackee import db
 from fittrackee.users.models import FollowRequest, User
@@ -89,3 +91,19 @@ TEST_OAUTH_CLIENT_METADATA = {
     "redirect_uris": [random_domain()],
     "scope": "profile:read workouts:read",
 }
+
+
+@contextmanager
+def capture_queries() -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
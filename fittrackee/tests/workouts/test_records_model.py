@@ -1,11 +1,22 @@
 import datetime
-from datetime import timedelta
+from datetime import timedelta, timezone
+from typing import Dict, Optional
+from unittest.mock import patch
 
 import pytest
 from flask import Flask
 
+from fittrackee import db
 from fittrackee.users.models import User
-from fittrackee.workouts.models import Record, Sport, Workout
+from fittrackee.workouts.models import (
+    Record,
+    Sport,
+    Workout,
+    deferred_records_update,
+    recalculate_records,
+)
+
+from ..fixtures.fixtures_workouts import update_workout
 
 
 @pytest.mark.disable_autouse_update_records_patch
@@ -215,3 +226,270 @@ class TestRecordModel:
         record_serialize = record_ap.serialize()
         assert record_serialize.get("value") == "0:07:00"
         assert isinstance(record_serialize.get("value"), str)
+
+
+@pytest.mark.disable_autouse_update_records_patch
+class TestRecordsUpdate:
+    @staticmethod
+    def add_workout(
+        user: User,
+        sport: Sport,
+        distance: float,
+        workout_date: Optional[datetime.datetime] = None,
+    ) -> Workout:
+        workout = Workout(
+            user_id=user.id,
+            sport_id=sport.id,
+            workout_date=(
+                datetime.datetime(2018, 2, 1, tzinfo=timezone.utc)
+                if workout_date is None
+                else workout_date
+            ),
+            distance=distance,
+            duration=timedelta(seconds=3600),
+        )
+        update_workout(workout)
+        db.session.add(workout)
+        db.session.commit()
+        return workout
+
+    @staticmethod
+    def get_records_workouts(user: User, sport: Sport) -> Dict:
+        return {
+            record.record_type: record.workout_id
+            for record in Record.query.filter_by(
+                user_id=user.id, sport_id=sport.id
+            ).all()
+        }
+
+    def test_it_updates_records_when_new_workout_is_better(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = self.add_workout(user_1, sport_1_cycling, distance=20)
+
+        assert self.get_records_workouts(user_1, sport_1_cycling) == {
+            "AS": workout.id,
+            "BP": workout.id,
+            "FD": workout.id,
+            "LD": workout_cycling_user_1.id,
+            "MS": workout.id,
+        }
+        record_fd = Record.query.filter_by(
+            user_id=user_1.id, sport_id=sport_1_cycling.id, record_type="FD"
+        ).one()
+        assert record_fd.value == 20.0
+        assert record_fd.workout_uuid == workout.uuid
+        assert record_fd.workout_date == workout.workout_date
+
+    def test_it_does_not_update_records_when_new_workout_is_not_better(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        self.add_workout(user_1, sport_1_cycling, distance=5)
+
+        assert set(
+            self.get_records_workouts(user_1, sport_1_cycling).values()
+        ) == {workout_cycling_user_1.id}
+
+    def test_it_keeps_oldest_workout_when_values_are_equal(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = self.add_workout(
+            user_1,
+            sport_1_cycling,
+            distance=10,
+            workout_date=datetime.datetime(2017, 1, 1, tzinfo=timezone.utc),
+        )
+
+        assert set(
+            self.get_records_workouts(user_1, sport_1_cycling).values()
+        ) == {workout.id}
+
+    def test_it_does_not_recalculate_records_on_workout_insert(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        with patch(
+            "fittrackee.workouts.models.recalculate_records"
+        ) as recalculate_records_mock:
+            self.add_workout(user_1, sport_1_cycling, distance=20)
+
+        recalculate_records_mock.assert_not_called()
+
+    def test_it_recalculates_records_when_record_holder_is_downgraded(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = self.add_workout(user_1, sport_1_cycling, distance=20)
+
+        workout.distance = 5
+        update_workout(workout)
+        db.session.commit()
+
+        assert set(
+            self.get_records_workouts(user_1, sport_1_cycling).values()
+        ) == {workout_cycling_user_1.id}
+
+    def test_it_updates_record_when_record_holder_is_improved(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout_cycling_user_1.distance = 15
+        db.session.commit()
+
+        record_fd = Record.query.filter_by(
+            user_id=user_1.id, sport_id=sport_1_cycling.id, record_type="FD"
+        ).one()
+        assert record_fd.value == 15.0
+        assert record_fd.workout_id == workout_cycling_user_1.id
+
+    def test_it_recalculates_records_when_record_holder_sport_changes(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        sport_2_running: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = self.add_workout(user_1, sport_1_cycling, distance=20)
+
+        workout.sport_id = sport_2_running.id
+        db.session.commit()
+
+        assert set(
+            self.get_records_workouts(user_1, sport_1_cycling).values()
+        ) == {workout_cycling_user_1.id}
+        assert set(
+            self.get_records_workouts(user_1, sport_2_running).values()
+        ) == {workout.id}
+
+    def test_it_recalculates_records_when_record_holder_is_deleted(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = self.add_workout(user_1, sport_1_cycling, distance=20)
+
+        db.session.delete(workout)
+        db.session.commit()
+
+        assert set(
+            self.get_records_workouts(user_1, sport_1_cycling).values()
+        ) == {workout_cycling_user_1.id}
+
+    def test_it_deletes_records_when_last_workout_is_deleted(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        db.session.delete(workout_cycling_user_1)
+        db.session.commit()
+
+        assert Record.query.count() == 0
+
+    def test_it_does_not_use_zero_pace_for_pace_records(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = self.add_workout(user_1, sport_1_cycling, distance=0)
+
+        recalculate_records(
+            db.session.connection(), user_1.id, [sport_1_cycling.id]
+        )
+        db.session.commit()
+
+        records_workouts = self.get_records_workouts(user_1, sport_1_cycling)
+        assert records_workouts["AP"] == workout_cycling_user_1.id
+        assert records_workouts["BP"] == workout_cycling_user_1.id
+        assert workout.id not in records_workouts.values()
+
+
+@pytest.mark.disable_autouse_update_records_patch
+class TestDeferredRecordsUpdate:
+    def test_it_does_not_update_records_in_context(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+    ) -> None:
+        with deferred_records_update(db.session()):
+            workout = Workout(
+                user_id=user_1.id,
+                sport_id=sport_1_cycling.id,
+                workout_date=datetime.datetime(
+                    2018, 1, 1, tzinfo=timezone.utc
+                ),
+                distance=10,
+                duration=timedelta(seconds=3600),
+            )
+            update_workout(workout)
+            db.session.add(workout)
+            db.session.commit()
+
+            assert Record.query.count() == 0
+
+    def test_it_calculates_records_when_exiting_context(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        sport_2_running: Sport,
+    ) -> None:
+        with deferred_records_update(db.session()):
+            workouts = []
+            for sport, distance in [
+                (sport_1_cycling, 10),
+                (sport_1_cycling, 20),
+                (sport_2_running, 5),
+            ]:
+                workout = Workout(
+                    user_id=user_1.id,
+                    sport_id=sport.id,
+                    workout_date=datetime.datetime(
+                        2018, 1, 1, tzinfo=timezone.utc
+                    ),
+                    distance=distance,
+                    duration=timedelta(seconds=3600),
+                )
+                update_workout(workout)
+                db.session.add(workout)
+                db.session.commit()
+                workouts.append(workout)
+
+        records = Record.query.all()
+        assert {
+            (record.sport_id, record.record_type, record.workout_id)
+            for record in records
+            if record.record_type == "FD"
+        } == {
+            (sport_1_cycling.id, "FD", workouts[1].id),
+            (sport_2_running.id, "FD", workouts[2].id),
+        }
+        assert len(records) == 12
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from fittrackee.workouts.services.elevation.dem_elevation_provider import (
+    VOID_VALUE,
+    HgtElevationProvider,
+)
+
+
+class TestHgtElevationProviderGetTileName:
+    @pytest.mark.parametrize(
+        "input_latitude,input_longitude,expected_tile_name",
+        [
+            (44.68095, 6.07367, "N44E006.hgt"),
+            (-33.85, 151.2, "S34E151.hgt"),
+            (40.71, -74.01, "N40W075.hgt"),
+            (0.5, -0.5, "N00W001.hgt"),
+        ],
+    )
+    def test_it_returns_tile_name(
+        self,
+        input_latitude: float,
+        input_longitude: float,
+        expected_tile_name: str,
+    ) -> None:
+        assert (
+            HgtElevationProvider.get_tile_name(input_latitude, input_longitude)
+            == expected_tile_name
+        )
+
+
+class TestHgtElevationProviderGetElevation:
+    def test_it_returns_none_when_no_tile_covers_coordinates(
+        self, tmp_path: Path
+    ) -> None:
+        provider = HgtElevationProvider(str(tmp_path))
+
+        assert provider.get_elevation(44.68095, 6.07367) is None
+
+    def test_it_returns_none_when_tile_is_invalid(
+        self, tmp_path: Path
+    ) -> None:
+        (tmp_path / "N44E006.hgt").write_bytes(b"\x00\x01\x02")
+        provider = HgtElevationProvider(str(tmp_path))
+
+        assert provider.get_elevation(44.68095, 6.07367) is None
+
+    @pytest.mark.parametrize(
+        "input_latitude,input_longitude,expected_elevation",
+        [
+            # north-west corner
+            (44.99, 6.01, 1),
+            # north-east corner
+            (44.99, 6.99, 3),
+            # center
+            (44.5, 6.5, 5),
+            # south-west corner
+            (44.01, 6.01, 7),
+        ],
+    )
+    def test_it_returns_elevation_of_nearest_grid_point(
+        self,
+        tmp_path: Path,
+        input_latitude: float,
+        input_longitude: float,
+        expected_elevation: int,
+    ) -> None:
+        np.arange(1, 10, dtype=">i2").reshape((3, 3)).tofile(
+            tmp_path / "N44E006.hgt"
+        )
+        provider = HgtElevationProvider(str(tmp_path))
+
+        assert (
+            provider.get_elevation(input_latitude, input_longitude)
+            == expected_elevation
+        )
+
+    def test_it_returns_none_when_data_is_missing(
+        self, tmp_path: Path
+    ) -> None:
+        np.full((3, 3), VOID_VALUE, dtype=">i2").tofile(
+            tmp_path / "N44E006.hgt"
+        )
+        provider = HgtElevationProvider(str(tmp_path))
+
+        assert provider.get_elevation(44.5, 6.5) is None
@@ -0,0 +1,65 @@
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+from fittrackee.workouts.services.elevation.dem_elevation_service import (
+    DemElevationService,
+)
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from gpxpy.gpx import GPXTrackPoint
+
+
+class TestDemElevationServiceInstantiation:
+    def test_it_instantiates_service_when_dem_dir_is_not_set(
+        self, app: "Flask"
+    ) -> None:
+        service = DemElevationService()
+
+        assert service.is_enabled is False
+
+    def test_it_instantiates_service_when_dem_dir_is_set(
+        self, app_with_dem_dir: "Flask"
+    ) -> None:
+        service = DemElevationService()
+
+        assert service.is_enabled is True
+
+
+class TestDemElevationServiceGetElevations:
+    def test_it_returns_empty_list_when_dem_dir_is_not_set(
+        self,
+        app: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+    ) -> None:
+        service = DemElevationService()
+
+        assert (
+            service.get_elevations(gpx_track_points_without_elevations) == []
+        )
+
+    def test_it_returns_elevations_from_dem_tiles(
+        self,
+        app_with_dem_dir: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+    ) -> None:
+        np.full((3, 3), 1000, dtype=">i2").tofile(
+            f"{app_with_dem_dir.config['ELEVATION_DEM_DIR']}/N44E006.hgt"
+        )
+        service = DemElevationService()
+
+        result = service.get_elevations(gpx_track_points_without_elevations)
+
+        assert result == [1000] * len(gpx_track_points_without_elevations)
+
+    def test_it_returns_none_for_points_not_covered_by_tiles(
+        self,
+        app_with_dem_dir: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+    ) -> None:
+        service = DemElevationService()
+
+        result = service.get_elevations(gpx_track_points_without_elevations)
+
+        assert result == [None] * len(gpx_track_points_without_elevations)
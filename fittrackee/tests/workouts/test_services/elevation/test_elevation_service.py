@@ -4,6 +4,9 @@ from unittest.mock import patch, sentinel
 import pytest
 
 from fittrackee.constants import ElevationDataSource
+from fittrackee.workouts.services.elevation.dem_elevation_service import (
+    DemElevationService,
+)
 from fittrackee.workouts.services.elevation.elevation_service import (
     ElevationService,
 )
@@ -91,6 +94,26 @@ class TestElevationServiceInstantiation:
         assert service.smooth is expected_smooth
         assert service.elevation_data_source == input_preference
 
+    def test_it_instantiates_service_when_preference_is_dem_and_dem_dir_is_not_set(  # noqa
+        self, app_with_open_elevation_and_valhalla_url: "Flask", user_1: "User"
+    ) -> None:
+        user_1.missing_elevations_processing = ElevationDataSource.DEM
+        service = ElevationService(user_1.missing_elevations_processing)
+
+        assert service.elevation_service is None
+        assert service.smooth is False
+        assert service.elevation_data_source == ElevationDataSource.FILE
+
+    def test_it_instantiates_service_when_preference_is_dem(
+        self, app_with_dem_dir: "Flask", user_1: "User"
+    ) -> None:
+        user_1.missing_elevations_processing = ElevationDataSource.DEM
+        service = ElevationService(user_1.missing_elevations_processing)
+
+        assert isinstance(service.elevation_service, DemElevationService)
+        assert service.smooth is False
+        assert service.elevation_data_source == ElevationDataSource.DEM
+
 
 class TestElevationServiceGetElevations:
     @pytest.mark.parametrize(
@@ -1,12 +1,19 @@
 import copy
+from pathlib import Path
 from typing import TYPE_CHECKING, List
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 import requests
 from gpxpy.gpx import GPXTrackPoint
 
+from fittrackee import db
 from fittrackee.tests.mixins import ResponseMockMixin
+from fittrackee.workouts.models import ElevationCache
+from fittrackee.workouts.services.elevation.elevation_cache import (
+    get_coordinates_key,
+)
 from fittrackee.workouts.services.elevation.exceptions import (
     ElevationServiceException,
 )
@@ -61,7 +68,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
 
         with (
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 return_value=self.get_response({}),
             ) as post_mock,
@@ -82,7 +89,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
         service = OpenElevationService()
 
         with patch.object(
-            requests,
+            requests.Session,
             "post",
             return_value=self.get_response(
                 {"results": OPEN_ELEVATION_RESPONSE}
@@ -118,16 +125,18 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
                 5,
             ),
             patch.object(
-                requests,
+                requests.Session,
                 "post",
-                side_effect=[
-                    self.get_response(
-                        {"results": OPEN_ELEVATION_RESPONSE[:5]}
-                    ),
-                    self.get_response(
-                        {"results": OPEN_ELEVATION_RESPONSE[5:]}
-                    ),
-                ],
+                # chunks are requested concurrently
+                side_effect=lambda url, json, timeout: self.get_response(
+                    {
+                        "results": (
+                            OPEN_ELEVATION_RESPONSE[:5]
+                            if len(json["locations"]) == 5
+                            else OPEN_ELEVATION_RESPONSE[5:]
+                        )
+                    }
+                ),
             ) as post_mock,
         ):
             result = service.get_elevations(
@@ -145,7 +154,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
         service = OpenElevationService()
 
         with patch.object(
-            requests,
+            requests.Session,
             "post",
             return_value=self.get_response(
                 {"results": copy.deepcopy(OPEN_ELEVATION_RESPONSE)}
@@ -166,7 +175,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
 
         with (
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 side_effect=requests.exceptions.HTTPError,
             ),
@@ -187,7 +196,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
                 "base_elevation_service.appLog"
             ) as logger_mock,
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 return_value=self.get_response(
                     {"results": OPEN_ELEVATION_RESPONSE[:-1]}
@@ -216,7 +225,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
 
         with (
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 return_value=self.get_response(
                     {"results": OPEN_ELEVATION_RESPONSE}
@@ -236,7 +245,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
         service = OpenElevationService()
 
         with patch.object(
-            requests,
+            requests.Session,
             "post",
             return_value=self.get_response(
                 {"results": copy.deepcopy(OPEN_ELEVATION_RESPONSE)}
@@ -261,7 +270,7 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
         service = OpenElevationService()
 
         with patch.object(
-            requests,
+            requests.Session,
             "post",
             return_value=self.get_response(
                 {"results": copy.deepcopy(OPEN_ELEVATION_RESPONSE[:2])}
@@ -279,3 +288,119 @@ class TestOpenElevationServiceGetElevation(ResponseMockMixin):
             )
 
         assert result == [998, 998]
+
+
+class TestOpenElevationServiceElevationsCache(ResponseMockMixin):
+    def test_it_stores_elevations_in_cache(
+        self,
+        app_with_open_elevation_url: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+    ) -> None:
+        service = OpenElevationService()
+
+        with patch.object(
+            requests.Session,
+            "post",
+            return_value=self.get_response(
+                {"results": OPEN_ELEVATION_RESPONSE}
+            ),
+        ):
+            service.get_elevations(gpx_track_points_without_elevations)
+
+        point = gpx_track_points_without_elevations[0]
+        latitude, longitude = get_coordinates_key(
+            point.latitude, point.longitude
+        )
+        elevation_cache = db.session.get(
+            ElevationCache, ("open_elevation", latitude, longitude)
+        )
+        assert elevation_cache is not None
+        assert elevation_cache.elevation == 998
+
+    def test_it_does_not_call_api_when_all_elevations_are_cached(
+        self,
+        app_with_open_elevation_url: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+    ) -> None:
+        service = OpenElevationService()
+        with patch.object(
+            requests.Session,
+            "post",
+            return_value=self.get_response(
+                {"results": OPEN_ELEVATION_RESPONSE}
+            ),
+        ):
+            service.get_elevations(gpx_track_points_without_elevations)
+
+        with patch.object(requests.Session, "post") as post_mock:
+            result = service.get_elevations(
+                gpx_track_points_without_elevations
+            )
+
+        post_mock.assert_not_called()
+        assert result == [998, 998, 994, 994, 994, 1124, 1124, 1124, 1124]
+
+    def test_it_calls_api_only_for_points_missing_in_cache(
+        self,
+        app_with_open_elevation_url: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+    ) -> None:
+        service = OpenElevationService()
+        with patch.object(
+            requests.Session,
+            "post",
+            return_value=self.get_response(
+                {"results": OPEN_ELEVATION_RESPONSE[:5]}
+            ),
+        ):
+            service.get_elevations(gpx_track_points_without_elevations[:5])
+
+        with patch.object(
+            requests.Session,
+            "post",
+            return_value=self.get_response(
+                {"results": OPEN_ELEVATION_RESPONSE[5:]}
+            ),
+        ) as post_mock:
+            result = service.get_elevations(
+                gpx_track_points_without_elevations
+            )
+
+        post_mock.assert_called_once_with(
+            service.url,
+            json={
+                "locations": [
+                    {
+                        "latitude": point.latitude,
+                        "longitude": point.longitude,
+                    }
+                    for point in gpx_track_points_without_elevations[5:]
+                ]
+            },
+            timeout=30,
+        )
+        assert result == [998, 998, 994, 994, 994, 1124, 1124, 1124, 1124]
+
+    def test_it_does_not_get_elevations_from_dem_tiles(
+        self,
+        app_with_open_elevation_url: "Flask",
+        gpx_track_points_without_elevations: List["GPXTrackPoint"],
+        tmp_path: Path,
+    ) -> None:
+        np.full((3, 3), 1000, dtype=">i2").tofile(tmp_path / "N44E006.hgt")
+        app_with_open_elevation_url.config["ELEVATION_DEM_DIR"] = str(tmp_path)
+        service = OpenElevationService()
+
+        with patch.object(
+            requests.Session,
+            "post",
+            return_value=self.get_response(
+                {"results": OPEN_ELEVATION_RESPONSE}
+            ),
+        ) as post_mock:
+            result = service.get_elevations(
+                gpx_track_points_without_elevations
+            )
+
+        post_mock.assert_called_once()
+        assert result == [998, 998, 994, 994, 994, 1124, 1124, 1124, 1124]
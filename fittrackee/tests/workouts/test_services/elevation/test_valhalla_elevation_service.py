@@ -57,7 +57,7 @@ class TestValhallaElevationServiceGetElevation(ResponseMockMixin):
 
         with (
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 return_value=self.get_response({}),
             ) as post_mock,
@@ -77,7 +77,7 @@ class TestValhallaElevationServiceGetElevation(ResponseMockMixin):
         service = ValhallaElevationService()
 
         with patch.object(
-            requests,
+            requests.Session,
             "post",
             return_value=self.get_response({"height": VALHALLA_RESPONSE}),
         ) as post_mock:
@@ -105,7 +105,7 @@ class TestValhallaElevationServiceGetElevation(ResponseMockMixin):
         service = ValhallaElevationService()
 
         with patch.object(
-            requests,
+            requests.Session,
             "post",
             return_value=self.get_response({"height": VALHALLA_RESPONSE}),
         ):
@@ -124,7 +124,7 @@ class TestValhallaElevationServiceGetElevation(ResponseMockMixin):
 
         with (
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 side_effect=requests.exceptions.HTTPError,
             ),
@@ -145,7 +145,7 @@ class TestValhallaElevationServiceGetElevation(ResponseMockMixin):
                 "base_elevation_service.appLog"
             ) as logger_mock,
             patch.object(
-                requests,
+                requests.Session,
                 "post",
                 return_value=self.get_response(
                     {"height": VALHALLA_RESPONSE[:-1]}
@@ -2,12 +2,13 @@ from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
 import pytest
-from staticmap3 import Line, StaticMap
+from staticmap3 import Line
 
 from fittrackee import VERSION
 from fittrackee.tests.fixtures.fixtures_workouts import (
     track_points_part_1_coordinates,
 )
+from fittrackee.workouts.services.map_tiles.static_map import CachedStaticMap
 from fittrackee.workouts.services.workout_from_file import (
     BaseWorkoutWithSegmentsCreationService,
 )
@@ -95,8 +96,8 @@ class TestBaseWorkoutWithSegmentsCreationServiceGenerateMapImage:
         self, app: "Flask"
     ) -> None:
         with patch(
-            "fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service.StaticMap",
-            return_value=StaticMap(400, 225, 10),
+            "fittrackee.workouts.services.map_tiles.static_map.CachedStaticMap",
+            return_value=CachedStaticMap(400, 225, 10),
         ) as static_map_mock:
             BaseWorkoutWithSegmentsCreationService.generate_map_image(
                 map_filepath="/tmp/map.png",
@@ -109,19 +110,20 @@ class TestBaseWorkoutWithSegmentsCreationServiceGenerateMapImage:
             padding_x=10,
             headers={"User-Agent": f"FitTrackee v{VERSION}"},
             delay_between_retries=5,
+            tile_server_url=app.config["TILE_SERVER"]["URL"],
         )
 
     def test_it_calls_configured_tile_server_for_static_map_when_default_static_map_to_false(  # noqa
         self,
         app: "Flask",
-        static_map_get_mock: MagicMock,
+        tile_server_request_mock: MagicMock,
     ) -> None:
         BaseWorkoutWithSegmentsCreationService.generate_map_image(
             map_filepath="/tmp/map.png",
             coordinates=track_points_part_1_coordinates,
         )
 
-        call_args, _ = static_map_get_mock.call_args
+        call_args, _ = tile_server_request_mock.call_args
         assert (
             app.config["TILE_SERVER"]["URL"]
             .replace("{s}.", "")
@@ -132,14 +134,14 @@ class TestBaseWorkoutWithSegmentsCreationServiceGenerateMapImage:
     def test_it_calls_default_tile_server_for_static_map_when_default_static_map_to_true(  # noqa
         self,
         app_default_static_map: "Flask",
-        static_map_get_mock: MagicMock,
+        tile_server_request_mock: MagicMock,
     ) -> None:
         BaseWorkoutWithSegmentsCreationService.generate_map_image(
             map_filepath="/tmp/map.png",
             coordinates=track_points_part_1_coordinates,
         )
 
-        call_args, _ = static_map_get_mock.call_args
+        call_args, _ = tile_server_request_mock.call_args
         assert (
             app_default_static_map.config["TILE_SERVER"]["URL"].replace(
                 "/{z}/{x}/{y}.png", ""
@@ -150,14 +152,14 @@ class TestBaseWorkoutWithSegmentsCreationServiceGenerateMapImage:
     def test_it_calls_static_map_with_fittrackee_user_agent(
         self,
         app: "Flask",
-        static_map_get_mock: MagicMock,
+        tile_server_request_mock: MagicMock,
     ) -> None:
         BaseWorkoutWithSegmentsCreationService.generate_map_image(
             map_filepath="/tmp/map.png",
             coordinates=track_points_part_1_coordinates,
         )
 
-        _, call_kwargs = static_map_get_mock.call_args
+        _, call_kwargs = tile_server_request_mock.call_args
 
         assert call_kwargs["headers"] == {
             "User-Agent": f"FitTrackee v{VERSION}"
@@ -165,7 +167,7 @@ class TestBaseWorkoutWithSegmentsCreationServiceGenerateMapImage:
 
     def test_it_calls_line_with_given_coordinates(self, app: "Flask") -> None:
         with patch(
-            "fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service.Line",
+            "staticmap3.Line",
             return_value=Line(track_points_part_1_coordinates, "#3388FF", 4),
         ) as line_mock:
             BaseWorkoutWithSegmentsCreationService.generate_map_image(
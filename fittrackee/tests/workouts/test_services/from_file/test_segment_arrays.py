@@ -0,0 +1,346 @@
+import random
+from dataclasses import asdict, astuple
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import gpxpy
+import gpxpy.gpx
+import pytest
+import pytz
+
+from fittrackee.workouts.services import WorkoutGpxService
+from fittrackee.workouts.services.workout_from_file.segment_arrays import (
+    SegmentArrays,
+    get_elevations_array,
+    get_hr_cadence_power_stats,
+    get_track_stats,
+)
+
+GPX_FILES = [
+    "gpx_file",
+    "gpx_file_with_offset",
+    "gpx_file_with_microseconds",
+    "gpx_file_with_gpxtpx_extensions",
+    "gpx_file_without_elevation",
+    "gpx_file_with_invalid_elevation",
+    "gpx_file_with_2_segments_and_without_elevation",
+    "gpx_file_without_time_on_last_point",
+    "gpx_file_with_one_point_on_last_segment",
+    "gpx_file_with_segments",
+    "gpx_file_with_3_segments",
+    "gpx_file_with_zero_distance_segment",
+    "gpx_file_with_first_segment_empty",
+]
+
+
+def get_generated_segment(
+    points_count: int, seed: int
+) -> "gpxpy.gpx.GPXTrackSegment":
+    """
+    Return segment containing edge cases: missing, null and equal
+    elevations, distant points, pauses and points without time
+    """
+    random_generator = random.Random(seed)
+    segment = gpxpy.gpx.GPXTrackSegment()
+    latitude, longitude, elevation = 44.68095, 6.07367, 998.0
+    point_time = datetime(2018, 3, 13, 12, 44, 45, tzinfo=timezone.utc)
+    for _ in range(points_count):
+        choice = random_generator.random()
+        if choice < 0.01:
+            latitude += random_generator.uniform(-0.5, 0.5)
+            longitude += random_generator.uniform(-0.5, 0.5)
+        elif choice > 0.1:
+            latitude += random_generator.uniform(-0.0003, 0.0003)
+            longitude += random_generator.uniform(-0.0003, 0.0003)
+        elevation += random_generator.choice([0, 0, 1.5, -2.3])
+        point_time += timedelta(
+            seconds=random_generator.choice([0, 1, 1, 2, 5, 30]),
+            microseconds=random_generator.choice([0, 0, 250000]),
+        )
+        segment.points.append(
+            gpxpy.gpx.GPXTrackPoint(
+                latitude=latitude,
+                longitude=longitude,
+                elevation=random_generator.choice(
+                    [elevation, elevation, elevation, None, 0]
+                ),
+                time=(
+                    None if random_generator.random() < 0.02 else point_time
+                ),
+            )
+        )
+    return segment
+
+
+def get_segments(
+    request: pytest.FixtureRequest, gpx_file_name: str
+) -> List["gpxpy.gpx.GPXTrackSegment"]:
+    gpx = gpxpy.parse(request.getfixturevalue(gpx_file_name))
+    return gpx.tracks[0].segments
+
+
+class TestSegmentArraysGetCumulativeDistances:
+    @pytest.mark.parametrize("gpx_file_name", GPX_FILES)
+    def test_it_returns_same_distances_as_gpxpy(
+        self, request: pytest.FixtureRequest, gpx_file_name: str
+    ) -> None:
+        for segment in get_segments(request, gpx_file_name):
+            expected_distances = []
+            previous_point = None
+            previous_distance = 0.0
+            for point in segment.points:
+                distance = (
+                    point.distance_3d(previous_point)  # type: ignore
+                    if (
+                        point.elevation
+                        and previous_point
+                        and previous_point.elevation
+                    )
+                    else point.distance_2d(previous_point)  # type: ignore
+                )
+                distance = 0.0 if distance is None else distance
+                previous_distance = distance + previous_distance
+                expected_distances.append(previous_distance)
+                previous_point = point
+
+            distances = SegmentArrays.from_track_segment(
+                segment
+            ).get_cumulative_distances()
+
+            assert distances.tolist() == pytest.approx(expected_distances)
+
+    def test_it_returns_same_distances_as_gpxpy_for_generated_segment(
+        self,
+    ) -> None:
+        segment = get_generated_segment(1000, seed=1)
+        expected_distances = [0.0]
+        for previous_point, point in zip(
+            segment.points, segment.points[1:], strict=False
+        ):
+            distance = (
+                point.distance_3d(previous_point)
+                if point.elevation and previous_point.elevation
+                else point.distance_2d(previous_point)
+            )
+            expected_distances.append(expected_distances[-1] + distance)  # type: ignore
+
+        distances = SegmentArrays.from_track_segment(
+            segment
+        ).get_cumulative_distances()
+
+        assert distances.tolist() == pytest.approx(expected_distances)
+
+    def test_it_returns_empty_array_when_no_points(self) -> None:
+        distances = SegmentArrays([]).get_cumulative_distances()
+
+        assert distances.tolist() == []
+
+
+class TestSegmentArraysGetSpeeds:
+    @pytest.mark.parametrize("gpx_file_name", GPX_FILES)
+    def test_it_returns_same_speeds_as_gpxpy(
+        self, request: pytest.FixtureRequest, gpx_file_name: str
+    ) -> None:
+        for segment in get_segments(request, gpx_file_name):
+            expected_speeds = [
+                segment.get_speed(index)
+                for index in range(len(segment.points))
+            ]
+
+            speeds = SegmentArrays.from_track_segment(segment).get_speeds()
+
+            assert [
+                None if speed != speed else speed for speed in speeds.tolist()
+            ] == pytest.approx(expected_speeds)
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_it_returns_same_speeds_as_gpxpy_for_generated_segment(
+        self, seed: int
+    ) -> None:
+        segment = get_generated_segment(1000, seed=seed)
+        expected_speeds = [
+            segment.get_speed(index) for index in range(len(segment.points))
+        ]
+
+        speeds = SegmentArrays.from_track_segment(segment).get_speeds()
+
+        assert [
+            None if speed != speed else speed for speed in speeds.tolist()
+        ] == pytest.approx(expected_speeds)
+
+    def test_it_calculates_speeds_with_next_points_elevations_when_provided(
+        self,
+    ) -> None:
+        segment = get_generated_segment(100, seed=1)
+        next_elevations = get_elevations_array(
+            [point.elevation for point in segment.points]
+        )
+        expected_speeds = []
+        for index, point in enumerate(segment.points):
+            point.elevation = 500.0
+            expected_speeds.append(segment.get_speed(index))
+
+        speeds = SegmentArrays.from_track_segment(segment).get_speeds(
+            next_elevations
+        )
+
+        assert [
+            None if speed != speed else speed for speed in speeds.tolist()
+        ] == pytest.approx(expected_speeds)
+
+
+class TestSegmentArraysGetTimeDifferences:
+    def test_it_returns_same_time_differences_as_gpxpy(self) -> None:
+        segment = get_generated_segment(100, seed=1)
+        first_point = segment.points[0]
+
+        time_differences = SegmentArrays.from_track_segment(
+            segment
+        ).get_time_differences(
+            first_point.time  # type: ignore[arg-type]
+        )
+
+        assert [
+            None if difference != difference else difference
+            for difference in time_differences.tolist()
+        ] == [point.time_difference(first_point) for point in segment.points]
+
+
+class TestSegmentArraysGetTimesStrings:
+    def test_it_returns_same_times_as_workout_gpx_service(self) -> None:
+        segment = get_generated_segment(100, seed=1)
+        segment.points[1].time = datetime(
+            2018, 3, 13, 13, 44, 50, 250, tzinfo=timezone(timedelta(hours=1))
+        )
+
+        times = SegmentArrays.from_track_segment(segment).get_times_strings()
+
+        assert times == [
+            str(point.time.astimezone(pytz.utc)) if point.time else None
+            for point in segment.points
+        ]
+
+
+class TestSegmentArraysGetStats:
+    @pytest.mark.parametrize("gpx_file_name", GPX_FILES)
+    @pytest.mark.parametrize("raw", [True, False])
+    def test_it_returns_same_values_as_gpxpy(
+        self, request: pytest.FixtureRequest, gpx_file_name: str, raw: bool
+    ) -> None:
+        for segment in get_segments(request, gpx_file_name):
+            stats = SegmentArrays.from_track_segment(segment).get_stats(
+                stopped_speed_threshold=1, raw=raw
+            )
+
+            assert astuple(stats.moving_data) == pytest.approx(
+                tuple(
+                    segment.get_moving_data(  # type: ignore[arg-type]
+                        stopped_speed_threshold=1, raw=raw
+                    )
+                )
+            )
+            assert stats.duration == pytest.approx(segment.get_duration())
+            assert (
+                stats.min_alt,
+                stats.max_alt,
+            ) == segment.get_elevation_extremes()
+            assert (stats.uphill, stats.downhill) == pytest.approx(
+                segment.get_uphill_downhill()
+            )
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    @pytest.mark.parametrize("raw", [True, False])
+    @pytest.mark.parametrize("stopped_speed_threshold", [1, 10])
+    def test_it_returns_same_values_as_gpxpy_for_generated_segment(
+        self, seed: int, raw: bool, stopped_speed_threshold: float
+    ) -> None:
+        segment = get_generated_segment(1000, seed=seed)
+
+        stats = SegmentArrays.from_track_segment(segment).get_stats(
+            stopped_speed_threshold=stopped_speed_threshold, raw=raw
+        )
+
+        moving_data = segment.get_moving_data(
+            stopped_speed_threshold=stopped_speed_threshold, raw=raw
+        )
+        assert moving_data
+        assert stats.moving_data.moving_time == pytest.approx(
+            moving_data.moving_time
+        )
+        assert stats.moving_data.stopped_time == pytest.approx(
+            moving_data.stopped_time
+        )
+        assert stats.moving_data.moving_distance == pytest.approx(
+            moving_data.moving_distance
+        )
+        assert stats.moving_data.stopped_distance == pytest.approx(
+            moving_data.stopped_distance
+        )
+        assert stats.moving_data.max_speed == pytest.approx(
+            moving_data.max_speed
+        )
+        assert (stats.uphill, stats.downhill) == pytest.approx(
+            segment.get_uphill_downhill()
+        )
+        assert (
+            stats.min_alt,
+            stats.max_alt,
+        ) == segment.get_elevation_extremes()
+
+    def test_it_returns_none_duration_when_last_points_have_no_time(
+        self,
+    ) -> None:
+        segment = get_generated_segment(10, seed=1)
+        segment.points[-1].time = None
+        segment.points[-2].time = None
+
+        stats = SegmentArrays.from_track_segment(segment).get_stats(
+            stopped_speed_threshold=1, raw=False
+        )
+
+        assert stats.duration is None
+
+
+class TestGetTrackStats:
+    @pytest.mark.parametrize("gpx_file_name", GPX_FILES)
+    def test_it_returns_same_values_as_gpxpy(
+        self, request: pytest.FixtureRequest, gpx_file_name: str
+    ) -> None:
+        track = gpxpy.parse(request.getfixturevalue(gpx_file_name)).tracks[0]
+        gpx_info = WorkoutGpxService.get_gpx_info(
+            parsed_gpx=track,
+            stopped_speed_threshold=1,
+            use_raw_gpx_speed=False,
+        )
+
+        stats = get_track_stats(
+            [
+                SegmentArrays.from_track_segment(segment).get_stats(
+                    stopped_speed_threshold=1, raw=False
+                )
+                for segment in track.segments
+            ]
+        )
+
+        assert asdict(
+            WorkoutGpxService.get_gpx_info_from_stats(stats)
+        ) == pytest.approx(asdict(gpx_info))
+
+
+class TestGetHrCadencePowerStats:
+    @pytest.mark.parametrize(
+        "heart_rates, cadences, powers",
+        [
+            ([], [], []),
+            ([92, 87, 88, 90], [0, 0, 0], [305, 0, 0, 280]),
+            ([92, 87, 88, 91], [50, 51, 53], [305, 303]),
+        ],
+    )
+    def test_it_returns_same_values_as_workout_gpx_service(
+        self, heart_rates: List[int], cadences: List[int], powers: List[int]
+    ) -> None:
+        assert get_hr_cadence_power_stats(
+            heart_rates, cadences, powers
+        ) == WorkoutGpxService._get_hr_cadence_power_data(
+            heart_rates, cadences, powers
+        )
@@ -1,9 +1,17 @@
+from io import BytesIO
+from itertools import pairwise
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
+import fitdecode
 import gpxpy
 import pytest
 
 from fittrackee.tests.workouts.mixins import WorkoutFileMixin
+from fittrackee.tests.workouts.utils import (
+    generate_fit_file,
+    get_traced_memory,
+)
 from fittrackee.workouts.exceptions import WorkoutFileException
 from fittrackee.workouts.services import WorkoutFitService
 
@@ -58,6 +66,76 @@ class TestWorkoutFitServiceParseFile(WorkoutFileMixin):
         assert moving_data.moving_time == 250.0
         assert round(moving_data.moving_distance, 1) == 318.2
 
+    @pytest.mark.parametrize(
+        "input_segments_creation_event,expected_segments_count",
+        [("none", 1), ("only_manual", 4), ("all", 4)],
+    )
+    def test_it_creates_segments_on_stop_events(
+        self,
+        app: "Flask",
+        input_segments_creation_event: str,
+        expected_segments_count: int,
+    ) -> None:
+        gpx = WorkoutFitService.parse_file(
+            BytesIO(generate_fit_file(100, stop_event_every=25)),
+            segments_creation_event=input_segments_creation_event,
+        )
+
+        assert len(gpx.tracks[0].segments) == expected_segments_count
+        assert (
+            sum(len(segment.points) for segment in gpx.tracks[0].segments)
+            == 100
+        )
+
+    def test_it_returns_gpx_with_sorted_points_when_records_are_not_ordered(
+        self, app: "Flask"
+    ) -> None:
+        with patch.object(
+            fitdecode,
+            "FitReader",
+            return_value=reversed(
+                list(fitdecode.FitReader(BytesIO(generate_fit_file(10))))
+            ),
+        ):
+            gpx = WorkoutFitService.parse_file(
+                BytesIO(b""), segments_creation_event="none"
+            )
+
+        points = gpx.tracks[0].segments[0].points
+        assert len(points) == 10
+        assert all(
+            previous_point.time < point.time  # type: ignore[operator]
+            for previous_point, point in pairwise(points)
+        )
+        assert gpx.creator == "garmin Edge 530"
+        assert WorkoutFitService._get_calories(gpx.tracks[0]) == 1500
+
+
+@pytest.mark.benchmark
+class TestWorkoutFitServiceParseLargeFile:
+    """
+    Memory benchmark on generated large files
+    """
+
+    @pytest.mark.parametrize("input_records_count", [1000, 5000])
+    def test_it_does_not_keep_frames_in_memory(
+        self, input_records_count: int
+    ) -> None:
+        fit_content = generate_fit_file(
+            input_records_count, stop_event_every=1000
+        )
+        _, frames_peak = get_traced_memory(
+            lambda content: list(fitdecode.FitReader(BytesIO(content))),
+            fit_content,
+        )
+
+        _, parsing_peak = get_traced_memory(
+            WorkoutFitService.parse_file, BytesIO(fit_content), "all"
+        )
+
+        # parsed file only contains points, frames are not kept
+        assert parsing_peak < frames_peak
+
 
 #
 class TestWorkoutFitServiceInstantiation(WorkoutFileMixin):
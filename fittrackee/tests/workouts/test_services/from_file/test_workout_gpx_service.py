@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Dict, Optional
 from unittest.mock import MagicMock, call, patch
 
 import gpxpy
+import numpy as np
 import pytest
 import requests
 from geoalchemy2.shape import to_shape
@@ -29,6 +30,7 @@ from fittrackee.tests.workouts.mixins import (
     WorkoutFileMixin,
     WorkoutGpxInfoMixin,
 )
+from fittrackee.tests.workouts.utils import FakeWeather
 from fittrackee.workouts.exceptions import (
     WorkoutExceedingValueException,
     WorkoutException,
@@ -48,6 +50,12 @@ from fittrackee.workouts.services.elevation.open_elevation_service import (
 from fittrackee.workouts.services.elevation.valhalla_elevation_service import (
     ValhallaElevationService,
 )
+from fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service import (  # noqa
+    weather_service,
+)
+from fittrackee.workouts.services.workout_from_file.workout_gpx_service import (  # noqa
+    GpxAnalysisSettings,
+)
 from fittrackee.workouts.services.workout_from_file.workout_point import (
     WorkoutPoint,
 )
@@ -165,7 +173,7 @@ class TestWorkoutGpxServiceInstantiation(WorkoutFileMixin):
 
 class TestWorkoutGpxServiceGetWeatherData:
     def test_it_calls_weather_service(
-        self, default_weather_service: MagicMock
+        self, app: "Flask", default_weather_service: MagicMock
     ) -> None:
         start_point = WorkoutPoint(
             6.07367,
@@ -184,9 +192,44 @@ class TestWorkoutGpxServiceGetWeatherData:
             [
                 call(start_point),
                 call(end_point),
-            ]
+            ],
+            # start and end points are fetched concurrently
+            any_order=True,
         )
 
+    @pytest.mark.disable_autouse_default_weather_service
+    def test_it_returns_start_and_end_weather_data(self, app: "Flask") -> None:
+        start_point = WorkoutPoint(
+            6.07367,
+            44.68095,
+            datetime(2018, 3, 13, 12, 44, 45, tzinfo=timezone.utc),
+        )
+        end_point = WorkoutPoint(
+            6.27442,
+            44.87822,
+            datetime(2018, 3, 13, 13, 48, 55, tzinfo=timezone.utc),
+        )
+
+        with patch.object(weather_service, "weather_api", FakeWeather()):
+            weather_start, weather_end = WorkoutGpxService.get_weather_data(
+                start_point, end_point
+            )
+
+        assert weather_start == {
+            "humidity": 0.69,
+            "icon": "partly-cloudy-day",
+            "temperature": 44.68,
+            "wind": 6.07,
+            "windBearing": 12,
+        }
+        assert weather_end == {
+            "humidity": 0.69,
+            "icon": "partly-cloudy-day",
+            "temperature": 44.88,
+            "wind": 6.27,
+            "windBearing": 13,
+        }
+
 
 @pytest.mark.disable_autouse_update_records_patch
 class WorkoutGpxServiceProcessFileTestCase(
@@ -1148,6 +1191,34 @@ class TestWorkoutGpxServiceProcessFileOnCreation(
             "time": "2018-03-13 12:48:55+00:00",
         }
 
+    def test_it_creates_workout_and_segment_when_gpx_file_has_no_elevation_and_dem_dir_is_set(  # noqa
+        self,
+        app_with_dem_dir: "Flask",
+        sport_1_cycling: Sport,
+        user_1: "User",
+        gpx_file_without_elevation: str,
+    ) -> None:
+        np.full((3, 3), 1000, dtype=">i2").tofile(
+            f"{app_with_dem_dir.config['ELEVATION_DEM_DIR']}/N44E006.hgt"
+        )
+        user_1.missing_elevations_processing = ElevationDataSource.DEM
+        service = self.init_service_with_gpx(
+            user_1, sport_1_cycling, gpx_file_without_elevation
+        )
+
+        with patch.object(requests, "post") as post_mock:
+            service.process_workout()
+        db.session.commit()
+
+        post_mock.assert_not_called()
+        workout = Workout.query.one()
+        assert workout.elevation_data_source == ElevationDataSource.DEM
+        assert workout.min_alt == 1000
+        assert workout.max_alt == 1000
+        assert {
+            point["elevation"] for point in workout.segments[0].points
+        } == {1000.0}
+
     def test_it_creates_workout_when_user_preference_is_open_elevation_smooth(
         self,
         app_with_open_elevation_url: "Flask",
@@ -1789,7 +1860,9 @@ class TestWorkoutGpxServiceProcessFileOnCreation(
                         service.end_point.time,  # type: ignore
                     )
                 ),
-            ]
+            ],
+            # start and end points are fetched concurrently
+            any_order=True,
         )
 
     def test_it_does_not_call_weather_service_when_endpoint_has_no_time(
@@ -1812,6 +1885,42 @@ class TestWorkoutGpxServiceProcessFileOnCreation(
 
         default_weather_service.assert_not_called()
 
+    def test_it_adds_weather_task_when_async_processing_is_enabled(
+        self,
+        app: "Flask",
+        sport_1_cycling: Sport,
+        user_1: "User",
+        gpx_file_with_segments: str,
+        default_weather_service: MagicMock,
+    ) -> None:
+        app.config["WEATHER_ASYNC_PROCESSING"] = True
+        service = self.init_service_with_gpx(
+            user_1, sport_1_cycling, gpx_file_with_segments, get_weather=True
+        )
+
+        with patch(
+            "fittrackee.workouts.tasks.update_workout_weather.send"
+        ) as send_mock:
+            workout = service.process_workout()
+            send_mock.assert_not_called()
+            db.session.commit()
+
+        app.config["WEATHER_ASYNC_PROCESSING"] = False
+        default_weather_service.assert_not_called()
+        send_mock.assert_called_once_with(
+            workout_id=workout.id,
+            start_point={
+                "latitude": service.start_point.latitude,  # type: ignore
+                "longitude": service.start_point.longitude,  # type: ignore
+                "time": service.start_point.time.isoformat(),  # type: ignore
+            },
+            end_point={
+                "latitude": service.end_point.latitude,  # type: ignore
+                "longitude": service.end_point.longitude,  # type: ignore
+                "time": service.end_point.time.isoformat(),  # type: ignore
+            },
+        )
+
     def test_it_calls_weather_service_when_gpx_last_segment_has_one_point(
         self,
         app: "Flask",
@@ -1853,7 +1962,9 @@ class TestWorkoutGpxServiceProcessFileOnCreation(
                         ),
                     )
                 ),
-            ]
+            ],
+            # start and end points are fetched concurrently
+            any_order=True,
         )
 
     def test_it_does_not_call_weather_service_when_flag_is_false(
@@ -2803,3 +2914,300 @@ class TestWorkoutGpxServiceProcessFileOnRefresh(
             "speed": 4.33,
             "time": "2018-03-13 12:48:55+00:00",
         }
+
+
+class TestWorkoutGpxServiceProcessFileWithVectorizedProcessing(
+    WorkoutGpxServiceProcessFileTestCase
+):
+    workout_keys = [
+        "ascent",
+        "ave_cadence",
+        "ave_hr",
+        "ave_pace",
+        "ave_power",
+        "ave_speed",
+        "best_pace",
+        "bounds",
+        "descent",
+        "distance",
+        "duration",
+        "max_alt",
+        "max_cadence",
+        "max_hr",
+        "max_power",
+        "max_speed",
+        "min_alt",
+        "moving",
+        "pauses",
+    ]
+
+    def process_file(
+        self,
+        app: "Flask",
+        user: "User",
+        sport: "Sport",
+        gpx_content: str,
+        vectorized_processing: bool,
+    ) -> "Workout":
+        app.config["VECTORIZED_GPX_PROCESSING"] = vectorized_processing
+        service = self.init_service_with_gpx(
+            user, sport, gpx_content, get_weather=False
+        )
+        service.process_workout()
+        db.session.commit()
+        return service.workout  # type: ignore[return-value]
+
+    @pytest.mark.parametrize(
+        "input_gpx_file",
+        [
+            "gpx_file",
+            "gpx_file_with_gpxtpx_extensions_and_power",
+            "gpx_file_with_ns3_extensions",
+            "gpx_file_with_cadence_zero_values",
+            "gpx_file_without_elevation",
+            "gpx_file_with_microseconds",
+            "gpx_file_with_3_segments",
+            "gpx_file_with_zero_distance_segment",
+            "gpx_file_with_first_segment_empty",
+        ],
+    )
+    def test_it_stores_same_data_as_gpxpy_processing(
+        self,
+        app: "Flask",
+        sport_1_cycling: Sport,
+        user_1: "User",
+        input_gpx_file: str,
+        request: pytest.FixtureRequest,
+    ) -> None:
+        gpx_content = request.getfixturevalue(input_gpx_file)
+        expected_workout = self.process_file(
+            app, user_1, sport_1_cycling, gpx_content, False
+        )
+
+        workout = self.process_file(
+            app, user_1, sport_1_cycling, gpx_content, True
+        )
+
+        assert workout.id != expected_workout.id
+        for key in self.workout_keys:
+            assert getattr(workout, key) == getattr(expected_workout, key), key
+        assert len(workout.segments) == len(expected_workout.segments)
+        for segment, expected_segment in zip(
+            workout.segments, expected_workout.segments, strict=True
+        ):
+            for key in self.workout_keys:
+                if key == "bounds":
+                    continue
+                assert getattr(segment, key) == getattr(
+                    expected_segment, key
+                ), key
+            assert segment.points == expected_segment.points
+            assert to_shape(segment.geom) == to_shape(expected_segment.geom)
+
+    def test_it_creates_workout_when_user_uses_raw_speed(
+        self,
+        app: "Flask",
+        sport_1_cycling: Sport,
+        user_1_raw_speed: "User",
+        gpx_file_with_3_segments: str,
+    ) -> None:
+        expected_workout = self.process_file(
+            app,
+            user_1_raw_speed,
+            sport_1_cycling,
+            gpx_file_with_3_segments,
+            False,
+        )
+
+        workout = self.process_file(
+            app,
+            user_1_raw_speed,
+            sport_1_cycling,
+            gpx_file_with_3_segments,
+            True,
+        )
+
+        assert workout.max_speed == expected_workout.max_speed
+        assert [segment.max_speed for segment in workout.segments] == [
+            segment.max_speed for segment in expected_workout.segments
+        ]
+
+
+class TestWorkoutGpxServiceAnalyseGpx(WorkoutFileMixin):
+    @staticmethod
+    def get_settings(
+        *,
+        sport_label: str = "Cycling (Sport)",
+        fetch_missing_elevations: bool = False,
+    ) -> GpxAnalysisSettings:
+        return GpxAnalysisSettings(
+            sport_label=sport_label,
+            stopped_speed_threshold=1,
+            use_raw_gpx_speed=False,
+            vectorized_processing=False,
+            fetch_missing_elevations=fetch_missing_elevations,
+        )
+
+    def parse_file(self, gpx_content: str) -> "gpxpy.gpx.GPX":
+        return WorkoutGpxService.parse_file(
+            self.get_file_content(gpx_content), "none"
+        )
+
+    def test_it_returns_none_when_file_has_no_valid_segments(self) -> None:
+        gpx = self.parse_file(
+            "<gpx><trk><trkseg></trkseg><trkseg></trkseg></trk></gpx>"
+        )
+
+        assert WorkoutGpxService.analyse_gpx(gpx, self.get_settings()) is None
+
+    def test_it_returns_none_when_elevations_must_be_fetched(
+        self, gpx_file_without_elevation: str
+    ) -> None:
+        gpx = self.parse_file(gpx_file_without_elevation)
+
+        assert (
+            WorkoutGpxService.analyse_gpx(
+                gpx, self.get_settings(fetch_missing_elevations=True)
+            )
+            is None
+        )
+
+    def test_it_returns_analysis_when_file_has_no_missing_elevations(
+        self, gpx_file: str
+    ) -> None:
+        gpx = self.parse_file(gpx_file)
+
+        analysis = WorkoutGpxService.analyse_gpx(
+            gpx, self.get_settings(fetch_missing_elevations=True)
+        )
+
+        assert analysis is not None
+        assert len(analysis.segments) == 1
+        assert analysis.segments[0] is not None
+        assert len(analysis.segments[0].points) == len(
+            gpx.tracks[0].segments[0].points
+        )
+        assert analysis.track_gpx_info == analysis.segments[0].gpx_info
+
+    def test_it_returns_no_data_for_segments_without_distance(
+        self, gpx_file_with_zero_distance_segment: str
+    ) -> None:
+        gpx = self.parse_file(gpx_file_with_zero_distance_segment)
+
+        analysis = WorkoutGpxService.analyse_gpx(gpx, self.get_settings())
+
+        assert analysis is not None
+        assert [
+            segment_data is None for segment_data in analysis.segments
+        ] == [len(segment.points) < 2 for segment in gpx.tracks[0].segments]
+
+    def test_it_removes_elevations_for_sport_without_elevation(
+        self, gpx_file: str
+    ) -> None:
+        gpx = self.parse_file(gpx_file)
+
+        analysis = WorkoutGpxService.analyse_gpx(
+            gpx, self.get_settings(sport_label="Open Water Swimming")
+        )
+
+        assert analysis is not None
+        assert analysis.segments[0] is not None
+        assert {
+            point["elevation"] for point in analysis.segments[0].points
+        } == {None}
+
+
+class TestWorkoutGpxServiceProcessFileWithAnalysis(
+    WorkoutGpxServiceProcessFileTestCase
+):
+    def process_file(
+        self,
+        user: "User",
+        sport: "Sport",
+        gpx_content: str,
+        with_analysis: bool,
+    ) -> "Workout":
+        gpx = WorkoutGpxService.parse_file(
+            self.get_file_content(gpx_content), "none"
+        )
+        gpx_analysis = (
+            WorkoutGpxService.analyse_gpx(
+                gpx,
+                GpxAnalysisSettings(
+                    sport_label=sport.label,
+                    stopped_speed_threshold=sport.stopped_speed_threshold,
+                    use_raw_gpx_speed=user.use_raw_gpx_speed,
+                    vectorized_processing=False,
+                    fetch_missing_elevations=False,
+                ),
+            )
+            if with_analysis
+            else None
+        )
+        service = WorkoutGpxService(
+            user,
+            self.get_file_content(gpx_content),
+            sport,
+            sport.stopped_speed_threshold,
+            get_weather=False,
+            parsed_gpx=gpx,
+            gpx_analysis=gpx_analysis,
+        )
+        service.process_workout()
+        db.session.commit()
+        return service.workout  # type: ignore[return-value]
+
+    @pytest.mark.parametrize(
+        "input_gpx_file",
+        [
+            "gpx_file",
+            "gpx_file_with_gpxtpx_extensions_and_power",
+            "gpx_file_without_elevation",
+            "gpx_file_with_3_segments",
+            "gpx_file_with_zero_distance_segment",
+        ],
+    )
+    def test_it_stores_same_data_as_processing_without_analysis(
+        self,
+        app: "Flask",
+        sport_1_cycling: Sport,
+        user_1: "User",
+        input_gpx_file: str,
+        request: pytest.FixtureRequest,
+    ) -> None:
+        gpx_content = request.getfixturevalue(input_gpx_file)
+        expected_workout = self.process_file(
+            user_1, sport_1_cycling, gpx_content, with_analysis=False
+        )
+
+        workout = self.process_file(
+            user_1, sport_1_cycling, gpx_content, with_analysis=True
+        )
+
+        for key in TestWorkoutGpxServiceProcessFileWithVectorizedProcessing.workout_keys:  # noqa
+            assert getattr(workout, key) == getattr(expected_workout, key), key
+        assert workout.elevation_data_source == (
+            expected_workout.elevation_data_source
+        )
+        for segment, expected_segment in zip(
+            workout.segments, expected_workout.segments, strict=True
+        ):
+            assert segment.start_date == expected_segment.start_date
+            assert segment.points == expected_segment.points
+            assert to_shape(segment.geom) == to_shape(expected_segment.geom)
+
+    def test_it_does_not_process_segments_points_again(
+        self,
+        app: "Flask",
+        sport_1_cycling: Sport,
+        user_1: "User",
+        gpx_file: str,
+    ) -> None:
+        with patch.object(
+            WorkoutGpxService, "_process_segment_points"
+        ) as process_segment_points_mock:
+            self.process_file(
+                user_1, sport_1_cycling, gpx_file, with_analysis=True
+            )
+
+        process_segment_points_mock.assert_not_called()
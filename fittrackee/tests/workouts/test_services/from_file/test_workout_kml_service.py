@@ -1,3 +1,4 @@
+from io import BytesIO
 from typing import TYPE_CHECKING
 
 import gpxpy
@@ -6,6 +7,10 @@ import pytest
 from fittrackee.tests.workouts.mixins import (
     WorkoutFileMixin,
 )
+from fittrackee.tests.workouts.utils import (
+    generate_kml_file,
+    get_traced_memory,
+)
 from fittrackee.workouts.exceptions import WorkoutFileException
 from fittrackee.workouts.services import WorkoutKmlService
 
@@ -81,6 +86,37 @@ class TestWorkoutKmlServiceParseFile(WorkoutFileMixin):
         assert moving_data.moving_time == 250.0
         assert round(moving_data.moving_distance, 1) == 320.0
 
+    def test_it_returns_gpx_with_first_placemark_only(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        kml_2_2_with_one_track: str,
+    ) -> None:
+        kml_content = kml_2_2_with_one_track.replace(
+            "  </Document>",
+            """    <Placemark>
+      <name><![CDATA[another workout]]></name>
+      <gx:MultiTrack>
+        <gx:Track>
+          <when>2018-03-13T13:44:45Z</when>
+          <gx:coord>6.07367 44.68095 998</gx:coord>
+        </gx:Track>
+      </gx:MultiTrack>
+    </Placemark>
+  </Document>""",
+        )
+
+        gpx = WorkoutKmlService.parse_file(
+            self.get_file_content(kml_content),
+            segments_creation_event="none",
+        )
+
+        assert gpx.tracks[0].name == "just a workout"
+        assert len(gpx.tracks[0].segments) == 1
+        moving_data = gpx.get_moving_data()
+        assert moving_data.moving_time == 250.0
+
     def test_it_returns_gpx_with_kml_2_2_with_two_tracks(
         self,
         app: "Flask",
@@ -192,6 +228,27 @@ class TestWorkoutKmlServiceParseFile(WorkoutFileMixin):
         assert last_point_cad.text == "90"
 
 
+@pytest.mark.benchmark
+class TestWorkoutKmlServiceParseLargeFile:
+    """
+    Memory benchmark on generated large files
+    """
+
+    @pytest.mark.parametrize("input_points_count", [1000, 5000])
+    def test_it_does_not_keep_parsed_elements_in_memory(
+        self, input_points_count: int
+    ) -> None:
+        kml_content = generate_kml_file(input_points_count)
+
+        gpx_size, parsing_peak = get_traced_memory(
+            WorkoutKmlService.parse_file, BytesIO(kml_content), "all"
+        )
+
+        # track extended data (heart rates) are only matched with points at
+        # the end of track, other parsed elements are cleared
+        assert parsing_peak < gpx_size * 1.75
+
+
 class TestWorkoutKmlServiceInstantiation(WorkoutFileMixin):
     def test_it_instantiates_service(
         self,
@@ -1,11 +1,21 @@
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
 from typing import TYPE_CHECKING
 
 import gpxpy
 import pytest
 
+from fittrackee.tests.fixtures.fixtures_workouts import (
+    tcx_track_points_part_1,
+    tcx_track_points_part_2,
+)
 from fittrackee.tests.workouts.mixins import (
     WorkoutFileMixin,
 )
+from fittrackee.tests.workouts.utils import (
+    generate_tcx_file,
+    get_traced_memory,
+)
 from fittrackee.workouts.exceptions import WorkoutFileException
 from fittrackee.workouts.services import WorkoutTcxService
 
@@ -279,6 +289,157 @@ class TestWorkoutTcxServiceParseFile(WorkoutFileMixin):
         assert track_extension.tag == "{gpxtrkx}Calories"
         assert track_extension.text == "86"
 
+    def test_it_returns_gpx_with_large_tcx_file(
+        self, app: "Flask", sport_1_cycling: "Sport"
+    ) -> None:
+        points_count = 10000
+        start = datetime(2018, 3, 13, 12, tzinfo=timezone.utc)
+        track_points = "".join(
+            f"""
+        <Trackpoint>
+          <Time>{(start + timedelta(seconds=index)).isoformat()}</Time>
+          <Position>
+            <LatitudeDegrees>{44 + index / 100000}</LatitudeDegrees>
+            <LongitudeDegrees>{6 + index / 100000}</LongitudeDegrees>
+          </Position>
+          <AltitudeMeters>{900 + index % 100}</AltitudeMeters>
+          <HeartRateBpm><Value>{100 + index % 50}</Value></HeartRateBpm>
+          <Extensions>
+            <ns3:TPX><ns3:Watts>{200 + index % 50}</ns3:Watts></ns3:TPX>
+          </Extensions>
+        </Trackpoint>"""
+            for index in range(points_count)
+        )
+        tcx_content = f"""<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase
+    xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"
+    xmlns:ns3="http://www.garmin.com/xmlschemas/ActivityExtension/v2"
+>
+    <Activities>
+        <Activity Sport="Biking">
+            <Lap StartTime="2018-03-13T12:00:00Z">
+                <Track>{track_points}
+                </Track>
+            </Lap>
+        </Activity>
+    </Activities>
+</TrainingCenterDatabase>"""
+
+        gpx = WorkoutTcxService.parse_file(
+            self.get_file_content(tcx_content),
+            segments_creation_event="none",
+        )
+
+        points = gpx.tracks[0].segments[0].points
+        assert len(points) == points_count
+        last_point = points[-1]
+        assert last_point.latitude == 44.09999
+        assert last_point.longitude == 6.09999
+        assert last_point.elevation == 999.0
+        assert last_point.time == start + timedelta(seconds=points_count - 1)
+        assert [
+            (extension.tag, extension.text)
+            for extension in last_point.extensions[0]
+        ] == [("{gpxtpx}hr", "149"), ("{gpxtpx}power", "249")]
+
+    def test_it_ignores_tracks_outside_activities(
+        self, app: "Flask", sport_1_cycling: "Sport"
+    ) -> None:
+        tcx_content = (
+            """<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase
+    xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"
+>
+    <Courses>
+        <Course>
+            <Lap StartTime="2018-03-13T12:44:45Z">
+                <Track>
+"""
+            + tcx_track_points_part_1
+            + """
+                </Track>
+            </Lap>
+        </Course>
+    </Courses>
+    <Activities>
+        <Activity Sport="Other">
+            <Lap StartTime="2018-03-13T12:44:45Z">
+                <Track>
+"""
+            + tcx_track_points_part_2
+            + """
+                </Track>
+            </Lap>
+        </Activity>
+    </Activities>
+</TrainingCenterDatabase>"""
+        )
+
+        gpx = WorkoutTcxService.parse_file(
+            self.get_file_content(tcx_content),
+            segments_creation_event="none",
+        )
+
+        assert len(gpx.tracks[0].segments) == 1
+        assert gpx.tracks[0].segments[0].points[0].time == datetime(
+            2018, 3, 13, 12, 46, 30, tzinfo=timezone.utc
+        )
+
+    def test_it_does_not_resolve_external_entities(
+        self, app: "Flask", sport_1_cycling: "Sport"
+    ) -> None:
+        tcx_content = (
+            """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE TrainingCenterDatabase [
+    <!ENTITY creator SYSTEM "file:///etc/hostname">
+]>
+<TrainingCenterDatabase
+    xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"
+>
+    <Activities>
+        <Activity Sport="Other">
+            <Lap StartTime="2018-03-13T12:44:45Z">
+                <Track>
+"""
+            + tcx_track_points_part_1
+            + """
+                </Track>
+            </Lap>
+            <Creator>
+                <Name>&creator;</Name>
+            </Creator>
+        </Activity>
+    </Activities>
+</TrainingCenterDatabase>"""
+        )
+
+        gpx = WorkoutTcxService.parse_file(
+            self.get_file_content(tcx_content),
+            segments_creation_event="none",
+        )
+
+        assert gpx.creator is None
+
+
+@pytest.mark.benchmark
+class TestWorkoutTcxServiceParseLargeFile:
+    """
+    Memory benchmark on generated large files
+    """
+
+    @pytest.mark.parametrize("input_points_count", [1000, 5000])
+    def test_it_does_not_keep_parsed_elements_in_memory(
+        self, input_points_count: int
+    ) -> None:
+        tcx_content = generate_tcx_file(input_points_count)
+
+        gpx_size, parsing_peak = get_traced_memory(
+            WorkoutTcxService.parse_file, BytesIO(tcx_content), "all"
+        )
+
+        # peak memory is mostly the parsed gpx, parsed elements are cleared
+        assert parsing_peak < gpx_size * 1.25
+
 
 class TestWorkoutTcxServiceInstantiation(WorkoutFileMixin):
     def test_it_instantiates_service(
@@ -0,0 +1,71 @@
+from io import BytesIO
+
+import pytest
+from lxml import etree as ET
+
+from fittrackee.workouts.services.workout_from_file.xml_parser import (
+    get_element_text,
+    iterparse_xml,
+)
+
+XML_CONTENT = b"""<?xml version="1.0" encoding="UTF-8"?>
+<root xmlns="http://example.com/default" xmlns:ns="http://example.com/ns">
+  <items>
+    <ns:item><value> 1 </value></ns:item>
+    <ns:item><value>2</value></ns:item>
+  </items>
+</root>"""
+
+
+class TestIterparseXml:
+    def test_it_returns_events_with_paths_without_namespaces(self) -> None:
+        events = [
+            (event, path)
+            for event, path, _ in iterparse_xml(BytesIO(XML_CONTENT))
+        ]
+
+        assert events[:4] == [
+            ("start", ("root",)),
+            ("start", ("root", "items")),
+            ("start", ("root", "items", "item")),
+            ("start", ("root", "items", "item", "value")),
+        ]
+        assert events[-1] == ("end", ("root",))
+
+    def test_it_returns_elements_text_on_end_event(self) -> None:
+        values = [
+            get_element_text(element)
+            for event, path, element in iterparse_xml(BytesIO(XML_CONTENT))
+            if event == "end" and path[-1] == "value"
+        ]
+
+        assert values == ["1", "2"]
+
+    def test_it_clears_parsed_elements(self) -> None:
+        items_children_count = []
+        for event, path, element in iterparse_xml(BytesIO(XML_CONTENT)):
+            if event == "end" and path == ("root", "items"):
+                items_children_count.append(len(element))
+
+        # only last item is kept (cleared)
+        assert items_children_count == [1]
+
+    def test_it_raises_error_when_xml_is_invalid(self) -> None:
+        with pytest.raises(ET.XMLSyntaxError):
+            list(iterparse_xml(BytesIO(b"<root><items></root>")))
+
+
+class TestGetElementText:
+    @pytest.mark.parametrize(
+        "input_xml, expected_text",
+        [
+            (b"<value>text</value>", "text"),
+            (b"<value>\n  text\n</value>", "text"),
+            (b"<value>  </value>", None),
+            (b"<value/>", None),
+        ],
+    )
+    def test_it_returns_stripped_text(
+        self, input_xml: bytes, expected_text: str
+    ) -> None:
+        assert get_element_text(ET.fromstring(input_xml)) == expected_text
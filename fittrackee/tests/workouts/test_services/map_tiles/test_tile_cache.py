@@ -0,0 +1,374 @@
+import os
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+from time_machine import travel
+
+from fittrackee.workouts.services.map_tiles import Tile, TileCache
+from fittrackee.workouts.services.map_tiles.tile_cache import (
+    get_tile_url_pattern,
+)
+
+if TYPE_CHECKING:
+    from flask import Flask
+
+TILE_SERVER_URL = "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
+TILE_URL = "https://a.tile.openstreetmap.org/13/4109/2930.png"
+HEADERS = {"User-Agent": "FitTrackee"}
+
+
+def get_response(
+    status_code: int = 200,
+    content: bytes = b"tile",
+    headers: Optional[Dict] = None,
+) -> Mock:
+    return Mock(
+        status_code=status_code,
+        content=content,
+        headers=CaseInsensitiveDict(
+            {"Content-Type": "image/png", **(headers if headers else {})}
+        ),
+    )
+
+
+class TileCacheTestCase:
+    @staticmethod
+    def get_tile(
+        tile_cache: TileCache,
+        response: Optional[Mock] = None,
+        side_effect: Optional[Exception] = None,
+        x: int = 4109,
+    ) -> Tuple[Mock, Tile]:
+        with patch.object(
+            TileCache,
+            "_request_tile_server",
+            return_value=response if response else get_response(),
+            side_effect=side_effect,
+        ) as request_mock:
+            tile = tile_cache.get_tile(
+                TILE_URL,
+                tile_server_url=TILE_SERVER_URL,
+                z=13,
+                x=x,
+                y=2930,
+                headers=HEADERS,
+            )
+        return request_mock, tile
+
+
+class TestTileCacheGetTile(TileCacheTestCase):
+    def test_it_returns_tile_from_tile_server_when_not_cached(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+
+        request_mock, tile = self.get_tile(tile_cache)
+
+        request_mock.assert_called_once_with(
+            TILE_URL, headers=HEADERS, timeout=30
+        )
+        assert tile.status_code == 200
+        assert tile.content == b"tile"
+        assert tile.content_type == "image/png"
+        assert tile.max_age == app.config["TILE_CACHE_TTL"]
+
+    def test_it_stores_tile(self, app: "Flask") -> None:
+        tile_cache = TileCache()
+
+        self.get_tile(tile_cache)
+
+        tile_path = TileCache.get_tile_path(
+            app.config["TILE_CACHE_DIR"], TILE_SERVER_URL, 13, 4109, 2930
+        )
+        with open(tile_path, "rb") as f:
+            assert f.read() == b"tile"
+        assert os.path.exists(f"{tile_path}.json")
+
+    def test_it_returns_cached_tile_when_not_expired(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        self.get_tile(tile_cache, get_response(content=b"cached tile"))
+
+        request_mock, tile = self.get_tile(tile_cache)
+
+        request_mock.assert_not_called()
+        assert tile.content == b"cached tile"
+        assert 0 < tile.max_age <= app.config["TILE_CACHE_TTL"]
+
+    def test_it_uses_max_age_returned_by_tile_server(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+
+        _, tile = self.get_tile(
+            tile_cache,
+            get_response(headers={"Cache-Control": "public, max-age=3600"}),
+        )
+
+        assert tile.max_age == 3600
+
+    def test_it_does_not_store_tile_when_tile_server_forbids_it(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        self.get_tile(
+            tile_cache, get_response(headers={"Cache-Control": "no-store"})
+        )
+
+        request_mock, _ = self.get_tile(tile_cache)
+
+        request_mock.assert_called_once()
+
+    def test_it_does_not_store_tile_when_max_size_is_0(
+        self, app: "Flask"
+    ) -> None:
+        app.config["TILE_CACHE_MAX_SIZE"] = 0
+        tile_cache = TileCache()
+        self.get_tile(tile_cache)
+
+        request_mock, tile = self.get_tile(tile_cache)
+
+        request_mock.assert_called_once()
+        assert tile.max_age == 0
+        assert os.path.exists(app.config["TILE_CACHE_DIR"]) is False
+
+    @pytest.mark.parametrize("input_status_code", [404, 500])
+    def test_it_returns_error_when_tile_is_not_cached(
+        self, app: "Flask", input_status_code: int
+    ) -> None:
+        tile_cache = TileCache()
+
+        _, tile = self.get_tile(
+            tile_cache,
+            get_response(
+                status_code=input_status_code,
+                content=b"error",
+                headers={"Content-Type": "text/html"},
+            ),
+        )
+
+        assert tile.status_code == input_status_code
+        assert tile.content == b"error"
+        assert tile.content_type == "text/html"
+        assert tile.max_age == 0
+        assert os.path.exists(app.config["TILE_CACHE_DIR"]) is False
+
+    def test_it_raises_error_when_tile_server_is_unavailable_and_tile_is_not_cached(  # noqa
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            self.get_tile(
+                tile_cache, side_effect=requests.exceptions.ConnectionError()
+            )
+
+
+class TestTileCacheGetExpiredTile(TileCacheTestCase):
+    @staticmethod
+    def get_expired_time(app: "Flask") -> float:
+        return time.time() + app.config["TILE_CACHE_TTL"] + 1
+
+    def test_it_revalidates_tile_with_etag_and_last_modified(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        last_modified = "Wed, 14 Oct 2026 10:00:00 GMT"
+        self.get_tile(
+            tile_cache,
+            get_response(
+                headers={"ETag": '"abc"', "Last-Modified": last_modified}
+            ),
+        )
+
+        with travel(self.get_expired_time(app), tick=False):
+            request_mock, _ = self.get_tile(tile_cache)
+
+        request_mock.assert_called_once_with(
+            TILE_URL,
+            headers={
+                **HEADERS,
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": last_modified,
+            },
+            timeout=30,
+        )
+
+    def test_it_returns_cached_tile_when_not_modified(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        self.get_tile(
+            tile_cache,
+            get_response(content=b"cached tile", headers={"ETag": '"abc"'}),
+        )
+        expired_time = self.get_expired_time(app)
+
+        with travel(expired_time, tick=False):
+            _, tile = self.get_tile(
+                tile_cache, get_response(status_code=304, content=b"")
+            )
+        with travel(expired_time + 1, tick=False):
+            next_request_mock, _ = self.get_tile(tile_cache)
+
+        assert tile.status_code == 200
+        assert tile.content == b"cached tile"
+        assert tile.max_age == app.config["TILE_CACHE_TTL"]
+        # expiration is updated
+        next_request_mock.assert_not_called()
+
+    def test_it_replaces_tile_when_modified(self, app: "Flask") -> None:
+        tile_cache = TileCache()
+        self.get_tile(tile_cache, get_response(headers={"ETag": '"abc"'}))
+        expired_time = self.get_expired_time(app)
+
+        with travel(expired_time, tick=False):
+            _, tile = self.get_tile(
+                tile_cache, get_response(content=b"new tile")
+            )
+        with travel(expired_time + 1, tick=False):
+            next_request_mock, next_tile = self.get_tile(tile_cache)
+
+        assert tile.content == b"new tile"
+        next_request_mock.assert_not_called()
+        assert next_tile.content == b"new tile"
+
+    def test_it_returns_stale_tile_when_tile_server_returns_error(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        self.get_tile(tile_cache, get_response(content=b"cached tile"))
+
+        with travel(self.get_expired_time(app), tick=False):
+            _, tile = self.get_tile(
+                tile_cache, get_response(status_code=503, content=b"")
+            )
+
+        assert tile.status_code == 200
+        assert tile.content == b"cached tile"
+        assert tile.max_age == 0
+
+    def test_it_returns_stale_tile_when_tile_server_is_unavailable(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        self.get_tile(tile_cache, get_response(content=b"cached tile"))
+
+        with travel(self.get_expired_time(app), tick=False):
+            _, tile = self.get_tile(
+                tile_cache, side_effect=requests.exceptions.Timeout()
+            )
+
+        assert tile.status_code == 200
+        assert tile.content == b"cached tile"
+
+
+class TestTileCacheEviction(TileCacheTestCase):
+    def test_it_removes_least_recently_used_tiles_when_max_size_exceeded(
+        self, app: "Flask"
+    ) -> None:
+        # each tile takes about 1100 bytes with metadata
+        app.config["TILE_CACHE_MAX_SIZE"] = 3500
+        tile_cache = TileCache()
+        now = time.time()
+        for x in range(3):
+            self.get_tile(tile_cache, get_response(content=b"0" * 1000), x=x)
+            os.utime(
+                TileCache.get_tile_path(
+                    app.config["TILE_CACHE_DIR"], TILE_SERVER_URL, 13, x, 2930
+                ),
+                (now - 100 + x, now - 100 + x),
+            )
+        # tile 0 is used
+        self.get_tile(tile_cache, x=0)
+
+        self.get_tile(tile_cache, get_response(content=b"0" * 1000), x=3)
+
+        assert [
+            os.path.exists(
+                TileCache.get_tile_path(
+                    app.config["TILE_CACHE_DIR"], TILE_SERVER_URL, 13, x, 2930
+                )
+            )
+            for x in range(4)
+        ] == [True, False, False, True]
+
+
+class TestTileCacheGetTileFromUrl:
+    @pytest.mark.parametrize(
+        "input_url",
+        [
+            "https://a.tile.openstreetmap.org/13/4109/2930.png",
+            # when no subdomains are provided (see STATICMAP_SUBDOMAINS)
+            "https://tile.openstreetmap.org/13/4109/2930.png",
+        ],
+    )
+    def test_it_gets_tile_with_coordinates_from_url(
+        self, app: "Flask", input_url: str
+    ) -> None:
+        tile_cache = TileCache()
+
+        with patch.object(tile_cache, "get_tile") as get_tile_mock:
+            tile_cache.get_tile_from_url(
+                input_url, tile_server_url=TILE_SERVER_URL, headers=HEADERS
+            )
+
+        get_tile_mock.assert_called_once_with(
+            input_url,
+            tile_server_url=TILE_SERVER_URL,
+            z=13,
+            x=4109,
+            y=2930,
+            headers=HEADERS,
+            timeout=30,
+            config=None,
+        )
+
+    def test_it_gets_tile_without_cache_when_url_does_not_match(
+        self, app: "Flask"
+    ) -> None:
+        tile_cache = TileCache()
+        url = "https://example.com/tiles/13/4109/2930.png"
+
+        with patch.object(
+            tile_cache, "get_tile_without_cache"
+        ) as get_tile_without_cache_mock:
+            tile_cache.get_tile_from_url(
+                url, tile_server_url=TILE_SERVER_URL, headers=HEADERS
+            )
+
+        get_tile_without_cache_mock.assert_called_once_with(
+            url, headers=HEADERS, timeout=30
+        )
+
+
+class TestGetTileUrlPattern:
+    @pytest.mark.parametrize(
+        "input_tile_server_url,input_url",
+        [
+            (
+                "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+                "https://tile.openstreetmap.org/13/4109/2930.png",
+            ),
+            (
+                "https://{s}.tile-cyclosm.openstreetmap.fr/cyclosm/{z}/{x}/{y}.png",
+                "https://b.tile-cyclosm.openstreetmap.fr/cyclosm/13/4109/2930.png",
+            ),
+            (
+                "https://tiles.example.com/tile?z={z}&x={x}&y={y}",
+                "https://tiles.example.com/tile?z=13&x=4109&y=2930",
+            ),
+        ],
+    )
+    def test_it_returns_tile_coordinates(
+        self, input_tile_server_url: str, input_url: str
+    ) -> None:
+        match = get_tile_url_pattern(input_tile_server_url).match(input_url)
+
+        assert match
+        assert match.groupdict() == {"z": "13", "x": "4109", "y": "2930"}
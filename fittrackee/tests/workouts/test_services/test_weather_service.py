@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch, sentinel
 import pytest
 import pytz
 import requests
+from flask import Flask
 
 from fittrackee.dates import get_datetime_in_utc
 from fittrackee.tests.utils import random_string
@@ -15,6 +16,7 @@ from fittrackee.workouts.services.workout_from_file.workout_point import (
 )
 
 from ...mixins import ResponseMockMixin
+from ..utils import FakeWeather
 
 VISUAL_CROSSING_RESPONSE = {
     "queryCost": 1,
@@ -214,7 +216,9 @@ class TestWeatherService(WeatherTestCase):
 
         assert weather_data is None
 
-    def test_it_returns_none_when_weather_api_raises_exception(self) -> None:
+    def test_it_returns_none_when_weather_api_raises_exception(
+        self, app: Flask
+    ) -> None:
         weather_api = Mock()
         weather_api.get_weather = Mock()
         weather_api.get_weather.side_effect = Exception()
@@ -226,7 +230,7 @@ class TestWeatherService(WeatherTestCase):
 
         assert weather_data is None
 
-    def test_it_returns_weather_data(self) -> None:
+    def test_it_returns_weather_data(self, app: Flask) -> None:
         weather_api = Mock()
         weather_api.get_weather = Mock()
         weather_api.get_weather.return_value = sentinel
@@ -237,3 +241,98 @@ class TestWeatherService(WeatherTestCase):
         weather_data = weather_service.get_weather(point)
 
         assert weather_data == sentinel
+
+
+class TestWeatherServiceCache(WeatherTestCase):
+    @staticmethod
+    def get_weather_service() -> WeatherService:
+        weather_service = WeatherService()
+        weather_service.weather_api = FakeWeather()
+        return weather_service
+
+    def test_it_does_not_cache_weather_data_when_ttl_is_0(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        app_with_memory_cache.config["WEATHER_CACHE_TTL"] = 0
+        weather_service = self.get_weather_service()
+        point = self.get_gpx_point(datetime.now(timezone.utc))
+
+        weather_service.get_weather(point)
+        weather_service.get_weather(point)
+
+        assert len(weather_service.weather_api.calls) == 2  # type: ignore
+
+    def test_it_returns_cached_weather_data_for_close_point_and_same_hour(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        app_with_memory_cache.config["WEATHER_CACHE_TTL"] = 60
+        weather_service = self.get_weather_service()
+        time = datetime(2022, 11, 15, 13, 10, tzinfo=timezone.utc)
+        weather_data = weather_service.get_weather(
+            WorkoutPoint(latitude=48.866667, longitude=2.333333, time=time)
+        )
+
+        cached_weather_data = weather_service.get_weather(
+            WorkoutPoint(
+                latitude=48.8671,
+                longitude=2.3325,
+                time=time.replace(minute=50),
+            )
+        )
+
+        assert cached_weather_data == weather_data
+        assert len(weather_service.weather_api.calls) == 1  # type: ignore
+
+    @pytest.mark.parametrize(
+        "input_description,input_point",
+        [
+            (
+                "distant location",
+                WorkoutPoint(
+                    latitude=48.9,
+                    longitude=2.333333,
+                    time=datetime(2022, 11, 15, 13, 10, tzinfo=timezone.utc),
+                ),
+            ),
+            (
+                "other hour",
+                WorkoutPoint(
+                    latitude=48.866667,
+                    longitude=2.333333,
+                    time=datetime(2022, 11, 15, 14, 10, tzinfo=timezone.utc),
+                ),
+            ),
+        ],
+    )
+    def test_it_calls_weather_api_when_point_does_not_match_cached_data(
+        self,
+        app_with_memory_cache: Flask,
+        input_description: str,
+        input_point: WorkoutPoint,
+    ) -> None:
+        app_with_memory_cache.config["WEATHER_CACHE_TTL"] = 60
+        weather_service = self.get_weather_service()
+        weather_service.get_weather(
+            WorkoutPoint(
+                latitude=48.866667,
+                longitude=2.333333,
+                time=datetime(2022, 11, 15, 13, 10, tzinfo=timezone.utc),
+            )
+        )
+
+        weather_service.get_weather(input_point)
+
+        assert len(weather_service.weather_api.calls) == 2  # type: ignore
+
+    def test_it_does_not_cache_weather_api_errors(
+        self, app_with_memory_cache: Flask
+    ) -> None:
+        app_with_memory_cache.config["WEATHER_CACHE_TTL"] = 60
+        weather_service = self.get_weather_service()
+        point = self.get_gpx_point(datetime.now(timezone.utc))
+        with patch.object(FakeWeather, "_get_data", side_effect=Exception()):
+            weather_service.get_weather(point)
+
+        weather_data = weather_service.get_weather(point)
+
+        assert weather_data is not None
@@ -1,15 +1,22 @@
 import os
+import shutil
+import tempfile
+import zipfile
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, List, Union
-from unittest.mock import MagicMock, patch
+from typing import TYPE_CHECKING, Dict, List, Union
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 from time_machine import travel
 
+from fittrackee import db
+from fittrackee.constants import MapStatus
 from fittrackee.files import get_absolute_file_path
 from fittrackee.users.models import Notification
 from fittrackee.workouts.exceptions import WorkoutException
+from fittrackee.workouts.models import Workout
 from fittrackee.workouts.services import (
+    WorkoutGpxService,
     WorkoutsFromArchiveCreationAsyncService,
 )
 from fittrackee.workouts.services.workouts_from_file_creation_service import (
@@ -17,6 +24,7 @@ from fittrackee.workouts.services.workouts_from_file_creation_service import (
 )
 
 from ...mixins import UserTaskMixin
+from ..utils import generate_fit_file
 
 if TYPE_CHECKING:
     from flask import Flask
@@ -366,3 +374,443 @@ class TestWorkoutsFromArchiveCreationAsyncServiceProcess(UserTaskMixin):
             "archive": None,
             "files": {"test_4.gpx": "no tracks in gpx file"},
         }
+
+
+class TestWorkoutsFromArchiveCreationAsyncServiceParallelImport(UserTaskMixin):
+    @staticmethod
+    def generate_temporary_archive_with_fit_files(files_count: int) -> str:
+        fit_file_content = generate_fit_file(
+            records_count=1000, stop_event_every=500
+        )
+        _, file_path = tempfile.mkstemp(prefix="archive_", suffix=".zip")
+        with zipfile.ZipFile(file_path, "w") as zip_file:
+            for index in range(files_count):
+                zip_file.writestr(f"workout_{index}.fit", fit_file_content)
+        return file_path
+
+    @staticmethod
+    def generate_temporary_archive_with_gpx_files(
+        files: Dict[str, str],
+    ) -> str:
+        _, file_path = tempfile.mkstemp(prefix="archive_", suffix=".zip")
+        with zipfile.ZipFile(file_path, "w") as zip_file:
+            for file_name, file_content in files.items():
+                zip_file.writestr(file_name, file_content)
+        return file_path
+
+    def test_it_returns_created_workouts(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["test_1.gpx", "test_2.gpx", "test_3.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        workouts, processing_output = service.process()
+
+        assert len(workouts) == 3
+        assert [workout.title for workout in workouts] == [
+            "just a workout n°1",
+            "just a workout n°2",
+            "just a workout n°3",
+        ]
+        assert processing_output == {
+            "errored_workouts": {},
+            "task_short_id": upload_task.short_id,
+        }
+        assert upload_task.progress == 100
+        assert upload_task.data["new_workouts_count"] == 3
+
+    def test_it_creates_workout_and_store_error_when_one_file_is_invalid(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["test_1.gpx", "test_4.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(
+                "tests/files/gpx_test_incorrect.zip"
+            ),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        new_workouts, _ = service.process()
+
+        assert len(new_workouts) == 1
+        assert upload_task.progress == 100
+        assert upload_task.data["new_workouts_count"] == 1
+        assert upload_task.errored is True
+        assert upload_task.errors == {
+            "archive": None,
+            "files": {"test_4.gpx": "no tracks in gpx file"},
+        }
+
+    def test_it_stores_error_when_file_does_not_exist_in_archive(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["test_1.gpx", "missing.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        new_workouts, _ = service.process()
+
+        assert len(new_workouts) == 1
+        assert upload_task.errors == {
+            "archive": None,
+            "files": {
+                "missing.gpx": (
+                    "There is no item named 'missing.gpx' in the archive"
+                )
+            },
+        }
+
+    def test_it_does_not_process_segments_points_in_main_process(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["test_1.gpx", "test_2.gpx", "test_3.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        with patch.object(
+            WorkoutGpxService, "_process_segment_points"
+        ) as process_segment_points_mock:
+            workouts, _ = service.process()
+
+        assert len(workouts) == 3
+        process_segment_points_mock.assert_not_called()
+
+    def test_it_creates_same_workouts_as_sequential_import(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        files_to_process = [f"workout_{index}.fit" for index in range(3)]
+        archive_path = self.generate_temporary_archive_with_fit_files(3)
+        workouts_values = {}
+        for workers in [1, 2]:
+            app.config["WORKOUTS_IMPORT_WORKERS"] = workers
+            file_path = archive_path.replace(".zip", f"_{workers}.zip")
+            shutil.copyfile(archive_path, file_path)
+            upload_task = self.create_workouts_upload_task(
+                user_1,
+                workouts_data={"sport_id": sport_1_cycling.id},
+                files_to_process=files_to_process,
+                equipment_ids=None,
+                file_path=file_path,
+            )
+            service = WorkoutsFromArchiveCreationAsyncService(
+                task_id=upload_task.id
+            )
+
+            workouts, _ = service.process()
+
+            workouts_values[workers] = [
+                (
+                    workout.workout_date,
+                    workout.distance,
+                    workout.duration,
+                    workout.moving,
+                    workout.max_speed,
+                    workout.ascent,
+                    workout.descent,
+                    len(workout.segments),
+                )
+                for workout in workouts
+            ]
+        os.remove(archive_path)
+
+        assert len(workouts_values[2]) == 3
+        assert workouts_values[2] == workouts_values[1]
+
+    def test_it_inserts_workouts_by_chunk(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = [f"workout_{index}.fit" for index in range(12)]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive_with_fit_files(12),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        reserved_ids: List[int] = []
+
+        def reserve_workouts_ids(count: int) -> List[int]:
+            workouts_ids = (
+                WorkoutsFromArchiveCreationAsyncService._reserve_workouts_ids(
+                    count
+                )
+            )
+            reserved_ids.extend(workouts_ids)
+            return workouts_ids
+
+        with patch.object(
+            WorkoutsFromArchiveCreationAsyncService,
+            "_reserve_workouts_ids",
+            side_effect=reserve_workouts_ids,
+        ) as reserve_workouts_ids_mock:
+            workouts, _ = service.process()
+
+        assert len(workouts) == 12
+        assert reserve_workouts_ids_mock.call_args_list == [call(10), call(2)]
+        assert [workout.id for workout in workouts] == reserved_ids
+        assert upload_task.progress == 100
+        assert upload_task.data["new_workouts_count"] == 12
+
+    def test_it_generates_maps_once_workouts_are_committed(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["test_1.gpx", "test_2.gpx", "test_3.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+        workouts_count_on_map_generation = []
+
+        def generate_map_image(map_filepath: str, coordinates: List) -> None:
+            workouts_count_on_map_generation.append(
+                db.session.execute(
+                    db.select(db.func.count(Workout.id))
+                ).scalar()
+            )
+            with open(map_filepath, "wb") as map_file:
+                map_file.write(b"map")
+
+        with patch.object(
+            WorkoutGpxService,
+            "generate_map_image",
+            side_effect=generate_map_image,
+        ):
+            workouts, _ = service.process()
+
+        assert len(workouts) == 3
+        assert workouts_count_on_map_generation == [3, 3, 3]
+        for workout in workouts:
+            assert workout.map_status == MapStatus.READY
+            assert workout.map
+            assert os.path.exists(get_absolute_file_path(workout.map))
+
+    def test_it_sends_map_rendering_tasks_when_async_rendering_is_enabled(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        app.config["STATICMAP_ASYNC_RENDERING"] = True
+        files_to_process = ["test_1.gpx", "test_2.gpx", "test_3.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        with (
+            patch.object(
+                WorkoutGpxService, "generate_map_image"
+            ) as generate_map_image_mock,
+            patch(
+                "fittrackee.workouts.tasks.render_workout_map.send"
+            ) as render_workout_map_mock,
+        ):
+            workouts, _ = service.process()
+
+        app.config["STATICMAP_ASYNC_RENDERING"] = False
+        assert len(workouts) == 3
+        generate_map_image_mock.assert_not_called()
+        assert render_workout_map_mock.call_args_list == [
+            call(workout_id=workout.id, map_id=workout.map_id)
+            for workout in workouts
+        ]
+        for workout in workouts:
+            assert workout.map_status == MapStatus.PENDING
+
+    def test_it_processes_chunk_files_one_by_one_when_an_error_occurs(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        gpx_file: str,
+        gpx_file_with_duplicated_segments: str,
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["workout.gpx", "duplicated_segments.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive_with_gpx_files(
+                {
+                    "workout.gpx": gpx_file,
+                    "duplicated_segments.gpx": (
+                        gpx_file_with_duplicated_segments
+                    ),
+                }
+            ),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        workouts, _ = service.process()
+
+        assert len(workouts) == 1
+        assert Workout.query.count() == 1
+        assert upload_task.progress == 100
+        assert upload_task.data["new_workouts_count"] == 1
+        assert upload_task.errors == {
+            "archive": None,
+            "files": {
+                "duplicated_segments.gpx": "some segments have same start date"
+            },
+        }
+        user_workouts_path = get_absolute_file_path(
+            os.path.join("workouts", str(user_1.id))
+        )
+        assert (
+            len(
+                [
+                    file
+                    for file in os.listdir(user_workouts_path)
+                    if file.endswith(".gpx")
+                ]
+            )
+            == 1
+        )
+
+    def test_it_deletes_workouts_when_map_generation_fails(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["WORKOUTS_IMPORT_WORKERS"] = 2
+        files_to_process = ["test_1.gpx", "test_2.gpx"]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive(),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        with patch.object(
+            WorkoutGpxService,
+            "generate_map_image",
+            side_effect=Exception("error"),
+        ):
+            workouts, _ = service.process()
+
+        assert workouts == []
+        assert Workout.query.count() == 0
+        assert upload_task.data["new_workouts_count"] == 0
+        assert upload_task.errors == {
+            "archive": None,
+            "files": {
+                "test_1.gpx": "error when generating map image",
+                "test_2.gpx": "error when generating map image",
+            },
+        }
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("input_workers", [1, 4])
+    def test_it_imports_archive_with_500_files(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        input_workers: int,
+    ) -> None:
+        """
+        benchmark on archive containing 500 .fit files
+        """
+        app.config["WORKOUTS_IMPORT_WORKERS"] = input_workers
+        files_to_process = [f"workout_{index}.fit" for index in range(500)]
+        upload_task = self.create_workouts_upload_task(
+            user_1,
+            workouts_data={"sport_id": sport_1_cycling.id},
+            files_to_process=files_to_process,
+            equipment_ids=None,
+            file_path=self.generate_temporary_archive_with_fit_files(500),
+        )
+        service = WorkoutsFromArchiveCreationAsyncService(
+            task_id=upload_task.id
+        )
+
+        new_workouts, _ = service.process()
+
+        assert len(new_workouts) == 500
+        assert upload_task.progress == 100
+        assert upload_task.data["new_workouts_count"] == 500
+        assert upload_task.errored is False
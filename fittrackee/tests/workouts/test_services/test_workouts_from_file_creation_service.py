@@ -10,7 +10,7 @@ import pytest
 from werkzeug.datastructures import FileStorage
 
 from fittrackee import db
-from fittrackee.constants import ElevationDataSource
+from fittrackee.constants import ElevationDataSource, MapStatus
 from fittrackee.equipments.exceptions import (
     InvalidEquipmentException,
     InvalidEquipmentsException,
@@ -378,6 +378,59 @@ class TestWorkoutsFromFileCreationServiceCreateWorkout(
         assert new_workout.workout_visibility == VisibilityLevel.PRIVATE
         assert WorkoutSegment.query.count() == 1
 
+    def test_it_sets_map_status_to_ready(
+        self,
+        app: "Flask",
+        user_1: "User",
+        gpx_file_storage: "FileStorage",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        service = WorkoutsFromFileCreationService(
+            auth_user=user_1,
+            file=gpx_file_storage,
+            workouts_data={"sport_id": sport_1_cycling.id},
+        )
+
+        service.create_workout_from_file(extension="gpx", equipments=None)
+        db.session.commit()
+
+        new_workout = Workout.query.one()
+        assert new_workout.map_status == MapStatus.READY
+
+    def test_it_sends_map_rendering_task_when_async_rendering_is_enabled(
+        self,
+        app: "Flask",
+        user_1: "User",
+        gpx_file_storage: "FileStorage",
+        sport_1_cycling: "Sport",
+    ) -> None:
+        app.config["STATICMAP_ASYNC_RENDERING"] = True
+        service = WorkoutsFromFileCreationService(
+            auth_user=user_1,
+            file=gpx_file_storage,
+            workouts_data={"sport_id": sport_1_cycling.id},
+        )
+
+        with (
+            patch.object(
+                WorkoutGpxService, "generate_map_image"
+            ) as generate_map_image_mock,
+            patch(
+                "fittrackee.workouts.tasks.render_workout_map.send"
+            ) as render_workout_map_mock,
+        ):
+            service.create_workout_from_file(extension="gpx", equipments=None)
+            db.session.commit()
+
+        app.config["STATICMAP_ASYNC_RENDERING"] = False
+        new_workout = Workout.query.one()
+        assert new_workout.map is not None
+        assert new_workout.map_status == MapStatus.PENDING
+        generate_map_image_mock.assert_not_called()
+        render_workout_map_mock.assert_called_once_with(
+            workout_id=new_workout.id, map_id=new_workout.map_id
+        )
+
     def test_it_creates_workout_when_extension_is_gpx_and_with_all_data(
         self,
         app: "Flask",
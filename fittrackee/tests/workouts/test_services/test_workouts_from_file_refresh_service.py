@@ -734,6 +734,7 @@ class TestWorkoutFromFileRefreshServiceRefresh(WorkoutAssertMixin):
         assert workout_cycling_user_1.serialize(user=user_1, light=False) == {
             **workout_data,
             "map": None,
+            "map_status": None,
             "modification_date": now,
             "original_file": None,
             "segments": [],
@@ -2613,7 +2613,14 @@ class TestGetAllStats(ApiTestCaseMixin):
         assert data["data"]["workouts"] == 0
         assert data["data"]["sports"] == 0
         assert data["data"]["users"] == 2
-        assert "uploads_dir_size" in data["data"]
+        assert data["data"]["storage_usage"] == {
+            "archives": 0,
+            "exports": 0,
+            "maps": 0,
+            "original_files": 0,
+            "pictures": 0,
+        }
+        assert data["data"]["uploads_dir_size"] == 0
 
     def test_it_does_not_count_inactive_user(
         self, app: Flask, user_1_moderator: User, inactive_user: User
@@ -11,7 +11,7 @@ from fittrackee.users.models import FollowRequest, User
 from fittrackee.visibility_levels import VisibilityLevel
 from fittrackee.workouts.models import Sport, Workout
 
-from ..utils import jsonify_dict
+from ..utils import capture_queries, jsonify_dict
 from .mixins import WorkoutApiTestCaseMixin
 
 
@@ -584,3 +584,31 @@ class TestGetUserTimelinePagination(WorkoutApiTestCaseMixin):
             "Mon, 01 Jan 2018 00:00:00 GMT"
             == data["data"]["workouts"][4]["workout_date"]
         )
+
+    def test_it_does_not_run_queries_for_each_workout(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        seven_workouts_user_1: List[Workout],
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        # 2 workouts
+        with capture_queries() as last_page_statements:
+            client.get(
+                "/api/timeline?page=2",
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        # 5 workouts
+        with capture_queries() as first_page_statements:
+            response = client.get(
+                "/api/timeline?page=1",
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        data = json.loads(response.data.decode())
+        assert len(data["data"]["workouts"]) == 5
+        assert len(first_page_statements) <= len(last_page_statements)
@@ -1,10 +1,18 @@
-from typing import TYPE_CHECKING
+import math
+from typing import TYPE_CHECKING, Dict, List
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
+from fittrackee import db
 from fittrackee.workouts.exceptions import WorkoutGPXException
-from fittrackee.workouts.utils.chart import get_chart_data
+from fittrackee.workouts.utils.chart import (
+    downsample_chart_data,
+    downsampled_chart_data_cache,
+    get_chart_data,
+    get_lttb_indices,
+)
 
 if TYPE_CHECKING:
     from flask import Flask
@@ -116,3 +124,176 @@ class TestGetChartData:
             workout_ave_cadence=None,
             can_see_heart_rate=True,
         )
+
+    def test_it_calls_get_chart_data_from_segment_points_when_points_are_stored_in_json(  # noqa
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        points = workout_cycling_user_1_segment_0_with_coordinates.points
+        # segment created before points compression
+        workout_cycling_user_1_segment_0_with_coordinates._points = points
+        workout_cycling_user_1_segment_0_with_coordinates.points_data = None
+        db.session.commit()
+
+        with patch(
+            "fittrackee.workouts.utils.chart.get_chart_data_from_segment_points"
+        ) as get_chart_data_from_segment_points_mock:
+            get_chart_data(
+                workout_cycling_user_1_with_coordinates,
+                user=user_1,
+                can_see_heart_rate=True,
+            )
+        get_chart_data_from_segment_points_mock.assert_called_once_with(
+            [points],
+            workout_cycling_user_1_with_coordinates.sport,
+            user=user_1,
+            workout_ave_cadence=None,
+            can_see_heart_rate=True,
+        )
+
+    def test_it_returns_downsampled_chart_data_when_resolution_is_provided(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        chart_data = get_chart_data(
+            workout_cycling_user_1_with_coordinates,
+            user=user_1,
+            can_see_heart_rate=True,
+        )
+        assert chart_data
+
+        downsampled_chart_data = get_chart_data(
+            workout_cycling_user_1_with_coordinates,
+            user=user_1,
+            can_see_heart_rate=True,
+            resolution=3,
+        )
+
+        assert downsampled_chart_data == downsample_chart_data(chart_data, 3)
+
+    def test_it_returns_cached_downsampled_chart_data(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        downsampled_chart_data_cache.clear()
+        chart_data = get_chart_data(
+            workout_cycling_user_1_with_coordinates,
+            user=user_1,
+            can_see_heart_rate=True,
+            resolution=3,
+        )
+
+        with patch(
+            "fittrackee.workouts.utils.chart.get_chart_data_from_segment_points"
+        ) as get_chart_data_from_segment_points_mock:
+            cached_chart_data = get_chart_data(
+                workout_cycling_user_1_with_coordinates,
+                user=user_1,
+                can_see_heart_rate=True,
+                resolution=3,
+            )
+
+        get_chart_data_from_segment_points_mock.assert_not_called()
+        assert cached_chart_data == chart_data
+
+
+def get_chart_data_points(points_count: int) -> List[Dict]:
+    return [
+        {
+            "distance": index / 100,
+            "duration": index,
+            "elevation": 100 + 50 * math.sin(index / 20),
+            "speed": 20.0 if index != 250 else 60.0,
+        }
+        for index in range(points_count)
+    ]
+
+
+class TestGetLttbIndices:
+    def test_it_returns_all_indices_when_threshold_exceeds_points_count(
+        self,
+    ) -> None:
+        x = np.arange(5, dtype=float)
+
+        indices = get_lttb_indices(x, x[:, np.newaxis], 10)
+
+        assert indices.tolist() == [0, 1, 2, 3, 4]
+
+    def test_it_returns_threshold_indices_with_first_and_last_points(
+        self,
+    ) -> None:
+        x = np.linspace(0, 1, 1000)
+        y = np.sin(x * 20)[:, np.newaxis]
+
+        indices = get_lttb_indices(x, y, 100)
+
+        assert len(indices) == 100
+        assert indices[0] == 0
+        assert indices[-1] == 999
+        assert (np.diff(indices) > 0).all()
+
+    def test_it_selects_peak(self) -> None:
+        x = np.linspace(0, 1, 100)
+        y = np.zeros((100, 1))
+        y[42] = 1
+
+        indices = get_lttb_indices(x, y, 10)
+
+        assert 42 in indices
+
+
+class TestDownsampleChartData:
+    def test_it_returns_chart_data_when_points_count_is_below_resolution(
+        self,
+    ) -> None:
+        chart_data = get_chart_data_points(10)
+
+        assert downsample_chart_data(chart_data, 10) == chart_data
+
+    def test_it_returns_chart_data_with_given_resolution(self) -> None:
+        chart_data = get_chart_data_points(1000)
+
+        downsampled_chart_data = downsample_chart_data(chart_data, 100)
+
+        assert len(downsampled_chart_data) == 100
+        assert downsampled_chart_data[0] == chart_data[0]
+        assert downsampled_chart_data[-1] == chart_data[-1]
+
+    def test_it_preserves_peak_of_any_channel(self) -> None:
+        chart_data = get_chart_data_points(1000)
+
+        downsampled_chart_data = downsample_chart_data(chart_data, 50)
+
+        assert chart_data[250] in downsampled_chart_data
+
+    def test_it_downsamples_chart_data_with_missing_values(self) -> None:
+        chart_data = get_chart_data_points(1000)
+        for point in chart_data[100:200]:
+            del point["elevation"]
+
+        downsampled_chart_data = downsample_chart_data(chart_data, 50)
+
+        assert len(downsampled_chart_data) == 50
+
+    def test_it_downsamples_chart_data_when_distance_does_not_change(
+        self,
+    ) -> None:
+        chart_data = [
+            {**point, "distance": 0} for point in get_chart_data_points(100)
+        ]
+
+        downsampled_chart_data = downsample_chart_data(chart_data, 10)
+
+        assert len(downsampled_chart_data) == 10
@@ -1,27 +1,28 @@
 from typing import TYPE_CHECKING
 
 import pytest
-import shapely.wkt
-from shapely import set_precision
+from sqlalchemy import select, text
 
+from fittrackee import db
 from fittrackee.workouts.exceptions import (
+    InvalidBboxException,
     InvalidCoordinatesException,
     InvalidRadiusException,
+    InvalidZoomException,
 )
+from fittrackee.workouts.models import WorkoutSegment
 from fittrackee.workouts.utils.geometry import (
-    get_buffered_location,
     get_chart_data_from_segment_points,
     get_geojson_from_segments,
+    get_location_filter,
+    get_start_points_clusters,
 )
 
-from ...mixins import GeometryMixin
-
 if TYPE_CHECKING:
     from flask import Flask
-    from shapely import Polygon
 
     from fittrackee.users.models import User
-    from fittrackee.workouts.models import Sport, Workout, WorkoutSegment
+    from fittrackee.workouts.models import Sport, Workout
 
 
 class TestGetGeojsonFromSegments:
@@ -590,7 +591,7 @@ class TestGetChartDataFromSegmentPoints:
         }
 
 
-class TestGetBufferedLocation(GeometryMixin):
+class TestGetLocationFilter:
     @pytest.mark.parametrize("input_radius", ["invalid", "", "0", "-1"])
     def test_it_raises_exception_when_radius_is_invalid(
         self, app: "Flask", input_radius: str
@@ -599,7 +600,7 @@ class TestGetBufferedLocation(GeometryMixin):
             InvalidRadiusException,
             match="invalid radius, must be an float greater than zero",
         ):
-            get_buffered_location(
+            get_location_filter(
                 coordinates="48.85341,2.3488", radius_str=input_radius
             )
 
@@ -616,23 +617,112 @@ class TestGetBufferedLocation(GeometryMixin):
                 "longitude, separated by a comma"
             ),
         ):
-            get_buffered_location(input_coordinates, radius_str="10")
+            get_location_filter(input_coordinates, radius_str="10")
 
-    @pytest.mark.parametrize("input_radius", ["1", "1.0"])
-    def test_it_returns_buffered_polygon_with_4326_srid(
+    @pytest.mark.parametrize("input_radius", ["13", "13.0"])
+    def test_it_returns_filter_on_segments_within_radius(
         self,
         app: "Flask",
-        paris_with_10km_buffer: "Polygon",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
         input_radius: str,
     ) -> None:
-        paris_coordinates = "48.85341,2.3488"
+        # segment is around 12.9 km from given location
+        location_filter = get_location_filter(
+            "44.564511,6.087168", input_radius
+        )
+
+        assert WorkoutSegment.query.filter(location_filter).all() == [
+            workout_cycling_user_1_segment_0_with_coordinates
+        ]
 
-        buffer = get_buffered_location(paris_coordinates, input_radius)
+    def test_it_returns_filter_excluding_segments_outside_radius(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        location_filter = get_location_filter("44.564511,6.087168", "12.5")
+
+        assert WorkoutSegment.query.filter(location_filter).all() == []
+
+    @pytest.mark.benchmark
+    def test_it_uses_geography_index_on_100k_segments(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        """
+        benchmark on 100,000 segments with random geometries
+        """
+        db.session.execute(
+            text(
+                """
+                INSERT INTO workout_segments (
+                  workout_id, workout_uuid, start_date, duration, geom
+                )
+                SELECT :workout_id, CAST(:workout_uuid AS uuid),
+                  :workout_date + make_interval(secs => n),
+                  make_interval(mins => 1),
+                  ST_SetSRID(
+                    ST_MakeLine(
+                      ST_MakePoint(lon, lat),
+                      ST_MakePoint(lon + 0.01, lat + 0.01)
+                    ),
+                    4326
+                  )
+                FROM (
+                  SELECT n, random() * 10 AS lon, 40 + random() * 10 AS lat
+                  FROM generate_series(1, 100000) AS n
+                ) AS coordinates;
+                """
+            ),
+            {
+                "workout_id": workout_cycling_user_1.id,
+                "workout_uuid": str(workout_cycling_user_1.uuid),
+                "workout_date": workout_cycling_user_1.workout_date,
+            },
+        )
+        db.session.execute(text("ANALYZE workout_segments;"))
+        query = select(WorkoutSegment.uuid).where(
+            get_location_filter("44.564511,6.087168", "10")
+        )
+
+        query_plan = "\n".join(
+            row[0]
+            for row in db.session.execute(
+                text(
+                    "EXPLAIN "
+                    + str(
+                        query.compile(
+                            dialect=db.engine.dialect,
+                            compile_kwargs={"literal_binds": True},
+                        )
+                    )
+                )
+            )
+        )
+
+        assert "ix_workout_segments_geom_geography" in query_plan
+
+
+class TestGetStartPointsClusters:
+    @pytest.mark.parametrize("input_zoom", [-1, 23, 100000000000])
+    def test_it_raises_exception_when_zoom_is_invalid(
+        self, input_zoom: int
+    ) -> None:
+        with pytest.raises(
+            InvalidZoomException,
+            match="invalid zoom, must be an integer between 0 and 22",
+        ):
+            get_start_points_clusters([], input_zoom)
 
-        srid, geometry = buffer.split(";")
-        assert srid == "SRID=4326"
-        # to handle rounding differences on different platforms
-        precision = 1e-10
-        assert str(
-            set_precision(shapely.wkt.loads(geometry), precision)
-        ) == str(set_precision(paris_with_10km_buffer, precision))
+    def test_it_raises_exception_when_bbox_is_invalid(self) -> None:
+        with pytest.raises(InvalidBboxException):
+            get_start_points_clusters([], 5, [-5.2, 41.3, 9.6])
@@ -0,0 +1,167 @@
+import json
+from typing import Dict, List
+
+import pytest
+
+from fittrackee.workouts.utils.points import (
+    InvalidPointsDataException,
+    SegmentPointsReader,
+    encode_points,
+    get_segment_points_reader,
+)
+
+POINTS: List[Dict] = [
+    {
+        "cadence": 0,
+        "distance": 0.0,
+        "duration": 0,
+        "elevation": 998.0,
+        "heart_rate": 92,
+        "latitude": 44.68095,
+        "longitude": 6.07367,
+        "pace": None,
+        "power": 0,
+        "speed": 0,
+        "time": "2018-03-13 12:44:45+00:00",
+    },
+    {
+        "cadence": 50,
+        "distance": 4.4527796323533435,
+        "duration": 5,
+        "elevation": None,
+        "latitude": 44.68091,
+        "longitude": 6.07367,
+        "pace": 0.9090909091,
+        "power": 305,
+        "speed": 3.96,
+        "time": "2018-03-13 12:44:50.250000+00:00",
+    },
+    {
+        "distance": 40002.5,
+        "duration": 40000,
+        "elevation": 1003.5,
+        "heart_rate": 180,
+        "latitude": 44.68087,
+        "longitude": 6.07357,
+        "pace": 0.25,
+        "speed": 14.4,
+        "time": "2018-03-14 00:01:30+00:00",
+    },
+]
+
+
+class TestEncodePoints:
+    def test_it_returns_identical_points_after_decoding(self) -> None:
+        points_data = encode_points(POINTS)
+
+        assert SegmentPointsReader(points_data).get_points() == POINTS
+
+    def test_it_preserves_serialized_values(self) -> None:
+        points_data = encode_points(POINTS)
+
+        assert json.dumps(
+            SegmentPointsReader(points_data).get_points()
+        ) == json.dumps(POINTS)
+
+    def test_it_encodes_empty_points(self) -> None:
+        points_data = encode_points([])
+
+        reader = SegmentPointsReader(points_data)
+        assert len(reader) == 0
+        assert reader.get_points() == []
+
+    def test_it_stores_time_not_in_utc_without_conversion(self) -> None:
+        points: List[Dict] = [
+            {"time": "2018-03-13 13:44:45+01:00"},
+            {"time": None},
+        ]
+
+        points_data = encode_points(points)
+
+        assert SegmentPointsReader(points_data).get_points() == points
+
+    def test_it_stores_unexpected_values(self) -> None:
+        points: List[Dict] = [
+            {"label": "start", "is_valid": True},
+            {"label": None},
+        ]
+
+        points_data = encode_points(points)
+
+        assert SegmentPointsReader(points_data).get_points() == points
+
+    def test_it_compresses_points(self) -> None:
+        points = [
+            {
+                "distance": float(index * 4),
+                "duration": index,
+                "heart_rate": 120,
+                "time": f"2018-03-13 12:{index // 60:02}:{index % 60:02}"
+                "+00:00",
+            }
+            for index in range(3600)
+        ]
+
+        points_data = encode_points(points)
+
+        assert len(points_data) < len(json.dumps(points)) / 10
+
+
+class TestSegmentPointsReader:
+    def test_it_raises_error_when_data_are_invalid(self) -> None:
+        with pytest.raises(
+            InvalidPointsDataException, match="invalid points data"
+        ):
+            SegmentPointsReader(b"invalid")
+
+    def test_it_returns_channels(self) -> None:
+        reader = SegmentPointsReader(encode_points(POINTS))
+
+        assert reader.channels == list(POINTS[0].keys())
+
+    def test_it_returns_only_requested_channels(self) -> None:
+        reader = SegmentPointsReader(encode_points(POINTS))
+
+        points = reader.get_points(["heart_rate", "time"])
+
+        assert points == [
+            {"heart_rate": 92, "time": "2018-03-13 12:44:45+00:00"},
+            {"time": "2018-03-13 12:44:50.250000+00:00"},
+            {"heart_rate": 180, "time": "2018-03-14 00:01:30+00:00"},
+        ]
+
+    def test_it_decodes_only_requested_channels(self) -> None:
+        reader = SegmentPointsReader(encode_points(POINTS))
+
+        reader.get_points(["speed"])
+
+        assert list(reader._decoded.keys()) == ["speed"]
+
+    def test_it_returns_channel_values(self) -> None:
+        reader = SegmentPointsReader(encode_points(POINTS))
+
+        assert reader.get_channel("power") == [0, 305, None]
+
+    def test_it_returns_none_values_when_channel_does_not_exist(
+        self,
+    ) -> None:
+        reader = SegmentPointsReader(encode_points(POINTS))
+
+        assert reader.get_channel("temperature") == [None, None, None]
+
+
+class TestGetSegmentPointsReader:
+    def test_it_returns_reader_for_points_data(self) -> None:
+        reader = get_segment_points_reader(encode_points(POINTS), [])
+
+        assert reader.get_points() == POINTS
+
+    def test_it_returns_reader_for_points_stored_in_json(self) -> None:
+        reader = get_segment_points_reader(None, POINTS)
+
+        assert reader.get_points() == POINTS
+
+    def test_it_returns_empty_reader_when_no_points(self) -> None:
+        reader = get_segment_points_reader(None, [])
+
+        assert reader.get_points() == []
@@ -0,0 +1,204 @@
+from typing import List
+
+import pytest
+from flask import Flask
+
+from fittrackee import db
+from fittrackee.constants import PaceSpeedDisplay
+from fittrackee.users.models import User, UserSportPreference
+from fittrackee.workouts.models import Sport, Workout
+from fittrackee.workouts.utils.sports import (
+    SportDisplayedData,
+    SportsDisplayedDataResolver,
+    get_sport_displayed_data,
+)
+
+from ...utils import capture_queries
+from ..mixins import WorkoutApiTestCaseMixin
+
+PREFERENCES_QUERY = "users_sports_preferences.pace_speed_display"
+
+
+def count_preferences_queries(statements: List[str]) -> int:
+    return len(
+        [
+            statement
+            for statement in statements
+            if PREFERENCES_QUERY in statement
+        ]
+    )
+
+
+class TestSportsDisplayedDataResolver:
+    def test_it_returns_sport_displayed_data_when_no_user_provided(
+        self, app: Flask, sport_1_cycling: Sport
+    ) -> None:
+        resolver = SportsDisplayedDataResolver(user=None)
+
+        with capture_queries() as statements:
+            sport_displayed_data = resolver.get(sport_1_cycling)
+
+        assert sport_displayed_data == SportDisplayedData(
+            display_elevation=True,
+            display_pace=False,
+            display_power=True,
+            display_speed=True,
+            display_cadence=True,
+            display_spm_cadence=False,
+            display_rpm_cadence=True,
+        )
+        assert count_preferences_queries(statements) == 0
+
+    def test_it_returns_sport_config_when_user_has_no_preferences(
+        self, app: Flask, user_1: User, sport_2_running: Sport
+    ) -> None:
+        sport_2_running.pace_speed_display = PaceSpeedDisplay.PACE
+        db.session.commit()
+        resolver = SportsDisplayedDataResolver(user=user_1)
+
+        sport_displayed_data = resolver.get(sport_2_running)
+
+        assert sport_displayed_data.display_pace is True
+        assert sport_displayed_data.display_speed is False
+
+    def test_it_returns_user_preferences(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_2_running: Sport,
+        user_1_sport_2_preference: UserSportPreference,
+    ) -> None:
+        user_1_sport_2_preference.pace_speed_display = (
+            PaceSpeedDisplay.PACE_AND_SPEED
+        )
+        db.session.commit()
+        resolver = SportsDisplayedDataResolver(user=user_1)
+
+        sport_displayed_data = resolver.get(sport_2_running)
+
+        assert sport_displayed_data.display_pace is True
+        assert sport_displayed_data.display_speed is True
+
+    def test_it_forces_speed_display(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_2_running: Sport,
+        user_1_sport_2_preference: UserSportPreference,
+    ) -> None:
+        user_1_sport_2_preference.pace_speed_display = PaceSpeedDisplay.PACE
+        db.session.commit()
+        resolver = SportsDisplayedDataResolver(user=user_1)
+
+        sport_displayed_data = resolver.get(
+            sport_2_running, force_display_speed=True
+        )
+
+        assert sport_displayed_data.display_speed is True
+        assert resolver.get(sport_2_running).display_speed is False
+
+    def test_it_loads_user_preferences_once(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        sport_2_running: Sport,
+        user_1_sport_1_preference: UserSportPreference,
+        user_1_sport_2_preference: UserSportPreference,
+    ) -> None:
+        resolver = SportsDisplayedDataResolver(user=user_1)
+
+        with capture_queries() as statements:
+            for sport in [sport_1_cycling, sport_2_running, sport_1_cycling]:
+                resolver.get(sport)
+
+        assert count_preferences_queries(statements) == 1
+
+
+class TestGetSportDisplayedData:
+    def test_it_does_not_memoize_data_outside_request(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_2_running: Sport,
+        user_1_sport_2_preference: UserSportPreference,
+    ) -> None:
+        assert (
+            get_sport_displayed_data(sport_2_running, user_1).display_pace
+            is False
+        )
+        user_1_sport_2_preference.pace_speed_display = PaceSpeedDisplay.PACE
+        db.session.commit()
+
+        assert (
+            get_sport_displayed_data(sport_2_running, user_1).display_pace
+            is True
+        )
+
+
+class TestSportsDisplayedDataQueries(WorkoutApiTestCaseMixin):
+    @pytest.mark.parametrize(
+        "input_url",
+        [
+            "/api/auth/profile",
+            "/api/stats/{username}/by_sport",
+            "/api/stats/{username}/by_time",
+            "/api/stats/{username}/by_time?time=month",
+            "/api/timeline",
+            "/api/workouts",
+            "/api/workouts?with_statistics=true",
+        ],
+    )
+    def test_it_loads_user_preferences_once_per_request(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        sport_2_running: Sport,
+        sport_3_cycling_transport: Sport,
+        user_1_sport_1_preference: UserSportPreference,
+        user_1_sport_2_preference: UserSportPreference,
+        workout_cycling_user_1: Workout,
+        workout_running_user_1: Workout,
+        seven_workouts_user_1: List[Workout],
+        input_url: str,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        with capture_queries() as statements:
+            response = client.get(
+                input_url.format(username=user_1.username),
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        assert response.status_code == 200
+        assert count_preferences_queries(statements) == 1
+
+    def test_it_loads_user_preferences_again_on_next_request(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_2_running: Sport,
+        user_1_sport_2_preference: UserSportPreference,
+        workout_running_user_1: Workout,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        client.get(
+            "/api/workouts",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+        user_1_sport_2_preference.pace_speed_display = PaceSpeedDisplay.PACE
+        db.session.commit()
+
+        response = client.get(
+            "/api/workouts",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        data = response.get_json()
+        assert data["data"]["workouts"][0]["ave_speed"] is None
+        assert data["data"]["workouts"][0]["ave_pace"] is not None
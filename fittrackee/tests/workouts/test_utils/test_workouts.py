@@ -1,3 +1,4 @@
+import re
 from datetime import datetime, timezone
 from statistics import mean
 from typing import List, Optional, Union
@@ -9,13 +10,19 @@ from gpxpy.gpxfield import SimpleTZ
 
 from fittrackee.users.models import FollowRequest, User
 from fittrackee.visibility_levels import VisibilityLevel
-from fittrackee.workouts.exceptions import WorkoutForbiddenException
+from fittrackee.workouts.exceptions import (
+    InvalidBboxException,
+    InvalidZoomException,
+    WorkoutForbiddenException,
+)
 from fittrackee.workouts.models import Sport, Workout
 from fittrackee.workouts.utils.workouts import (
     get_average_speed,
+    get_bbox_from_request_args,
     get_ordered_workouts,
     get_workout,
     get_workout_datetime,
+    get_zoom_from_request_args,
 )
 
 utc_datetime = datetime(
@@ -136,6 +143,68 @@ class TestWorkoutGetWorkoutDatetime:
         assert workout_date_with_tz is None
 
 
+class TestGetZoomFromRequestArgs:
+    def test_it_returns_none_when_no_zoom_provided(self) -> None:
+        assert get_zoom_from_request_args({}) is None
+
+    @pytest.mark.parametrize("input_zoom", ["0", "12", "22"])
+    def test_it_returns_zoom(self, input_zoom: str) -> None:
+        assert get_zoom_from_request_args({"zoom": input_zoom}) == int(
+            input_zoom
+        )
+
+    @pytest.mark.parametrize(
+        "input_zoom", ["invalid", "1.5", "-1", "23", "100000000000"]
+    )
+    def test_it_raises_error_when_zoom_is_invalid(
+        self, input_zoom: str
+    ) -> None:
+        with pytest.raises(
+            InvalidZoomException,
+            match="invalid zoom, must be an integer between 0 and 22",
+        ):
+            get_zoom_from_request_args({"zoom": input_zoom})
+
+
+class TestGetBboxFromRequestArgs:
+    def test_it_returns_none_when_no_bbox_provided(self) -> None:
+        assert get_bbox_from_request_args({}) is None
+
+    def test_it_returns_bbox(self) -> None:
+        assert get_bbox_from_request_args({"bbox": "-5.2,41.3,9.6,51.1"}) == [
+            -5.2,
+            41.3,
+            9.6,
+            51.1,
+        ]
+
+    @pytest.mark.parametrize(
+        "input_bbox",
+        [
+            "",
+            "invalid",
+            "-5.2,41.3,9.6",
+            "-5.2,41.3,9.6,51.1,2",
+            "9.6,41.3,-5.2,51.1",
+            "-5.2,51.1,9.6,41.3",
+            "-5.2,41.3,inf,51.1",
+            "-5.2,nan,9.6,51.1",
+        ],
+    )
+    def test_it_raises_error_when_bbox_is_invalid(
+        self, input_bbox: str
+    ) -> None:
+        with pytest.raises(
+            InvalidBboxException,
+            match=re.escape(
+                "invalid bbox, must be a string with min. longitude, min. "
+                "latitude, max. longitude and max. latitude, separated by a "
+                "comma"
+            ),
+        ):
+            get_bbox_from_request_args({"bbox": input_bbox})
+
+
 class TestGetOrderedWorkouts:
     def test_it_returns_empty_list_when_no_workouts_provided(
         self,
@@ -1,17 +1,21 @@
 import json
+import os
 from datetime import datetime, timezone
 from typing import Dict, List
-from unittest.mock import mock_open, patch
+from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 from flask import Flask
 
 from fittrackee import db
+from fittrackee.constants import MapStatus
 from fittrackee.tests.comments.mixins import CommentMixin
 from fittrackee.users.models import FollowRequest, User
 from fittrackee.visibility_levels import VisibilityLevel
 from fittrackee.workouts.models import Sport, Workout, WorkoutSegment
+from fittrackee.workouts.services.map_tiles import TileCache
 
+from ..fixtures.fixtures_workouts import byte_image
 from ..mixins import GeometryMixin
 from ..utils import jsonify_dict
 from .mixins import WorkoutApiTestCaseMixin
@@ -1002,6 +1006,72 @@ class TestGetWorkoutGeoJsonAsUnauthenticatedUser(
         )
 
 
+class TestGetWorkoutGeoJsonConditionalRequest(GetWorkoutGeoJSONTestCase):
+    def test_it_returns_304_without_getting_geojson_when_etag_matches(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        url = self.route.format(
+            workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+        )
+        etag = client.get(
+            url, headers=dict(Authorization=f"Bearer {auth_token}")
+        ).headers["ETag"]
+
+        with patch(
+            "fittrackee.workouts.workouts.get_geojson_from_segments"
+        ) as get_geojson_mock:
+            response = client.get(
+                url,
+                headers={
+                    "Authorization": f"Bearer {auth_token}",
+                    "If-None-Match": etag,
+                },
+            )
+
+        assert response.status_code == 304
+        get_geojson_mock.assert_not_called()
+
+    def test_it_returns_geojson_when_segments_change(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+        workout_cycling_user_1_segment_1_with_coordinates: WorkoutSegment,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        url = self.route.format(
+            workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+        )
+        etag = client.get(
+            url, headers=dict(Authorization=f"Bearer {auth_token}")
+        ).headers["ETag"]
+        db.session.delete(workout_cycling_user_1_segment_1_with_coordinates)
+        db.session.commit()
+
+        response = client.get(
+            url,
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "If-None-Match": etag,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
 class GetWorkoutSegmentGeoJSONTestCase(WorkoutApiTestCaseMixin, GeometryMixin):
     route = "/api/workouts/{workout_uuid}/geojson/segment/{segment_id}"
 
@@ -1481,6 +1551,64 @@ class TestGetWorkoutChartDataAsWorkoutOwner(GetWorkoutChartDataTestCase):
             == workout_cycling_user_1_segment_0_chart_data
         )
 
+    @pytest.mark.parametrize("input_resolution", ["invalid", "2", "-1"])
+    def test_it_returns_error_when_resolution_is_invalid(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+        input_resolution: str,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            self.route.format(
+                workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+            )
+            + f"?resolution={input_resolution}",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_400(
+            response,
+            "resolution must be an integer greater than or equal to 3",
+        )
+
+    def test_it_returns_downsampled_chart_data(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+        workout_cycling_user_1_segment_0_chart_data: List[Dict],
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            self.route.format(
+                workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+            )
+            + "?resolution=3",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert "success" in data["status"]
+        chart_data = data["data"]["chart_data"]
+        assert len(chart_data) == 3
+        assert chart_data[0] == workout_cycling_user_1_segment_0_chart_data[0]
+        assert (
+            chart_data[-1] == workout_cycling_user_1_segment_0_chart_data[-1]
+        )
+
     def test_it_returns_error_when_user_is_suspended(
         self,
         app: Flask,
@@ -1630,6 +1758,7 @@ class TestGetWorkoutChartDataAsFollower(
             user=user_2,
             can_see_heart_rate=expected_can_see_heart_rate,
             segment_short_id=None,
+            resolution=None,
         )
 
     def test_it_returns_error_when_user_is_suspended(
@@ -1770,6 +1899,7 @@ class TestGetWorkoutChartDataAsUser(
             user=user_2,
             can_see_heart_rate=expected_can_see_heart_rate,
             segment_short_id=None,
+            resolution=None,
         )
 
     def test_it_returns_chart_data_when_analysis_visibility_is_public(
@@ -1931,6 +2061,7 @@ class TestGetWorkoutChartDataAsUnauthenticatedUser(
             user=None,
             can_see_heart_rate=expected_can_see_heart_rate,
             segment_short_id=None,
+            resolution=None,
         )
 
     def test_it_returns_chart_data_when_map_visibility_is_public(
@@ -1964,6 +2095,122 @@ class TestGetWorkoutChartDataAsUnauthenticatedUser(
         )
 
 
+class TestGetWorkoutChartDataConditionalRequest(GetWorkoutChartDataTestCase):
+    def test_it_returns_etag(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            self.route.format(
+                workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+            ),
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+
+    def test_it_returns_304_without_getting_chart_data_when_etag_matches(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        url = self.route.format(
+            workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+        )
+        etag = client.get(
+            url, headers=dict(Authorization=f"Bearer {auth_token}")
+        ).headers["ETag"]
+
+        with patch(
+            "fittrackee.workouts.workouts.get_chart_data"
+        ) as get_chart_data_mock:
+            response = client.get(
+                url,
+                headers={
+                    "Authorization": f"Bearer {auth_token}",
+                    "If-None-Match": etag,
+                },
+            )
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.data == b""
+        get_chart_data_mock.assert_not_called()
+
+    def test_it_returns_chart_data_when_workout_is_modified(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        url = self.route.format(
+            workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+        )
+        etag = client.get(
+            url, headers=dict(Authorization=f"Bearer {auth_token}")
+        ).headers["ETag"]
+        workout_cycling_user_1_with_coordinates.title = self.random_string()
+        db.session.commit()
+
+        response = client.get(
+            url,
+            headers={
+                "Authorization": f"Bearer {auth_token}",
+                "If-None-Match": etag,
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_it_returns_404_when_user_can_not_view_chart_data(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        url = self.route.format(
+            workout_uuid=workout_cycling_user_1_with_coordinates.short_id
+        )
+        etag = client.get(
+            url, headers=dict(Authorization=f"Bearer {auth_token}")
+        ).headers["ETag"]
+
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        self.assert_404_with_message(
+            response,
+            "workout not found "
+            f"(id: {workout_cycling_user_1_with_coordinates.short_id})",
+        )
+
+
 class TestGetWorkoutSegmentGpx(WorkoutApiTestCaseMixin):
     route = "/api/workouts/{workout_uuid}/gpx/segment/{segment_id}"
 
@@ -2502,6 +2749,109 @@ class TestGetWorkoutMap(WorkoutApiTestCaseMixin):
 
         self.assert_404_with_message(response, "Map file does not exist")
 
+    def test_it_returns_304_when_etag_matches_map_id(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        map_id = self.random_string()
+        workout_cycling_user_1.map_id = map_id
+        workout_cycling_user_1.map = self.random_string()
+        client = app.test_client()
+
+        with patch(
+            "fittrackee.workouts.workouts.send_from_directory",
+        ) as send_from_directory_mock:
+            response = client.get(
+                f"/api/workouts/map/{map_id}",
+                headers={"If-None-Match": f'"{map_id}"'},
+            )
+
+        assert response.status_code == 304
+        send_from_directory_mock.assert_not_called()
+
+    def test_it_returns_202_when_map_is_pending(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        map_id = self.random_string()
+        workout_cycling_user_1.map_id = map_id
+        workout_cycling_user_1.map = self.random_string()
+        workout_cycling_user_1.map_status = MapStatus.PENDING
+        client = app.test_client()
+
+        with patch(
+            "fittrackee.workouts.workouts.send_from_directory",
+        ) as send_from_directory_mock:
+            response = client.get(
+                f"/api/workouts/map/{map_id}",
+                headers={"If-None-Match": f'"{map_id}"'},
+            )
+
+        assert response.status_code == 202
+        data = json.loads(response.data.decode())
+        assert data["status"] == "pending"
+        assert data["message"] == "map image is being generated"
+        send_from_directory_mock.assert_not_called()
+
+
+class TestGetMapTile(WorkoutApiTestCaseMixin):
+    def test_it_returns_tile_from_tile_server(
+        self, app: Flask, tile_server_request_mock: MagicMock
+    ) -> None:
+        tile_server_request_mock.reset_mock()
+        client = app.test_client()
+
+        response = client.get("/api/workouts/map_tile/c/13/4109/2930.png")
+
+        assert response.status_code == 200
+        assert response.content_type == "image/png"
+        assert response.data == byte_image
+        assert response.headers["Cache-Control"] == (
+            f"public, max-age={app.config['TILE_CACHE_TTL']}"
+        )
+        tile_server_request_mock.assert_called_once_with(
+            "https://tile.openstreetmap.org/13/4109/2930.png",
+            headers={"User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:88.0)"},
+            timeout=30,
+        )
+
+    def test_it_returns_cached_tile(
+        self, app: Flask, tile_server_request_mock: MagicMock
+    ) -> None:
+        client = app.test_client()
+        client.get("/api/workouts/map_tile/c/13/4109/2930.png")
+        tile_server_request_mock.reset_mock()
+
+        response = client.get("/api/workouts/map_tile/a/13/4109/2930.png")
+
+        assert response.status_code == 200
+        assert response.data == byte_image
+        assert "Cache-Control" in response.headers
+        tile_server_request_mock.assert_not_called()
+
+    def test_it_returns_tile_server_error(self, app: Flask) -> None:
+        client = app.test_client()
+        with patch.object(
+            TileCache,
+            "_request_tile_server",
+            return_value=MagicMock(
+                status_code=404,
+                content=b"",
+                headers={"content-type": "text/html"},
+            ),
+        ):
+            response = client.get("/api/workouts/map_tile/c/13/4109/2930.png")
+
+        assert response.status_code == 404
+        assert "Cache-Control" not in response.headers
+        assert os.path.exists(app.config["TILE_CACHE_DIR"]) is False
+
 
 class TestWorkoutScope(WorkoutApiTestCaseMixin):
     @pytest.mark.parametrize(
@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 import pytest
 from flask import Flask
-from shapely import to_geojson
+from shapely import LineString, to_geojson
 from shapely.geometry.multilinestring import MultiLineString
 
 from fittrackee import db
@@ -16,7 +16,7 @@ from fittrackee.visibility_levels import VisibilityLevel
 from fittrackee.workouts.models import Sport, Workout, WorkoutSegment
 
 from ..mixins import WorkoutMixin
-from ..utils import jsonify_dict
+from ..utils import capture_queries, jsonify_dict
 from .mixins import WorkoutApiTestCaseMixin
 
 if TYPE_CHECKING:
@@ -473,6 +473,34 @@ class TestGetWorkoutsWithPagination(WorkoutApiTestCaseMixin):
             "total": 7,
         }
 
+    def test_it_does_not_run_queries_for_each_workout(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        seven_workouts_user_1: List[Workout],
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+        # 2 workouts
+        with capture_queries() as last_page_statements:
+            client.get(
+                "/api/workouts?page=2",
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        # 5 workouts
+        with capture_queries() as first_page_statements:
+            response = client.get(
+                "/api/workouts?page=1",
+                headers=dict(Authorization=f"Bearer {auth_token}"),
+            )
+
+        data = json.loads(response.data.decode())
+        assert len(data["data"]["workouts"]) == 5
+        assert len(first_page_statements) <= len(last_page_statements)
+
 
 class TestGetWorkoutsWithOrder(WorkoutApiTestCaseMixin):
     def test_it_gets_workouts_with_default_order(
@@ -3504,6 +3532,109 @@ class TestGetWorkoutsFeatureCollection(WorkoutApiTestCaseMixin):
             error_message="invalid radius, must be an float greater than zero",
         )
 
+    @pytest.mark.parametrize(
+        "input_zoom, expected_tolerance",
+        [("5", 0.001), ("9", 0.001), ("12", 0.0002), ("15", 0.00005)],
+    )
+    def test_it_returns_simplified_geometries_depending_on_zoom(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+        workout_cycling_user_1_segment_0_coordinates: List[List],
+        workout_cycling_user_1_segment_1_with_coordinates: WorkoutSegment,
+        workout_cycling_user_1_segment_1_coordinates: List[List],
+        input_zoom: str,
+        expected_tolerance: float,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"/api/workouts/collection?zoom={input_zoom}",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert data["data"]["features"][0]["geometry"] == json.loads(
+            to_geojson(
+                MultiLineString(
+                    [
+                        LineString(coordinates).simplify(
+                            expected_tolerance, preserve_topology=True
+                        )
+                        for coordinates in [
+                            workout_cycling_user_1_segment_0_coordinates,
+                            workout_cycling_user_1_segment_1_coordinates,
+                        ]
+                    ]
+                )
+            )
+        )
+
+    def test_it_returns_full_resolution_geometries_for_highest_zoom_levels(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+        workout_cycling_user_1_segment_0_coordinates: List[List],
+        workout_cycling_user_1_segment_1_with_coordinates: WorkoutSegment,
+        workout_cycling_user_1_segment_1_coordinates: List[List],
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            "/api/workouts/collection?zoom=18",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert data["data"]["features"][0]["geometry"] == json.loads(
+            to_geojson(
+                MultiLineString(
+                    [
+                        workout_cycling_user_1_segment_0_coordinates,
+                        workout_cycling_user_1_segment_1_coordinates,
+                    ]
+                )
+            )
+        )
+
+    @pytest.mark.parametrize(
+        "input_zoom", ["invalid", "-1", "1.5", "23", "100000000000"]
+    )
+    def test_it_returns_400_when_zoom_is_invalid(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1_with_coordinates: Workout,
+        workout_cycling_user_1_segment_0_with_coordinates: WorkoutSegment,
+        input_zoom: str,
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"/api/workouts/collection?zoom={input_zoom}",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_400(
+            response,
+            error_message="invalid zoom, must be an integer between 0 and 22",
+        )
+
     def test_it_returns_400_when_workout_visibility_is_invalid(
         self,
         app: Flask,
@@ -3893,6 +4024,205 @@ class TestGetWorkoutsForGlobalMap(WorkoutApiTestCaseMixin):
             workout_running_user_1_with_coordinates.short_id
         )
 
+    def test_it_returns_clusters_when_zoom_is_provided(
+        self,
+        app_with_global_map_workouts_limit_equal_to_1: Flask,
+        user_1: User,
+        sport_1_cycling: "Sport",
+        sport_2_running: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_running_user_1_with_coordinates: "Workout",
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app_with_global_map_workouts_limit_equal_to_1, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=5",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert data["data"]["bbox"] == [6.07364, 44.67977, 6.07367, 44.68095]
+        assert data["data"]["limit_exceeded"] is False
+        assert len(data["data"]["features"]) == 1
+        cluster = data["data"]["features"][0]
+        assert cluster["properties"] == {
+            "bounds": [44.67977, 6.07364, 44.68095, 6.07367],
+            "count": 2,
+        }
+        assert cluster["geometry"]["type"] == "Point"
+        assert cluster["geometry"]["coordinates"] == pytest.approx(
+            [6.073655, 44.68036]
+        )
+
+    def test_it_returns_a_cluster_per_workout_for_highest_zoom_level(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: "Sport",
+        sport_2_running: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_running_user_1_with_coordinates: "Workout",
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=18",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert sorted(
+            feature["geometry"]["coordinates"]
+            for feature in data["data"]["features"]
+        ) == [[6.07364, 44.67977], [6.07367, 44.68095]]
+        assert {
+            feature["properties"]["count"]
+            for feature in data["data"]["features"]
+        } == {1}
+
+    def test_it_returns_workout_properties_for_clusters_with_one_workout(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=5",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert len(data["data"]["features"]) == 1
+        assert data["data"]["features"][0]["properties"] == {
+            "bounds": workout_cycling_user_1_with_coordinates.bounds,
+            "count": 1,
+            "id": workout_cycling_user_1_with_coordinates.short_id,
+            "sport_id": sport_1_cycling.id,
+            "title": workout_cycling_user_1_with_coordinates.title,
+            "workout_visibility": (
+                workout_cycling_user_1_with_coordinates.workout_visibility.value
+            ),
+        }
+
+    def test_it_returns_only_clusters_within_bbox(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: "Sport",
+        sport_2_running: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_running_user_1_with_coordinates: "Workout",
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=18&bbox=6.07366,44.68,6.07368,44.682",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        # bounding box of all start points
+        assert data["data"]["bbox"] == [6.07364, 44.67977, 6.07367, 44.68095]
+        assert len(data["data"]["features"]) == 1
+        assert data["data"]["features"][0]["geometry"]["coordinates"] == [
+            6.07367,
+            44.68095,
+        ]
+
+    def test_it_returns_no_clusters_when_no_workouts_within_bbox(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=5&bbox=-5.2,41.3,5.2,43.1",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        assert response.status_code == 200
+        data = json.loads(response.data.decode())
+        assert data["data"]["bbox"] == [6.07367, 44.68095, 6.07367, 44.68095]
+        assert data["data"]["features"] == []
+
+    def test_it_returns_empty_collection_when_zoom_is_provided_and_no_workouts(
+        self, app: Flask, user_1: User
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=5",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_no_features(response)
+
+    @pytest.mark.parametrize(
+        "input_zoom", ["invalid", "-1", "23", "100000000000"]
+    )
+    def test_it_returns_400_when_zoom_is_invalid(
+        self, app: Flask, user_1: User, input_zoom: str
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom={input_zoom}",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_400(
+            response,
+            error_message="invalid zoom, must be an integer between 0 and 22",
+        )
+
+    @pytest.mark.parametrize(
+        "input_bbox", ["invalid", "-5.2,41.3,9.6", "9.6,41.3,-5.2,51.1"]
+    )
+    def test_it_returns_400_when_bbox_is_invalid(
+        self, app: Flask, user_1: User, input_bbox: str
+    ) -> None:
+        client, auth_token = self.get_test_client_and_auth_token(
+            app, user_1.email
+        )
+
+        response = client.get(
+            f"{self.route}?zoom=5&bbox={input_bbox}",
+            headers=dict(Authorization=f"Bearer {auth_token}"),
+        )
+
+        self.assert_400(
+            response,
+            error_message=(
+                "invalid bbox, must be a string with min. longitude, min. "
+                "latitude, max. longitude and max. latitude, separated by a "
+                "comma"
+            ),
+        )
+
     def test_expected_scope_is_workouts_read(
         self, app: Flask, user_1: User
     ) -> None:
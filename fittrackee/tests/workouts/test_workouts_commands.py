@@ -9,8 +9,13 @@ from click.testing import CliRunner
 
 from fittrackee import db
 from fittrackee.cli import cli
+from fittrackee.constants import MapStatus
 from fittrackee.workouts.commands import logger
 from fittrackee.workouts.exceptions import WorkoutException
+from fittrackee.workouts.models import WorkoutsDailyStats
+from fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service import (  # noqa
+    BaseWorkoutWithSegmentsCreationService,
+)
 from fittrackee.workouts.services.workouts_from_file_creation_service import (
     WorkoutsFromArchiveCreationAsyncService,
 )
@@ -22,7 +27,7 @@ if TYPE_CHECKING:
     from flask import Flask
 
     from fittrackee.users.models import User
-    from fittrackee.workouts.models import Sport
+    from fittrackee.workouts.models import Sport, Workout, WorkoutSegment
 
 
 class TestCliWorkoutsArchiveUploads(UserTaskMixin):
@@ -934,3 +939,188 @@ class TestCliWorkoutsRefresh(UserTaskMixin):
 
         assert result.exit_code == 1
         assert caplog.messages == [error_message]
+
+
+class TestCliWorkoutsConvertPoints:
+    def test_it_displays_0_when_no_segments_to_convert(
+        self, app: "Flask", caplog: "LogCaptureFixture"
+    ) -> None:
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["workouts", "convert_points"])
+
+        assert result.exit_code == 0
+        assert caplog.messages == ["\nSegments converted: 0."]
+
+    def test_it_converts_points_stored_in_json(
+        self,
+        app: "Flask",
+        caplog: "LogCaptureFixture",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+        workout_cycling_user_1_segment_1_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        segment = workout_cycling_user_1_segment_0_with_coordinates
+        points = segment.points
+        segment._points = points
+        segment.points_data = None
+        db.session.commit()
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli, ["workouts", "convert_points", "--per-page", "1"]
+        )
+
+        assert result.exit_code == 0
+        assert caplog.messages == ["\nSegments converted: 1."]
+        db.session.refresh(segment)
+        assert segment._points == []
+        assert segment.points_data is not None
+        assert segment.points == points
+
+
+class TestCliWorkoutsRenderMaps:
+    @staticmethod
+    def set_map(workout: "Workout", status: MapStatus) -> None:
+        workout.map = f"workouts/{workout.user_id}/{workout.short_id}.png"
+        workout.map_id = f"map_id_{workout.short_id}"
+        workout.map_status = status
+        db.session.commit()
+
+    def test_it_renders_pending_maps(
+        self,
+        app: "Flask",
+        caplog: "LogCaptureFixture",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+        workout_running_user_1: "Workout",
+        sport_2_running: "Sport",
+    ) -> None:
+        self.set_map(workout_cycling_user_1, MapStatus.PENDING)
+        self.set_map(workout_running_user_1, MapStatus.ERROR)
+        runner = CliRunner()
+
+        with (
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService, "generate_map_image"
+            ) as generate_map_image_mock,
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService,
+                "get_map_hash",
+                return_value="map_hash",
+            ),
+        ):
+            result = runner.invoke(cli, ["workouts", "render_maps"])
+
+        assert result.exit_code == 0
+        assert caplog.messages == ["\nMaps rendered: 1 (errors: 0)."]
+        generate_map_image_mock.assert_called_once()
+        assert workout_cycling_user_1.map_id == "map_hash"
+        assert workout_cycling_user_1.map_status == MapStatus.READY
+        assert workout_running_user_1.map_status == MapStatus.ERROR
+
+    def test_it_counts_errored_maps(
+        self,
+        app: "Flask",
+        caplog: "LogCaptureFixture",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        self.set_map(workout_cycling_user_1, MapStatus.ERROR)
+        runner = CliRunner()
+
+        with patch.object(
+            BaseWorkoutWithSegmentsCreationService,
+            "generate_map_image",
+            side_effect=RuntimeError("tile server error"),
+        ):
+            result = runner.invoke(
+                cli, ["workouts", "render_maps", "--status", "error"]
+            )
+
+        assert result.exit_code == 0
+        assert caplog.messages[-1] == "\nMaps rendered: 0 (errors: 1)."
+        assert workout_cycling_user_1.map_status == MapStatus.ERROR
+
+    def test_it_sends_rendering_tasks(
+        self,
+        app: "Flask",
+        caplog: "LogCaptureFixture",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        self.set_map(workout_cycling_user_1, MapStatus.ERROR)
+        runner = CliRunner()
+
+        with (
+            patch(
+                "fittrackee.workouts.tasks.render_workout_map.send"
+            ) as render_workout_map_mock,
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService, "generate_map_image"
+            ) as generate_map_image_mock,
+        ):
+            result = runner.invoke(
+                cli,
+                ["workouts", "render_maps", "--status", "all", "--queue"],
+            )
+
+        assert result.exit_code == 0
+        assert caplog.messages == ["\nRendering tasks sent: 1."]
+        generate_map_image_mock.assert_not_called()
+        assert workout_cycling_user_1.map_status == MapStatus.PENDING
+        render_workout_map_mock.assert_called_once_with(
+            workout_id=workout_cycling_user_1.id,
+            map_id=workout_cycling_user_1.map_id,
+        )
+
+
+class TestCliWorkoutsRebuildStats:
+    def test_it_rebuilds_stats_for_all_users(
+        self,
+        app: "Flask",
+        caplog: "LogCaptureFixture",
+        user_1: "User",
+        user_2: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        WorkoutsDailyStats.query.delete()
+        db.session.commit()
+        runner = CliRunner()
+
+        result = runner.invoke(cli, ["workouts", "rebuild_stats"])
+
+        assert result.exit_code == 0
+        assert caplog.messages == ["\nUsers statistics rebuilt: 2."]
+        daily_stats = WorkoutsDailyStats.query.one()
+        assert daily_stats.user_id == user_1.id
+        assert daily_stats.total_workouts == 1
+
+    def test_it_rebuilds_stats_for_given_user(
+        self,
+        app: "Flask",
+        caplog: "LogCaptureFixture",
+        user_1: "User",
+        user_2: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+        workout_cycling_user_2: "Workout",
+    ) -> None:
+        WorkoutsDailyStats.query.delete()
+        db.session.commit()
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli, ["workouts", "rebuild_stats", "--user", user_2.username]
+        )
+
+        assert result.exit_code == 0
+        assert caplog.messages == ["\nUsers statistics rebuilt: 1."]
+        daily_stats = WorkoutsDailyStats.query.one()
+        assert daily_stats.user_id == user_2.id
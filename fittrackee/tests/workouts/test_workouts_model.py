@@ -1,8 +1,8 @@
 import os
 import re
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pytest
 from flask import Flask
@@ -11,7 +11,11 @@ from shapely import LineString, Point
 from sqlalchemy.exc import IntegrityError
 
 from fittrackee import db
-from fittrackee.constants import ElevationDataSource, PaceSpeedDisplay
+from fittrackee.constants import (
+    ElevationDataSource,
+    MapStatus,
+    PaceSpeedDisplay,
+)
 from fittrackee.equipments.models import Equipment
 from fittrackee.files import get_absolute_file_path
 from fittrackee.tests.comments.mixins import CommentMixin
@@ -19,13 +23,16 @@ from fittrackee.tests.fixtures.fixtures_workouts import update_workout
 from fittrackee.users.models import User, UserSportPreference
 from fittrackee.utils import encode_uuid
 from fittrackee.visibility_levels import VisibilityLevel
+from fittrackee.workouts.constants import SIMPLIFIED_GEOMETRIES
 from fittrackee.workouts.exceptions import WorkoutForbiddenException
 from fittrackee.workouts.models import (
     Record,
     Sport,
     Workout,
     WorkoutLike,
+    WorkoutsDailyStats,
     WorkoutSegment,
+    serialize_workouts,
 )
 
 from ..mixins import ReportMixin, WorkoutMixin
@@ -137,6 +144,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -208,6 +216,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -289,6 +298,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": float(workout.max_alt),  # type: ignore[arg-type]
             "max_cadence": workout.max_cadence,
@@ -372,6 +382,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -456,6 +467,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": workout.max_alt,
             "max_cadence": workout.max_cadence * 2,
@@ -630,6 +642,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": workout.max_alt,
             "max_cadence": None,
@@ -711,6 +724,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout.map_visibility.value,
             "max_alt": workout.max_alt,
             "max_cadence": None,
@@ -881,6 +895,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -955,6 +970,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -1028,6 +1044,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": float(workout_cycling_user_1.max_alt),  # type: ignore[arg-type]
             "max_cadence": workout_cycling_user_1.max_cadence,
@@ -1102,6 +1119,7 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -1451,6 +1469,41 @@ class TestWorkoutModelForOwner(WorkoutModelTestCase):
             == ElevationDataSource.FILE
         )
 
+    @pytest.mark.parametrize(
+        "input_map_status", [MapStatus.PENDING, MapStatus.READY]
+    )
+    def test_it_returns_map_status(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+        input_map_status: MapStatus,
+    ) -> None:
+        workout = self.update_workout_with_file_data(
+            workout_cycling_user_1, map_id=random_string()
+        )
+        workout.map_status = input_map_status
+
+        serialized_workout = workout.serialize(user=user_1, light=False)
+
+        assert serialized_workout["map_status"] == input_map_status.value
+
+    def test_it_does_not_return_map_status_when_workout_has_no_map(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout_cycling_user_1.map_status = MapStatus.ERROR
+
+        serialized_workout = workout_cycling_user_1.serialize(
+            user=user_1, light=False
+        )
+
+        assert serialized_workout["map_status"] is None
+
 
 class TestWorkoutModelAsFollower(CommentMixin, WorkoutModelTestCase):
     def test_it_raises_exception_when_workout_visibility_is_private(
@@ -1994,6 +2047,7 @@ class TestWorkoutModelAsFollower(CommentMixin, WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": None,
             "max_alt": None,
             "min_alt": None,
@@ -2109,6 +2163,7 @@ class TestWorkoutModelAsFollower(CommentMixin, WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": None,
             "max_cadence": workout_cycling_user_1.max_cadence,
@@ -2619,6 +2674,7 @@ class TestWorkoutModelAsUser(CommentMixin, WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": None,
             "max_alt": None,
             "min_alt": None,
@@ -2729,6 +2785,7 @@ class TestWorkoutModelAsUser(CommentMixin, WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": None,
             "max_cadence": workout_cycling_user_1.max_cadence,
@@ -3289,6 +3346,7 @@ class TestWorkoutModelAsUnauthenticatedUser(
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_1.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -3395,6 +3453,7 @@ class TestWorkoutModelAsModerator(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_2.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -3481,6 +3540,7 @@ class TestWorkoutModelAsModerator(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": map_id,
+            "map_status": None,
             "map_visibility": workout_cycling_user_2.map_visibility.value,
             "max_alt": workout_cycling_user_2.max_alt,
             "max_cadence": None,
@@ -3611,6 +3671,7 @@ class TestWorkoutModelAsModerator(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_2.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -3694,6 +3755,7 @@ class TestWorkoutModelAsAdmin(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": None,
+            "map_status": None,
             "map_visibility": workout_cycling_user_2.map_visibility.value,
             "max_alt": None,
             "max_cadence": None,
@@ -3771,6 +3833,7 @@ class TestWorkoutModelAsAdmin(WorkoutModelTestCase):
             "liked": False,
             "likes_count": 0,
             "map": map_id,
+            "map_status": None,
             "map_visibility": workout_cycling_user_2.map_visibility.value,
             "max_alt": workout_cycling_user_2.max_alt,
             "max_cadence": None,
@@ -4046,3 +4109,310 @@ class TestWorkoutSegmentModel:
         assert to_shape(workout_cycling_user_1_segment.geom) == LineString(
             segments_coordinates
         )
+
+    def test_it_stores_simplified_geometries(
+        self,
+        app: Flask,
+        sport_1_cycling: Sport,
+        user_1: User,
+        workout_cycling_user_1: Workout,
+        workout_cycling_user_1_segment: WorkoutSegment,
+        workout_cycling_user_1_segment_1_coordinates: List[List],
+    ) -> None:
+        workout_cycling_user_1_segment.store_geometry(
+            workout_cycling_user_1_segment_1_coordinates
+        )
+        db.session.commit()
+
+        line = LineString(workout_cycling_user_1_segment_1_coordinates)
+        for column_name, tolerance, _ in SIMPLIFIED_GEOMETRIES:
+            simplified_geometry = to_shape(
+                getattr(workout_cycling_user_1_segment, column_name)
+            )
+            assert simplified_geometry == line.simplify(
+                tolerance, preserve_topology=True
+            )
+        assert workout_cycling_user_1_segment.geom_low is not None
+        assert len(
+            to_shape(workout_cycling_user_1_segment.geom_low).coords
+        ) < len(line.coords)
+
+    @pytest.mark.parametrize("input_zoom", [None, 16])
+    def test_it_returns_full_resolution_geometry(
+        self, input_zoom: Optional[int]
+    ) -> None:
+        geometry = WorkoutSegment.get_geometry_for_zoom(input_zoom)
+
+        assert geometry is WorkoutSegment.geom
+
+    @pytest.mark.parametrize(
+        "input_zoom, expected_column",
+        [
+            (0, "geom_low"),
+            (9, "geom_low"),
+            (10, "geom_medium"),
+            (13, "geom_high"),
+        ],
+    )
+    def test_it_returns_simplified_geometry_for_zoom(
+        self, input_zoom: int, expected_column: str
+    ) -> None:
+        geometry = WorkoutSegment.get_geometry_for_zoom(input_zoom)
+
+        assert str(geometry) == (
+            f"coalesce(workout_segments.{expected_column}, "
+            "workout_segments.geom)"
+        )
+
+
+class TestWorkoutsDailyStats:
+    @staticmethod
+    def get_daily_stats(user: User) -> List[WorkoutsDailyStats]:
+        return (
+            WorkoutsDailyStats.query.filter_by(user_id=user.id)
+            .order_by(WorkoutsDailyStats.day, WorkoutsDailyStats.sport_id)
+            .all()
+        )
+
+    def test_it_adds_daily_stats_when_workout_is_created(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        daily_stats = self.get_daily_stats(user_1)
+
+        assert len(daily_stats) == 1
+        assert daily_stats[0].sport_id == sport_1_cycling.id
+        assert daily_stats[0].day == workout_cycling_user_1.workout_date.date()
+        assert daily_stats[0].total_workouts == 1
+        assert daily_stats[0].distance_sum == 10
+        assert daily_stats[0].distance_count == 1
+        assert daily_stats[0].moving_sum == timedelta(seconds=3600)
+        assert daily_stats[0].ascent_sum is None
+        assert daily_stats[0].ascent_count == 0
+        assert daily_stats[0].ave_speed_sum == 10
+        assert daily_stats[0].calories_sum is None
+
+    def test_it_aggregates_workouts_on_the_same_day(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout = Workout(
+            user_id=user_1.id,
+            sport_id=sport_1_cycling.id,
+            workout_date=datetime(2018, 1, 1, 18, tzinfo=timezone.utc),
+            distance=5,
+            duration=timedelta(seconds=1800),
+        )
+        update_workout(workout)
+        workout.ascent = 120
+        workout.calories = 200
+        db.session.add(workout)
+        db.session.commit()
+
+        daily_stats = self.get_daily_stats(user_1)
+
+        assert len(daily_stats) == 1
+        assert daily_stats[0].total_workouts == 2
+        assert daily_stats[0].distance_sum == 15
+        assert daily_stats[0].moving_sum == timedelta(seconds=5400)
+        assert daily_stats[0].ascent_sum == 120
+        assert daily_stats[0].ascent_count == 1
+        assert daily_stats[0].calories_sum == 200
+
+    def test_it_uses_user_timezone_for_day(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+    ) -> None:
+        user_1.timezone = "America/New_York"
+        workout = Workout(
+            user_id=user_1.id,
+            sport_id=sport_1_cycling.id,
+            workout_date=datetime(2018, 1, 1, 2, tzinfo=timezone.utc),
+            distance=5,
+            duration=timedelta(seconds=1800),
+        )
+        update_workout(workout)
+        db.session.add(workout)
+        db.session.commit()
+
+        daily_stats = self.get_daily_stats(user_1)
+
+        assert [stats.day for stats in daily_stats] == [date(2017, 12, 31)]
+
+    def test_it_updates_daily_stats_when_workout_date_and_sport_change(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        sport_2_running: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout_cycling_user_1.sport_id = sport_2_running.id
+        workout_cycling_user_1.workout_date = datetime(
+            2018, 1, 2, tzinfo=timezone.utc
+        )
+        db.session.commit()
+
+        daily_stats = self.get_daily_stats(user_1)
+
+        assert len(daily_stats) == 1
+        assert daily_stats[0].sport_id == sport_2_running.id
+        assert daily_stats[0].day == date(2018, 1, 2)
+        assert daily_stats[0].total_workouts == 1
+
+    def test_it_updates_daily_stats_when_workout_values_change(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout_cycling_user_1.distance = 12
+        db.session.commit()
+
+        daily_stats = self.get_daily_stats(user_1)
+
+        assert len(daily_stats) == 1
+        assert daily_stats[0].distance_sum == 12
+
+    def test_it_removes_daily_stats_when_workout_is_deleted(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        db.session.delete(workout_cycling_user_1)
+        db.session.commit()
+
+        assert self.get_daily_stats(user_1) == []
+
+
+class TestSerializeWorkouts(WorkoutModelTestCase):
+    def test_it_returns_empty_list_when_no_workouts(
+        self, app: Flask, user_1: User
+    ) -> None:
+        assert serialize_workouts([], user=user_1) == []
+
+    @pytest.mark.parametrize("input_light", [True, False])
+    def test_it_returns_same_data_as_workout_serializer_for_owner(
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        sport_2_running: Sport,
+        seven_workouts_user_1: List[Workout],
+        workout_running_user_1: Workout,
+        equipment_bike_user_1: Equipment,
+        input_light: bool,
+    ) -> None:
+        seven_workouts_user_1[0].equipments = [equipment_bike_user_1]
+        db.session.commit()
+        workouts = [*seven_workouts_user_1, workout_running_user_1]
+
+        serialized_workouts = serialize_workouts(
+            workouts, user=user_1, light=input_light, with_equipments=True
+        )
+
+        assert serialized_workouts == [
+            workout.serialize(
+                user=user_1, light=input_light, with_equipments=True
+            )
+            for workout in workouts
+        ]
+
+    @pytest.mark.parametrize("input_light", [True, False])
+    def test_it_returns_same_data_as_workout_serializer_for_follower(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2: User,
+        user_3: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+        workout_cycling_user_2: Workout,
+        input_light: bool,
+    ) -> None:
+        add_follower(user_2, user_1)
+        workout_cycling_user_2.workout_visibility = VisibilityLevel.FOLLOWERS
+        for user in [user_1, user_2, user_3]:
+            db.session.add(
+                WorkoutLike(
+                    user_id=user.id, workout_id=workout_cycling_user_2.id
+                )
+            )
+        db.session.commit()
+        workouts = [workout_cycling_user_2, workout_cycling_user_1]
+
+        serialized_workouts = serialize_workouts(
+            workouts, user=user_1, light=input_light
+        )
+
+        assert serialized_workouts == [
+            workout.serialize(user=user_1, light=input_light)
+            for workout in workouts
+        ]
+        if not input_light:
+            assert serialized_workouts[0]["likes_count"] == 3
+            assert serialized_workouts[0]["liked"] is True
+            assert serialized_workouts[1]["likes_count"] == 0
+            assert serialized_workouts[1]["liked"] is False
+
+    def test_it_returns_same_data_as_workout_serializer_for_unauthenticated_user(  # noqa
+        self,
+        app: Flask,
+        user_1: User,
+        sport_1_cycling: Sport,
+        workout_cycling_user_1: Workout,
+    ) -> None:
+        workout_cycling_user_1.workout_visibility = VisibilityLevel.PUBLIC
+        db.session.commit()
+
+        serialized_workouts = serialize_workouts(
+            [workout_cycling_user_1], light=False
+        )
+
+        assert serialized_workouts == [
+            workout_cycling_user_1.serialize(light=False)
+        ]
+
+    def test_it_returns_suspension_for_suspended_workouts(
+        self,
+        app: Flask,
+        user_1: User,
+        user_2_admin: User,
+        sport_1_cycling: Sport,
+        seven_workouts_user_1: List[Workout],
+    ) -> None:
+        expected_report_actions = {}
+        for workout in seven_workouts_user_1[:2]:
+            workout.suspended_at = datetime.now(timezone.utc)
+            expected_report_actions[workout.id] = (
+                self.create_report_workout_action(
+                    user_2_admin, user_1, workout
+                )
+            )
+
+        serialized_workouts = serialize_workouts(
+            seven_workouts_user_1, user=user_1
+        )
+
+        assert serialized_workouts == [
+            workout.serialize(user=user_1) for workout in seven_workouts_user_1
+        ]
+        for serialized_workout, workout in zip(
+            serialized_workouts[:2], seven_workouts_user_1[:2], strict=True
+        ):
+            assert serialized_workout["suspension"] == (
+                expected_report_actions[workout.id].serialize(
+                    current_user=user_1, full=False
+                )
+            )
@@ -1,30 +1,44 @@
 import os
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Dict
-from unittest.mock import MagicMock, patch
+from typing import TYPE_CHECKING, Dict, List, Optional
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 from time_machine import travel
 
 from fittrackee import db
+from fittrackee.constants import MapStatus, StorageCategory
 from fittrackee.exceptions import TaskException
 from fittrackee.users.models import Notification
+from fittrackee.users.storage import (
+    get_storage_usage,
+    update_storage_usage,
+    update_storage_usage_from_files,
+)
+from fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service import (  # noqa
+    BaseWorkoutWithSegmentsCreationService,
+    weather_service,
+)
 from fittrackee.workouts.services.workouts_from_file_creation_service import (
     WorkoutsFromArchiveCreationAsyncService,
 )
 from fittrackee.workouts.tasks import (
+    mark_workout_map_as_errored,
     process_workouts_archive_upload,
     process_workouts_archives_uploads,
+    render_workout_map,
     update_task_and_clean,
+    update_workout_weather,
 )
 
 from ..mixins import RandomMixin, UserTaskMixin
+from .utils import FakeWeather
 
 if TYPE_CHECKING:
     from flask import Flask
 
     from fittrackee.users.models import User
-    from fittrackee.workouts.models import Sport
+    from fittrackee.workouts.models import Sport, Workout, WorkoutSegment
 
 
 class TestUpdateTaskAndClean(UserTaskMixin):
@@ -139,6 +153,28 @@ class TestUpdateTaskAndClean(UserTaskMixin):
 
         assert os.path.isfile(file_path) is False
 
+    @pytest.mark.parametrize(
+        "input_error", ["some error", "task execution aborted"]
+    )
+    def test_it_decrements_archives_storage_usage(
+        self, app: "Flask", user_1: "User", input_error: str
+    ) -> None:
+        file_path = self.generate_temporary_archive()
+        task = self.create_workouts_upload_task(
+            user_1, file_path=file_path, file_size=os.path.getsize(file_path)
+        )
+        update_storage_usage(
+            db.session.connection(),
+            user_1.id,
+            StorageCategory.ARCHIVES,
+            os.path.getsize(file_path),
+        )
+        db.session.commit()
+
+        update_task_and_clean(error=input_error, upload_task_id=task.id)
+
+        assert get_storage_usage(user_1.id)["archives"] == 0
+
 
 class TestProcessWorkoutsArchivesUploads(UserTaskMixin):
     def test_it_returns_0_when_no_queued_archive_upload_tasks(
@@ -281,3 +317,367 @@ class TestProcessWorkoutsArchivesUploadTask(RandomMixin, UserTaskMixin):
             )
 
         assert upload_task.updated_at == now
+
+
+class TestUpdateWorkoutWeather:
+    @pytest.mark.disable_autouse_default_weather_service
+    def test_it_updates_workout_weather(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        with patch.object(weather_service, "weather_api", FakeWeather()):
+            update_workout_weather(
+                workout_cycling_user_1.id,
+                {
+                    "latitude": 44.68095,
+                    "longitude": 6.07367,
+                    "time": "2018-03-13T12:44:45+00:00",
+                },
+                {
+                    "latitude": 44.67822,
+                    "longitude": 6.07442,
+                    "time": "2018-03-13T13:48:55+00:00",
+                },
+            )
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.weather_start == {
+            "humidity": 0.69,
+            "icon": "partly-cloudy-day",
+            "temperature": 44.68,
+            "wind": 6.07,
+            "windBearing": 12,
+        }
+        assert workout_cycling_user_1.weather_end == {
+            "humidity": 0.69,
+            "icon": "partly-cloudy-day",
+            "temperature": 44.68,
+            "wind": 6.07,
+            "windBearing": 13,
+        }
+
+    def test_it_does_not_update_weather_when_workout_already_has_weather(
+        self,
+        app: "Flask",
+        user_1: "User",
+        sport_1_cycling: "Sport",
+        workout_cycling_user_1: "Workout",
+        default_weather_service: MagicMock,
+    ) -> None:
+        workout_cycling_user_1.weather_start = {"temperature": 10}
+        workout_cycling_user_1.weather_end = {"temperature": 12}
+        db.session.commit()
+
+        update_workout_weather(
+            workout_cycling_user_1.id,
+            {
+                "latitude": 44.68095,
+                "longitude": 6.07367,
+                "time": "2018-03-13T12:44:45+00:00",
+            },
+            {
+                "latitude": 44.67822,
+                "longitude": 6.07442,
+                "time": "2018-03-13T13:48:55+00:00",
+            },
+        )
+
+        default_weather_service.assert_not_called()
+
+    def test_it_does_not_raise_error_when_workout_does_not_exist(
+        self, app: "Flask", default_weather_service: MagicMock
+    ) -> None:
+        update_workout_weather(
+            1,
+            {
+                "latitude": 44.68095,
+                "longitude": 6.07367,
+                "time": "2018-03-13T12:44:45+00:00",
+            },
+            {
+                "latitude": 44.67822,
+                "longitude": 6.07442,
+                "time": "2018-03-13T13:48:55+00:00",
+            },
+        )
+
+        default_weather_service.assert_not_called()
+
+
+class MapRenderingMixin:
+    @staticmethod
+    def set_pending_map(workout: "Workout") -> str:
+        map_id = "pending_map_id"
+        workout.map = "workouts/1/map.png"
+        workout.map_id = map_id
+        workout.map_status = MapStatus.PENDING
+        db.session.commit()
+        return map_id
+
+    @staticmethod
+    def write_map_file(map_filepath: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(map_filepath), exist_ok=True)
+        with open(map_filepath, "wb") as f:
+            f.write(content)
+
+    def generate_map_image(
+        self, map_filepath: str, coordinates: List[List]
+    ) -> None:
+        self.write_map_file(map_filepath, b"new map")
+
+
+class TestRenderWorkoutMap(MapRenderingMixin):
+    def test_it_renders_workout_map(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+        workout_cycling_user_1_segment_1_with_coordinates: "WorkoutSegment",
+        workout_cycling_user_1_segment_0_coordinates: List[List],
+        workout_cycling_user_1_segment_1_coordinates: List[List],
+    ) -> None:
+        map_id = self.set_pending_map(workout_cycling_user_1_with_coordinates)
+
+        with (
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService,
+                "generate_map_image",
+                side_effect=self.generate_map_image,
+            ) as generate_map_image_mock,
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService,
+                "get_map_hash",
+                return_value="map_hash",
+            ),
+        ):
+            render_workout_map(
+                workout_id=workout_cycling_user_1_with_coordinates.id,
+                map_id=map_id,
+            )
+
+        generate_map_image_mock.assert_called_once_with(
+            map_filepath=ANY,
+            coordinates=(
+                workout_cycling_user_1_segment_0_coordinates
+                + workout_cycling_user_1_segment_1_coordinates
+            ),
+        )
+        db.session.refresh(workout_cycling_user_1_with_coordinates)
+        assert workout_cycling_user_1_with_coordinates.map_id == "map_hash"
+        assert (
+            workout_cycling_user_1_with_coordinates.map_status
+            == MapStatus.READY
+        )
+        absolute_map_filepath = os.path.join(
+            app.config["UPLOAD_FOLDER"], "workouts/1/map.png"
+        )
+        with open(absolute_map_filepath, "rb") as f:
+            assert f.read() == b"new map"
+        assert os.listdir(os.path.dirname(absolute_map_filepath)) == [
+            "map.png"
+        ]
+
+    def test_it_replaces_existing_map_and_updates_storage_usage(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        map_id = self.set_pending_map(workout_cycling_user_1_with_coordinates)
+        absolute_map_filepath = os.path.join(
+            app.config["UPLOAD_FOLDER"], "workouts/1/map.png"
+        )
+        self.write_map_file(absolute_map_filepath, b"map")
+        update_storage_usage_from_files()
+
+        with patch.object(
+            BaseWorkoutWithSegmentsCreationService,
+            "generate_map_image",
+            side_effect=self.generate_map_image,
+        ):
+            render_workout_map(
+                workout_id=workout_cycling_user_1_with_coordinates.id,
+                map_id=map_id,
+            )
+
+        with open(absolute_map_filepath, "rb") as f:
+            assert f.read() == b"new map"
+        assert get_storage_usage(user_1.id)["maps"] == len(b"new map")
+
+    def test_it_does_not_render_map_when_map_id_differs(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        self.set_pending_map(workout_cycling_user_1_with_coordinates)
+
+        with patch.object(
+            BaseWorkoutWithSegmentsCreationService, "generate_map_image"
+        ) as generate_map_image_mock:
+            render_workout_map(
+                workout_id=workout_cycling_user_1_with_coordinates.id,
+                map_id="previous_map_id",
+            )
+
+        generate_map_image_mock.assert_not_called()
+        assert (
+            workout_cycling_user_1_with_coordinates.map_status
+            == MapStatus.PENDING
+        )
+
+    @pytest.mark.parametrize("input_status", [MapStatus.READY, None])
+    def test_it_does_not_render_map_when_map_is_not_pending(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+        input_status: Optional[MapStatus],
+    ) -> None:
+        map_id = self.set_pending_map(workout_cycling_user_1_with_coordinates)
+        workout_cycling_user_1_with_coordinates.map_status = input_status
+        db.session.commit()
+
+        with patch.object(
+            BaseWorkoutWithSegmentsCreationService, "generate_map_image"
+        ) as generate_map_image_mock:
+            render_workout_map(
+                workout_id=workout_cycling_user_1_with_coordinates.id,
+                map_id=map_id,
+            )
+
+        generate_map_image_mock.assert_not_called()
+
+    def test_it_keeps_map_pending_when_rendering_fails(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        map_id = self.set_pending_map(workout_cycling_user_1_with_coordinates)
+
+        with (
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService,
+                "generate_map_image",
+                side_effect=RuntimeError("tile server error"),
+            ),
+            pytest.raises(RuntimeError, match="tile server error"),
+        ):
+            render_workout_map(
+                workout_id=workout_cycling_user_1_with_coordinates.id,
+                map_id=map_id,
+            )
+
+        db.session.rollback()
+        assert workout_cycling_user_1_with_coordinates.map_id == map_id
+        assert (
+            workout_cycling_user_1_with_coordinates.map_status
+            == MapStatus.PENDING
+        )
+
+    def test_it_keeps_existing_map_when_rendering_fails(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1_with_coordinates: "Workout",
+        workout_cycling_user_1_segment_0_with_coordinates: "WorkoutSegment",
+    ) -> None:
+        map_id = self.set_pending_map(workout_cycling_user_1_with_coordinates)
+        absolute_map_filepath = os.path.join(
+            app.config["UPLOAD_FOLDER"], "workouts/1/map.png"
+        )
+        self.write_map_file(absolute_map_filepath, b"map")
+        update_storage_usage_from_files()
+
+        def generate_partial_map_image(
+            map_filepath: str, coordinates: List[List]
+        ) -> None:
+            self.write_map_file(map_filepath, b"partial")
+            raise RuntimeError("tile server error")
+
+        with (
+            patch.object(
+                BaseWorkoutWithSegmentsCreationService,
+                "generate_map_image",
+                side_effect=generate_partial_map_image,
+            ),
+            pytest.raises(RuntimeError, match="tile server error"),
+        ):
+            render_workout_map(
+                workout_id=workout_cycling_user_1_with_coordinates.id,
+                map_id=map_id,
+            )
+
+        db.session.rollback()
+        with open(absolute_map_filepath, "rb") as f:
+            assert f.read() == b"map"
+        assert os.listdir(os.path.dirname(absolute_map_filepath)) == [
+            "map.png"
+        ]
+        assert get_storage_usage(user_1.id)["maps"] == len(b"map")
+
+    def test_it_does_not_raise_error_when_workout_does_not_exist(
+        self, app: "Flask"
+    ) -> None:
+        render_workout_map(workout_id=1, map_id="map_id")
+
+
+class TestMarkWorkoutMapAsErrored(MapRenderingMixin):
+    def test_it_marks_pending_map_as_errored(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        map_id = self.set_pending_map(workout_cycling_user_1)
+
+        mark_workout_map_as_errored(
+            {
+                "kwargs": {
+                    "workout_id": workout_cycling_user_1.id,
+                    "map_id": map_id,
+                }
+            },
+            {"retries": 4},
+        )
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.map_status == MapStatus.ERROR
+
+    def test_it_does_not_update_map_when_map_id_differs(
+        self,
+        app: "Flask",
+        sport_1_cycling: "Sport",
+        user_1: "User",
+        workout_cycling_user_1: "Workout",
+    ) -> None:
+        self.set_pending_map(workout_cycling_user_1)
+
+        mark_workout_map_as_errored(
+            {
+                "kwargs": {
+                    "workout_id": workout_cycling_user_1.id,
+                    "map_id": "previous_map_id",
+                }
+            },
+            {"retries": 4},
+        )
+
+        db.session.refresh(workout_cycling_user_1)
+        assert workout_cycling_user_1.map_status == MapStatus.PENDING
@@ -1,10 +1,16 @@
+import gc
+import struct
+import tracemalloc
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
+from fitdecode.utils import compute_crc
 from werkzeug.datastructures import FileStorage
 
 from fittrackee import db
 from fittrackee.workouts.services import WorkoutsFromFileCreationService
+from fittrackee.workouts.services.weather.base_weather import BaseWeather
 
 if TYPE_CHECKING:
     from fittrackee.equipments.models import Equipment
@@ -19,6 +25,180 @@ MAX_WORKOUT_VALUES = {
     "elevation": 9999.99,
 }
 
+FIT_EPOCH = datetime(1989, 12, 31, tzinfo=timezone.utc)
+# global message number and fields (number, struct format, base type)
+FIT_MESSAGES: Dict[str, Tuple[int, List[Tuple[int, str, int]]]] = {
+    "file_id": (
+        0,
+        [(0, "B", 0x00), (1, "H", 0x84), (2, "H", 0x84), (4, "I", 0x86)],
+    ),
+    "session": (18, [(253, "I", 0x86), (11, "H", 0x84)]),
+    "record": (
+        20,
+        [
+            (253, "I", 0x86),  # timestamp
+            (0, "i", 0x85),  # position_lat
+            (1, "i", 0x85),  # position_long
+            (78, "I", 0x86),  # enhanced_altitude
+            (3, "B", 0x02),  # heart_rate
+            (4, "B", 0x02),  # cadence
+            (7, "H", 0x84),  # power
+        ],
+    ),
+    "event": (21, [(253, "I", 0x86), (0, "B", 0x00), (1, "B", 0x00)]),
+}
+
+
+def generate_fit_file(
+    records_count: int, stop_event_every: Optional[int] = None
+) -> bytes:
+    """
+    Generate an Activity FIT file with given number of records (one record
+    per second), with 'stop_all' timer events if 'stop_event_every' is
+    provided.
+    """
+    data = b""
+    for local_type, (global_number, fields) in enumerate(
+        FIT_MESSAGES.values()
+    ):
+        data += struct.pack(
+            "<BBBHB", 0x40 | local_type, 0, 0, global_number, len(fields)
+        )
+        for field_number, field_format, base_type in fields:
+            data += struct.pack(
+                "<BBB", field_number, struct.calcsize(field_format), base_type
+            )
+    local_types = {name: index for index, name in enumerate(FIT_MESSAGES)}
+
+    def get_message(name: str, *values: int) -> bytes:
+        fields_format = "".join(field[1] for field in FIT_MESSAGES[name][1])
+        return struct.pack(f"<B{fields_format}", local_types[name], *values)
+
+    start = int(
+        (
+            datetime(2018, 3, 13, 12, 44, 45, tzinfo=timezone.utc) - FIT_EPOCH
+        ).total_seconds()
+    )
+    data += get_message("file_id", 4, 1, 3121, start)
+    semicircles = 2**31 / 180
+    for index in range(records_count):
+        timestamp = start + index
+        if stop_event_every and index and index % stop_event_every == 0:
+            data += get_message("event", timestamp, 0, 4)
+        data += get_message(
+            "record",
+            timestamp,
+            int((44.68095 - index * 0.00004) * semicircles),
+            int((6.07367 + index * 0.00002) * semicircles),
+            int((998.0 + (index % 100) / 10 + 500) * 5),
+            120 + index % 40,
+            80 + index % 10,
+            200 + index % 50,
+        )
+    data += get_message("session", start + records_count, 1500)
+
+    header = struct.pack("<BBHI4s", 14, 0x20, 2132, len(data), b".FIT")
+    header += struct.pack("<H", compute_crc(header))
+    return header + data + struct.pack("<H", compute_crc(header + data))
+
+
+def get_traced_memory(function: Callable, *args: Any) -> Tuple[int, int]:
+    """
+    Return memory allocated by function (traced by 'tracemalloc'):
+    - memory still allocated once function returns (including returned
+      value)
+    - peak memory during function call
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function(*args)  # noqa: F841
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, peak
+
+
+def generate_tcx_file(points_count: int) -> bytes:
+    """
+    Generate a TCX file with one activity containing given number of
+    trackpoints (one trackpoint per second), with heart rate, cadence and
+    power.
+    """
+    start = datetime(2018, 3, 13, 12, 44, 45, tzinfo=timezone.utc)
+    trackpoints = "".join(
+        f"""
+          <Trackpoint>
+            <Time>{(start + timedelta(seconds=index)).isoformat()}</Time>
+            <Position>
+              <LatitudeDegrees>{44.68095 - index * 0.00004}</LatitudeDegrees>
+              <LongitudeDegrees>{6.07367 + index * 0.00002}</LongitudeDegrees>
+            </Position>
+            <AltitudeMeters>{998.0 + (index % 100) / 10}</AltitudeMeters>
+            <HeartRateBpm><Value>{120 + index % 40}</Value></HeartRateBpm>
+            <Cadence>{80 + index % 10}</Cadence>
+            <Extensions>
+              <ns3:TPX><ns3:Watts>{200 + index % 50}</ns3:Watts></ns3:TPX>
+            </Extensions>
+          </Trackpoint>"""
+        for index in range(points_count)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase
+  xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2"
+  xmlns:ns3="http://www.garmin.com/xmlschemas/ActivityExtension/v2"
+>
+  <Activities>
+    <Activity Sport="Biking">
+      <Id>{start.isoformat()}</Id>
+      <Lap StartTime="{start.isoformat()}">
+        <Track>{trackpoints}
+        </Track>
+      </Lap>
+    </Activity>
+  </Activities>
+</TrainingCenterDatabase>""".encode()
+
+
+def generate_kml_file(points_count: int) -> bytes:
+    """
+    Generate a KML file with one track containing given number of points
+    (one point per second), with heart rate.
+    """
+    start = datetime(2018, 3, 13, 12, 44, 45, tzinfo=timezone.utc)
+    points = "".join(
+        f"""
+          <when>{(start + timedelta(seconds=index)).isoformat()}</when>
+          <gx:coord>{6.07367 + index * 0.00002} {44.68095 - index * 0.00004} {998.0 + (index % 100) / 10}</gx:coord>"""  # noqa: E501
+        for index in range(points_count)
+    )
+    heart_rates = "".join(
+        f"""
+                <gx:value>{120 + index % 40}</gx:value>"""
+        for index in range(points_count)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<kml
+  xmlns="http://www.opengis.net/kml/2.2"
+  xmlns:gx="http://www.google.com/kml/ext/2.2"
+>
+  <Document>
+    <Placemark>
+      <name>just a workout</name>
+      <gx:MultiTrack>
+        <gx:Track>{points}
+          <ExtendedData>
+            <SchemaData schemaUrl="#schema">
+              <gx:SimpleArrayData name="heartrate">{heart_rates}
+              </gx:SimpleArrayData>
+            </SchemaData>
+          </ExtendedData>
+        </gx:Track>
+      </gx:MultiTrack>
+    </Placemark>
+  </Document>
+</kml>""".encode()
+
 
 def create_a_workout_with_file(
     user: "User",
@@ -49,3 +229,32 @@ def create_a_workout_with_file(
 def add_follower(user: "User", follower: "User") -> None:
     follower.send_follow_request_to(user)
     user.approves_follow_request_from(follower)
+
+
+class FakeWeather(BaseWeather):
+    """
+    Weather provider returning data computed from coordinates, without API
+    calls (calls are stored for assertions).
+    """
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        super().__init__(api_key="")
+        self.calls: List[Tuple[float, float, datetime]] = []
+
+    @staticmethod
+    def _get_timestamp(time: datetime) -> int:
+        return int(time.replace(minute=0, second=0, microsecond=0).timestamp())
+
+    def _get_data(
+        self, latitude: float, longitude: float, time: datetime
+    ) -> Optional[Dict]:
+        self.calls.append((latitude, longitude, time))
+        return {
+            "humidity": 0.69,
+            "icon": "partly-cloudy-day",
+            "temperature": round(latitude, 2),
+            "wind": round(longitude, 2),
+            "windBearing": time.hour,
+        }
@@ -54,9 +54,9 @@ from fittrackee.visibility_levels import (
     VisibilityLevel,
     get_calculated_visibility,
 )
-from fittrackee.workouts.models import Sport
+from fittrackee.workouts.models import Sport, rebuild_workouts_daily_stats
 
-from ..constants import IMAGE_MIMETYPES, PaceSpeedDisplay
+from ..constants import IMAGE_MIMETYPES, PaceSpeedDisplay, StorageCategory
 from ..workouts.constants import PACE_SPORTS
 from .exceptions import UserControlsException, UserCreationException
 from .models import (
@@ -69,6 +69,7 @@ from .models import (
     UserTask,
 )
 from .roles import UserRole
+from .storage import get_file_size, update_storage_usage
 from .tasks import export_data
 from .timezones import TIMEZONES, get_timezone
 from .utils.controls import check_password, is_valid_email
@@ -1051,7 +1052,7 @@ def edit_user_preferences(auth_user: User) -> Union[Dict, HttpResponse]:
                   (``public``, ``followers_only``, ``private``)
     :<json string missing_elevations_processing: source and method for missing
                   elevations, depending on application configuration
-                  (``file`` (missing elevation are not processed),
+                  (``file`` (missing elevation are not processed), ``dem``,
                   ``open_elevation``, ``open_elevation_smooth``, ``valhalla``)
     :<json string segments_creation_event: event triggering a segment creation
                   for .fit files (``all``, ``only_manual``, ``none``)
@@ -1129,6 +1130,7 @@ def edit_user_preferences(auth_user: User) -> Union[Dict, HttpResponse]:
     calories_visibility = post_data.get("calories_visibility")
 
     try:
+        timezone_changed = auth_user.timezone != timezone
         auth_user.date_format = date_format
         auth_user.display_ascent = display_ascent
         auth_user.imperial_units = imperial_units
@@ -1156,6 +1158,10 @@ def edit_user_preferences(auth_user: User) -> Union[Dict, HttpResponse]:
         auth_user.split_workout_charts = split_workout_charts
         auth_user.missing_elevations_processing = missing_elevations_processing
         auth_user.calories_visibility = VisibilityLevel(calories_visibility)
+        if timezone_changed:
+            # daily statistics are calculated in user timezone
+            db.session.flush()
+            rebuild_workouts_daily_stats(db.session.connection(), auth_user.id)
         db.session.commit()
 
         return {
@@ -1872,12 +1878,20 @@ def edit_picture(auth_user: User) -> Union[Dict, HttpResponse]:
     )
 
     try:
+        old_picture_size = 0
         if auth_user.picture is not None:
             old_picture_path = get_absolute_file_path(auth_user.picture)
             if os.path.isfile(get_absolute_file_path(old_picture_path)):
+                old_picture_size = get_file_size(old_picture_path)
                 os.remove(old_picture_path)
         image.save(absolute_picture_path)
         auth_user.picture = relative_picture_path
+        update_storage_usage(
+            db.session.connection(),
+            auth_user.id,
+            StorageCategory.PICTURES,
+            get_file_size(absolute_picture_path) - old_picture_size,
+        )
         db.session.commit()
         return {
             "status": "success",
@@ -1930,7 +1944,14 @@ def del_picture(auth_user: User) -> Union[Tuple[Dict, int], HttpResponse]:
     try:
         picture_path = get_absolute_file_path(auth_user.picture)
         if os.path.isfile(picture_path):
+            picture_size = get_file_size(picture_path)
             os.remove(picture_path)
+            update_storage_usage(
+                db.session.connection(),
+                auth_user.id,
+                StorageCategory.PICTURES,
+                -picture_size,
+            )
         auth_user.picture = None
         db.session.commit()
         return {"status": "no content"}, 204
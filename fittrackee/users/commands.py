@@ -8,6 +8,7 @@ from humanize import naturalsize
 from fittrackee import db
 from fittrackee.cli.app import app
 from fittrackee.languages import SUPPORTED_LANGUAGES
+from fittrackee.users.counters import update_counters
 from fittrackee.users.exceptions import UserNotFoundException
 from fittrackee.users.export_data import (
     clean_user_data_export,
@@ -15,6 +16,7 @@ from fittrackee.users.export_data import (
     process_queued_data_export,
 )
 from fittrackee.users.roles import UserRole
+from fittrackee.users.storage import update_storage_usage_from_files
 from fittrackee.users.timezones import get_timezone
 from fittrackee.users.users_service import UserManagerService
 from fittrackee.users.utils.language import get_language
@@ -159,6 +161,28 @@ def clean(
         logger.info(f"Blacklisted tokens deleted: {deleted_rows}.")
 
 
+@users_cli.command("update_counters")
+def update_denormalized_counters() -> None:
+    """
+    Recalculate followers, following, workouts and likes counts.
+    """
+    with app.app_context():
+        update_counters()
+        logger.info("Counters updated.")
+
+
+@users_cli.command("update_storage_usage")
+def update_users_storage_usage() -> None:
+    """
+    Recalculate users storage usage from files in upload directory.
+    """
+    with app.app_context():
+        storage_usage = update_storage_usage_from_files()
+        for category, size in storage_usage.items():
+            logger.info(f"{category.replace('_', ' ')}: {naturalsize(size)}")
+        logger.info(f"Total: {naturalsize(sum(storage_usage.values()))}.")
+
+
 @users_cli.command("clean_archives")
 @click.option("--days", type=int, required=True, help="Number of days.")
 def clean_export_archives(
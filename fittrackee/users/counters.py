@@ -0,0 +1,184 @@
+from typing import TYPE_CHECKING, List
+
+from sqlalchemy import func, or_, select
+
+from fittrackee import db
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine.base import Connection
+    from sqlalchemy.sql.elements import ColumnElement
+
+
+def _get_follow_count_subquery(
+    users_table: "ColumnElement", relation: str
+) -> "ColumnElement":
+    """
+    Return correlated subquery counting approved follow requests with
+    users not suspended (same result as 'followers' and 'following'
+    relationships)
+    """
+    from .models import FollowRequest, User
+
+    follow_requests_table = FollowRequest.__table__  # type: ignore
+    other_user = User.__table__.alias("other_user")  # type: ignore
+    if relation == "followers":
+        user_column = follow_requests_table.c.followed_user_id
+        other_user_column = follow_requests_table.c.follower_user_id
+    else:
+        user_column = follow_requests_table.c.follower_user_id
+        other_user_column = follow_requests_table.c.followed_user_id
+    return (
+        select(func.count())
+        .select_from(
+            follow_requests_table.join(
+                other_user, other_user.c.id == other_user_column
+            )
+        )
+        .where(
+            user_column == users_table.c.id,  # type: ignore
+            follow_requests_table.c.is_approved == True,  # noqa: E712
+            other_user.c.suspended_at == None,  # noqa: E711
+        )
+        .scalar_subquery()
+    )
+
+
+def update_follow_counters(connection: "Connection", user_ids: List) -> None:
+    """
+    Recalculate followers and following counts for given users
+    """
+    from .models import User
+
+    users_table = User.__table__  # type: ignore
+    connection.execute(
+        users_table.update()
+        .where(users_table.c.id.in_(user_ids))
+        .values(
+            followers_count=_get_follow_count_subquery(
+                users_table, "followers"
+            ),
+            following_count=_get_follow_count_subquery(
+                users_table, "following"
+            ),
+        )
+    )
+
+
+def update_related_users_follow_counters(
+    connection: "Connection", user_id: int
+) -> None:
+    """
+    Recalculate follow counters for users following or followed by given
+    user (for instance when user is suspended or unsuspended)
+    """
+    from .models import FollowRequest, User
+
+    users_table = User.__table__  # type: ignore
+    follow_requests_table = FollowRequest.__table__  # type: ignore
+    connection.execute(
+        users_table.update()
+        .where(
+            or_(
+                users_table.c.id.in_(
+                    select(follow_requests_table.c.followed_user_id).where(
+                        follow_requests_table.c.follower_user_id == user_id
+                    )
+                ),
+                users_table.c.id.in_(
+                    select(follow_requests_table.c.follower_user_id).where(
+                        follow_requests_table.c.followed_user_id == user_id
+                    )
+                ),
+            )
+        )
+        .values(
+            followers_count=_get_follow_count_subquery(
+                users_table, "followers"
+            ),
+            following_count=_get_follow_count_subquery(
+                users_table, "following"
+            ),
+        )
+    )
+
+
+def decrement_likes_counts(user_id: int) -> None:
+    """
+    Decrement likes counts of workouts and comments liked by given user.
+
+    To call before deleting user, since likes are deleted by database
+    cascade (no ORM events are emitted).
+    """
+    from fittrackee.comments.models import Comment, CommentLike
+    from fittrackee.workouts.models import Workout, WorkoutLike
+
+    for model, like_model, column in [
+        (Workout, WorkoutLike, "workout_id"),
+        (Comment, CommentLike, "comment_id"),
+    ]:
+        table = model.__table__  # type: ignore
+        like_table = like_model.__table__  # type: ignore
+        db.session.execute(
+            table.update()
+            .where(
+                table.c.id.in_(
+                    select(like_table.c[column]).where(
+                        like_table.c.user_id == user_id
+                    )
+                )
+            )
+            .values(
+                likes_count=table.c.likes_count - 1,
+                # a like does not modify workout or comment ('onupdate' is
+                # ignored)
+                modification_date=table.c.modification_date,
+            )
+        )
+
+
+def update_counters() -> None:
+    """
+    Recalculate all denormalized counters:
+    - users followers, following and workouts counts
+    - workouts and comments likes counts
+    """
+    from fittrackee.comments.models import Comment, CommentLike
+    from fittrackee.workouts.models import Workout, WorkoutLike
+
+    from .models import User
+
+    users_table = User.__table__  # type: ignore
+    workouts_table = Workout.__table__  # type: ignore
+    db.session.execute(
+        users_table.update().values(
+            followers_count=_get_follow_count_subquery(
+                users_table, "followers"
+            ),
+            following_count=_get_follow_count_subquery(
+                users_table, "following"
+            ),
+            workouts_count=(
+                select(func.count(workouts_table.c.id))
+                .where(workouts_table.c.user_id == users_table.c.id)
+                .scalar_subquery()
+            ),
+        )
+    )
+
+    for model, like_model, column in [
+        (Workout, WorkoutLike, "workout_id"),
+        (Comment, CommentLike, "comment_id"),
+    ]:
+        table = model.__table__  # type: ignore
+        like_table = like_model.__table__  # type: ignore
+        db.session.execute(
+            table.update().values(
+                likes_count=(
+                    select(func.count(like_table.c.id))
+                    .where(like_table.c[column] == table.c.id)
+                    .scalar_subquery()
+                ),
+                modification_date=table.c.modification_date,
+            )
+        )
+    db.session.commit()
@@ -8,6 +8,7 @@ from zipfile import ZipFile
 from flask import current_app
 
 from fittrackee import appLog, db
+from fittrackee.constants import StorageCategory
 from fittrackee.emails.tasks import send_email
 from fittrackee.files import get_absolute_file_path
 from fittrackee.utils import decode_short_id
@@ -15,6 +16,7 @@ from fittrackee.workouts.constants import WORKOUT_ALLOWED_EXTENSIONS
 
 from .exceptions import UserTaskException
 from .models import Notification, User, UserTask
+from .storage import update_storage_usage
 from .utils.language import get_language
 
 
@@ -167,6 +169,12 @@ def export_user_data(task_id: int) -> None:
                 "exports", str(user.id), archive_file_name
             )
             export_request.file_size = os.path.getsize(archive_file_path)
+            update_storage_usage(
+                db.session.connection(),
+                user.id,
+                StorageCategory.EXPORTS,
+                export_request.file_size,
+            )
             db.session.flush()
             export_request.progress = 100
 
@@ -10,18 +10,20 @@ from sqlalchemy import and_, func
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.event import listens_for
-from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.orm.session import Session, object_session
 from sqlalchemy.schema import CheckConstraint
 from sqlalchemy.sql import text
-from sqlalchemy.sql.expression import select
 from sqlalchemy.types import Enum
 
 from fittrackee import BaseModel, appLog, bcrypt, db
 from fittrackee.comments.models import Comment
-from fittrackee.constants import ElevationDataSource, PaceSpeedDisplay
+from fittrackee.constants import (
+    ElevationDataSource,
+    PaceSpeedDisplay,
+    StorageCategory,
+)
 from fittrackee.database import TZDateTime
 from fittrackee.dates import aware_utc_now
 from fittrackee.files import get_absolute_file_path
@@ -36,6 +38,10 @@ from .constants import (
     NOTIFICATIONS_PREFERENCES_SCHEMA,
     USER_LINK_TEMPLATE,
 )
+from .counters import (
+    update_follow_counters,
+    update_related_users_follow_counters,
+)
 from .exceptions import (
     BlockUserException,
     FollowRequestAlreadyProcessedError,
@@ -51,6 +57,17 @@ from .roles import (
     has_moderator_rights,
     is_auth_user,
 )
+from .social_graph import (
+    get_blocked_by_ids,
+    get_blocked_ids,
+    get_followers_ids,
+    invalidate_social_graph,
+)
+from .storage import get_file_size, update_storage_usage
+from .tokens_cache import (
+    invalidate_user_verified_tokens,
+    invalidate_verified_token,
+)
 from .utils.tokens import decode_user_token, get_user_token
 
 if TYPE_CHECKING:
@@ -128,6 +145,18 @@ class FollowRequest(BaseModel):
 def on_follow_request_insert(
     mapper: Mapper, connection: Connection, new_follow_request: FollowRequest
 ) -> None:
+    invalidate_social_graph(
+        new_follow_request.follower_user_id,
+        new_follow_request.followed_user_id,
+    )
+    update_follow_counters(
+        connection,
+        [
+            new_follow_request.follower_user_id,
+            new_follow_request.followed_user_id,
+        ],
+    )
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Connection) -> None:
         to_user = User.query.filter_by(
@@ -155,6 +184,14 @@ def on_follow_request_insert(
 def on_follow_request_update(
     mapper: Mapper, connection: Connection, follow_request: FollowRequest
 ) -> None:
+    invalidate_social_graph(
+        follow_request.follower_user_id, follow_request.followed_user_id
+    )
+    update_follow_counters(
+        connection,
+        [follow_request.follower_user_id, follow_request.followed_user_id],
+    )
+
     follow_request_object = object_session(follow_request)
     if follow_request_object and follow_request_object.is_modified(
         follow_request
@@ -222,6 +259,18 @@ def on_follow_request_update(
 def on_follow_request_delete(
     mapper: Mapper, connection: Connection, old_follow_request: FollowRequest
 ) -> None:
+    invalidate_social_graph(
+        old_follow_request.follower_user_id,
+        old_follow_request.followed_user_id,
+    )
+    update_follow_counters(
+        connection,
+        [
+            old_follow_request.follower_user_id,
+            old_follow_request.followed_user_id,
+        ],
+    )
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Any) -> None:
         Notification.query.filter(
@@ -387,6 +436,17 @@ class User(BaseModel):
         server_default="PRIVATE",
         nullable=False,
     )
+    # denormalized counters, updated by listeners
+    # (see 'ftcli users update_counters' to recalculate them)
+    followers_count: Mapped[int] = mapped_column(
+        server_default="0", nullable=False
+    )
+    following_count: Mapped[int] = mapped_column(
+        server_default="0", nullable=False
+    )
+    workouts_count: Mapped[int] = mapped_column(
+        server_default="0", nullable=False
+    )
 
     workouts: Mapped[List["Workout"]] = relationship(
         "Workout", lazy=True, back_populates="user"
@@ -533,18 +593,6 @@ class User(BaseModel):
     def has_admin_rights(self) -> bool:
         return has_admin_rights(UserRole(self.role))
 
-    @hybrid_property
-    def workouts_count(self) -> int:
-        return Workout.query.filter(Workout.user_id == self.id).count()
-
-    @workouts_count.expression  # type: ignore
-    def workouts_count(self) -> int:
-        return (
-            select(func.count(Workout.id))
-            .where(Workout.user_id == self.id)
-            .label("workouts_count")
-        )
-
     @property
     def pending_follow_requests(self) -> List[FollowRequest]:
         return self.received_follow_requests.filter_by(updated_at=None).all()
@@ -643,6 +691,13 @@ class User(BaseModel):
     def get_followers_user_ids(self) -> List:
         return [followers.id for followers in self.followers]
 
+    def has_follower(self, user: "User") -> bool:
+        # same result as 'user in self.followers.all()' ('followers' excludes
+        # suspended users) without loading all followers
+        return user.suspended_at is None and user.id in get_followers_ids(
+            self.id
+        )
+
     def get_user_url(self) -> str:
         """Return user url on user interface"""
         return f"{current_app.config['UI_URL']}/users/{self.username}"
@@ -665,6 +720,7 @@ class User(BaseModel):
             )
             .on_conflict_do_nothing()
         )
+        invalidate_social_graph(self.id, user.id)
         follow_request = FollowRequest.query.filter_by(
             follower_user_id=user.id,
             followed_user_id=self.id,
@@ -677,26 +733,17 @@ class User(BaseModel):
         BlockedUser.query.filter_by(
             user_id=user.id, by_user_id=self.id
         ).delete()
+        invalidate_social_graph(self.id, user.id)
         db.session.commit()
 
     def is_blocked_by(self, user: "User") -> bool:
-        return (
-            BlockedUser.query.filter_by(
-                user_id=self.id, by_user_id=user.id
-            ).first()
-            is not None
-        )
+        return user.id in get_blocked_by_ids(self.id)
 
     def get_blocked_user_ids(self) -> List:
-        return [
-            blocked_user.user_id for blocked_user in self.blocked_users.all()
-        ]
+        return list(get_blocked_ids(self.id))
 
     def get_blocked_by_user_ids(self) -> List:
-        return [
-            blocked_user.by_user_id
-            for blocked_user in self.blocked_by_users.all()
-        ]
+        return list(get_blocked_by_ids(self.id))
 
     @property
     def suspension_action(self) -> Optional["ReportAction"]:
@@ -848,6 +895,12 @@ class User(BaseModel):
         ):
             return ElevationDataSource.FILE
 
+        if (
+            self.missing_elevations_processing == ElevationDataSource.DEM
+            and not current_app.config["ELEVATION_DEM_DIR"]
+        ):
+            return ElevationDataSource.FILE
+
         return self.missing_elevations_processing
 
     def serialize(
@@ -867,8 +920,8 @@ class User(BaseModel):
 
         serialized_user: Dict = {
             "created_at": self.created_at,
-            "followers": self.followers.count(),
-            "following": self.following.count(),
+            "followers": self.followers_count,
+            "following": self.following_count,
             "nb_workouts": self.workouts_count,
             "picture": self.picture is not None,
             "role": UserRole(self.role).name.lower(),
@@ -898,7 +951,7 @@ class User(BaseModel):
             return serialized_user
 
         sports = []
-        if self.workouts_count > 0:  # type: ignore
+        if self.workouts_count > 0:
             sports = (
                 db.session.query(Workout.sport_id)
                 .filter(Workout.user_id == self.id)
@@ -918,7 +971,7 @@ class User(BaseModel):
 
         if role is not None:
             total = (0, "0:00:00", 0)
-            if self.workouts_count > 0:  # type: ignore
+            if self.workouts_count > 0:
                 total = tuple(
                     db.session.query(
                         func.sum(Workout.distance),
@@ -1004,6 +1057,27 @@ class User(BaseModel):
         return serialized_user
 
 
+@listens_for(User, "after_update")
+def on_user_update(mapper: Mapper, connection: Connection, user: User) -> None:
+    instance_state = db.inspect(user)
+
+    # verified tokens contain user status and role
+    if any(
+        instance_state.attrs[attribute].load_history().has_changes()
+        for attribute in ["is_active", "suspended_at", "role"]
+    ):
+        invalidate_user_verified_tokens(user.id)
+
+    # followers and following counts exclude suspended users
+    state_history = instance_state.attrs["suspended_at"].load_history()
+    if not state_history.added and not state_history.deleted:
+        return
+    old_value = state_history.deleted[0] if state_history.deleted else None
+    new_value = state_history.added[0] if state_history.added else None
+    if (old_value is None) != (new_value is None):
+        update_related_users_follow_counters(connection, user.id)
+
+
 UserSportPreferenceEquipment = db.Table(
     "users_sports_preferences_equipments",
     db.Column(
@@ -1096,6 +1170,27 @@ class UserSportPreference(BaseModel):
         }
 
 
+class UserStorage(BaseModel):
+    """
+    Size of user files by category, updated when files are stored or
+    deleted (see 'ftcli users update_storage_usage' to recalculate it)
+    """
+
+    __tablename__ = "users_storage"
+
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    category: Mapped[StorageCategory] = mapped_column(
+        Enum(StorageCategory, name="storage_categories"),
+        primary_key=True,
+    )
+    size: Mapped[int] = mapped_column(
+        db.BigInteger, server_default="0", nullable=False
+    )  # bytes
+
+
 class BlacklistedToken(BaseModel):
     __tablename__ = "blacklisted_tokens"
 
@@ -1127,6 +1222,13 @@ class BlacklistedToken(BaseModel):
         return cls.query.filter_by(token=str(auth_token)).first() is not None
 
 
+@listens_for(BlacklistedToken, "after_insert")
+def on_blacklisted_token_insert(
+    mapper: Mapper, connection: Connection, new_token: BlacklistedToken
+) -> None:
+    invalidate_verified_token(new_token.token)
+
+
 class UserTask(BaseModel):
     __tablename__ = "user_tasks"
 
@@ -1308,10 +1410,23 @@ def on_user_task_delete(
             Notification.event_object_id == old_record.id,
         ).delete()
         if old_record.file_path:
+            file_path = get_absolute_file_path(old_record.file_path)
+            file_size = get_file_size(file_path)
             try:
-                os.remove(get_absolute_file_path(old_record.file_path))
+                os.remove(file_path)
             except OSError:
                 appLog.error("archive not found when deleting export request")
+            else:
+                update_storage_usage(
+                    connection,
+                    old_record.user_id,
+                    (
+                        StorageCategory.EXPORTS
+                        if old_record.task_type == "user_data_export"
+                        else StorageCategory.ARCHIVES
+                    ),
+                    -file_size,
+                )
 
 
 class Notification(BaseModel):
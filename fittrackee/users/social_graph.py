@@ -0,0 +1,151 @@
+import json
+from typing import Dict, Optional, Set
+
+import redis
+from flask import current_app, g, has_request_context
+from sqlalchemy import select
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm.session import Session
+
+from fittrackee import appLog, db, redis_client
+
+REDIS_KEY_PREFIX = "fittrackee:social_graph"
+RELATIONS = ["followers", "following", "blocked", "blocked_by"]
+
+
+class SocialGraphCache:
+    """
+    Per-user sets of ids:
+    - followers: users following the user (approved follow requests)
+    - following: users followed by the user (approved follow requests)
+    - blocked: users blocked by the user
+    - blocked_by: users blocking the user
+
+    Sets are kept during the request (application context globals, reset
+    before each request) and, if 'SOCIAL_GRAPH_CACHE_TTL' is set, shared
+    between processes through Redis.
+    Cached sets are invalidated when follow requests or blocked users are
+    updated.
+
+    Note: suspended users are not excluded from sets.
+    """
+
+    @staticmethod
+    def _get_local_cache() -> Optional[Dict]:
+        if not has_request_context():
+            return None
+        return g.setdefault("social_graph", {})
+
+    @staticmethod
+    def _get_redis_key(user_id: int, relation: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{user_id}:{relation}"
+
+    @staticmethod
+    def _get_ttl() -> int:
+        return current_app.config["SOCIAL_GRAPH_CACHE_TTL"]
+
+    @staticmethod
+    def _load_ids(user_id: int, relation: str) -> Set[int]:
+        from .models import BlockedUser, FollowRequest
+
+        if relation == "followers":
+            query = select(FollowRequest.follower_user_id).where(
+                FollowRequest.followed_user_id == user_id,
+                FollowRequest.is_approved == True,  # noqa
+            )
+        elif relation == "following":
+            query = select(FollowRequest.followed_user_id).where(
+                FollowRequest.follower_user_id == user_id,
+                FollowRequest.is_approved == True,  # noqa
+            )
+        elif relation == "blocked":
+            query = select(BlockedUser.user_id).where(
+                BlockedUser.by_user_id == user_id
+            )
+        elif relation == "blocked_by":
+            query = select(BlockedUser.by_user_id).where(
+                BlockedUser.user_id == user_id
+            )
+        else:
+            raise ValueError(f"invalid relation: {relation}")
+        return set(db.session.scalars(query).all())
+
+    def _get_from_redis(self, key: str) -> Optional[Set[int]]:
+        try:
+            value = redis_client.get(key)
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when getting social graph from Redis: {e}")
+            return None
+        return None if value is None else set(json.loads(value))
+
+    def _store_in_redis(self, key: str, ids: Set[int]) -> None:
+        try:
+            redis_client.set(key, json.dumps(list(ids)), ex=self._get_ttl())
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when storing social graph in Redis: {e}")
+
+    def get_ids(self, user_id: int, relation: str) -> Set[int]:
+        local_cache = self._get_local_cache()
+        key = self._get_redis_key(user_id, relation)
+        if local_cache is not None and key in local_cache:
+            return local_cache[key]
+
+        ids = self._get_from_redis(key) if self._get_ttl() else None
+        if ids is None:
+            ids = self._load_ids(user_id, relation)
+            if self._get_ttl():
+                self._store_in_redis(key, ids)
+
+        if local_cache is not None:
+            local_cache[key] = ids
+        return ids
+
+    def invalidate(self, *user_ids: int) -> None:
+        keys = [
+            self._get_redis_key(user_id, relation)
+            for user_id in user_ids
+            for relation in RELATIONS
+        ]
+        local_cache = self._get_local_cache()
+        if local_cache is not None:
+            for key in keys:
+                local_cache.pop(key, None)
+        if self._get_ttl():
+            try:
+                redis_client.delete(*keys)
+            except redis.exceptions.RedisError as e:
+                appLog.error(
+                    f"Error when deleting social graph from Redis: {e}"
+                )
+
+
+social_graph_cache = SocialGraphCache()
+
+
+def reset_social_graph_local_cache() -> None:
+    g.pop("social_graph", None)
+
+
+def invalidate_social_graph(*user_ids: int) -> None:
+    social_graph_cache.invalidate(*user_ids)
+
+    # sets may be loaded again before commit
+    @listens_for(db.Session, "after_commit", once=True)
+    def receive_after_commit(session: Session) -> None:
+        social_graph_cache.invalidate(*user_ids)
+
+
+def get_followers_ids(user_id: int) -> Set[int]:
+    return social_graph_cache.get_ids(user_id, "followers")
+
+
+def get_following_ids(user_id: int) -> Set[int]:
+    return social_graph_cache.get_ids(user_id, "following")
+
+
+def get_blocked_ids(user_id: int) -> Set[int]:
+    return social_graph_cache.get_ids(user_id, "blocked")
+
+
+def get_blocked_by_ids(user_id: int) -> Set[int]:
+    return social_graph_cache.get_ids(user_id, "blocked_by")
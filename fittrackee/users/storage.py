@@ -0,0 +1,139 @@
+import os
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from fittrackee import db
+from fittrackee.constants import StorageCategory
+from fittrackee.files import get_absolute_file_path
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine.base import Connection
+
+# directories containing users files ('<directory>/<user_id>/<file>')
+USERS_DIRECTORIES = ["exports", "pictures", "workouts"]
+
+
+def get_file_size(file_path: str) -> int:
+    """
+    Return file size in bytes (0 if file does not exist)
+    """
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def update_storage_usage(
+    connection: "Connection",
+    user_id: int,
+    category: StorageCategory,
+    size: int,
+) -> None:
+    """
+    Add given size (negative when files are deleted) to user storage usage
+    for given category.
+
+    Storage usage is updated in the same transaction as related rows, see
+    'ftcli users update_storage_usage' to recalculate it from files.
+    """
+    from .models import UserStorage
+
+    storage_table = UserStorage.__table__  # type: ignore
+    if size < 0:
+        connection.execute(
+            storage_table.update()
+            .where(
+                storage_table.c.user_id == user_id,
+                storage_table.c.category == category,
+            )
+            .values(size=func.greatest(storage_table.c.size + size, 0))
+        )
+    elif size > 0:
+        insert_statement = postgresql.insert(storage_table).values(
+            user_id=user_id, category=category, size=size
+        )
+        connection.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=["user_id", "category"],
+                set_={
+                    "size": storage_table.c.size
+                    + insert_statement.excluded.size
+                },
+            )
+        )
+
+
+def get_storage_usage(user_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Return storage usage in bytes by category, for all users or given user
+    """
+    from .models import UserStorage
+
+    query = select(UserStorage.category, func.sum(UserStorage.size)).group_by(
+        UserStorage.category
+    )
+    if user_id is not None:
+        query = query.where(UserStorage.user_id == user_id)
+    usage = dict.fromkeys([category.value for category in StorageCategory], 0)
+    for category, size in db.session.execute(query).all():
+        usage[category.value] = int(size)
+    return usage
+
+
+def _get_file_category(directory: str, file_name: str) -> StorageCategory:
+    if directory == "exports":
+        return StorageCategory.EXPORTS
+    if directory == "pictures":
+        return StorageCategory.PICTURES
+    if file_name.startswith("archive_") and file_name.endswith(".zip"):
+        return StorageCategory.ARCHIVES
+    if file_name.endswith(".png"):
+        return StorageCategory.MAPS
+    return StorageCategory.ORIGINAL_FILES
+
+
+def update_storage_usage_from_files() -> Dict[str, int]:
+    """
+    Recalculate storage usage of all users from files in upload directory
+    and return storage usage by category.
+
+    Files of deleted users and files outside users directories (for instance
+    map tiles cache) are not counted.
+    """
+    from .models import User, UserStorage
+
+    user_ids = {user_id for (user_id,) in db.session.query(User.id).all()}
+    usage: Dict[Tuple[int, StorageCategory], int] = {}
+    for directory in USERS_DIRECTORIES:
+        directory_path = get_absolute_file_path(directory)
+        if not os.path.isdir(directory_path):
+            continue
+        for user_directory in os.scandir(directory_path):
+            if (
+                not user_directory.is_dir()
+                or not user_directory.name.isdigit()
+                or int(user_directory.name) not in user_ids
+            ):
+                continue
+            user_id = int(user_directory.name)
+            for dir_path, _, file_names in os.walk(user_directory.path):
+                for file_name in file_names:
+                    key = (user_id, _get_file_category(directory, file_name))
+                    usage[key] = usage.get(key, 0) + get_file_size(
+                        os.path.join(dir_path, file_name)
+                    )
+
+    db.session.query(UserStorage).delete()
+    if usage:
+        db.session.execute(
+            postgresql.insert(UserStorage).values(
+                [
+                    {"user_id": user_id, "category": category, "size": size}
+                    for (user_id, category), size in usage.items()
+                ]
+            )
+        )
+    db.session.commit()
+    return get_storage_usage()
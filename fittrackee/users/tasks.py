@@ -4,11 +4,16 @@ import dramatiq
 from dramatiq.middleware import Shutdown, TimeLimitExceeded
 
 from fittrackee import db
-from fittrackee.constants import TASKS_TIME_LIMIT, TaskPriority
+from fittrackee.constants import (
+    TASKS_TIME_LIMIT,
+    StorageCategory,
+    TaskPriority,
+)
 from fittrackee.exceptions import TaskException
 from fittrackee.files import get_absolute_file_path
 from fittrackee.users.export_data import export_user_data
 from fittrackee.users.models import UserTask
+from fittrackee.users.storage import get_file_size, update_storage_usage
 
 
 def update_task_and_clean(task_id: int) -> None:
@@ -24,13 +29,25 @@ def update_task_and_clean(task_id: int) -> None:
         f"user_{name}data.json"
         for name in ["", "workouts_", "equipments_", "comments_"]
     ]
-    if export_request.file_path:
-        files.append(export_request.file_path)
     for file in files:
         try:
             os.remove(os.path.join(export_directory, file))
         except OSError:
             continue
+    if export_request.file_path:
+        archive_path = get_absolute_file_path(export_request.file_path)
+        archive_size = get_file_size(archive_path)
+        try:
+            os.remove(archive_path)
+        except OSError:
+            pass
+        else:
+            update_storage_usage(
+                db.session.connection(),
+                export_request.user_id,
+                StorageCategory.EXPORTS,
+                -archive_size,
+            )
     db.session.commit()
 
 
@@ -0,0 +1,306 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Dict, Optional
+
+import jwt
+import redis
+from flask import current_app
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm.session import Session
+
+from fittrackee import appLog, db, redis_client
+
+if TYPE_CHECKING:
+    from .models import User
+
+REDIS_KEY_PREFIX = "fittrackee:auth_tokens"
+LOCAL_CACHE_MAX_SIZE = 1024
+
+
+@dataclass
+class VerifiedToken:
+    """
+    Snapshot of user data for a verified authentication token (not expired
+    and not blacklisted)
+    """
+
+    user_id: int
+    is_active: bool
+    is_suspended: bool
+    role: int
+    expires_at: float
+    # user revocation generation when token was verified
+    generation: int = 0
+
+
+class VerifiedTokensCache:
+    """
+    Cache of verified authentication tokens, to avoid decoding token and
+    checking blacklisted tokens on each request.
+
+    Tokens are kept in process memory (bounded LRU cache) and shared
+    between processes through Redis.
+    Entries expire after 'AUTH_TOKEN_CACHE_TTL' seconds (or at token
+    expiration if sooner). They are invalidated when token is blacklisted
+    and when user status or role changes.
+
+    Since invalidation can not reach memory of other processes, each entry
+    stores the user revocation generation (a counter in Redis incremented
+    on invalidation). An entry is only returned if its generation matches
+    the current one, so Redis must be available to use cached tokens.
+    """
+
+    def __init__(self, maxsize: int = LOCAL_CACHE_MAX_SIZE) -> None:
+        self.maxsize = maxsize
+        self._local_cache: OrderedDict[str, VerifiedToken] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    @staticmethod
+    def _get_ttl() -> int:
+        return current_app.config["AUTH_TOKEN_CACHE_TTL"]
+
+    @staticmethod
+    def _get_token_hash(auth_token: str) -> str:
+        return hashlib.sha256(auth_token.encode()).hexdigest()
+
+    @staticmethod
+    def _get_redis_key(token_hash: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{token_hash}"
+
+    @staticmethod
+    def _get_redis_user_key(user_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:user:{user_id}"
+
+    @staticmethod
+    def _get_redis_generation_key(user_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:user:{user_id}:generation"
+
+    def reset_stats(self) -> None:
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local_cache.clear()
+
+    def _get_generation(self, user_id: int) -> Optional[int]:
+        """
+        Return None if generation can not be retrieved from Redis
+        """
+        try:
+            value = redis_client.get(self._get_redis_generation_key(user_id))
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when getting tokens generation: {e}")
+            return None
+        return 0 if value is None else int(value)  # type: ignore
+
+    def _revoke_user_tokens(self, user_id: int) -> None:
+        generation_key = self._get_redis_generation_key(user_id)
+        try:
+            redis_client.incr(generation_key)
+            # generation must outlive entries storing it
+            redis_client.expire(generation_key, self._get_ttl())
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when revoking tokens in Redis: {e}")
+
+    def _remove_from_local_cache(self, token_hash: str) -> None:
+        with self._lock:
+            self._local_cache.pop(token_hash, None)
+
+    def _get_from_local_cache(
+        self, token_hash: str
+    ) -> Optional[VerifiedToken]:
+        with self._lock:
+            verified_token = self._local_cache.get(token_hash)
+            if verified_token is None:
+                return None
+            if verified_token.expires_at <= time.time():
+                del self._local_cache[token_hash]
+                return None
+            self._local_cache.move_to_end(token_hash)
+            return verified_token
+
+    def _store_in_local_cache(
+        self, token_hash: str, verified_token: VerifiedToken
+    ) -> None:
+        with self._lock:
+            self._local_cache[token_hash] = verified_token
+            self._local_cache.move_to_end(token_hash)
+            while len(self._local_cache) > self.maxsize:
+                self._local_cache.popitem(last=False)
+
+    def _get_from_redis(self, token_hash: str) -> Optional[VerifiedToken]:
+        try:
+            value = redis_client.get(self._get_redis_key(token_hash))
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when getting token from Redis: {e}")
+            return None
+        return None if value is None else VerifiedToken(**json.loads(value))
+
+    def _store_in_redis(
+        self, token_hash: str, verified_token: VerifiedToken, ttl: int
+    ) -> None:
+        user_key = self._get_redis_user_key(verified_token.user_id)
+        try:
+            pipeline = redis_client.pipeline()
+            pipeline.set(
+                self._get_redis_key(token_hash),
+                json.dumps(asdict(verified_token)),
+                ex=ttl,
+            )
+            pipeline.sadd(user_key, token_hash)
+            pipeline.expire(user_key, self._get_ttl())
+            pipeline.expire(
+                self._get_redis_generation_key(verified_token.user_id),
+                self._get_ttl(),
+            )
+            pipeline.execute()
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when storing token in Redis: {e}")
+
+    def get(self, auth_token: str) -> Optional[VerifiedToken]:
+        if not self._get_ttl():
+            return None
+        token_hash = self._get_token_hash(auth_token)
+
+        verified_token = self._get_from_local_cache(token_hash)
+        if verified_token:
+            if self._is_not_revoked(verified_token):
+                self.stats["local_hits"] += 1
+                return verified_token
+            self._remove_from_local_cache(token_hash)
+
+        verified_token = self._get_from_redis(token_hash)
+        if (
+            verified_token
+            and verified_token.expires_at > time.time()
+            and self._is_not_revoked(verified_token)
+        ):
+            self.stats["redis_hits"] += 1
+            self._store_in_local_cache(token_hash, verified_token)
+            return verified_token
+
+        self.stats["misses"] += 1
+        return None
+
+    def _is_not_revoked(self, verified_token: VerifiedToken) -> bool:
+        return (
+            self._get_generation(verified_token.user_id)
+            == verified_token.generation
+        )
+
+    def store(self, auth_token: str, user: "User") -> None:
+        if not self._get_ttl():
+            return
+        try:
+            payload = jwt.decode(
+                auth_token,
+                current_app.config["SECRET_KEY"],
+                algorithms=["HS256"],
+            )
+        except jwt.InvalidTokenError:
+            return
+        now = time.time()
+        expires_at = min(now + self._get_ttl(), payload["exp"])
+        if expires_at <= now:
+            return
+        generation = self._get_generation(user.id)
+        if generation is None:
+            return
+
+        verified_token = VerifiedToken(
+            user_id=user.id,
+            is_active=user.is_active,
+            is_suspended=user.suspended_at is not None,
+            role=user.role,
+            expires_at=expires_at,
+            generation=generation,
+        )
+        token_hash = self._get_token_hash(auth_token)
+        self._store_in_local_cache(token_hash, verified_token)
+        self._store_in_redis(
+            token_hash, verified_token, ttl=int(expires_at - now) + 1
+        )
+
+    def invalidate_token(self, auth_token: str) -> None:
+        if not self._get_ttl():
+            return
+        try:
+            payload = jwt.decode(
+                auth_token,
+                current_app.config["SECRET_KEY"],
+                algorithms=["HS256"],
+                options={"verify_exp": False},
+            )
+        except jwt.InvalidTokenError:
+            return
+        # other tokens of the same user will be verified again
+        self._revoke_user_tokens(int(payload["sub"]))
+        token_hash = self._get_token_hash(auth_token)
+        self._remove_from_local_cache(token_hash)
+        try:
+            redis_client.delete(self._get_redis_key(token_hash))
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when deleting token from Redis: {e}")
+
+    def invalidate_user(self, user_id: int) -> None:
+        if not self._get_ttl():
+            return
+        self._revoke_user_tokens(user_id)
+        with self._lock:
+            for token_hash in [
+                token_hash
+                for token_hash, verified_token in self._local_cache.items()
+                if verified_token.user_id == user_id
+            ]:
+                del self._local_cache[token_hash]
+        user_key = self._get_redis_user_key(user_id)
+        try:
+            token_hashes = redis_client.smembers(user_key)
+            redis_client.delete(
+                user_key,
+                *[
+                    self._get_redis_key(token_hash.decode())
+                    for token_hash in token_hashes  # type: ignore
+                ],
+            )
+        except redis.exceptions.RedisError as e:
+            appLog.error(f"Error when deleting tokens from Redis: {e}")
+
+
+verified_tokens_cache = VerifiedTokensCache()
+
+
+def get_verified_token(auth_token: str) -> Optional[VerifiedToken]:
+    return verified_tokens_cache.get(auth_token)
+
+
+def store_verified_token(auth_token: str, user: "User") -> None:
+    verified_tokens_cache.store(auth_token, user)
+
+
+def invalidate_verified_token(auth_token: str) -> None:
+    verified_tokens_cache.invalidate_token(auth_token)
+
+    # token may be verified again before commit
+    @listens_for(db.Session, "after_commit", once=True)
+    def receive_after_commit(session: Session) -> None:
+        verified_tokens_cache.invalidate_token(auth_token)
+
+
+def invalidate_user_verified_tokens(user_id: int) -> None:
+    verified_tokens_cache.invalidate_user(user_id)
+
+    # token may be verified again before commit
+    @listens_for(db.Session, "after_commit", once=True)
+    def receive_after_commit(session: Session) -> None:
+        verified_tokens_cache.invalidate_user(user_id)
+
+
+def get_verified_tokens_cache_stats() -> Dict[str, int]:
+    return dict(verified_tokens_cache.stats)
@@ -21,8 +21,14 @@ from fittrackee.responses import (
     handle_error_and_return_response,
 )
 from fittrackee.visibility_levels import VisibilityLevel
-from fittrackee.workouts.models import Record, Workout, WorkoutSegment
+from fittrackee.workouts.models import (
+    Record,
+    Workout,
+    WorkoutsDailyStats,
+    WorkoutSegment,
+)
 
+from .counters import decrement_likes_counts
 from .exceptions import (
     BlockUserException,
     FollowRequestAlreadyRejectedError,
@@ -847,6 +853,9 @@ def delete_user(
             UserSportPreference.user_id == user.id
         ).delete()
         db.session.query(Record).filter(Record.user_id == user.id).delete()
+        db.session.query(WorkoutsDailyStats).filter(
+            WorkoutsDailyStats.user_id == user.id
+        ).delete()
         # delete all equipment associated with this user
         db.session.query(Equipment).filter(
             Equipment.user_id == user.id
@@ -856,6 +865,8 @@ def delete_user(
         ).delete(synchronize_session=False)
         db.session.query(Workout).filter(Workout.user_id == user.id).delete()
         db.session.query(UserTask).filter(UserTask.user_id == user.id).delete()
+        # likes are deleted by database cascade
+        decrement_likes_counts(user.id)
         db.session.flush()
         user_picture = user.picture
         db.session.delete(user)
@@ -1643,6 +1654,7 @@ def get_user_latest_workouts(
                 "liked": false,
                 "likes_count": 0,
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": null,
                 "max_speed": 10.0,
@@ -1755,13 +1767,12 @@ def get_user_latest_workouts(
         Workout.user_id == user.id,
     )
     if not auth_user or (
-        auth_user.id != user.id
-        and auth_user.id not in user.get_followers_user_ids()
+        auth_user.id != user.id and not user.has_follower(auth_user)
     ):
         workouts_query = workouts_query.filter(
             Workout.workout_visibility == VisibilityLevel.PUBLIC
         )
-    elif auth_user.id in user.get_followers_user_ids():
+    elif user.has_follower(auth_user):
         workouts_query = workouts_query.filter(
             Workout.workout_visibility.in_(
                 [VisibilityLevel.PUBLIC, VisibilityLevel.FOLLOWERS]
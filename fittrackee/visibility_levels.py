@@ -71,8 +71,7 @@ def can_view(
 
     if (
         target_object.__getattribute__(visibility) == VisibilityLevel.FOLLOWERS
-        and user in owner.followers.all()
-    ):
+    ) and owner.has_follower(user):
         return True
 
     # visibility level is private
@@ -101,8 +100,7 @@ def can_view_workout_data(
 
     if (
         getattr(target_user, attribute) == VisibilityLevel.FOLLOWERS
-        and user in target_user.followers.all()
-    ):
+    ) and target_user.has_follower(user):
         return True
 
     # visibility level is private
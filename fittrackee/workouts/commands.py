@@ -6,10 +6,20 @@ from typing import Optional
 
 import click
 
+from fittrackee import db
 from fittrackee.cli.app import app
+from fittrackee.constants import MapStatus
 from fittrackee.users.models import User
 from fittrackee.workouts.constants import WORKOUT_ALLOWED_EXTENSIONS
-from fittrackee.workouts.models import Sport
+from fittrackee.workouts.models import (
+    Sport,
+    Workout,
+    WorkoutSegment,
+    rebuild_workouts_daily_stats,
+)
+from fittrackee.workouts.services.workout_map_service import (
+    WorkoutMapService,
+)
 from fittrackee.workouts.services.workouts_from_file_refresh_service import (
     WorkoutsFromFileRefreshService,
 )
@@ -468,3 +478,164 @@ def refresh_workouts(
             )
 
         logger.info("\nDone.")
+
+
+@workouts_cli.command("convert_points")
+@click.option(
+    "--per-page",
+    help="number of segments converted per batch (default: 100)",
+    type=int,
+    callback=validate_number,
+    default=100,
+)
+@click.option(
+    "--verbose",
+    "-v",
+    "verbose",
+    is_flag=True,
+    default=False,
+    help="enable verbose output log (default: disabled)",
+)
+def convert_segments_points(per_page: int, verbose: bool) -> None:
+    """
+    Convert segments points stored in JSON into compressed points.
+    """
+    with app.app_context():
+        logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+        converted = 0
+        while True:
+            segments = (
+                WorkoutSegment.query.filter(
+                    WorkoutSegment.points_data.is_(None)
+                )
+                .order_by(WorkoutSegment.start_date)
+                .limit(per_page)
+                .all()
+            )
+            if not segments:
+                break
+            for segment in segments:
+                segment.points = segment.points
+                logger.debug(f"segment '{segment.short_id}' converted.")
+            db.session.commit()
+            converted += len(segments)
+        logger.info(f"\nSegments converted: {converted}.")
+
+
+@workouts_cli.command("render_maps")
+@click.option(
+    "--status",
+    type=click.Choice(["pending", "error", "all"]),
+    default="pending",
+    help=(
+        "status of maps to render, 'all' to render all workouts maps "
+        "(default: pending)"
+    ),
+)
+@click.option(
+    "--user",
+    help="username of workouts owner",
+    type=str,
+    callback=validate_user,
+)
+@click.option(
+    "--queue",
+    "queue",
+    is_flag=True,
+    default=False,
+    help=(
+        "send rendering tasks to the queue instead of rendering maps "
+        "(default: disabled)"
+    ),
+)
+@click.option(
+    "--verbose",
+    "-v",
+    "verbose",
+    is_flag=True,
+    default=False,
+    help="enable verbose output log (default: disabled)",
+)
+def render_maps(
+    status: str, user: Optional[str], queue: bool, verbose: bool
+) -> None:
+    """
+    Render workouts map images (for instance when rendering tasks failed or
+    when no workers are running).
+    """
+    with app.app_context():
+        logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+        workouts_query = Workout.query.filter(Workout.map.is_not(None))
+        if status != "all":
+            workouts_query = workouts_query.filter(
+                Workout.map_status == MapStatus(status)
+            )
+        if user:
+            workouts_query = workouts_query.join(
+                User, User.id == Workout.user_id
+            ).filter(User.username == user)
+
+        count = 0
+        errored = 0
+        for workout in workouts_query.order_by(Workout.id).all():
+            map_service = WorkoutMapService(workout)
+            if queue:
+                map_service.add_rendering_task()
+                db.session.commit()
+                logger.debug(f"task sent for workout '{workout.short_id}'.")
+                count += 1
+                continue
+            try:
+                map_service.render()
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(
+                    f"error when rendering map for workout "
+                    f"'{workout.short_id}': {e}"
+                )
+                errored += 1
+                continue
+            logger.debug(f"map rendered for workout '{workout.short_id}'.")
+            count += 1
+
+        if queue:
+            logger.info(f"\nRendering tasks sent: {count}.")
+        else:
+            logger.info(f"\nMaps rendered: {count} (errors: {errored}).")
+
+
+@workouts_cli.command("rebuild_stats")
+@click.option(
+    "--user",
+    help=(
+        "username of workouts owner (if not provided, statistics are "
+        "rebuilt for all users)"
+    ),
+    type=str,
+    callback=validate_user,
+)
+@click.option(
+    "--verbose",
+    "-v",
+    "verbose",
+    is_flag=True,
+    default=False,
+    help="enable verbose output log (default: disabled)",
+)
+def rebuild_stats(user: Optional[str], verbose: bool) -> None:
+    """
+    Rebuild workouts daily statistics used by statistics endpoints.
+    """
+    with app.app_context():
+        logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+        users_query = db.session.query(User.id, User.username)
+        if user:
+            users_query = users_query.filter(User.username == user)
+        count = 0
+        for user_id, username in users_query.order_by(User.id).all():
+            rebuild_workouts_daily_stats(db.session.connection(), user_id)
+            db.session.commit()
+            logger.debug(f"statistics rebuilt for user '{username}'.")
+            count += 1
+        logger.info(f"\nUsers statistics rebuilt: {count}.")
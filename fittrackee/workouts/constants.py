@@ -86,3 +86,18 @@ TRACK_EXTENSION_NSMAP = {
 }
 
 WGS84_CRS = 4326  # World Geodetic System 1984, in degrees
+
+# simplified segments geometries, used to display tracks on maps depending
+# on zoom level: (segment column, tolerance in degrees, max zoom level)
+SIMPLIFIED_GEOMETRIES = [
+    ("geom_low", 0.001, 9),  # ~110m
+    ("geom_medium", 0.0002, 12),  # ~22m
+    ("geom_high", 0.00005, 15),  # ~5m
+]
+
+# highest zoom level of map tiles
+MAX_ZOOM = 22
+
+# approximate size of start points clusters on global map, in pixels
+# (for 256x256 pixels tiles)
+GLOBAL_MAP_CLUSTER_SIZE = 60
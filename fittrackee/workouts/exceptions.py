@@ -1,5 +1,15 @@
 from fittrackee.exceptions import GenericException
 
+from .constants import MAX_ZOOM
+
+
+class InvalidBboxException(Exception):
+    def __init__(self) -> None:
+        super().__init__(
+            "invalid bbox, must be a string with min. longitude, min. "
+            "latitude, max. longitude and max. latitude, separated by a comma"
+        )
+
 
 class InvalidCoordinatesException(Exception):
     def __init__(self) -> None:
@@ -19,6 +29,13 @@ class InvalidRadiusException(Exception):
         super().__init__("invalid radius, must be an float greater than zero")
 
 
+class InvalidZoomException(Exception):
+    def __init__(self) -> None:
+        super().__init__(
+            f"invalid zoom, must be an integer between 0 and {MAX_ZOOM}"
+        )
+
+
 class InvalidVisibilityException(Exception):
     def __init__(self) -> None:
         super().__init__("invalid value for visibility")
@@ -1,27 +1,52 @@
 import os
-from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid4
 
 from geoalchemy2 import Geometry, WKBElement
 from shapely import LineString, Point
+from sqlalchemy import column, func, or_, select, tuple_, values
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.event import listens_for
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+    relationship,
+    selectinload,
+)
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.orm.session import Session, object_session
 from sqlalchemy.sql.expression import nulls_last, text
 from sqlalchemy.types import JSON, Enum
 
 from fittrackee import BaseModel, appLog, db
-from fittrackee.constants import ElevationDataSource, PaceSpeedDisplay
+from fittrackee.constants import (
+    ElevationDataSource,
+    MapStatus,
+    PaceSpeedDisplay,
+    StorageCategory,
+)
 from fittrackee.database import PSQL_INTEGER_LIMIT, TZDateTime
 from fittrackee.dates import aware_utc_now
 from fittrackee.equipments.models import WorkoutEquipment
 from fittrackee.files import get_absolute_file_path, get_file_extension
+from fittrackee.users.storage import get_file_size, update_storage_usage
 from fittrackee.utils import encode_uuid
 from fittrackee.visibility_levels import (
     VisibilityLevel,
@@ -32,6 +57,7 @@ from fittrackee.visibility_levels import (
 
 from .constants import (
     PACE_SPORTS,
+    SIMPLIFIED_GEOMETRIES,
     WGS84_CRS,
 )
 from .exceptions import WorkoutForbiddenException
@@ -39,6 +65,11 @@ from .utils.convert import (
     convert_in_duration,
     convert_value_to_integer,
 )
+from .utils.points import (
+    SegmentPointsReader,
+    encode_points,
+    get_segment_points_reader,
+)
 from .utils.sports import (
     get_cadence,
     get_elevation_data,
@@ -49,7 +80,10 @@ from .utils.sports import (
 )
 
 if TYPE_CHECKING:
+    from sqlalchemy.engine.row import Row
     from sqlalchemy.orm.attributes import AttributeEvent
+    from sqlalchemy.sql import ColumnElement, Select
+    from sqlalchemy.sql.selectable import ScalarSelect
 
     from fittrackee.comments.models import Comment
     from fittrackee.equipments.models import Equipment
@@ -103,48 +137,312 @@ RECORD_TYPES_COLUMNS_MATCHING = {
     "MS": "max_speed",  # 'Max speed'
 }
 RECORD_TYPES = list(RECORD_TYPES_COLUMNS_MATCHING.keys())
+LOWEST_VALUE_RECORD_TYPES = ["AP", "BP"]
+# workouts columns with sum and count of non-null values in daily stats
+WORKOUTS_DAILY_STATS_COLUMNS = [
+    "distance",
+    "moving",
+    "ascent",
+    "descent",
+    "ave_speed",
+    "ave_pace",
+]
+WORKOUTS_DAILY_STATS_TABLE_COLUMNS = [
+    "user_id",
+    "sport_id",
+    "day",
+    "total_workouts",
+    *[
+        f"{column}_{aggregate}"
+        for column in WORKOUTS_DAILY_STATS_COLUMNS
+        for aggregate in ["sum", "count"]
+    ],
+    "calories_sum",
+]
 DESCRIPTION_MAX_CHARACTERS = 10000
 NOTES_MAX_CHARACTERS = 500
 TITLE_MAX_CHARACTERS = 255
 
 
+# session info keys
+DEFERRED_RECORDS_UPDATE = "deferred_records_update"
+RECORDS_TO_RECALCULATE = "records_to_recalculate"
+
+
+def get_record_value(record_type: str, workout: "Workout") -> Optional[int]:
+    """
+    Return value as stored in records (null or zero values are not stored).
+    """
+    return convert_value_to_integer(
+        record_type,
+        getattr(workout, RECORD_TYPES_COLUMNS_MATCHING[record_type]),
+    )
+
+
+def is_better_record_value(
+    record_type: str,
+    value: int,
+    workout_date: datetime,
+    other_value: int,
+    other_workout_date: datetime,
+) -> bool:
+    """
+    On same value, the oldest workout holds the record.
+    """
+    if value == other_value:
+        return workout_date < other_workout_date
+    if record_type in LOWEST_VALUE_RECORD_TYPES:
+        return value < other_value
+    return value > other_value
+
+
+def upsert_records(connection: Connection, records: List[Dict]) -> None:
+    if not records:
+        return
+    record_table = Record.__table__  # type: ignore
+    statement = postgresql.insert(record_table).values(records)
+    connection.execute(
+        statement.on_conflict_do_update(
+            constraint="user_sports_records",
+            set_={
+                column: statement.excluded[column]
+                for column in [
+                    "workout_id",
+                    "workout_uuid",
+                    "workout_date",
+                    "value",
+                ]
+            },
+        )
+    )
+
+
+def recalculate_records(
+    connection: Connection,
+    user_id: int,
+    sport_ids: Iterable[int],
+    record_types: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Recalculate records from all user workouts for given sports with a
+    single query, record holders being ranked with window functions.
+    Records without value are deleted.
+    """
+    sport_ids = list(sport_ids)
+    record_types = RECORD_TYPES if record_types is None else list(record_types)
+    if not sport_ids or not record_types:
+        return
+
+    ranks = []
+    for record_type in record_types:
+        column = getattr(Workout, RECORD_TYPES_COLUMNS_MATCHING[record_type])
+        if record_type in LOWEST_VALUE_RECORD_TYPES:
+            # zero pace is returned for workouts without speed
+            column_sorted = nulls_last(
+                func.nullif(column, timedelta(seconds=0)).asc()
+            )
+        else:
+            column_sorted = nulls_last(column.desc())
+        ranks.append(
+            func.row_number()
+            .over(
+                partition_by=Workout.sport_id,
+                order_by=[column_sorted, Workout.workout_date],
+            )
+            .label(f"{record_type}_rank")
+        )
+    ranked_workouts = (
+        select(
+            Workout.id,
+            Workout.uuid,
+            Workout.sport_id,
+            Workout.workout_date,
+            *[
+                getattr(Workout, RECORD_TYPES_COLUMNS_MATCHING[record_type])
+                for record_type in record_types
+            ],
+            *ranks,
+        )
+        .where(Workout.user_id == user_id, Workout.sport_id.in_(sport_ids))
+        .subquery()
+    )
+    records_workouts = connection.execute(
+        select(ranked_workouts).where(
+            or_(
+                *[
+                    ranked_workouts.c[f"{record_type}_rank"] == 1
+                    for record_type in record_types
+                ]
+            )
+        )
+    ).mappings()
+
+    new_records = []
+    for workout in records_workouts:
+        for record_type in record_types:
+            if workout[f"{record_type}_rank"] != 1:
+                continue
+            value = convert_value_to_integer(
+                record_type,
+                workout[RECORD_TYPES_COLUMNS_MATCHING[record_type]],
+            )
+            if not value:
+                continue
+            new_records.append(
+                {
+                    "user_id": user_id,
+                    "sport_id": workout["sport_id"],
+                    "record_type": record_type,
+                    "workout_id": workout["id"],
+                    "workout_uuid": workout["uuid"],
+                    "workout_date": workout["workout_date"],
+                    "value": value,
+                }
+            )
+    upsert_records(connection, new_records)
+
+    record_table = Record.__table__  # type: ignore
+    connection.execute(
+        record_table.delete().where(
+            record_table.c.user_id == user_id,
+            record_table.c.sport_id.in_(sport_ids),
+            record_table.c.record_type.in_(record_types),
+            tuple_(record_table.c.sport_id, record_table.c.record_type).not_in(
+                [
+                    (record["sport_id"], record["record_type"])
+                    for record in new_records
+                ]
+            ),
+        )
+    )
+
+
 def update_records(
-    user_id: int, sport_id: int, connection: Connection, session: Session
+    workout: "Workout", connection: Connection, new_workout: bool = False
 ) -> None:
+    """
+    Update records incrementally, by comparing workout values with current
+    records.
+    Records are recalculated only when workout held a record and its value
+    is downgraded or its sport has changed.
+    """
+    session = object_session(workout)
+    deferred_records = (
+        session.info.get(DEFERRED_RECORDS_UPDATE) if session else None
+    )
     record_table = Record.__table__  # type: ignore
-    new_records = Workout.get_user_workout_records(user_id, sport_id)
-    for record_type, record_data in new_records.items():
-        if record_data["record_value"]:
-            record = Record.query.filter_by(
-                user_id=user_id, sport_id=sport_id, record_type=record_type
-            ).first()
-            if record:
-                value = convert_value_to_integer(
-                    record_type, record_data["record_value"]
-                )
-                connection.execute(
-                    record_table.update()
-                    .where(record_table.c.id == record.id)
-                    .values(
-                        value=value,
-                        workout_id=record_data["workout"].id,
-                        workout_uuid=record_data["workout"].uuid,
-                        workout_date=record_data["workout"].workout_date,
-                    )
-                )
-            else:
-                new_record = Record(
-                    workout=record_data["workout"], record_type=record_type
-                )
-                new_record.value = record_data["record_value"]  # type: ignore
-                session.add(new_record)
+
+    if deferred_records is not None:
+        deferred_records.add((workout.user_id, workout.sport_id))
+        if not new_workout:
+            for sport_id in connection.execute(
+                select(record_table.c.sport_id)
+                .where(record_table.c.workout_id == workout.id)
+                .distinct()
+            ).scalars():
+                deferred_records.add((workout.user_id, sport_id))
+        return
+
+    current_records: Dict[str, "Row"] = {}
+    records_to_recalculate: Dict[int, Set[str]] = {}
+    for existing_record in connection.execute(
+        select(
+            record_table.c.sport_id,
+            record_table.c.record_type,
+            record_table.c.workout_id,
+            record_table.c.workout_date,
+            record_table.c.value,
+        ).where(
+            record_table.c.user_id == workout.user_id,
+            or_(
+                record_table.c.sport_id == workout.sport_id,
+                record_table.c.workout_id == workout.id,
+            ),
+        )
+    ):
+        if existing_record.sport_id != workout.sport_id:
+            # workout sport has changed
+            records_to_recalculate.setdefault(
+                existing_record.sport_id, set()
+            ).add(existing_record.record_type)
         else:
-            connection.execute(
-                record_table.delete()
-                .where(record_table.c.user_id == user_id)
-                .where(record_table.c.sport_id == sport_id)
-                .where(record_table.c.record_type == record_type)
+            current_records[existing_record.record_type] = existing_record
+
+    new_records = []
+    for record_type in RECORD_TYPES:
+        value = get_record_value(record_type, workout)
+        record = current_records.get(record_type)
+        if record and record.workout_id == workout.id:
+            if not value or is_better_record_value(
+                record_type,
+                record.value,
+                record.workout_date,
+                value,
+                workout.workout_date,
+            ):
+                records_to_recalculate.setdefault(workout.sport_id, set()).add(
+                    record_type
+                )
+                continue
+            if (
+                value == record.value
+                and workout.workout_date == record.workout_date
+            ):
+                continue
+        elif not value or (
+            record
+            and not is_better_record_value(
+                record_type,
+                value,
+                workout.workout_date,
+                record.value,
+                record.workout_date,
             )
+        ):
+            continue
+        new_records.append(
+            {
+                "user_id": workout.user_id,
+                "sport_id": workout.sport_id,
+                "record_type": record_type,
+                "workout_id": workout.id,
+                "workout_uuid": workout.uuid,
+                "workout_date": workout.workout_date,
+                "value": value,
+            }
+        )
+    upsert_records(connection, new_records)
+
+    for sport_id, record_types in records_to_recalculate.items():
+        recalculate_records(
+            connection, workout.user_id, [sport_id], record_types
+        )
+
+
+@contextmanager
+def deferred_records_update(session: Session) -> Iterator[None]:
+    """
+    Records are not updated on each workout flush, but recalculated once
+    for all sports of added or updated workouts when exiting context (for
+    instance on archive import).
+    """
+    deferred_records: Set[Tuple[int, int]] = set()
+    session.info[DEFERRED_RECORDS_UPDATE] = deferred_records
+    try:
+        yield
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        del session.info[DEFERRED_RECORDS_UPDATE]
+        if deferred_records:
+            sports_by_user: Dict[int, Set[int]] = {}
+            for user_id, sport_id in deferred_records:
+                sports_by_user.setdefault(user_id, set()).add(sport_id)
+            connection = session.connection()
+            for user_id, sport_ids in sports_by_user.items():
+                recalculate_records(connection, user_id, sport_ids)
+            session.commit()
 
 
 def format_value(
@@ -187,6 +485,195 @@ def update_equipments(workout: "Workout", connection: Connection) -> None:
         )
 
 
+def update_user_workouts_count(
+    connection: Connection, user_id: int, increment: int
+) -> None:
+    from fittrackee.users.models import User
+
+    users_table = User.__table__  # type: ignore
+    connection.execute(
+        users_table.update()
+        .where(users_table.c.id == user_id)
+        .values(workouts_count=users_table.c.workouts_count + increment)
+    )
+
+
+def update_workout_likes_count(
+    connection: Connection, workout_id: int, increment: int
+) -> None:
+    workouts_table = Workout.__table__  # type: ignore
+    connection.execute(
+        workouts_table.update()
+        .where(workouts_table.c.id == workout_id)
+        .values(
+            likes_count=workouts_table.c.likes_count + increment,
+            # a like does not modify workout ('onupdate' is ignored)
+            modification_date=workouts_table.c.modification_date,
+        )
+    )
+
+
+def get_local_date(
+    date_column: Any, user_timezone: Any
+) -> "ColumnElement[date]":
+    """
+    Return date in user timezone (workout date is stored without timezone
+    in database)
+    """
+    return func.date(
+        func.timezone(
+            func.coalesce(user_timezone, "UTC"),
+            func.timezone("Z", date_column),
+        )
+    )
+
+
+def get_daily_stats_query(
+    user_id: int, user_timezone: Any, *filters: Any
+) -> "Select":
+    workout_day = get_local_date(Workout.workout_date, user_timezone)
+    return (
+        select(
+            Workout.user_id,
+            Workout.sport_id,
+            workout_day,
+            func.count(Workout.id),
+            *[
+                aggregate
+                for column in WORKOUTS_DAILY_STATS_COLUMNS
+                for aggregate in [
+                    func.sum(getattr(Workout, column)),
+                    func.count(getattr(Workout, column)),
+                ]
+            ],
+            func.sum(Workout.calories),
+        )
+        .where(Workout.user_id == user_id, *filters)
+        .group_by(Workout.user_id, Workout.sport_id, workout_day)
+    )
+
+
+def get_user_timezone_subquery(user_id: int) -> "ScalarSelect":
+    from fittrackee.users.models import User
+
+    return select(User.timezone).where(User.id == user_id).scalar_subquery()
+
+
+def update_workouts_daily_stats(
+    connection: Connection,
+    user_id: int,
+    workouts_keys: Iterable[Tuple[int, datetime]],
+) -> None:
+    """
+    Recalculate daily statistics of days containing given workouts dates
+    for given sports (days are calculated in user timezone).
+    """
+    workouts_keys = list(workouts_keys)
+    if not workouts_keys:
+        return
+
+    user_timezone = get_user_timezone_subquery(user_id)
+    keys = values(
+        column("sport_id", db.Integer),
+        column("workout_date", TZDateTime),
+        name="keys",
+    ).data(workouts_keys)
+    days = (
+        select(
+            keys.c.sport_id,
+            get_local_date(keys.c.workout_date, user_timezone).label("day"),
+        )
+        .distinct()
+        .cte("days")
+    )
+    daily_stats_table = WorkoutsDailyStats.__table__  # type: ignore
+    connection.execute(
+        daily_stats_table.delete().where(
+            daily_stats_table.c.user_id == user_id,
+            tuple_(daily_stats_table.c.sport_id, daily_stats_table.c.day).in_(
+                select(days.c.sport_id, days.c.day)
+            ),
+        )
+    )
+
+    # a day in user timezone is included in the 24 hours around workout
+    # dates
+    workouts_dates = [workout_date for _, workout_date in workouts_keys]
+    connection.execute(
+        daily_stats_table.insert().from_select(
+            WORKOUTS_DAILY_STATS_TABLE_COLUMNS,
+            get_daily_stats_query(
+                user_id,
+                user_timezone,
+                Workout.workout_date
+                >= min(workouts_dates) - timedelta(days=1),
+                Workout.workout_date
+                <= max(workouts_dates) + timedelta(days=1),
+                tuple_(
+                    Workout.sport_id,
+                    get_local_date(Workout.workout_date, user_timezone),
+                ).in_(select(days.c.sport_id, days.c.day)),
+            ),
+        )
+    )
+
+
+def rebuild_workouts_daily_stats(connection: Connection, user_id: int) -> None:
+    """
+    Recalculate all daily statistics for a user (for instance, when user
+    timezone changes).
+    """
+    daily_stats_table = WorkoutsDailyStats.__table__  # type: ignore
+    connection.execute(
+        daily_stats_table.delete().where(
+            daily_stats_table.c.user_id == user_id
+        )
+    )
+    connection.execute(
+        daily_stats_table.insert().from_select(
+            WORKOUTS_DAILY_STATS_TABLE_COLUMNS,
+            get_daily_stats_query(
+                user_id, get_user_timezone_subquery(user_id)
+            ),
+        )
+    )
+
+
+def get_workout_daily_stats_keys(
+    workout: "Workout", check_changes: bool = False
+) -> Set[Tuple[int, datetime]]:
+    """
+    Return sports and dates of daily statistics to update, including
+    previous values when sport or date has changed.
+    If 'check_changes' is True, no keys are returned when values used in
+    statistics are not modified.
+    """
+    instance_state = db.inspect(workout)
+    if check_changes and not any(
+        instance_state.attrs[attribute].load_history().has_changes()
+        for attribute in [
+            "sport_id",
+            "workout_date",
+            "calories",
+            *WORKOUTS_DAILY_STATS_COLUMNS,
+        ]
+    ):
+        return set()
+    sport_ids = {
+        workout.sport_id,
+        *instance_state.attrs.sport_id.load_history().deleted,
+    }
+    workout_dates = {
+        workout.workout_date,
+        *instance_state.attrs.workout_date.load_history().deleted,
+    }
+    return {
+        (sport_id, workout_date)
+        for sport_id in sport_ids
+        for workout_date in workout_dates
+    }
+
+
 class Sport(BaseModel):
     __tablename__ = "sports"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -330,6 +817,11 @@ class Workout(BaseModel):
     map_id: Mapped[Optional[str]] = mapped_column(
         db.String(50), index=True, nullable=True
     )
+    # map image is generated asynchronously when 'STATICMAP_ASYNC_RENDERING'
+    # is enabled ('map_id' is then a temporary id until image is ready)
+    map_status: Mapped[Optional[MapStatus]] = mapped_column(
+        Enum(MapStatus, name="map_status"), nullable=True
+    )
     weather_start: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
     weather_end: Mapped[Optional[Dict]] = mapped_column(JSON, nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(
@@ -384,6 +876,10 @@ class Workout(BaseModel):
         nullable=False,
     )
     calories: Mapped[Optional[int]] = mapped_column(nullable=True)  # kcal
+    # denormalized counter, updated by listeners
+    likes_count: Mapped[int] = mapped_column(
+        server_default="0", nullable=False
+    )
 
     user: Mapped["User"] = relationship(
         "User", lazy="select", single_parent=True
@@ -527,6 +1023,7 @@ class Workout(BaseModel):
         with_equipments: bool = False,  # for workouts list
         force_display_speed: bool = False,  # for workouts list
         sport_data_visibility: Optional["SportDisplayedData"] = None,
+        prefetched_data: Optional["WorkoutsPrefetchedData"] = None,
     ) -> Dict:
         """
         Used by Workout serializer and data export
@@ -546,6 +1043,8 @@ class Workout(BaseModel):
           3rd-party apps updating workouts equipments
         - force_display_speed: only used when 'light' is True, it allows to
           display speed when multiple sports are displayed
+        - prefetched_data: data loaded in bulk when serializing a list of
+          workouts
         """
         for_report = (
             for_report and user is not None and user.has_moderator_rights
@@ -685,8 +1184,16 @@ class Workout(BaseModel):
                 self.notes if user and user.id == self.user_id else None
             ),
             "description": self.description,
-            "likes_count": self.likes.count(),
-            "liked": self.liked_by(user) if user else False,
+            "likes_count": self.likes_count,
+            "liked": (
+                (
+                    self.id in prefetched_data.liked_workout_ids
+                    if prefetched_data
+                    else self.liked_by(user)
+                )
+                if user
+                else False
+            ),
             "original_file": (
                 get_file_extension(self.original_file)
                 if self.original_file and user and user.id == self.user_id
@@ -703,12 +1210,16 @@ class Workout(BaseModel):
         light: bool = True,  # for workouts list and timeline
         with_equipments: bool = False,  # for workouts list
         force_display_speed: bool = False,  # for workouts list
+        prefetched_data: Optional["WorkoutsPrefetchedData"] = None,
     ) -> Dict:
         """
         If 'light' is False, 'with_equipments' and 'force_display_speed' are
         ignored.
 
         'force_display_speed' allows to override sport preferences
+
+        'prefetched_data' is provided when serializing a list of workouts
+        (see 'serialize_workouts')
         """
 
         for_report = (
@@ -744,6 +1255,7 @@ class Workout(BaseModel):
             with_equipments=with_equipments,
             force_display_speed=force_display_speed,
             sport_data_visibility=sport_data_visibility,
+            prefetched_data=prefetched_data,
         )
 
         workout["map"] = (
@@ -751,6 +1263,11 @@ class Workout(BaseModel):
             if self.map and can_see_map_data and additional_data
             else None
         )
+        workout["map_status"] = (
+            self.map_status.value
+            if workout["map"] and self.map_status
+            else None
+        )
         workout["with_file"] = (
             self.original_file is not None
             and can_see_map_data
@@ -762,12 +1279,21 @@ class Workout(BaseModel):
             and additional_data
         )
         workout["suspended"] = is_workout_suspended
-        workout["user"] = self.user.serialize()
+        workout["user"] = (
+            prefetched_data.get_serialized_user(self.user)
+            if prefetched_data
+            else self.user.serialize()
+        )
 
         if is_owner or for_report:
             workout["suspended_at"] = self.suspended_at
-            if self.suspension_action:
-                workout["suspension"] = self.suspension_action.serialize(
+            suspension_action = (
+                prefetched_data.suspension_actions.get(self.id)
+                if prefetched_data
+                else self.suspension_action
+            )
+            if suspension_action:
+                workout["suspension"] = suspension_action.serialize(
                     current_user=user,  # type: ignore
                     full=False,
                 )
@@ -866,43 +1392,124 @@ class Workout(BaseModel):
         )
         return workout
 
-    @classmethod
-    def get_user_workout_records(cls, user_id: int, sport_id: int) -> Dict:
-        """
-        Note:
-        Values for ascent are null for workouts without gpx
-        """
-        records = {}
-        for record_type, column in RECORD_TYPES_COLUMNS_MATCHING.items():
-            workout_column = getattr(Workout, column)
-            column_sorted = nulls_last(
-                workout_column.asc()
-                if record_type in ["AP", "BP"]
-                else workout_column.desc()
-            )
-            record_workout = (
-                Workout.query.filter(
-                    Workout.user_id == user_id, Workout.sport_id == sport_id
-                )
-                .order_by(column_sorted, Workout.workout_date)
-                .first()
+
+@dataclass
+class WorkoutsPrefetchedData:
+    """
+    Data loaded in bulk for a list of workouts, to avoid running queries for
+    each serialized workout
+    """
+
+    liked_workout_ids: Set[int] = field(default_factory=set)
+    suspension_actions: Dict[int, "ReportAction"] = field(default_factory=dict)
+    serialized_users: Dict[int, Dict] = field(default_factory=dict)
+
+    def get_serialized_user(self, user: "User") -> Dict:
+        if user.id not in self.serialized_users:
+            self.serialized_users[user.id] = user.serialize()
+        return self.serialized_users[user.id]
+
+
+def prefetch_workouts_data(
+    workouts: List[Workout],
+    user: Optional["User"],
+    *,
+    light: bool = True,
+    with_equipments: bool = False,
+) -> WorkoutsPrefetchedData:
+    """
+    Load relationships needed by serializer for all workouts in one query
+    per relationship, as well as likes and suspension actions.
+    """
+    from fittrackee.reports.models import ReportAction
+
+    prefetched_data = WorkoutsPrefetchedData()
+    if not workouts:
+        return prefetched_data
+
+    workouts_ids = [workout.id for workout in workouts]
+    options = [selectinload(Workout.user), selectinload(Workout.records)]
+    if not light or with_equipments:
+        options.append(selectinload(Workout.equipments))
+    if not light:
+        options.append(selectinload(Workout.segments))
+    # already loaded workouts are not refreshed, only relationships
+    # not loaded yet are populated
+    Workout.query.options(*options).filter(Workout.id.in_(workouts_ids)).all()
+
+    suspended_workouts_ids = [
+        workout.id for workout in workouts if workout.suspended_at
+    ]
+    if suspended_workouts_ids:
+        # most recent suspension action for each workout
+        for action in (
+            ReportAction.query.filter(
+                ReportAction.workout_id.in_(suspended_workouts_ids),
+                ReportAction.action_type == "workout_suspension",
             )
-            records[record_type] = dict(
-                record_value=(
-                    getattr(record_workout, column) if record_workout else None
-                ),
-                workout=record_workout,
+            .order_by(ReportAction.created_at.asc())
+            .all()
+        ):
+            prefetched_data.suspension_actions[action.workout_id] = action
+
+    if not light and user:
+        prefetched_data.liked_workout_ids = {
+            workout_id
+            for (workout_id,) in db.session.query(WorkoutLike.workout_id)
+            .filter(
+                WorkoutLike.workout_id.in_(workouts_ids),
+                WorkoutLike.user_id == user.id,
             )
-        return records
+            .all()
+        }
+
+    return prefetched_data
+
+
+def serialize_workouts(
+    workouts: List[Workout],
+    *,
+    user: Optional["User"] = None,
+    params: Optional[Dict] = None,
+    light: bool = True,
+    with_equipments: bool = False,
+    force_display_speed: bool = False,
+) -> List[Dict]:
+    """
+    Serialize a list of workouts (for instance a page of workouts list or
+    timeline), returning the same data as 'Workout.serialize' with a fixed
+    number of queries for data shared between workouts.
+    """
+    prefetched_data = prefetch_workouts_data(
+        workouts, user, light=light, with_equipments=with_equipments
+    )
+    return [
+        workout.serialize(
+            user=user,
+            params=params,
+            light=light,
+            with_equipments=with_equipments,
+            force_display_speed=force_display_speed,
+            prefetched_data=prefetched_data,
+        )
+        for workout in workouts
+    ]
 
 
 @listens_for(Workout, "after_insert")
 def on_workout_insert(
     mapper: Mapper, connection: Connection, workout: Workout
 ) -> None:
+    update_user_workouts_count(connection, workout.user_id, 1)
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Any) -> None:
-        update_records(workout.user_id, workout.sport_id, connection, session)
+        update_records(workout, connection, new_workout=True)
+        update_workouts_daily_stats(
+            connection,
+            workout.user_id,
+            [(workout.sport_id, workout.workout_date)],
+        )
 
 
 @listens_for(Workout, "after_update")
@@ -913,24 +1520,27 @@ def on_workout_update(
     if workout_object and workout_object.is_modified(
         workout, include_collections=True
     ):
+        daily_stats_keys = get_workout_daily_stats_keys(
+            workout, check_changes=True
+        )
 
         @listens_for(db.Session, "after_flush", once=True)
         def receive_after_flush(session: Session, context: Any) -> None:
             if workout.equipments:
                 update_equipments(workout, connection)
-            sports_list = [workout.sport_id]
-            records = Record.query.filter_by(workout_id=workout.id).all()
-            for rec in records:
-                if rec.sport_id not in sports_list:
-                    sports_list.append(rec.sport_id)
-            for sport_id in sports_list:
-                update_records(workout.user_id, sport_id, connection, session)
+            update_records(workout, connection)
+            update_workouts_daily_stats(
+                connection, workout.user_id, daily_stats_keys
+            )
 
 
 @listens_for(Workout, "after_delete")
 def on_workout_delete(
     mapper: Mapper, connection: Connection, old_workout: "Workout"
 ) -> None:
+    daily_stats_keys = get_workout_daily_stats_keys(old_workout)
+    update_user_workouts_count(connection, old_workout.user_id, -1)
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Any) -> None:
         from fittrackee.users.models import Notification
@@ -940,14 +1550,28 @@ def on_workout_delete(
         if old_workout.equipments:
             raise Exception("equipments exists, remove them first")
 
+        deleted_files_sizes = {
+            StorageCategory.MAPS: 0,
+            StorageCategory.ORIGINAL_FILES: 0,
+        }
         if old_workout.map:
+            map_filepath = get_absolute_file_path(old_workout.map)
+            map_size = get_file_size(map_filepath)
             try:
-                os.remove(get_absolute_file_path(old_workout.map))
+                os.remove(map_filepath)
+                deleted_files_sizes[StorageCategory.MAPS] += map_size
             except OSError:
                 appLog.error("map file not found when deleting workout")
         if old_workout.original_file:
+            original_filepath = get_absolute_file_path(
+                old_workout.original_file
+            )
+            original_file_size = get_file_size(original_filepath)
             try:
-                os.remove(get_absolute_file_path(old_workout.original_file))
+                os.remove(original_filepath)
+                deleted_files_sizes[StorageCategory.ORIGINAL_FILES] += (
+                    original_file_size
+                )
             except OSError:
                 appLog.error("original file not found when deleting workout")
             # delete generated gpx file when original file is not a gpx
@@ -955,18 +1579,29 @@ def on_workout_delete(
                 old_workout.original_file
             )
             if original_file_extension != "gpx":
+                gpx_filepath = get_absolute_file_path(
+                    old_workout.original_file.replace(
+                        f".{original_file_extension}", ".gpx"
+                    )
+                )
+                gpx_file_size = get_file_size(gpx_filepath)
                 try:
-                    os.remove(
-                        get_absolute_file_path(
-                            old_workout.original_file.replace(
-                                f".{original_file_extension}", ".gpx"
-                            )
-                        )
+                    os.remove(gpx_filepath)
+                    deleted_files_sizes[StorageCategory.ORIGINAL_FILES] += (
+                        gpx_file_size
                     )
                 except OSError:
                     # note: .gpx files are no longer stored from
                     # version 1.1.0 onwards
                     pass
+        for category, size in deleted_files_sizes.items():
+            update_storage_usage(
+                connection, old_workout.user_id, category, -size
+            )
+
+        update_workouts_daily_stats(
+            connection, old_workout.user_id, daily_stats_keys
+        )
 
         Notification.query.filter(
             Notification.event_object_id == old_workout.id,
@@ -1012,6 +1647,12 @@ class WorkoutSegment(BaseModel):
         db.UniqueConstraint(
             "workout_id", "start_date", name="workout_id_start_date_unique"
         ),
+        # used by location filter (geodesic distance)
+        db.Index(
+            "ix_workout_segments_geom_geography",
+            text("geography(geom)"),
+            postgresql_using="gist",
+        ),
     )
 
     workout_id: Mapped[int] = mapped_column(db.ForeignKey("workouts.id"))
@@ -1054,8 +1695,31 @@ class WorkoutSegment(BaseModel):
         ),
         nullable=True,  # to handle pre-existing segments for now
     )
-    points: Mapped[List[Dict]] = mapped_column(
-        JSON, nullable=False, server_default="[]"
+    # simplified geometries for maps (see 'SIMPLIFIED_GEOMETRIES')
+    geom_low: Mapped[Optional["WKBElement"]] = mapped_column(
+        Geometry(
+            geometry_type="LINESTRING", srid=WGS84_CRS, spatial_index=False
+        ),
+        nullable=True,
+    )
+    geom_medium: Mapped[Optional["WKBElement"]] = mapped_column(
+        Geometry(
+            geometry_type="LINESTRING", srid=WGS84_CRS, spatial_index=False
+        ),
+        nullable=True,
+    )
+    geom_high: Mapped[Optional["WKBElement"]] = mapped_column(
+        Geometry(
+            geometry_type="LINESTRING", srid=WGS84_CRS, spatial_index=False
+        ),
+        nullable=True,
+    )
+    # points stored in JSON before points compression, see 'points_data'
+    _points: Mapped[List[Dict]] = mapped_column(
+        "points", JSON, nullable=False, server_default="[]"
+    )
+    points_data: Mapped[Optional[bytes]] = mapped_column(
+        db.LargeBinary, nullable=True
     )
     # to use as primary index in a next version
     uuid: Mapped[UUID] = mapped_column(
@@ -1094,7 +1758,40 @@ class WorkoutSegment(BaseModel):
         return encode_uuid(self.uuid)
 
     def store_geometry(self, coordinates: List[List[float]]) -> None:
-        self.geom = str(LineString(coordinates))  # type: ignore
+        line = LineString(coordinates)
+        self.geom = str(line)  # type: ignore
+        for column_name, tolerance, _ in SIMPLIFIED_GEOMETRIES:
+            setattr(
+                self,
+                column_name,
+                str(line.simplify(tolerance, preserve_topology=True)),
+            )
+
+    @classmethod
+    def get_geometry_for_zoom(cls, zoom: Optional[int]) -> "ColumnElement":
+        """
+        Return simplified geometry depending on map zoom level (full
+        resolution geometry if no zoom is provided, for highest levels or
+        when simplified geometry is not stored yet)
+        """
+        if zoom is not None:
+            for column_name, _, max_zoom in SIMPLIFIED_GEOMETRIES:
+                if zoom <= max_zoom:
+                    return func.coalesce(getattr(cls, column_name), cls.geom)
+        return cls.geom  # type: ignore[return-value]
+
+    @property
+    def points_reader(self) -> SegmentPointsReader:
+        return get_segment_points_reader(self.points_data, self._points)
+
+    @property
+    def points(self) -> List[Dict]:
+        return self.points_reader.get_points()
+
+    @points.setter
+    def points(self, points: List[Dict]) -> None:
+        self.points_data = encode_points(points)
+        self._points = []
 
     def serialize(
         self,
@@ -1242,22 +1939,102 @@ class Record(BaseModel):
 def on_record_delete(
     mapper: Mapper, connection: Connection, old_record: Record
 ) -> None:
-    @listens_for(db.Session, "after_flush", once=True)
-    def receive_after_flush(session: Session, context: Any) -> None:
-        workout = old_record.workout
-        new_records = Workout.get_user_workout_records(
-            workout.user_id, workout.sport_id
-        )
-        for record_type, record_data in new_records.items():
-            if (
-                record_data["record_value"]
-                and record_type == old_record.record_type
-            ):
-                new_record = Record(
-                    workout=record_data["workout"], record_type=record_type
+    # records deleted in the same flush (for instance when deleting a
+    # workout) are recalculated once
+    session = object_session(old_record) or db.session()
+    deferred_records = session.info.get(DEFERRED_RECORDS_UPDATE)
+    if deferred_records is not None:
+        deferred_records.add((old_record.user_id, old_record.sport_id))
+        return
+
+    records_to_recalculate = session.info.get(RECORDS_TO_RECALCULATE)
+    if records_to_recalculate is None:
+        records_to_recalculate = session.info[RECORDS_TO_RECALCULATE] = {}
+
+        @listens_for(session, "after_flush", once=True)
+        def receive_after_flush(session: Session, context: Any) -> None:
+            for (user_id, sport_id), record_types in session.info.pop(
+                RECORDS_TO_RECALCULATE
+            ).items():
+                recalculate_records(
+                    connection, user_id, [sport_id], record_types
                 )
-                new_record.value = record_data["record_value"]  # type: ignore
-                session.add(new_record)
+
+    records_to_recalculate.setdefault(
+        (old_record.user_id, old_record.sport_id), set()
+    ).add(old_record.record_type)
+
+
+class WorkoutsDailyStats(BaseModel):
+    """
+    Workouts statistics by user, sport and day (in user timezone), used by
+    statistics endpoints.
+    Sums and counts of non-null values are stored to calculate averages.
+    """
+
+    __tablename__ = "workouts_daily_stats"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id", "sport_id", "day", name="user_sport_daily_stats"
+        ),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id"), nullable=False
+    )
+    sport_id: Mapped[int] = mapped_column(
+        db.ForeignKey("sports.id"), nullable=False
+    )
+    day: Mapped[date] = mapped_column(db.Date, nullable=False)
+    total_workouts: Mapped[int] = mapped_column(nullable=False)
+    distance_sum: Mapped[Optional[float]] = mapped_column(
+        db.Numeric(12, 3), nullable=True
+    )
+    distance_count: Mapped[int] = mapped_column(nullable=False)
+    moving_sum: Mapped[Optional[timedelta]] = mapped_column(nullable=True)
+    moving_count: Mapped[int] = mapped_column(nullable=False)
+    ascent_sum: Mapped[Optional[float]] = mapped_column(
+        db.Numeric(12, 3), nullable=True
+    )
+    ascent_count: Mapped[int] = mapped_column(nullable=False)
+    descent_sum: Mapped[Optional[float]] = mapped_column(
+        db.Numeric(12, 3), nullable=True
+    )
+    descent_count: Mapped[int] = mapped_column(nullable=False)
+    ave_speed_sum: Mapped[Optional[float]] = mapped_column(
+        db.Numeric(12, 2), nullable=True
+    )
+    ave_speed_count: Mapped[int] = mapped_column(nullable=False)
+    ave_pace_sum: Mapped[Optional[timedelta]] = mapped_column(nullable=True)
+    ave_pace_count: Mapped[int] = mapped_column(nullable=False)
+    calories_sum: Mapped[Optional[int]] = mapped_column(
+        db.BigInteger, nullable=True
+    )
+
+    def __str__(self) -> str:
+        return (
+            f"<WorkoutsDailyStats {self.user_id} - {self.sport_id} - "
+            f"{self.day}>"
+        )
+
+
+class ElevationCache(BaseModel):
+    """
+    Elevations returned by elevation services, on a grid of quantized
+    coordinates (see elevation services)
+    """
+
+    __tablename__ = "elevations_cache"
+    source: Mapped[str] = mapped_column(db.String(50), primary_key=True)
+    latitude: Mapped[int] = mapped_column(primary_key=True)
+    longitude: Mapped[int] = mapped_column(primary_key=True)
+    elevation: Mapped[int] = mapped_column(nullable=False)
+
+    def __str__(self) -> str:
+        return (
+            f"<ElevationCache {self.source} - {self.latitude}, "
+            f"{self.longitude}>"
+        )
 
 
 class WorkoutLike(BaseModel):
@@ -1299,6 +2076,8 @@ class WorkoutLike(BaseModel):
 def on_workout_like_insert(
     mapper: Mapper, connection: Connection, new_workout_like: WorkoutLike
 ) -> None:
+    update_workout_likes_count(connection, new_workout_like.workout_id, 1)
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Connection) -> None:
         from fittrackee.users.models import Notification, User
@@ -1329,6 +2108,8 @@ def on_workout_like_insert(
 def on_workout_like_delete(
     mapper: Mapper, connection: Connection, old_workout_like: WorkoutLike
 ) -> None:
+    update_workout_likes_count(connection, old_workout_like.workout_id, -1)
+
     @listens_for(db.Session, "after_flush", once=True)
     def receive_after_flush(session: Session, context: Any) -> None:
         from fittrackee.users.models import Notification
@@ -1,23 +1,42 @@
 import os
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, List
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 
 from fittrackee import appLog
 
+from .elevation_cache import (
+    CoordinatesKey,
+    get_cached_elevations,
+    get_coordinates_key,
+    store_elevations,
+)
 from .exceptions import ElevationServiceException
 
 if TYPE_CHECKING:
     from gpxpy.gpx import GPXTrackPoint
 
 WINDOW_LEN = 51
+# maximum number of concurrent requests to elevation API
+MAX_WORKERS = 4
+
+# shared between services and threads to reuse connections
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
 
 
 class BaseElevationService(ABC):
     config_key: str = ""
     url_pattern: str = ""
     log_label: str = ""
+    # elevations cache source (elevations may differ between services)
+    cache_source: str = ""
 
     def __init__(self) -> None:
         self.url = self._get_api_url()
@@ -59,30 +78,87 @@ class BaseElevationService(ABC):
 
         return [int(p) for p in smooth_array]
 
+    @abstractmethod
+    def _get_elevations_for_chunk(
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
+        pass
+
     @abstractmethod
     def _get_elevations_for_api(
-        self, points: List["GPXTrackPoint"], smooth: bool = False
-    ) -> List[int]:
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
         pass
 
+    def _get_elevations_by_chunks(
+        self, points: List["GPXTrackPoint"], max_points: int
+    ) -> List[Optional[int]]:
+        """
+        Request elevations by chunks of points, chunks being requested
+        concurrently
+        """
+        chunks = [
+            points[i : i + max_points]
+            for i in range(0, len(points), max_points)
+        ]
+        if len(chunks) <= 1:
+            return self._get_elevations_for_chunk(points)
+
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_WORKERS, len(chunks))
+        ) as executor:
+            chunks_elevations = list(
+                executor.map(self._get_elevations_for_chunk, chunks)
+            )
+        return list(chain.from_iterable(chunks_elevations))
+
     def get_elevations(
         self, points: List["GPXTrackPoint"], smooth: bool = False
-    ) -> List[int]:
+    ) -> List[Optional[int]]:
+        """
+        Elevations are retrieved from:
+        - elevations cache,
+        - elevation API for remaining points (returned elevations are stored
+          in cache).
+        """
         appLog.debug(
             "{log_label}: getting elevations".format(log_label=self.log_label)
         )
+        keys = [
+            get_coordinates_key(point.latitude, point.longitude)
+            for point in points
+        ]
+        cached_elevations = get_cached_elevations(self.cache_source, set(keys))
+        results: List[Optional[int]] = [
+            cached_elevations.get(key) for key in keys
+        ]
+        missing_indexes = [
+            index for index, result in enumerate(results) if result is None
+        ]
 
-        results = self._get_elevations_for_api(points)
-
-        # Should not happen
-        if len(results) != len(points):
-            error = (
-                f"{self.log_label}: mismatch between number of points in "
-                "results"
+        if missing_indexes:
+            api_results = self._get_elevations_for_api(
+                [points[index] for index in missing_indexes]
             )
-            appLog.error(error)
-            raise ElevationServiceException(error)
+
+            # Should not happen
+            if len(api_results) != len(missing_indexes):
+                error = (
+                    f"{self.log_label}: mismatch between number of points in "
+                    "results"
+                )
+                appLog.error(error)
+                raise ElevationServiceException(error)
+
+            new_elevations: Dict[CoordinatesKey, int] = {}
+            for index, elevation in zip(
+                missing_indexes, api_results, strict=True
+            ):
+                results[index] = elevation
+                if elevation is not None:
+                    new_elevations[keys[index]] = int(elevation)
+            store_elevations(self.cache_source, new_elevations)
 
         if smooth:
-            return self.smooth_elevations(results)
+            return self.smooth_elevations(results)  # type: ignore
         return results
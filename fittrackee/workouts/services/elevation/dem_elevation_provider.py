@@ -0,0 +1,83 @@
+import math
+import os
+from typing import Dict, Optional
+
+import numpy as np
+from flask import current_app
+
+from fittrackee import appLog
+
+# value for missing data in SRTM tiles
+VOID_VALUE = -32768
+
+
+class HgtElevationProvider:
+    """
+    Elevations from local DEM tiles in SRTM HGT format (for instance
+    'N44E006.hgt'), without network access.
+
+    Tiles cover 1°x1° and contain a square grid of big-endian signed 16-bit
+    integers (1201x1201 for SRTM3, 3601x3601 for SRTM1). They are
+    memory-mapped, only read values are loaded.
+    """
+
+    def __init__(self, dem_dir: str) -> None:
+        self.dem_dir = dem_dir
+        self._tiles: Dict[str, Optional[np.memmap]] = {}
+
+    @staticmethod
+    def get_tile_name(latitude: float, longitude: float) -> str:
+        tile_latitude = math.floor(latitude)
+        tile_longitude = math.floor(longitude)
+        return (
+            f"{'N' if tile_latitude >= 0 else 'S'}{abs(tile_latitude):02d}"
+            f"{'E' if tile_longitude >= 0 else 'W'}{abs(tile_longitude):03d}"
+            ".hgt"
+        )
+
+    def _get_tile(self, tile_name: str) -> Optional[np.memmap]:
+        if tile_name not in self._tiles:
+            tile: Optional[np.memmap] = None
+            tile_path = os.path.join(self.dem_dir, tile_name)
+            if os.path.isfile(tile_path):
+                size = int(math.sqrt(os.path.getsize(tile_path) / 2))
+                if size < 2 or size * size * 2 != os.path.getsize(tile_path):
+                    appLog.error(f"DEM: invalid tile '{tile_name}'")
+                else:
+                    tile = np.memmap(
+                        tile_path, dtype=">i2", mode="r", shape=(size, size)
+                    )
+            self._tiles[tile_name] = tile
+        return self._tiles[tile_name]
+
+    def get_elevation(
+        self, latitude: float, longitude: float
+    ) -> Optional[int]:
+        """
+        Return elevation of nearest grid point, or None if no tile covers
+        coordinates or data is missing
+        """
+        tile = self._get_tile(self.get_tile_name(latitude, longitude))
+        if tile is None:
+            return None
+        size = tile.shape[0]
+        # first row is northern edge
+        row = round((math.floor(latitude) + 1 - latitude) * (size - 1))
+        column = round((longitude - math.floor(longitude)) * (size - 1))
+        elevation = int(tile[row, column])
+        return None if elevation == VOID_VALUE else elevation
+
+
+_providers: Dict[str, HgtElevationProvider] = {}
+
+
+def get_dem_elevation_provider() -> Optional[HgtElevationProvider]:
+    """
+    Return provider if a DEM directory is set ('ELEVATION_DEM_DIR')
+    """
+    dem_dir = current_app.config["ELEVATION_DEM_DIR"]
+    if not dem_dir:
+        return None
+    if dem_dir not in _providers:
+        _providers[dem_dir] = HgtElevationProvider(dem_dir)
+    return _providers[dem_dir]
@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING, List, Optional
+
+from flask import current_app
+
+from fittrackee import appLog
+
+from .dem_elevation_provider import get_dem_elevation_provider
+
+if TYPE_CHECKING:
+    from gpxpy.gpx import GPXTrackPoint
+
+
+class DemElevationService:
+    """
+    Elevations from local DEM tiles (see 'ELEVATION_DEM_DIR'), without
+    network access.
+    """
+
+    log_label = "DEM"
+
+    @property
+    def is_enabled(self) -> bool:
+        return current_app.config["ELEVATION_DEM_DIR"] != ""
+
+    def get_elevations(
+        self, points: List["GPXTrackPoint"], smooth: bool = False
+    ) -> List[Optional[int]]:
+        """
+        Elevation is None for points not covered by tiles or without data
+        """
+        dem_elevation_provider = get_dem_elevation_provider()
+        if not dem_elevation_provider:
+            return []
+
+        appLog.debug(
+            "{log_label}: getting elevations".format(log_label=self.log_label)
+        )
+        return [
+            dem_elevation_provider.get_elevation(
+                point.latitude, point.longitude
+            )
+            for point in points
+        ]
@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql
+
+from fittrackee import db
+
+# 4 decimal places: ~11 m in latitude
+COORDINATES_PRECISION = 10_000
+# maximum number of coordinates per query
+MAX_KEYS = 5000
+
+CoordinatesKey = Tuple[int, int]
+
+
+def get_coordinates_key(latitude: float, longitude: float) -> CoordinatesKey:
+    """
+    Return quantized coordinates, used as elevation cache key
+    """
+    return (
+        round(latitude * COORDINATES_PRECISION),
+        round(longitude * COORDINATES_PRECISION),
+    )
+
+
+def get_cached_elevations(
+    source: str, keys: Iterable[CoordinatesKey]
+) -> Dict[CoordinatesKey, int]:
+    from fittrackee.workouts.models import ElevationCache
+
+    keys = list(keys)
+    cached_elevations: Dict[CoordinatesKey, int] = {}
+    for i in range(0, len(keys), MAX_KEYS):
+        cached_elevations.update(
+            {
+                (latitude, longitude): elevation
+                for latitude, longitude, elevation in db.session.query(
+                    ElevationCache.latitude,
+                    ElevationCache.longitude,
+                    ElevationCache.elevation,
+                )
+                .filter(
+                    ElevationCache.source == source,
+                    tuple_(
+                        ElevationCache.latitude, ElevationCache.longitude
+                    ).in_(keys[i : i + MAX_KEYS]),
+                )
+                .all()
+            }
+        )
+    return cached_elevations
+
+
+def store_elevations(
+    source: str, elevations: Dict[CoordinatesKey, int]
+) -> None:
+    from fittrackee.workouts.models import ElevationCache
+
+    rows = [
+        {
+            "source": source,
+            "latitude": latitude,
+            "longitude": longitude,
+            "elevation": elevation,
+        }
+        for (latitude, longitude), elevation in elevations.items()
+    ]
+    for i in range(0, len(rows), MAX_KEYS):
+        insert_statement = postgresql.insert(ElevationCache).values(
+            rows[i : i + MAX_KEYS]
+        )
+        db.session.execute(
+            insert_statement.on_conflict_do_update(
+                index_elements=["source", "latitude", "longitude"],
+                set_={"elevation": insert_statement.excluded.elevation},
+            )
+        )
@@ -1,7 +1,8 @@
-from typing import TYPE_CHECKING, List, Tuple, Union
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 from fittrackee.constants import ElevationDataSource
 
+from .dem_elevation_service import DemElevationService
 from .open_elevation_service import OpenElevationService
 from .valhalla_elevation_service import ValhallaElevationService
 
@@ -14,6 +15,7 @@ WINDOW_LEN = 51
 class ElevationService:
     """
     Available elevation services:
+    - local DEM tiles
     - Open Elevation (with or without smoothing processing)
     - Valhalla
     """
@@ -27,7 +29,12 @@ class ElevationService:
     def _get_elevation_service(
         elevation_data_source: "ElevationDataSource",
     ) -> Tuple[
-        Union["OpenElevationService", "ValhallaElevationService", None],
+        Union[
+            "DemElevationService",
+            "OpenElevationService",
+            "ValhallaElevationService",
+            None,
+        ],
         bool,
         "ElevationDataSource",
     ]:
@@ -35,8 +42,14 @@ class ElevationService:
             return None, False, elevation_data_source
 
         service: Union[
-            "OpenElevationService", "ValhallaElevationService", None
+            "DemElevationService",
+            "OpenElevationService",
+            "ValhallaElevationService",
+            None,
         ] = None
+        if elevation_data_source == ElevationDataSource.DEM:
+            service = DemElevationService()
+
         if elevation_data_source in [
             ElevationDataSource.OPEN_ELEVATION,
             ElevationDataSource.OPEN_ELEVATION_SMOOTH,
@@ -57,7 +70,9 @@ class ElevationService:
             )
         return None, False, ElevationDataSource.FILE
 
-    def get_elevations(self, points: List["GPXTrackPoint"]) -> List[int]:
+    def get_elevations(
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
         if not self.elevation_service:
             return []
 
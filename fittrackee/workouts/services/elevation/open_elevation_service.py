@@ -1,8 +1,6 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-import requests
-
-from .base_elevation_service import BaseElevationService
+from .base_elevation_service import BaseElevationService, session
 from .exceptions import ElevationServiceException
 
 if TYPE_CHECKING:
@@ -21,30 +19,32 @@ class OpenElevationService(BaseElevationService):
     config_key = "OPEN_ELEVATION_API_URL"
     url_pattern = "{base_url}/api/v1/lookup"
     log_label = "Open Elevation API"
+    cache_source = "open_elevation"
+
+    def _get_elevations_for_chunk(
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
+        r = session.post(
+            self.url,
+            json={
+                "locations": [
+                    {
+                        "latitude": point.latitude,
+                        "longitude": point.longitude,
+                    }
+                    for point in points
+                ]
+            },
+            timeout=30,
+        )
+        r.raise_for_status()
+        results = r.json().get("results", [])
+        return [int(result["elevation"]) for result in results]
 
     def _get_elevations_for_api(
-        self, points: List["GPXTrackPoint"], smooth: bool = False
-    ) -> List[int]:
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
         if not self.url:
             raise ElevationServiceException("Open Elevation API: no URL set")
 
-        elevations: List[int] = []
-        for i in range(0, len(points), MAX_POINTS):
-            r = requests.post(
-                self.url,
-                json={
-                    "locations": [
-                        {
-                            "latitude": point.latitude,
-                            "longitude": point.longitude,
-                        }
-                        for point in points[i : i + MAX_POINTS]
-                    ]
-                },
-                timeout=30,
-            )
-            r.raise_for_status()
-            results = r.json().get("results", [])
-            elevations = [*elevations, *[int(r["elevation"]) for r in results]]
-
-        return elevations
+        return self._get_elevations_by_chunks(points, MAX_POINTS)
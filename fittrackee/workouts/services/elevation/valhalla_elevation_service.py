@@ -1,14 +1,15 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
-import requests
-
-from .base_elevation_service import BaseElevationService
+from .base_elevation_service import BaseElevationService, session
 from .exceptions import ElevationServiceException
 
 if TYPE_CHECKING:
     from gpxpy.gpx import GPXTrackPoint
 
 
+MAX_POINTS = 10000
+
+
 class ValhallaElevationService(BaseElevationService):
     """
     Documentation:
@@ -18,14 +19,12 @@ class ValhallaElevationService(BaseElevationService):
     config_key = "VALHALLA_API_URL"
     url_pattern = "{base_url}/height"
     log_label = "Valhalla Elevation API"
+    cache_source = "valhalla"
 
-    def _get_elevations_for_api(
-        self, points: List["GPXTrackPoint"], smooth: bool = False
-    ) -> List[int]:
-        if not self.url:
-            raise ElevationServiceException("Valhalla API: no URL set")
-
-        r = requests.post(
+    def _get_elevations_for_chunk(
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
+        r = session.post(
             self.url,
             json={
                 "shape": [
@@ -36,5 +35,12 @@ class ValhallaElevationService(BaseElevationService):
             timeout=30,
         )
         r.raise_for_status()
-        results = r.json().get("height", [])
-        return results
+        return r.json().get("height", [])
+
+    def _get_elevations_for_api(
+        self, points: List["GPXTrackPoint"]
+    ) -> List[Optional[int]]:
+        if not self.url:
+            raise ElevationServiceException("Valhalla API: no URL set")
+
+        return self._get_elevations_by_chunks(points, MAX_POINTS)
@@ -0,0 +1,7 @@
+from .tile_cache import Tile, TileCache, tile_cache
+
+__all__ = [
+    "Tile",
+    "TileCache",
+    "tile_cache",
+]
@@ -0,0 +1,35 @@
+from typing import Any, Optional, Tuple
+
+from staticmap3 import StaticMap
+
+from .tile_cache import TILE_SERVER_TIMEOUT, TileCacheConfig, tile_cache
+
+
+class CachedStaticMap(StaticMap):
+    """
+    Static map getting tiles from FitTrackee tile cache
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        tile_server_url: Optional[str] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        # url template before subdomain replacement, used to store tiles
+        self.tile_server_url = (
+            tile_server_url if tile_server_url else self.url_template
+        )
+        # tiles are fetched in threads, outside application context
+        self.tile_cache_config = TileCacheConfig.from_app_config()
+
+    def get(self, url: str, **kwargs: Any) -> Tuple[int, bytes]:
+        tile = tile_cache.get_tile_from_url(
+            url,
+            tile_server_url=self.tile_server_url,
+            headers=kwargs.get("headers", {}),
+            timeout=kwargs.get("timeout") or TILE_SERVER_TIMEOUT,
+            config=self.tile_cache_config,
+        )
+        return tile.status_code, tile.content
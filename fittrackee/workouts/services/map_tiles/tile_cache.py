@@ -0,0 +1,405 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from fittrackee import appLog
+
+TILE_SERVER_TIMEOUT = 30
+# when cache size exceeds limit, tiles are removed until cache size is under
+# this ratio of the limit
+EVICTION_RATIO = 0.8
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+@dataclass
+class TileCacheConfig:
+    cache_dir: str
+    max_size: int
+    ttl: int
+
+    @classmethod
+    def from_app_config(cls) -> "TileCacheConfig":
+        return cls(
+            cache_dir=current_app.config["TILE_CACHE_DIR"],
+            max_size=current_app.config["TILE_CACHE_MAX_SIZE"],
+            ttl=current_app.config["TILE_CACHE_TTL"],
+        )
+
+
+@dataclass
+class TileMetadata:
+    content_type: str
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class Tile:
+    status_code: int
+    content: bytes
+    content_type: str
+    # remaining lifetime in seconds, 0 if tile is not cached
+    max_age: int = 0
+
+
+def get_tile_server_key(tile_server_url: str) -> str:
+    """
+    Tile server url template is hashed, to invalidate stored tiles when tile
+    server is changed.
+    """
+    return hashlib.md5(
+        tile_server_url.encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+@lru_cache(maxsize=16)
+def get_tile_url_pattern(tile_server_url: str) -> "re.Pattern":
+    """
+    Return pattern to get tile coordinates from tile url.
+    Subdomain is optional, since it can be removed from url template when no
+    subdomains are provided (see 'STATICMAP_SUBDOMAINS')
+    """
+    pattern = re.escape(tile_server_url)
+    pattern = pattern.replace(re.escape("{s}."), r"(?:[^./]+\.)?")
+    pattern = pattern.replace(re.escape("{s}"), r"[^./]*")
+    for coordinate in ["z", "x", "y"]:
+        pattern = pattern.replace(
+            re.escape(f"{{{coordinate}}}"), rf"(?P<{coordinate}>\d+)", 1
+        )
+    return re.compile(f"^{pattern}$")
+
+
+class TileCache:
+    """
+    On-disk cache for map tiles, used by map tiles proxy and static map
+    generation.
+
+    Tiles are stored in '<TILE_CACHE_DIR>/<tile server hash>/<z>/<x>/<y>'
+    with their metadata (json file) used for conditional revalidation when
+    tile expires.
+    When cache size exceeds 'TILE_CACHE_MAX_SIZE', least recently used tiles
+    are removed (tile file modification time is updated on each read).
+    """
+
+    def __init__(self) -> None:
+        # shared HTTP session to reuse connections to tile server
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        # cache size by directory, calculated on first tile storage
+        self._cache_sizes: Dict[str, int] = {}
+
+    @staticmethod
+    def get_tile_path(
+        cache_dir: str, tile_server_url: str, z: int, x: int, y: int
+    ) -> str:
+        return os.path.join(
+            cache_dir,
+            get_tile_server_key(tile_server_url),
+            str(z),
+            str(x),
+            str(y),
+        )
+
+    def _request_tile_server(
+        self, url: str, *, headers: Dict, timeout: int
+    ) -> requests.Response:
+        return self.session.get(url, headers=headers, timeout=timeout)
+
+    @staticmethod
+    def _get_max_age(response: requests.Response, default_ttl: int) -> int:
+        cache_control = response.headers.get("cache-control", "")
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = MAX_AGE_PATTERN.search(cache_control)
+        return int(match.group(1)) if match else default_ttl
+
+    @staticmethod
+    def _read_tile(
+        tile_path: str,
+    ) -> Tuple[Optional[bytes], Optional[TileMetadata]]:
+        try:
+            with open(f"{tile_path}.json") as f:
+                metadata = TileMetadata(**json.load(f))
+            with open(tile_path, "rb") as f:
+                content = f.read()
+        except (OSError, TypeError, ValueError):
+            return None, None
+        return content, metadata
+
+    @staticmethod
+    def _write_file(file_path: str, content: bytes) -> None:
+        # to avoid reading incomplete file from another process
+        tmp_file_path = (
+            f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_file_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_file_path, file_path)
+
+    @staticmethod
+    def _get_cache_size(cache_dir: str) -> int:
+        cache_size = 0
+        for root, _, files in os.walk(cache_dir):
+            for file in files:
+                try:
+                    cache_size += os.path.getsize(os.path.join(root, file))
+                except OSError:
+                    continue
+        return cache_size
+
+    def _evict_tiles(self, cache_dir: str, max_size: int) -> None:
+        """
+        Remove least recently used tiles.
+        Cache size is calculated again, since cache directory can be shared
+        between processes.
+        """
+        tiles = []
+        cache_size = 0
+        for root, _, files in os.walk(cache_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                cache_size += stat.st_size
+                if not file.endswith((".json", ".tmp")):
+                    tiles.append((stat.st_mtime, file_path))
+
+        target_size = int(max_size * EVICTION_RATIO)
+        for _, tile_path in sorted(tiles):
+            if cache_size <= target_size:
+                break
+            for file_path in [tile_path, f"{tile_path}.json"]:
+                try:
+                    file_size = os.path.getsize(file_path)
+                    os.remove(file_path)
+                except OSError:
+                    continue
+                cache_size -= file_size
+        self._cache_sizes[cache_dir] = cache_size
+
+    def _store_tile(
+        self,
+        cache_dir: str,
+        max_size: int,
+        tile_path: str,
+        content: bytes,
+        metadata: TileMetadata,
+    ) -> None:
+        try:
+            os.makedirs(os.path.dirname(tile_path), exist_ok=True)
+            metadata_content = json.dumps(asdict(metadata)).encode()
+            self._write_file(tile_path, content)
+            self._write_file(f"{tile_path}.json", metadata_content)
+        except OSError as e:
+            appLog.error(f"error when storing map tile: {e}")
+            return
+
+        with self._lock:
+            if cache_dir not in self._cache_sizes:
+                self._cache_sizes[cache_dir] = self._get_cache_size(cache_dir)
+            else:
+                self._cache_sizes[cache_dir] += len(content) + len(
+                    metadata_content
+                )
+            if self._cache_sizes[cache_dir] > max_size:
+                self._evict_tiles(cache_dir, max_size)
+
+    def _update_metadata(self, tile_path: str, metadata: TileMetadata) -> None:
+        try:
+            self._write_file(
+                f"{tile_path}.json", json.dumps(asdict(metadata)).encode()
+            )
+        except OSError as e:
+            appLog.error(f"error when updating map tile metadata: {e}")
+
+    @staticmethod
+    def _mark_as_used(tile_path: str) -> None:
+        try:
+            os.utime(tile_path)
+        except OSError:
+            pass
+
+    def get_tile(
+        self,
+        url: str,
+        *,
+        tile_server_url: str,
+        z: int,
+        x: int,
+        y: int,
+        headers: Dict,
+        timeout: int = TILE_SERVER_TIMEOUT,
+        config: Optional[TileCacheConfig] = None,
+    ) -> Tile:
+        """
+        Return tile from cache if not expired, otherwise from tile server.
+        Expired tile is revalidated when the tile server returned 'ETag' or
+        'Last-Modified' headers, and returned if tile server is unavailable.
+
+        Config must be provided outside application context (for instance,
+        in static map threads).
+        """
+        if config is None:
+            config = TileCacheConfig.from_app_config()
+        cache_dir, max_size, ttl = (
+            config.cache_dir,
+            config.max_size,
+            config.ttl,
+        )
+        if max_size <= 0:
+            return self.get_tile_without_cache(
+                url, headers=headers, timeout=timeout
+            )
+
+        tile_path = self.get_tile_path(cache_dir, tile_server_url, z, x, y)
+        content, metadata = self._read_tile(tile_path)
+        now = time.time()
+
+        if content is not None and metadata and metadata.expires_at > now:
+            self._mark_as_used(tile_path)
+            return Tile(
+                status_code=200,
+                content=content,
+                content_type=metadata.content_type,
+                max_age=int(metadata.expires_at - now),
+            )
+
+        request_headers = {**headers}
+        if content is not None and metadata:
+            if metadata.etag:
+                request_headers["If-None-Match"] = metadata.etag
+            if metadata.last_modified:
+                request_headers["If-Modified-Since"] = metadata.last_modified
+
+        try:
+            response = self._request_tile_server(
+                url, headers=request_headers, timeout=timeout
+            )
+        except requests.exceptions.RequestException as e:
+            if content is None or metadata is None:
+                raise e
+            appLog.error(f"error when getting map tile, stale tile used: {e}")
+            return Tile(
+                status_code=200,
+                content=content,
+                content_type=metadata.content_type,
+            )
+
+        if (
+            response.status_code == 304
+            and content is not None
+            and metadata is not None
+        ):
+            max_age = self._get_max_age(response, ttl)
+            metadata.expires_at = now + max_age
+            metadata.etag = response.headers.get("etag", metadata.etag)
+            metadata.last_modified = response.headers.get(
+                "last-modified", metadata.last_modified
+            )
+            self._update_metadata(tile_path, metadata)
+            self._mark_as_used(tile_path)
+            return Tile(
+                status_code=200,
+                content=content,
+                content_type=metadata.content_type,
+                max_age=max_age,
+            )
+
+        content_type = response.headers.get("content-type", "image/png")
+        if response.status_code != 200 or not response.content:
+            if content is not None and metadata is not None:
+                appLog.error(
+                    f"error when getting map tile [{response.status_code}], "
+                    "stale tile used"
+                )
+                return Tile(
+                    status_code=200,
+                    content=content,
+                    content_type=metadata.content_type,
+                )
+            return Tile(
+                status_code=response.status_code,
+                content=response.content,
+                content_type=content_type,
+            )
+
+        max_age = self._get_max_age(response, ttl)
+        if max_age > 0:
+            self._store_tile(
+                cache_dir,
+                max_size,
+                tile_path,
+                response.content,
+                TileMetadata(
+                    content_type=content_type,
+                    expires_at=now + max_age,
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                ),
+            )
+        return Tile(
+            status_code=200,
+            content=response.content,
+            content_type=content_type,
+            max_age=max_age,
+        )
+
+    def get_tile_without_cache(
+        self, url: str, *, headers: Dict, timeout: int = TILE_SERVER_TIMEOUT
+    ) -> Tile:
+        response = self._request_tile_server(
+            url, headers=headers, timeout=timeout
+        )
+        return Tile(
+            status_code=response.status_code,
+            content=response.content,
+            content_type=response.headers.get("content-type", "image/png"),
+        )
+
+    def get_tile_from_url(
+        self,
+        url: str,
+        *,
+        tile_server_url: str,
+        headers: Dict,
+        timeout: int = TILE_SERVER_TIMEOUT,
+        config: Optional[TileCacheConfig] = None,
+    ) -> Tile:
+        """
+        Used when only tile url is known (static map generation).
+        Tile is not cached if coordinates cannot be extracted from url.
+        """
+        match = get_tile_url_pattern(tile_server_url).match(url)
+        if not match:
+            return self.get_tile_without_cache(
+                url, headers=headers, timeout=timeout
+            )
+        return self.get_tile(
+            url,
+            tile_server_url=tile_server_url,
+            z=int(match.group("z")),
+            x=int(match.group("x")),
+            y=int(match.group("y")),
+            headers=headers,
+            timeout=timeout,
+            config=config,
+        )
+
+
+tile_cache = TileCache()
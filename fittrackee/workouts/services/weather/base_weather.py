@@ -6,11 +6,25 @@ if TYPE_CHECKING:
 
     from ..workout_from_file.workout_point import WorkoutPoint
 
+# 2 decimal places: ~1.1 km in latitude
+CACHE_COORDINATES_DECIMALS = 2
+
 
 class BaseWeather(ABC):
+    # used in cache keys
+    name: str = ""
+
     def __init__(self, api_key: str) -> None:
         self.api_key: str = api_key
 
+    @staticmethod
+    @abstractmethod
+    def _get_timestamp(time: "datetime") -> int:
+        """
+        Return timestamp of data returned by provider for a given time
+        """
+        pass
+
     @abstractmethod
     def _get_data(
         self, latitude: float, longitude: float, time: "datetime"
@@ -45,6 +59,20 @@ class BaseWeather(ABC):
         """
         pass
 
+    def get_cache_key(self, point: "WorkoutPoint") -> Optional[str]:
+        """
+        Return key for points sharing same weather data (rounded location
+        and same provider timestamp)
+        """
+        if not point.time:
+            return None
+        latitude = round(point.latitude, CACHE_COORDINATES_DECIMALS)
+        longitude = round(point.longitude, CACHE_COORDINATES_DECIMALS)
+        return (
+            f"weather:{self.name}:{latitude},{longitude}:"
+            f"{self._get_timestamp(point.time)}"
+        )
+
     def get_weather(self, point: "WorkoutPoint") -> Optional[Dict]:
         if not point.time:
             # if there's no time associated with the point,
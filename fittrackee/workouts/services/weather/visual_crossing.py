@@ -9,6 +9,8 @@ from .base_weather import BaseWeather
 
 
 class VisualCrossing(BaseWeather):
+    name = "visualcrossing"
+
     def __init__(self, api_key: str):
         super().__init__(api_key)
         self.base_url = (
@@ -1,22 +1,30 @@
+import json
 import os
 from typing import TYPE_CHECKING, Dict, Optional, Union
 
+from flask import current_app
+
 from fittrackee import appLog
+from fittrackee.cache import get_cache_backend
 
 from .visual_crossing import VisualCrossing
 
 if TYPE_CHECKING:
     from ..workout_from_file.workout_point import WorkoutPoint
+    from .base_weather import BaseWeather
 
 
 class WeatherService:
     """
     Available API:
     - VisualCrossing
+
+    Weather data are cached (see 'WEATHER_CACHE_TTL'), points with close
+    locations and same hour share the same data.
     """
 
     def __init__(self) -> None:
-        self.weather_api = self._get_weather_api()
+        self.weather_api: Optional["BaseWeather"] = self._get_weather_api()
 
     @staticmethod
     def _get_weather_api() -> Union["VisualCrossing", None]:
@@ -31,11 +39,33 @@ class WeatherService:
             return VisualCrossing(weather_api_key)
         return None
 
-    def get_weather(self, point: "WorkoutPoint") -> Optional[Dict]:
-        if not self.weather_api:
-            return None
+    @staticmethod
+    def _get_weather_from_api(
+        weather_api: "BaseWeather", point: "WorkoutPoint"
+    ) -> Optional[Dict]:
         try:
-            return self.weather_api.get_weather(point)
+            return weather_api.get_weather(point)
         except Exception as e:
             appLog.error(f"error when getting weather data: {e}")
             return None
+
+    def get_weather(self, point: "WorkoutPoint") -> Optional[Dict]:
+        if not self.weather_api:
+            return None
+
+        ttl = current_app.config["WEATHER_CACHE_TTL"]
+        cache_key = self.weather_api.get_cache_key(point)
+        if not ttl or not cache_key:
+            return self._get_weather_from_api(self.weather_api, point)
+
+        cache_backend = get_cache_backend()
+        # points sharing the same key are fetched only once
+        with cache_backend.lock(cache_key):
+            value = cache_backend.get(cache_key)
+            if value is not None:
+                return json.loads(value)
+
+            weather_data = self._get_weather_from_api(self.weather_api, point)
+            if weather_data:
+                cache_backend.set(cache_key, json.dumps(weather_data), ttl)
+        return weather_data
@@ -1,10 +1,12 @@
 import hashlib
 import random
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import IO, TYPE_CHECKING, Dict, List, Optional, Union
 
 from flask import current_app
-from staticmap3 import Line, StaticMap
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm.session import Session
 
 from fittrackee import VERSION, appLog, db
 from fittrackee.constants import ElevationDataSource
@@ -21,6 +23,8 @@ if TYPE_CHECKING:
     from fittrackee.users.models import User
     from fittrackee.workouts.models import Sport, Workout
 
+    from .workout_gpx_service import GpxAnalysis, GpxAnalysisSettings
+
 weather_service = WeatherService()
 
 
@@ -43,6 +47,12 @@ class BaseWorkoutWithSegmentsCreationService(ABC):
         # for refresh
         get_elevation_on_refresh: bool = False,  # for refresh with CLI
         change_elevation_source: Optional[ElevationDataSource] = None,
+        # file already parsed in another process (archive import)
+        parsed_gpx: Optional["GPX"] = None,
+        gpx_analysis: Optional["GpxAnalysis"] = None,
+        # id reserved for new workout on parallel archive import: workouts
+        # are inserted with the other workouts of the same chunk
+        new_workout_id: Optional[int] = None,
     ) -> None:
         self.auth_user = auth_user
         self.sport = sport
@@ -57,6 +67,21 @@ class BaseWorkoutWithSegmentsCreationService(ABC):
         self.workout = workout
         self.is_creation = workout is None
         self.change_elevation_source = change_elevation_source
+        self.new_workout_id = new_workout_id
+
+    @classmethod
+    @abstractmethod
+    def parse_file(
+        cls, workout_file: IO[bytes], segments_creation_event: str
+    ) -> "GPX":
+        pass
+
+    @classmethod
+    @abstractmethod
+    def analyse_gpx(
+        cls, gpx: "GPX", settings: "GpxAnalysisSettings"
+    ) -> Optional["GpxAnalysis"]:
+        pass
 
     @abstractmethod
     def get_workout_date(self) -> "datetime":
@@ -86,16 +111,25 @@ class BaseWorkoutWithSegmentsCreationService(ABC):
 
     @classmethod
     def generate_map_image(cls, map_filepath: str, coordinates: List) -> None:
-        m = StaticMap(
+        from staticmap3 import Line
+
+        from ..map_tiles.static_map import CachedStaticMap
+
+        tile_server_config = current_app.config["TILE_SERVER"]
+        default_static_map = tile_server_config["DEFAULT_STATICMAP"]
+        m = CachedStaticMap(
             width=400,
             height=225,
             padding_x=10,
             headers={"User-Agent": f"FitTrackee v{VERSION}"},
             delay_between_retries=5,
+            tile_server_url=(
+                None if default_static_map else tile_server_config["URL"]
+            ),
         )
-        if not current_app.config["TILE_SERVER"]["DEFAULT_STATICMAP"]:
+        if not default_static_map:
             m.url_template = cls.get_static_map_tile_server_url(
-                current_app.config["TILE_SERVER"]
+                tile_server_config
             )
         line = Line(coords=coordinates, color="#3388FF", width=4)
         m.add_line(line)
@@ -106,15 +140,71 @@ class BaseWorkoutWithSegmentsCreationService(ABC):
     def get_weather_data(
         start_point: WorkoutPoint, end_point: WorkoutPoint
     ) -> List[Union[Dict, None]]:
-        return [
-            weather_service.get_weather(start_point),
-            weather_service.get_weather(end_point),
+        # start and end points weather data are fetched concurrently
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def get_weather(point: WorkoutPoint) -> Optional[Dict]:
+            with app.app_context():
+                return weather_service.get_weather(point)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return list(executor.map(get_weather, [start_point, end_point]))
+
+    @classmethod
+    def update_weather(
+        cls,
+        workout: "Workout",
+        start_point: WorkoutPoint,
+        end_point: WorkoutPoint,
+    ) -> None:
+        # In case of refresh, it updates only workouts without weather data
+        if workout.weather_start or workout.weather_end:
+            return
+
+        weather_start, weather_end = cls.get_weather_data(
+            start_point, end_point
+        )
+        if weather_start and weather_end:
+            workout.weather_start = weather_start
+            workout.weather_end = weather_end
+
+    @staticmethod
+    def add_weather_task(
+        workout: "Workout", start_point: WorkoutPoint, end_point: WorkoutPoint
+    ) -> None:
+        """
+        Weather data are fetched by a background task, once workout is
+        committed
+        """
+        from fittrackee.workouts.tasks import update_workout_weather
+
+        workout_id = workout.id
+        points = [
+            {
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "time": point.time.isoformat(),
+            }
+            for point in [start_point, end_point]
         ]
 
+        @listens_for(db.Session, "after_commit", once=True)
+        def receive_after_commit(session: Session) -> None:
+            update_workout_weather.send(
+                workout_id=workout_id,
+                start_point=points[0],
+                end_point=points[1],
+            )
+
     @abstractmethod
     def _process_file(self) -> "Workout":
         pass
 
+    def _flush(self) -> None:
+        # when id is reserved, new workout is flushed on chunk commit
+        if self.new_workout_id is None:
+            db.session.flush()
+
     def process_workout(self) -> "Workout":
         try:
             workout = self._process_file()
@@ -135,15 +225,16 @@ class BaseWorkoutWithSegmentsCreationService(ABC):
             )
             return workout
 
-        # In case of refresh, it updates only workouts without weather data
-        if not workout.weather_start and not workout.weather_end:
-            weather_start, weather_end = self.get_weather_data(
-                self.start_point,
-                self.end_point,
-            )
-            if weather_start and weather_end:
-                workout.weather_start = weather_start
-                workout.weather_end = weather_end
+        if (
+            self.is_creation
+            and current_app.config["WEATHER_ASYNC_PROCESSING"]
+            and current_app.config["TASKS_PROCESSING_AVAILABLE"]
+        ):
+            self._flush()
+            self.add_weather_task(workout, self.start_point, self.end_point)
+            return workout
+
+        self.update_weather(workout, self.start_point, self.end_point)
 
-        db.session.flush()
+        self._flush()
         return workout
@@ -0,0 +1,482 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+from gpxpy.geo import EARTH_RADIUS, ONE_DEGREE
+from gpxpy.gpx import DEFAULT_STOPPED_SPEED_THRESHOLD
+
+if TYPE_CHECKING:
+    import gpxpy.gpx
+
+# Vectorized equivalent of gpxpy calculations used on workout creation and
+# refresh (distances, speeds, moving data, uphill/downhill, elevation
+# extremes and duration).
+# Points are loaded once in arrays, missing values are stored as NaN.
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# same value as gpxpy.gpx.IGNORE_TOP_SPEED_PERCENTILES
+IGNORE_TOP_SPEED_PERCENTILES = 0.05
+
+
+@dataclass
+class SegmentMovingData:
+    moving_time: float
+    stopped_time: float
+    moving_distance: float
+    stopped_distance: float
+    max_speed: float  # m/s
+
+
+@dataclass
+class SegmentStats:
+    moving_data: SegmentMovingData
+    duration: Optional[float]
+    min_alt: Optional[float]
+    max_alt: Optional[float]
+    uphill: float
+    downhill: float
+
+
+def _get_time_in_microseconds(point_time: Optional[datetime]) -> float:
+    if point_time is None:
+        return np.nan
+    if point_time.tzinfo is None:
+        # same conversion as datetime.astimezone (naive datetime is
+        # considered as local time)
+        point_time = point_time.astimezone(timezone.utc)
+    return (point_time - EPOCH) // timedelta(microseconds=1)
+
+
+def get_distances(
+    latitudes_1: "np.ndarray",
+    longitudes_1: "np.ndarray",
+    elevations_1: "np.ndarray",
+    latitudes_2: "np.ndarray",
+    longitudes_2: "np.ndarray",
+    elevations_2: "np.ndarray",
+) -> "np.ndarray":
+    """
+    Same calculation as gpxpy.geo.distance:
+    - haversine distance for distant points (more than 0.2 degree)
+    - otherwise, approximated distance, with elevation if available
+    """
+    latitudes_1_rad = np.radians(latitudes_1)
+    latitudes_2_rad = np.radians(latitudes_2)
+    haversine = (
+        2
+        * np.arcsin(
+            np.sqrt(
+                np.power(np.sin((latitudes_1_rad - latitudes_2_rad) / 2), 2)
+                + np.power(
+                    np.sin(np.radians(longitudes_1 - longitudes_2) / 2), 2
+                )
+                * np.cos(latitudes_1_rad)
+                * np.cos(latitudes_2_rad)
+            )
+        )
+        * EARTH_RADIUS
+    )
+
+    x = latitudes_1 - latitudes_2
+    y = (longitudes_1 - longitudes_2) * np.cos(latitudes_1_rad)
+    distances_2d = np.sqrt(x * x + y * y) * ONE_DEGREE
+    with_elevation = (
+        ~np.isnan(elevations_1)
+        & ~np.isnan(elevations_2)
+        & (elevations_1 != elevations_2)
+    )
+    distances = np.where(
+        with_elevation,
+        np.sqrt(distances_2d**2 + (elevations_1 - elevations_2) ** 2),
+        distances_2d,
+    )
+
+    return np.where(
+        (np.abs(latitudes_1 - latitudes_2) > 0.2)
+        | (np.abs(longitudes_1 - longitudes_2) > 0.2),
+        haversine,
+        distances,
+    )
+
+
+def get_elevations_array(elevations: List[Optional[float]]) -> "np.ndarray":
+    return np.array(
+        [
+            np.nan if elevation is None else elevation
+            for elevation in elevations
+        ],
+        dtype="float64",
+    )
+
+
+def _sum(values: "np.ndarray") -> float:
+    # sequential sum, to get the same result as python sum
+    return float(np.cumsum(values)[-1]) if values.size else 0.0
+
+
+class SegmentArrays:
+    """
+    Segment points loaded in NumPy arrays.
+    """
+
+    def __init__(self, points: List["gpxpy.gpx.GPXTrackPoint"]) -> None:
+        self.size = len(points)
+        self.latitudes = np.array(
+            [point.latitude for point in points], dtype="float64"
+        )
+        self.longitudes = np.array(
+            [point.longitude for point in points], dtype="float64"
+        )
+        self.elevations = get_elevations_array(
+            [point.elevation for point in points]
+        )
+        # times in microseconds since epoch (exact values for differences)
+        self.times = np.array(
+            [_get_time_in_microseconds(point.time) for point in points],
+            dtype="float64",
+        )
+
+    @classmethod
+    def from_track_segment(
+        cls, track_segment: "gpxpy.gpx.GPXTrackSegment"
+    ) -> "SegmentArrays":
+        return cls(track_segment.points)
+
+    def _get_elevations_pairs(
+        self, only_truthy: bool
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        previous_elevations = self.elevations[:-1]
+        elevations = self.elevations[1:]
+        if not only_truthy:
+            return previous_elevations, elevations
+        # gpxpy uses 2d distance when one of elevations is None or 0
+        with_elevations = (previous_elevations != 0) & (elevations != 0)
+        return (
+            np.where(with_elevations, previous_elevations, np.nan),
+            np.where(with_elevations, elevations, np.nan),
+        )
+
+    def get_distances_between_points(
+        self,
+        only_truthy_elevations: bool = True,
+        from_next: bool = False,
+        next_elevations: Optional["np.ndarray"] = None,
+    ) -> "np.ndarray":
+        """
+        Distances between a point and the previous one (in meters), or
+        between a point and the next one if 'from_next' is True (results
+        may slightly differ, since approximation depends on first point
+        latitude).
+        """
+        previous_elevations, elevations = self._get_elevations_pairs(
+            only_truthy_elevations
+        )
+        if from_next:
+            return get_distances(
+                self.latitudes[:-1],
+                self.longitudes[:-1],
+                previous_elevations,
+                self.latitudes[1:],
+                self.longitudes[1:],
+                elevations if next_elevations is None else next_elevations[1:],
+            )
+        return get_distances(
+            self.latitudes[1:],
+            self.longitudes[1:],
+            elevations,
+            self.latitudes[:-1],
+            self.longitudes[:-1],
+            previous_elevations,
+        )
+
+    def get_cumulative_distances(self) -> "np.ndarray":
+        """
+        Cumulative distance for each point (in meters)
+        """
+        if self.size == 0:
+            return np.array([], dtype="float64")
+        distances = np.nan_to_num(self.get_distances_between_points())
+        return np.concatenate(([0.0], np.cumsum(distances)))
+
+    def get_seconds_between_points(self) -> "np.ndarray":
+        return (self.times[1:] - self.times[:-1]) / 1e6
+
+    def get_times_strings(self) -> List[Optional[str]]:
+        """
+        Points times in UTC, in the same format as
+        'str(point.time.astimezone(pytz.utc))', None when point has no time.
+        """
+        with_time = ~np.isnan(self.times)
+        microseconds = self.times[with_time].astype("int64")
+        times_strings = np.char.add(
+            np.char.replace(
+                np.datetime_as_string(
+                    microseconds.astype("datetime64[us]").astype(
+                        "datetime64[s]"
+                    )
+                ),
+                "T",
+                " ",
+            ),
+            np.where(
+                microseconds % 1_000_000 == 0,
+                "",
+                np.char.add(
+                    ".",
+                    np.char.zfill((microseconds % 1_000_000).astype("str"), 6),
+                ),
+            ),
+        )
+        times: List[Optional[str]] = [None] * self.size
+        for index, time_string in zip(
+            np.flatnonzero(with_time).tolist(),
+            times_strings.tolist(),
+            strict=True,
+        ):
+            times[index] = f"{time_string}+00:00"
+        return times
+
+    def get_time_differences(self, first_point_time: datetime) -> "np.ndarray":
+        """
+        Absolute time differences with given point (in seconds), NaN when
+        point has no time.
+        """
+        first_time = _get_time_in_microseconds(first_point_time)
+        return np.abs(self.times - first_time) / 1e6
+
+    @staticmethod
+    def _get_speeds_between_points(
+        distances: "np.ndarray", seconds: "np.ndarray"
+    ) -> "np.ndarray":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(seconds > 0, distances / seconds, np.nan)
+
+    def get_speeds(
+        self, next_elevations: Optional["np.ndarray"] = None
+    ) -> "np.ndarray":
+        """
+        Same calculation as gpxpy.gpx.GPXTrackSegment.get_speed for each
+        point: average speed with previous and next points (in m/s), NaN
+        when speed can not be calculated.
+
+        If provided, 'next_elevations' are used for next points (when points
+        elevations are updated while iterating over points, speed is
+        calculated with next point elevation not updated yet).
+        """
+        if self.size < 2:
+            return np.full(self.size, np.nan)
+        seconds = np.abs(self.get_seconds_between_points())
+        speeds_with_previous = np.concatenate(
+            (
+                [np.nan],
+                self._get_speeds_between_points(
+                    self.get_distances_between_points(
+                        only_truthy_elevations=False
+                    ),
+                    seconds,
+                ),
+            )
+        )
+        speeds_with_next = np.concatenate(
+            (
+                self._get_speeds_between_points(
+                    self.get_distances_between_points(
+                        only_truthy_elevations=False,
+                        from_next=True,
+                        next_elevations=next_elevations,
+                    ),
+                    seconds,
+                ),
+                [np.nan],
+            )
+        )
+        # like gpxpy, null speeds are ignored when calculating average
+        with_previous = ~np.isnan(speeds_with_previous) & (
+            speeds_with_previous != 0
+        )
+        with_next = ~np.isnan(speeds_with_next) & (speeds_with_next != 0)
+        return np.where(
+            with_previous & with_next,
+            (speeds_with_previous + speeds_with_next) / 2,
+            np.where(with_previous, speeds_with_previous, speeds_with_next),
+        )
+
+    def get_moving_data(
+        self, stopped_speed_threshold: Optional[float], raw: bool
+    ) -> SegmentMovingData:
+        """
+        Same calculation as gpxpy.gpx.GPXTrackSegment.get_moving_data
+        """
+        if not stopped_speed_threshold:
+            stopped_speed_threshold = DEFAULT_STOPPED_SPEED_THRESHOLD
+        if self.size < 2:
+            return SegmentMovingData(0.0, 0.0, 0.0, 0.0, 0.0)
+
+        seconds = self.get_seconds_between_points()
+        distances = self.get_distances_between_points()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speeds_kmh = (distances / 1000) / (seconds / 60**2)
+        counted = (seconds > 0) & (distances != 0) & ~np.isnan(distances)
+        stopped = counted & (speeds_kmh <= stopped_speed_threshold)
+        moving = counted & ~stopped
+        moving_seconds = np.where(moving, seconds, 0.0)
+        moving_time = _sum(moving_seconds)
+
+        with_speed = counted & (np.cumsum(moving_seconds) > 0)
+        speeds = distances[with_speed] / seconds[with_speed]
+        max_speed = self._get_max_speed(speeds, distances[with_speed], raw=raw)
+
+        return SegmentMovingData(
+            moving_time=moving_time,
+            stopped_time=_sum(seconds[stopped]),
+            moving_distance=_sum(distances[moving]),
+            stopped_distance=_sum(distances[stopped]),
+            max_speed=max_speed or 0.0,
+        )
+
+    @staticmethod
+    def _get_max_speed(
+        speeds: "np.ndarray", distances: "np.ndarray", raw: bool
+    ) -> Optional[float]:
+        """
+        Same calculation as gpxpy.geo.calculate_max_speed
+        """
+        if speeds.size == 0:
+            return None
+        if raw:
+            return float(np.max(speeds))
+
+        size = speeds.size
+        if size < 2:
+            return None
+        average_distance = _sum(distances) / size
+        standard_distance_deviation = np.sqrt(
+            _sum((distances - average_distance) ** 2) / size
+        )
+        filtered_speeds = np.sort(
+            speeds[
+                np.abs(distances - average_distance)
+                <= standard_distance_deviation * 1.5
+            ]
+        )
+        if filtered_speeds.size == 0:
+            return None
+        index = int(filtered_speeds.size * (1 - IGNORE_TOP_SPEED_PERCENTILES))
+        if index >= filtered_speeds.size:
+            index = -1
+        return float(filtered_speeds[index])
+
+    def get_uphill_downhill(self) -> Tuple[float, float]:
+        """
+        Same calculation as gpxpy.geo.calculate_uphill_downhill
+        """
+        elevations = self.elevations[~np.isnan(self.elevations)]
+        if elevations.size < 2:
+            return 0.0, 0.0
+        smoothed_elevations = elevations.copy()
+        smoothed_elevations[1:-1] = (
+            elevations[:-2] * 0.3
+            + elevations[1:-1] * 0.4
+            + elevations[2:] * 0.3
+        )
+        differences = np.diff(smoothed_elevations)
+        return (
+            _sum(np.where(differences > 0, differences, 0.0)),
+            _sum(np.where(differences > 0, 0.0, -differences)),
+        )
+
+    def get_elevation_extremes(
+        self,
+    ) -> Tuple[Optional[float], Optional[float]]:
+        elevations = self.elevations[~np.isnan(self.elevations)]
+        if elevations.size == 0:
+            return None, None
+        return float(np.min(elevations)), float(np.max(elevations))
+
+    def get_duration(self) -> Optional[float]:
+        """
+        Same calculation as gpxpy.gpx.GPXTrackSegment.get_duration
+        """
+        if self.size < 2:
+            return 0.0
+        first_time = (
+            self.times[1] if np.isnan(self.times[0]) else self.times[0]
+        )
+        last_time = (
+            self.times[-2] if np.isnan(self.times[-1]) else self.times[-1]
+        )
+        if np.isnan(first_time) or np.isnan(last_time):
+            return None
+        if last_time < first_time:
+            return None
+        return float((last_time - first_time) / 1e6)
+
+    def get_stats(
+        self, stopped_speed_threshold: float, raw: bool
+    ) -> SegmentStats:
+        min_alt, max_alt = self.get_elevation_extremes()
+        uphill, downhill = self.get_uphill_downhill()
+        return SegmentStats(
+            moving_data=self.get_moving_data(stopped_speed_threshold, raw),
+            duration=self.get_duration(),
+            min_alt=min_alt,
+            max_alt=max_alt,
+            uphill=uphill,
+            downhill=downhill,
+        )
+
+
+def get_track_stats(segments_stats: List[SegmentStats]) -> SegmentStats:
+    """
+    Aggregate segments stats, in the same way as gpxpy.gpx.GPXTrack
+    """
+    moving_data = SegmentMovingData(0.0, 0.0, 0.0, 0.0, 0.0)
+    duration: Optional[float] = 0.0
+    elevations = []
+    uphill, downhill = 0.0, 0.0
+    for stats in segments_stats:
+        moving_data.moving_time += stats.moving_data.moving_time
+        moving_data.stopped_time += stats.moving_data.stopped_time
+        moving_data.moving_distance += stats.moving_data.moving_distance
+        moving_data.stopped_distance += stats.moving_data.stopped_distance
+        if stats.moving_data.max_speed > moving_data.max_speed:
+            moving_data.max_speed = stats.moving_data.max_speed
+        if stats.duration is None:
+            duration = None
+        elif duration is not None:
+            duration += stats.duration
+        elevations.extend(
+            [
+                elevation
+                for elevation in [stats.min_alt, stats.max_alt]
+                if elevation is not None
+            ]
+        )
+        uphill += stats.uphill
+        downhill += stats.downhill
+    return SegmentStats(
+        moving_data=moving_data,
+        duration=duration,
+        min_alt=min(elevations) if elevations else None,
+        max_alt=max(elevations) if elevations else None,
+        uphill=uphill,
+        downhill=downhill,
+    )
+
+
+def get_hr_cadence_power_stats(
+    heart_rates: List[int], cadences: List[int], powers: List[int]
+) -> Dict:
+    """
+    Same values as WorkoutGpxService._get_hr_cadence_power_data
+    """
+    ave_cadence = float(np.mean(cadences)) if cadences else None
+    return {
+        "ave_cadence": ave_cadence if ave_cadence else None,
+        "ave_hr": float(np.mean(heart_rates)) if heart_rates else None,
+        "ave_power": float(np.mean(powers)) if powers else None,
+        "max_cadence": int(np.max(cadences)) if ave_cadence else None,
+        "max_hr": int(np.max(heart_rates)) if heart_rates else None,
+        "max_power": int(np.max(powers)) if powers else None,
+    }
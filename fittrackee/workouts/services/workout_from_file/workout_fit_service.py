@@ -1,6 +1,6 @@
-from typing import IO, TYPE_CHECKING, Any, List, Optional
+from operator import itemgetter
+from typing import IO, TYPE_CHECKING, Any, List, Optional, Tuple
 
-import fitdecode
 import gpxpy.gpx
 
 from ...constants import NSMAP
@@ -21,14 +21,11 @@ class WorkoutFitService(WorkoutGpxService):
         return value * (180.0 / 2**31)
 
     @staticmethod
-    def get_creator(data_frames: List["FitDataMessage"]) -> Optional[str]:
+    def get_creator(frame: "FitDataMessage") -> Optional[str]:
+        """
+        Get device metadata from first 'file_id' frame
+        """
         creator = None
-        # Handle device metadata from file_id
-        file_id_frames = filter(lambda f: f.name == "file_id", data_frames)
-        frame = next(file_id_frames, None)
-        if not frame:
-            return creator
-
         if frame.has_field("product_name"):
             creator = frame.get_value("product_name")
             if isinstance(creator, str):
@@ -54,24 +51,66 @@ class WorkoutFitService(WorkoutGpxService):
         return creator
 
     @staticmethod
-    def get_total_calories(
-        data_frames: List["FitDataMessage"],
-    ) -> Optional[str]:
-        # Get total calories from session
-        # - total calories = resting + active calories
-        # - units: kcal
-        calories = None
-        session_frames = filter(lambda f: f.name == "session", data_frames)
-        frame = next(session_frames, None)
-        if frame and frame.has_field("total_calories"):
-            calories = frame.get_value("total_calories")
-        return calories
+    def get_total_calories(frame: "FitDataMessage") -> Optional[str]:
+        """
+        Get total calories from first 'session' frame
+        - total calories = resting + active calories
+        - units: kcal
+        """
+        return frame.get_value("total_calories", fallback=None)
 
     @staticmethod
     def get_value_from_frame(frame: "FitDataMessage", key: str) -> Any:
-        if frame.has_field(key):
-            return frame.get_value(key)
-        return None
+        return frame.get_value(key, fallback=None)
+
+    @staticmethod
+    def is_segment_stop_event(
+        frame: "FitDataMessage", segments_creation_event: str
+    ) -> bool:
+        """
+        A new segment is created after 'stop_all' event
+        """
+        if (
+            segments_creation_event not in ["only_manual", "all"]
+            or frame.get_value("event", fallback=None) != "timer"
+            or frame.get_value("event_type", fallback=None) != "stop_all"
+        ):
+            return False
+        return not (
+            segments_creation_event == "only_manual"
+            and frame.has_field("timer_trigger")
+            and frame.get_value("timer_trigger") != "manual"
+        )
+
+    @classmethod
+    def get_point_from_record(
+        cls, frame: "FitDataMessage"
+    ) -> Optional["gpxpy.gpx.GPXTrackPoint"]:
+        longitude = cls.get_value_from_frame(frame, "position_long")
+        latitude = cls.get_value_from_frame(frame, "position_lat")
+        time = cls.get_value_from_frame(frame, "timestamp")
+        if not longitude or not latitude or not time:
+            return None
+
+        elevation = cls.get_value_from_frame(frame, "enhanced_altitude")
+        # some devices store elevation as a tuple instead of a float
+        if isinstance(elevation, tuple):
+            elevation = elevation[0] if elevation[0] is not None else None
+        heart_rate = cls.get_value_from_frame(frame, "heart_rate")
+        cadence = cls.get_value_from_frame(frame, "cadence")
+        power = cls.get_value_from_frame(frame, "power")
+
+        point = gpxpy.gpx.GPXTrackPoint(
+            longitude=cls.get_coordinate(longitude),
+            latitude=cls.get_coordinate(latitude),
+            elevation=float(elevation) if elevation else None,
+            time=time,
+        )
+        if any(value is not None for value in [heart_rate, cadence, power]):
+            point.extensions.append(
+                cls._get_extensions(heart_rate, cadence, power)
+            )
+        return point
 
     @classmethod
     def parse_file(
@@ -90,9 +129,15 @@ class WorkoutFitService(WorkoutGpxService):
         contains only one track. A new segment is created on after 'stop_all'
         event.
 
+        Frames are read in a single pass: creator, calories, segments stop
+        events and points are extracted while reading, and frames are not
+        kept in memory.
+
         TODO:
         - handle multiple sports activities (see Session)
         """
+        import fitdecode
+
         try:
             fit_file = fitdecode.FitReader(workout_file)
         except Exception as e:
@@ -100,94 +145,67 @@ class WorkoutFitService(WorkoutGpxService):
                 "error", "error when parsing fit file"
             ) from e
 
-        gpx_track = gpxpy.gpx.GPXTrack()
-        gpx_segment = gpxpy.gpx.GPXTrackSegment()
+        creator = None
+        calories = None
+        file_id_found = False
+        session_found = False
+        # points and stop events (None) with timestamp, in reading order
+        items: List[Tuple[Any, Optional["gpxpy.gpx.GPXTrackPoint"]]] = []
+        is_sorted = True
         try:
-            data_frames = list(
-                filter(
-                    lambda frame: frame.frame_type == fitdecode.FIT_FRAME_DATA,
-                    fit_file,
-                )
-            )
-
-            creator = cls.get_creator(data_frames)
-
-            calories = cls.get_total_calories(data_frames)
-
-            # Handle the actual data frames. We sort them by timestamp
-            # to handle devices that list events and records separately.
-            event_and_record_frames = sorted(
-                filter(
-                    lambda frame: frame.name in ["event", "record"],
-                    data_frames,
-                ),
-                key=lambda f: (
-                    f.get_value("timestamp")
-                    if f.has_field("timestamp")
-                    else -1
-                ),
-            )
+            for frame in fit_file:
+                if frame.frame_type != fitdecode.FIT_FRAME_DATA:
+                    continue
 
-            for frame in event_and_record_frames:
-                # create a new segment after 'stop_all' event
-                if (
-                    segments_creation_event in ["only_manual", "all"]
-                    and frame.name == "event"
-                    and frame.get_value("event") == "timer"
-                    and frame.get_value("event_type") == "stop_all"
-                ):
-                    if (
-                        segments_creation_event == "only_manual"
-                        and frame.has_field("timer_trigger")
-                        and frame.get_value("timer_trigger") != "manual"
-                    ):
-                        continue
-                    if gpx_segment.points:
-                        gpx_track.segments.append(gpx_segment)
-                    gpx_segment = gpxpy.gpx.GPXTrackSegment()
+                if frame.name == "file_id":
+                    if not file_id_found:
+                        file_id_found = True
+                        creator = cls.get_creator(frame)
                     continue
 
-                if frame.name != "record":
+                if frame.name == "session":
+                    if not session_found:
+                        session_found = True
+                        calories = cls.get_total_calories(frame)
                     continue
 
-                longitude = cls.get_value_from_frame(frame, "position_long")
-                latitude = cls.get_value_from_frame(frame, "position_lat")
-                time = cls.get_value_from_frame(frame, "timestamp")
-                if not longitude or not latitude or not time:
+                if frame.name == "event":
+                    if not cls.is_segment_stop_event(
+                        frame, segments_creation_event
+                    ):
+                        continue
+                    item = None
+                elif frame.name == "record":
+                    item = cls.get_point_from_record(frame)
+                    if item is None:
+                        continue
+                else:
                     continue
 
-                elevation = cls.get_value_from_frame(
-                    frame, "enhanced_altitude"
-                )
-                # some devices store elevation as a tuple instead of a float
-                if isinstance(elevation, tuple):
-                    elevation = (
-                        elevation[0] if elevation[0] is not None else None
-                    )
-                heart_rate = cls.get_value_from_frame(frame, "heart_rate")
-                cadence = cls.get_value_from_frame(frame, "cadence")
-                power = cls.get_value_from_frame(frame, "power")
-
-                point = gpxpy.gpx.GPXTrackPoint(
-                    longitude=cls.get_coordinate(longitude),
-                    latitude=cls.get_coordinate(latitude),
-                    elevation=float(elevation) if elevation else None,
-                    time=time,
-                )
-
-                if any(
-                    value is not None for value in [heart_rate, cadence, power]
-                ):
-                    point.extensions.append(
-                        cls._get_extensions(heart_rate, cadence, power)
-                    )
-                gpx_segment.points.append(point)
+                timestamp = frame.get_value("timestamp", fallback=-1)
+                if items and is_sorted and timestamp < items[-1][0]:
+                    is_sorted = False
+                items.append((timestamp, item))
 
         except fitdecode.exceptions.FitHeaderError as e:
             raise WorkoutFileException(
                 "error", "error when parsing fit file"
             ) from e
 
+        # Some devices list events and records separately, items are sorted
+        # by timestamp when needed.
+        if not is_sorted:
+            items.sort(key=itemgetter(0))
+
+        gpx_track = gpxpy.gpx.GPXTrack()
+        gpx_segment = gpxpy.gpx.GPXTrackSegment()
+        for _, point in items:
+            if point is None:
+                if gpx_segment.points:
+                    gpx_track.segments.append(gpx_segment)
+                gpx_segment = gpxpy.gpx.GPXTrackSegment()
+                continue
+            gpx_segment.points.append(point)
         if gpx_segment.points:
             gpx_track.segments.append(gpx_segment)
 
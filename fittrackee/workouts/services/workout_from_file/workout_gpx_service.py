@@ -1,11 +1,22 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from statistics import mean
-from typing import IO, TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import uuid4
 
 import gpxpy.gpx
-import pandas as pd
+import numpy as np
 import pytz
+from flask import current_app
 from lxml import etree as ET
 
 from fittrackee import appLog, db
@@ -27,11 +38,20 @@ from ..elevation.elevation_service import ElevationService
 from .base_workout_with_segment_service import (
     BaseWorkoutWithSegmentsCreationService,
 )
+from .segment_arrays import (
+    SegmentArrays,
+    SegmentStats,
+    get_elevations_array,
+    get_hr_cadence_power_stats,
+    get_track_stats,
+)
 from .workout_point import WorkoutPoint
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    import pandas as pd
+
     from fittrackee.users.models import User
     from fittrackee.workouts.models import Sport
 
@@ -49,6 +69,52 @@ class GpxInfo:
     descent: Optional[float] = None
 
 
+@dataclass
+class SegmentPointsData:
+    """
+    Data calculated from segment points
+    """
+
+    points: List[Dict]
+    coordinates: List[List[float]]
+    cadences: List[int]
+    heart_rates: List[int]
+    powers: List[int]
+    raw_max_speed: float
+    gpx_info: GpxInfo
+    # only with vectorized processing
+    stats: Optional["SegmentStats"] = None
+
+
+@dataclass
+class GpxAnalysisSettings:
+    sport_label: str
+    stopped_speed_threshold: float
+    use_raw_gpx_speed: bool
+    vectorized_processing: bool
+    # if True, files with missing elevations are not analysed, since
+    # elevations are fetched from elevation service
+    fetch_missing_elevations: bool
+
+
+@dataclass
+class GpxAnalysis:
+    """
+    Data calculated from parsed file, without database and elevation
+    service (for instance in a worker process on archive import).
+    Segments with less than 2 points have no data.
+    """
+
+    segments: List[Optional[SegmentPointsData]]
+    track_gpx_info: GpxInfo
+
+
+# function returning point elevation from point and point index
+PointElevationGetter = Callable[
+    ["gpxpy.gpx.GPXTrackPoint", int], Optional[float]
+]
+
+
 def remove_microseconds(delta: "timedelta") -> "timedelta":
     return delta - timedelta(microseconds=delta.microseconds)
 
@@ -64,6 +130,10 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
         get_elevation_on_refresh: bool = True,
         workout: Optional["Workout"] = None,
         change_elevation_source: Optional[ElevationDataSource] = None,
+        parsed_gpx: Optional["gpxpy.gpx.GPX"] = None,
+        # parsed file already analysed in another process (archive import)
+        gpx_analysis: Optional[GpxAnalysis] = None,
+        new_workout_id: Optional[int] = None,
     ):
         super().__init__(
             auth_user,
@@ -74,13 +144,28 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
             get_weather,
             get_elevation_on_refresh,
             change_elevation_source,
+            parsed_gpx,
+            gpx_analysis,
+            new_workout_id,
         )
-        self.gpx: "gpxpy.gpx.GPX" = self.parse_file(
-            workout_file, auth_user.segments_creation_event
+        self.gpx: "gpxpy.gpx.GPX" = (
+            parsed_gpx
+            if parsed_gpx
+            else self.parse_file(
+                workout_file, auth_user.segments_creation_event
+            )
         )
         self.cadences: List[int] = []
         self.heart_rates: List[int] = []
         self.powers: List[int] = []
+        self.vectorized_processing: bool = current_app.config[
+            "VECTORIZED_GPX_PROCESSING"
+        ]
+        # stats calculated with NumPy arrays on segment points processing
+        self.segments_stats: Dict[
+            "gpxpy.gpx.GPXTrackSegment", "SegmentStats"
+        ] = {}
+        self.gpx_analysis = gpx_analysis
 
     @staticmethod
     def _get_track_extension(calories: Union[int, str]) -> "ET.Element":
@@ -88,7 +173,9 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
 
     @staticmethod
     def _get_extensions(
-        heart_rate: Optional[int], cadence: Optional[int], power: Optional[int]
+        heart_rate: Optional[Union[int, str]],
+        cadence: Optional[Union[int, str]],
+        power: Optional[Union[int, str]],
     ) -> "ET.Element":
         track_point_extension = ET.Element("{gpxtpx}TrackPointExtension")
         if heart_rate is not None:
@@ -164,6 +251,32 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
             gpx_info.descent = hill.downhill
         return gpx_info
 
+    @staticmethod
+    def get_gpx_info_from_stats(stats: "SegmentStats") -> GpxInfo:
+        """
+        Same as 'get_gpx_info', with stats calculated with NumPy arrays
+        """
+        moving_data = stats.moving_data
+        gpx_info = GpxInfo(
+            duration=stats.duration,
+            distance=(
+                moving_data.moving_distance + moving_data.stopped_distance
+            ),
+            moving_time=moving_data.moving_time,
+            stopped_time=(
+                stats.duration - moving_data.moving_time
+                if stats.duration
+                else 0
+            ),
+            max_speed=moving_data.max_speed,
+            max_alt=stats.max_alt,
+            min_alt=stats.min_alt,
+        )
+        if stats.max_alt:
+            gpx_info.ascent = stats.uphill
+            gpx_info.descent = stats.downhill
+        return gpx_info
+
     @staticmethod
     def check_gpx_info(gpx_info: "GpxInfo") -> None:
         for key, value in WORKOUT_VALUES_LIMIT.items():
@@ -185,12 +298,14 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
         use_raw_gpx_speed: bool,
         hr_cadence_power_stats: dict,
         raw_max_speed: Optional[float] = None,
+        gpx_info: Optional[GpxInfo] = None,
     ) -> Union["Workout", "WorkoutSegment"]:
-        gpx_info = self.get_gpx_info(
-            parsed_gpx=parsed_gpx,
-            stopped_speed_threshold=stopped_speed_threshold,
-            use_raw_gpx_speed=use_raw_gpx_speed,
-        )
+        if gpx_info is None:
+            gpx_info = self.get_gpx_info(
+                parsed_gpx=parsed_gpx,
+                stopped_speed_threshold=stopped_speed_threshold,
+                use_raw_gpx_speed=use_raw_gpx_speed,
+            )
         self.check_gpx_info(gpx_info)
 
         if isinstance(object_to_update, WorkoutSegment):
@@ -270,7 +385,13 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
     def _get_point_elevation(
         self, elevation: Optional[float]
     ) -> Optional[float]:
-        if not elevation or self.sport.label in SPORTS_WITHOUT_ELEVATION_DATA:
+        return self._get_valid_elevation(elevation, self.sport.label)
+
+    @staticmethod
+    def _get_valid_elevation(
+        elevation: Optional[float], sport_label: str
+    ) -> Optional[float]:
+        if not elevation or sport_label in SPORTS_WITHOUT_ELEVATION_DATA:
             return None
 
         # some devices/software stores invalid elevation values
@@ -325,81 +446,140 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
 
         return None
 
-    def _process_segment_points(
+    @staticmethod
+    def _get_elevations_from_service(
+        elevation_service: "ElevationService",
+        points: List["gpxpy.gpx.GPXTrackPoint"],
+    ) -> List[Optional[int]]:
+        try:
+            return elevation_service.get_elevations(points)
+        except Exception as e:
+            raise WorkoutException(
+                "error",
+                "Error when getting elevation from elevation service",
+            ) from e
+
+    def _get_updated_point_elevation(
         self,
-        track_segment: "gpxpy.gpx.GPXTrackSegment",
+        point: "gpxpy.gpx.GPXTrackPoint",
+        point_idx: int,
+        existing_elevations: Optional["pd.DataFrame"],
+        elevations: List[Optional[int]],
+        workout_id: str,
+    ) -> Optional[float]:
+        """
+        Note: existing_elevations is None when no existing elevations
+        """
+        elevation = self._get_point_elevation(point.elevation)
+        # get elevation previously fetched
+        if (
+            not self.change_elevation_source
+            and existing_elevations is not None
+        ):
+            try:
+                previous_value = existing_elevations.at[  # noqa: PD008
+                    f"{point.time}|{point.latitude}|{point.longitude}",
+                    "elevation",
+                ]
+                elevation = (
+                    None if previous_value is None else float(previous_value)  # type: ignore[arg-type]
+                )
+            except KeyError:
+                appLog.error(
+                    "Error when getting existing elevation for "
+                    f"workout '{workout_id}'."
+                )
+        # get elevation from Elevation service
+        elif elevations:
+            elevation = elevations[point_idx]
+        return elevation
+
+    @staticmethod
+    def _get_extensions_values(
+        point: "gpxpy.gpx.GPXTrackPoint",
+    ) -> List[Tuple[str, int]]:
+        values: List[Tuple[str, int]] = []
+        if not point.extensions:
+            return values
+        extensions = []
+        for extension in point.extensions:
+            if "TrackPointExtension" in extension.tag:
+                extensions.extend(extension)
+            else:
+                extensions.append(extension)
+        for extension in extensions:
+            if not extension.text:
+                continue
+            if extension.tag == "power":
+                values.append(("power", int(extension.text)))
+            if extension.tag.endswith("}hr"):
+                values.append(("heart_rate", int(extension.text)))
+            if extension.tag.endswith("}cad"):
+                values.append(("cadence", int(float(extension.text))))
+            if extension.tag.endswith("}power"):
+                values.append(("power", int(extension.text)))
+        return values
+
+    @staticmethod
+    def _set_segment_start(
+        point: "gpxpy.gpx.GPXTrackPoint",
+        new_workout_segment: "WorkoutSegment",
         stopped_time_between_segments: timedelta,
         previous_segment_last_point_time: Optional[datetime],
-        new_workout_segment: "WorkoutSegment",
+    ) -> timedelta:
+        if not point.time:
+            raise WorkoutFileException("error", "<time> is missing in segment")
+        new_workout_segment.start_date = point.time
+        # if a previous segment exists, calculate stopped time
+        # between the two segments
+        if previous_segment_last_point_time and point.time:
+            stopped_time_between_segments += (
+                point.time - previous_segment_last_point_time
+            )
+        return stopped_time_between_segments
+
+    def _set_end_point(self, point: "gpxpy.gpx.GPXTrackPoint") -> None:
+        # store last gpx point (for weather data)
+        # Note: since segments with one point are ignored, the last
+        # point is overwritten, to get the last point from last valid
+        # segment
+        if point.time:
+            self.end_point = WorkoutPoint(
+                point.longitude,
+                point.latitude,
+                point.time,
+            )
+
+    @classmethod
+    def _get_segment_points_data(
+        cls,
+        track_segment: "gpxpy.gpx.GPXTrackSegment",
         first_point: "gpxpy.gpx.GPXTrackPoint",
-        existing_elevations: "pd.DataFrame",
-        elevation_service: Optional["ElevationService"],
-    ) -> Tuple[
-        timedelta,  # stopped_time_between_segments
-        Optional[datetime],  # previous_segment_last_point_time
-        Dict,  # hr_cadence_stats
-        float,  # raw_max_speed
-    ]:
+        get_point_elevation: PointElevationGetter,
+        stopped_speed_threshold: float,
+        use_raw_gpx_speed: bool,
+    ) -> SegmentPointsData:
+        """
+        Point elevations are updated while points are processed (distance
+        and speed are calculated with updated previous point elevation).
+        """
         points = track_segment.points
-        last_point_index = len(points) - 1
-        cadences = []
-        heart_rates = []
-        powers = []
+        cadences: List[int] = []
+        heart_rates: List[int] = []
+        powers: List[int] = []
+        extensions_values = {
+            "cadence": cadences,
+            "heart_rate": heart_rates,
+            "power": powers,
+        }
         previous_point = None
         previous_distance = 0.0
         segment_points: List[Dict] = []
-        elevations = []
         coordinates = []
         raw_max_speed = 0.0
-        workout_id = self.workout.short_id if self.workout else ""
-
-        if elevation_service:
-            try:
-                elevations = elevation_service.get_elevations(points)
-            except Exception as e:
-                raise WorkoutException(
-                    "error",
-                    "Error when getting elevation from elevation service",
-                ) from e
 
         for point_idx, point in enumerate(points):
-            if point_idx == 0:
-                if not point.time:
-                    raise WorkoutFileException(
-                        "error", "<time> is missing in segment"
-                    )
-                new_workout_segment.start_date = point.time
-                # if a previous segment exists, calculate stopped time
-                # between the two segments
-                if previous_segment_last_point_time and point.time:
-                    stopped_time_between_segments += (
-                        point.time - previous_segment_last_point_time
-                    )
-
-            point.elevation = self._get_point_elevation(point.elevation)
-            # get elevation previously fetched
-            if (
-                not self.change_elevation_source
-                and not existing_elevations.empty
-            ):
-                try:
-                    previous_value = existing_elevations.at[  # noqa: PD008
-                        f"{point.time}|{point.latitude}|{point.longitude}",
-                        "elevation",
-                    ]
-                    point.elevation = (
-                        None
-                        if previous_value is None
-                        else float(previous_value)  # type: ignore[arg-type]
-                    )
-                except KeyError:
-                    appLog.error(
-                        "Error when getting existing elevation for "
-                        f"workout '{workout_id}'."
-                    )
-            # get elevation from Elevation service
-            elif elevations:
-                point.elevation = elevations[point_idx]
+            point.elevation = get_point_elevation(point, point_idx)
 
             distance = (
                 point.distance_3d(previous_point)  # type: ignore[arg-type]
@@ -442,68 +622,276 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
                     else None
                 ),
             }
-            if point.extensions:
-                extensions = []
-                for extension in point.extensions:
-                    if "TrackPointExtension" in extension.tag:
-                        extensions.extend(extension)
-                    else:
-                        extensions.append(extension)
-                for extension in extensions:
-                    if not extension.text:
-                        continue
-                    if extension.tag == "power":
-                        power = int(extension.text)
-                        powers.append(power)
-                        segment_point["power"] = power
-                    if extension.tag.endswith("}hr"):
-                        hr = int(extension.text)
-                        heart_rates.append(hr)
-                        segment_point["heart_rate"] = hr
-                    if extension.tag.endswith("}cad"):
-                        cadence = int(float(extension.text))
-                        cadences.append(cadence)
-                        segment_point["cadence"] = cadence
-                    if extension.tag.endswith("}power"):
-                        power = int(extension.text)
-                        powers.append(power)
-                        segment_point["power"] = power
-
-            # last segment point
-            if point_idx == last_point_index:
-                previous_segment_last_point_time = point.time
-
-                # store last gpx point (for weather data)
-                # Note: since segments with one point are ignored, the last
-                # point is overwritten, to get the last point from last valid
-                # segment
-                if point.time:
-                    self.end_point = WorkoutPoint(
-                        point.longitude,
-                        point.latitude,
-                        point.time,
-                    )
+            for key, value in cls._get_extensions_values(point):
+                extensions_values[key].append(value)
+                segment_point[key] = value
+
             coordinates.append([point.longitude, point.latitude])
             segment_points.append(segment_point)
 
             previous_point = point
             previous_distance = distance
 
-        hr_cadence_stats = self._get_hr_cadence_power_data(
-            heart_rates, cadences, powers
+        return SegmentPointsData(
+            points=segment_points,
+            coordinates=coordinates,
+            cadences=cadences,
+            heart_rates=heart_rates,
+            powers=powers,
+            raw_max_speed=raw_max_speed,
+            gpx_info=cls.get_gpx_info(
+                parsed_gpx=track_segment,
+                stopped_speed_threshold=stopped_speed_threshold,
+                use_raw_gpx_speed=use_raw_gpx_speed,
+            ),
         )
-        self.cadences.extend(cadences)
-        self.heart_rates.extend(heart_rates)
-        self.powers.extend(powers)
-        self.coordinates.extend(coordinates)
-        new_workout_segment.points = segment_points
-        new_workout_segment.store_geometry(coordinates)
+
+    @classmethod
+    def _get_segment_points_data_with_arrays(
+        cls,
+        track_segment: "gpxpy.gpx.GPXTrackSegment",
+        first_point: "gpxpy.gpx.GPXTrackPoint",
+        get_point_elevation: PointElevationGetter,
+        stopped_speed_threshold: float,
+        use_raw_gpx_speed: bool,
+    ) -> SegmentPointsData:
+        """
+        Same result as '_get_segment_points_data', values being calculated
+        with NumPy arrays (see VECTORIZED_GPX_PROCESSING).
+        """
+        points = track_segment.points
+        cadences: List[int] = []
+        heart_rates: List[int] = []
+        powers: List[int] = []
+        extensions_values = {
+            "cadence": cadences,
+            "heart_rate": heart_rates,
+            "power": powers,
+        }
+        segment_points: List[Dict] = []
+
+        # like in '_get_segment_points_data', speed with next point is
+        # calculated with next point elevation from file
+        file_elevations = get_elevations_array(
+            [point.elevation for point in points]
+        )
+        for point_idx, point in enumerate(points):
+            point.elevation = get_point_elevation(point, point_idx)
+
+        segment_arrays = SegmentArrays.from_track_segment(track_segment)
+        distances = segment_arrays.get_cumulative_distances().tolist()
+        speeds = np.nan_to_num(
+            (segment_arrays.get_speeds(file_elevations) / 1000) * 3600
+        ).tolist()
+        speeds[0] = 0.0
+        durations = (
+            np.trunc(
+                np.nan_to_num(
+                    segment_arrays.get_time_differences(first_point.time)
+                )
+            )
+            .astype("int64")
+            .tolist()
+            if first_point.time
+            else [0] * len(points)
+        )
+
+        times = segment_arrays.get_times_strings()
+
+        raw_max_speed = 0.0
+        for point_idx, point in enumerate(points):
+            speed = round(speeds[point_idx], 2)
+            raw_max_speed = speed if speed > raw_max_speed else raw_max_speed
+            segment_point: Dict = {
+                "distance": distances[point_idx],
+                "duration": durations[point_idx],
+                "elevation": point.elevation,
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "pace": convert_speed_into_pace_in_sec_per_meter(speed),
+                "speed": speed,
+                "time": times[point_idx],
+            }
+            for key, value in cls._get_extensions_values(point):
+                extensions_values[key].append(value)
+                segment_point[key] = value
+            segment_points.append(segment_point)
+
+        stats = segment_arrays.get_stats(
+            stopped_speed_threshold, use_raw_gpx_speed
+        )
+        return SegmentPointsData(
+            points=segment_points,
+            coordinates=[
+                [point.longitude, point.latitude] for point in points
+            ],
+            cadences=cadences,
+            heart_rates=heart_rates,
+            powers=powers,
+            raw_max_speed=raw_max_speed,
+            gpx_info=cls.get_gpx_info_from_stats(stats),
+            stats=stats,
+        )
+
+    @classmethod
+    def _get_track_gpx_info(
+        cls,
+        track: "gpxpy.gpx.GPXTrack",
+        segments_stats: Dict["gpxpy.gpx.GPXTrackSegment", "SegmentStats"],
+        stopped_speed_threshold: float,
+        use_raw_gpx_speed: bool,
+        vectorized_processing: bool,
+    ) -> GpxInfo:
+        if not vectorized_processing:
+            return cls.get_gpx_info(
+                parsed_gpx=track,
+                stopped_speed_threshold=stopped_speed_threshold,
+                use_raw_gpx_speed=use_raw_gpx_speed,
+            )
+        # segments with less than 2 points are not processed, but
+        # taken into account in track data (like gpxpy)
+        return cls.get_gpx_info_from_stats(
+            get_track_stats(
+                [
+                    segments_stats.get(segment)
+                    or SegmentArrays.from_track_segment(segment).get_stats(
+                        stopped_speed_threshold, use_raw_gpx_speed
+                    )
+                    for segment in track.segments
+                ]
+            )
+        )
+
+    @classmethod
+    def analyse_gpx(
+        cls, gpx: "gpxpy.gpx.GPX", settings: GpxAnalysisSettings
+    ) -> Optional[GpxAnalysis]:
+        """
+        Calculate segments and track data from parsed file, without
+        database objects (workout creation only).
+
+        Return None if file cannot be analysed without elevation service
+        or if file is invalid (errors are raised on workout creation).
+
+        Note: point elevations are updated.
+        """
+        track = gpx.tracks[0]
+        valid_segments = [
+            segment for segment in track.segments if len(segment.points) > 1
+        ]
+        if not valid_segments or any(
+            not segment.points[0].time for segment in valid_segments
+        ):
+            return None
+        if settings.fetch_missing_elevations and any(
+            point.elevation is None
+            for segment in valid_segments
+            for point in segment.points
+        ):
+            return None
+
+        def get_point_elevation(
+            point: "gpxpy.gpx.GPXTrackPoint", point_idx: int
+        ) -> Optional[float]:
+            return cls._get_valid_elevation(
+                point.elevation, settings.sport_label
+            )
+
+        segments: List[Optional[SegmentPointsData]] = []
+        segments_stats = {}
+        first_point = valid_segments[0].points[0]
+        for segment in track.segments:
+            if len(segment.points) < 2:
+                segments.append(None)
+                continue
+            segment_data = (
+                cls._get_segment_points_data_with_arrays
+                if settings.vectorized_processing
+                else cls._get_segment_points_data
+            )(
+                segment,
+                first_point,
+                get_point_elevation,
+                settings.stopped_speed_threshold,
+                settings.use_raw_gpx_speed,
+            )
+            if segment_data.stats:
+                segments_stats[segment] = segment_data.stats
+            segments.append(segment_data)
+
+        return GpxAnalysis(
+            segments=segments,
+            track_gpx_info=cls._get_track_gpx_info(
+                track,
+                segments_stats,
+                settings.stopped_speed_threshold,
+                settings.use_raw_gpx_speed,
+                settings.vectorized_processing,
+            ),
+        )
+
+    def _process_segment_points(
+        self,
+        track_segment: "gpxpy.gpx.GPXTrackSegment",
+        first_point: "gpxpy.gpx.GPXTrackPoint",
+        existing_elevations: "pd.DataFrame",
+        elevation_service: Optional["ElevationService"],
+    ) -> SegmentPointsData:
+        elevations = []
+        workout_id = self.workout.short_id if self.workout else ""
+        if elevation_service:
+            elevations = self._get_elevations_from_service(
+                elevation_service, track_segment.points
+            )
+        previous_elevations = (
+            None if existing_elevations.empty else existing_elevations
+        )
+
+        def get_point_elevation(
+            point: "gpxpy.gpx.GPXTrackPoint", point_idx: int
+        ) -> Optional[float]:
+            return self._get_updated_point_elevation(
+                point, point_idx, previous_elevations, elevations, workout_id
+            )
 
         return (
-            stopped_time_between_segments,
-            previous_segment_last_point_time,
-            hr_cadence_stats,
-            raw_max_speed,
+            self._get_segment_points_data_with_arrays
+            if self.vectorized_processing
+            else self._get_segment_points_data
+        )(
+            track_segment,
+            first_point,
+            get_point_elevation,
+            self.stopped_speed_threshold,
+            self.auth_user.use_raw_gpx_speed,
+        )
+
+    def _store_segment_points_data(
+        self,
+        track_segment: "gpxpy.gpx.GPXTrackSegment",
+        segment_data: SegmentPointsData,
+        new_workout_segment: "WorkoutSegment",
+    ) -> Dict:
+        """
+        Return heart rate, cadence and power stats
+        """
+        self._set_end_point(track_segment.points[-1])
+        if segment_data.stats:
+            self.segments_stats[track_segment] = segment_data.stats
+        self.cadences.extend(segment_data.cadences)
+        self.heart_rates.extend(segment_data.heart_rates)
+        self.powers.extend(segment_data.powers)
+        self.coordinates.extend(segment_data.coordinates)
+        new_workout_segment.points = segment_data.points
+        new_workout_segment.store_geometry(segment_data.coordinates)
+        return (
+            get_hr_cadence_power_stats
+            if self.vectorized_processing
+            else self._get_hr_cadence_power_data
+        )(
+            segment_data.heart_rates,
+            segment_data.cadences,
+            segment_data.powers,
         )
 
     def _can_get_existing_elevations(self) -> bool:
@@ -537,9 +925,9 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
             == self.auth_user.missing_elevations_processing
         ):
             has_missing_elevation = any(
-                point.get("elevation") is None
+                elevation is None
                 for segment in self.workout.segments
-                for point in segment.points
+                for elevation in segment.points_reader.get_channel("elevation")
             )
             return not has_missing_elevation
 
@@ -547,6 +935,8 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
         return False
 
     def _get_existing_elevations(self) -> "pd.DataFrame":
+        import pandas as pd
+
         existing_elevations = pd.DataFrame()
 
         if not self.workout or not self._can_get_existing_elevations():
@@ -563,7 +953,9 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
                     ),
                     "elevation": point.get("elevation"),
                 }
-                for point in previous_segment.points
+                for point in previous_segment.points_reader.get_points(
+                    ["elevation", "latitude", "longitude", "time"]
+                )
             ]
             if points:
                 segment_df = pd.DataFrame(points).set_index(["idx"])
@@ -579,6 +971,8 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
         new_workout_uuid: "UUID",
         first_point: "gpxpy.gpx.GPXTrackPoint",
     ) -> Tuple[timedelta, float]:
+        import pandas as pd
+
         max_speed = 0.0
         previous_segment_last_point_time: Optional["datetime"] = None
         stopped_time_between_segments = timedelta(seconds=0)
@@ -605,11 +999,16 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
                     point.elevation is None for point in segment.points
                 )
 
-        elevation_service = self._get_elevation_service(
-            has_missing_elevation, not existing_elevations.empty
+        # analysed files do not need elevation service
+        elevation_service = (
+            None
+            if self.gpx_analysis
+            else self._get_elevation_service(
+                has_missing_elevation, not existing_elevations.empty
+            )
         )
 
-        for segment in segments:
+        for segment_idx, segment in enumerate(segments):
             # ignore segments with no distance
             if len(segment.points) < 2:
                 continue
@@ -620,19 +1019,27 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
             )
             db.session.add(new_workout_segment)
 
-            (
-                stopped_time_between_segments,
-                previous_segment_last_point_time,
-                hr_cadence_power_stats,
-                raw_max_speed,
-            ) = self._process_segment_points(
-                segment,
+            stopped_time_between_segments = self._set_segment_start(
+                segment.points[0],
+                new_workout_segment,
                 stopped_time_between_segments,
                 previous_segment_last_point_time,
-                new_workout_segment,
-                first_point,
-                existing_elevations,
-                elevation_service,
+            )
+            segment_data = (
+                self.gpx_analysis.segments[segment_idx]
+                if self.gpx_analysis
+                else None
+            )
+            if segment_data is None:
+                segment_data = self._process_segment_points(
+                    segment,
+                    first_point,
+                    existing_elevations,
+                    elevation_service,
+                )
+            previous_segment_last_point_time = segment.points[-1].time
+            hr_cadence_power_stats = self._store_segment_points_data(
+                segment, segment_data, new_workout_segment
             )
 
             workout_update_missing_elevations = (
@@ -648,7 +1055,8 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
                 stopped_speed_threshold=self.stopped_speed_threshold,
                 use_raw_gpx_speed=self.auth_user.use_raw_gpx_speed,
                 hr_cadence_power_stats=hr_cadence_power_stats,
-                raw_max_speed=raw_max_speed,
+                raw_max_speed=segment_data.raw_max_speed,
+                gpx_info=segment_data.gpx_info,
             )
 
             if (
@@ -720,8 +1128,11 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
                 sport_id=self.sport.id,
                 workout_date=self.get_workout_date(),
             )
+            if self.new_workout_id is not None:
+                self.workout.id = self.new_workout_id
+                self.workout.uuid = uuid4()
             db.session.add(self.workout)
-            db.session.flush()
+            self._flush()
         self.workout.source = self.gpx.creator
         if self.start_point:
             self.workout.store_start_point_geometry(
@@ -732,9 +1143,11 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
             track.segments, self.workout.id, self.workout.uuid, start_point
         )
 
-        hr_cadence_power_stats = self._get_hr_cadence_power_data(
-            self.heart_rates, self.cadences, self.powers
-        )
+        hr_cadence_power_stats = (
+            get_hr_cadence_power_stats
+            if self.vectorized_processing
+            else self._get_hr_cadence_power_data
+        )(self.heart_rates, self.cadences, self.powers)
         self.set_calculated_data(
             parsed_gpx=track,
             object_to_update=self.workout,
@@ -742,6 +1155,17 @@ class WorkoutGpxService(BaseWorkoutWithSegmentsCreationService):
             stopped_speed_threshold=self.stopped_speed_threshold,
             use_raw_gpx_speed=self.auth_user.use_raw_gpx_speed,
             hr_cadence_power_stats=hr_cadence_power_stats,
+            gpx_info=(
+                self.gpx_analysis.track_gpx_info
+                if self.gpx_analysis
+                else self._get_track_gpx_info(
+                    track,
+                    self.segments_stats,
+                    self.stopped_speed_threshold,
+                    self.auth_user.use_raw_gpx_speed,
+                    self.vectorized_processing,
+                )
+            ),
         )
         self.workout.max_speed = max_speed
         self.workout.best_pace = convert_speed_into_pace_duration(max_speed)
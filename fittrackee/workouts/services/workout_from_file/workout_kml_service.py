@@ -1,14 +1,68 @@
-from typing import IO
+from typing import IO, Dict, List, Optional
 
 import gpxpy.gpx
-import xmltodict
 from gpxpy.gpxfield import parse_time
+from lxml import etree as ET
 
 from ...exceptions import WorkoutFileException
 from .workout_gpx_service import WorkoutGpxService
+from .xml_parser import get_element_text, iterparse_xml
+
+PLACEMARK_PATH = ("kml", "Document", "Placemark")
+PLACEMARK_NAME_PATH = (*PLACEMARK_PATH, "name")
+PLACEMARK_DESCRIPTION_PATH = (*PLACEMARK_PATH, "description")
+TRACK_PATH = (*PLACEMARK_PATH, "MultiTrack", "Track")
+TRACK_WHEN_PATH = (*TRACK_PATH, "when")
+TRACK_COORD_PATH = (*TRACK_PATH, "coord")
+SIMPLE_ARRAY_DATA_PATH = (
+    *TRACK_PATH,
+    "ExtendedData",
+    "SchemaData",
+    "SimpleArrayData",
+)
+SIMPLE_ARRAY_DATA_VALUE_PATH = (*SIMPLE_ARRAY_DATA_PATH, "value")
 
 
 class WorkoutKmlService(WorkoutGpxService):
+    @classmethod
+    def _get_segment(
+        cls,
+        times: List[Optional[str]],
+        coords: List[Optional[str]],
+        extended_data: Dict[str, List[Optional[str]]],
+    ) -> "gpxpy.gpx.GPXTrackSegment":
+        gpx_segment = gpxpy.gpx.GPXTrackSegment()
+        heart_rates = extended_data.get("heartrate", [])
+        cadences = extended_data.get("cadence", [])
+        powers = extended_data.get("power", [])
+
+        for index, date in enumerate(times):
+            if index >= len(coords) or not coords[index]:
+                continue
+            longitude, latitude, elevation = coords[index].split()  # type: ignore[union-attr]
+            point = gpxpy.gpx.GPXTrackPoint(
+                longitude=float(longitude),
+                latitude=float(latitude),
+                elevation=float(elevation),
+                time=parse_time(date) if date else None,
+            )
+            heart_rate = (
+                heart_rates[index] if len(heart_rates) > index else None
+            )
+            cadence = cadences[index] if len(cadences) > index else None
+            power = powers[index] if len(powers) > index else None
+            if (
+                heart_rate is not None
+                or cadence is not None
+                or power is not None
+            ):
+                point.extensions.append(
+                    cls._get_extensions(heart_rate, cadence, power)
+                )
+
+            gpx_segment.points.append(point)
+        return gpx_segment
+
     @classmethod
     def parse_file(
         cls,
@@ -23,97 +77,73 @@ class WorkoutKmlService(WorkoutGpxService):
         corresponding to the first MultiTrack, containing one segment
         (<trkseg>) per kml track (<Track>).
 
+        File is parsed incrementally, to limit memory usage with large
+        files.
+
         Tested with files generated with OpenTracks.
 
         Note:
         - segments_creation_event is not used (only for .fit files)
         """
+        gpx_track = gpxpy.gpx.GPXTrack()
+        placemarks_count = 0
+        has_tracks = False
+        times: List[Optional[str]] = []
+        coords: List[Optional[str]] = []
+        extended_data: Dict[str, List[Optional[str]]] = {}
+        array_name: Optional[str] = None
+
         try:
-            kml_dict = xmltodict.parse(workout_file)
-        except Exception as e:
+            for event, path, element in iterparse_xml(workout_file):
+                if event == "start":
+                    if path == PLACEMARK_PATH:
+                        placemarks_count += 1
+                    elif placemarks_count > 1:
+                        # only first placemark is imported
+                        continue
+                    elif path == TRACK_PATH:
+                        has_tracks = True
+                        times = []
+                        coords = []
+                        extended_data = {}
+                    elif path == SIMPLE_ARRAY_DATA_PATH:
+                        array_name = element.get("name")
+                        extended_data[str(array_name)] = []
+                    continue
+
+                if placemarks_count > 1:
+                    continue
+                if path == TRACK_WHEN_PATH:
+                    times.append(get_element_text(element))
+                elif path == TRACK_COORD_PATH:
+                    coords.append(get_element_text(element))
+                elif path == SIMPLE_ARRAY_DATA_VALUE_PATH:
+                    extended_data[str(array_name)].append(
+                        get_element_text(element)
+                    )
+                elif path == TRACK_PATH:
+                    if coords:
+                        gpx_track.segments.append(
+                            cls._get_segment(times, coords, extended_data)
+                        )
+                elif path == PLACEMARK_NAME_PATH:
+                    gpx_track.name = get_element_text(element)
+                elif path == PLACEMARK_DESCRIPTION_PATH:
+                    gpx_track.description = get_element_text(element)
+        except ET.XMLSyntaxError as e:
             raise WorkoutFileException(
                 "error", "error when parsing kml file"
             ) from e
 
-        placemarks = kml_dict["kml"].get("Document", {}).get("Placemark", [])
-        if not placemarks:
+        if not placemarks_count:
             raise WorkoutFileException(
                 "error", "unsupported kml file"
             ) from None
-        if isinstance(placemarks, dict):
-            placemarks = [placemarks]
-        placemark = placemarks[0]
-
-        kml_tracks = placemark.get("MultiTrack", {}).get("Track", [])
-        coordinates_key = "coord"
-        if not kml_tracks:
-            kml_tracks = placemark.get("gx:MultiTrack", {}).get("gx:Track", [])
-            if not kml_tracks:
-                raise WorkoutFileException(
-                    "error", "no tracks in kml file"
-                ) from None
-            coordinates_key = "gx:coord"
-
-        if isinstance(kml_tracks, dict):
-            kml_tracks = [kml_tracks]
-
-        gpx_track = gpxpy.gpx.GPXTrack()
-        gpx_track.name = placemark.get("name")
-        gpx_track.description = placemark.get("description")
-        for kml_track in kml_tracks:
-            gpx_segment = gpxpy.gpx.GPXTrackSegment()
-
-            coords = kml_track.get(coordinates_key, [])
-            if not coords:
-                continue
-            if isinstance(coords, dict):
-                coords = [coords]
-            times = kml_track.get("when", [])
-            if isinstance(times, dict):
-                times = [times]
-
-            heart_rates = []
-            cadences = []
-            powers = []
-            extended_data = (
-                kml_track.get("ExtendedData", {})
-                .get("SchemaData", {})
-                .get("gx:SimpleArrayData", [])
-            )
-            for data in extended_data:
-                if data["@name"] == "heartrate":
-                    heart_rates = data["gx:value"]
-                if data["@name"] == "cadence":
-                    cadences = data["gx:value"]
-                if data["@name"] == "power":
-                    powers = data["gx:value"]
-
-            for index, date in enumerate(times):
-                if not coords[index]:
-                    continue
-                longitude, latitude, elevation = coords[index].split()
-                point = gpxpy.gpx.GPXTrackPoint(
-                    longitude=float(longitude),
-                    latitude=float(latitude),
-                    elevation=float(elevation),
-                    time=parse_time(date),
-                )
-                heart_rate = (
-                    heart_rates[index] if len(heart_rates) > index else None
-                )
-                cadence = cadences[index] if len(cadences) > index else None
-                power = powers[index] if len(powers) > index else None
-                if (
-                    heart_rate is not None
-                    or cadence is not None
-                    or power is not None
-                ):
-                    point.extensions.append(
-                        cls._get_extensions(heart_rate, cadence, power)
-                    )
+        if not has_tracks:
+            raise WorkoutFileException(
+                "error", "no tracks in kml file"
+            ) from None
 
-                gpx_segment.points.append(point)
-            gpx_track.segments.append(gpx_segment)
         gpx = gpxpy.gpx.GPX()
         gpx.tracks.append(gpx_track)
         return gpx
@@ -1,13 +1,22 @@
-import re
 from typing import IO, Dict, Optional
 
 import gpxpy.gpx
-import xmltodict
 from gpxpy.gpxfield import parse_time
+from lxml import etree as ET
 
 from ...constants import NSMAP
 from ...exceptions import WorkoutFileException
 from .workout_gpx_service import WorkoutGpxService
+from .xml_parser import get_element_text, iterparse_xml
+
+ROOT_PATH = ("TrainingCenterDatabase",)
+AUTHOR_NAME_PATH = (*ROOT_PATH, "Author", "Name")
+ACTIVITY_PATH = (*ROOT_PATH, "Activities", "Activity")
+ACTIVITY_CREATOR_NAME_PATH = (*ACTIVITY_PATH, "Creator", "Name")
+LAP_PATH = (*ACTIVITY_PATH, "Lap")
+LAP_CALORIES_PATH = (*LAP_PATH, "Calories")
+TRACK_PATH = (*LAP_PATH, "Track")
+TRACKPOINT_PATH = (*TRACK_PATH, "Trackpoint")
 
 
 class WorkoutTcxService(WorkoutGpxService):
@@ -24,6 +33,38 @@ class WorkoutTcxService(WorkoutGpxService):
             return elevation
         return None
 
+    @classmethod
+    def _get_track_point(
+        cls, point: Dict
+    ) -> Optional["gpxpy.gpx.GPXTrackPoint"]:
+        """
+        point: trackpoint values, with keys corresponding to element path
+        relative to trackpoint (for instance 'Position/LatitudeDegrees')
+        """
+        latitude = point.get("Position/LatitudeDegrees")
+        longitude = point.get("Position/LongitudeDegrees")
+        if latitude is None or longitude is None:
+            return None
+
+        time = point.get("Time")
+        gpx_track_point = gpxpy.gpx.GPXTrackPoint(
+            longitude=float(longitude),
+            latitude=float(latitude),
+            elevation=cls._get_elevation(point),
+            time=parse_time(time) if time else None,
+        )
+
+        heart_rate = point.get("HeartRateBpm/Value")
+        cadence = point.get("Cadence")
+        if not cadence:
+            cadence = point.get("Extensions/TPX/RunCadence")
+        power = point.get("Extensions/TPX/Watts")
+        if heart_rate is not None or cadence is not None or power is not None:
+            gpx_track_point.extensions.append(
+                cls._get_extensions(heart_rate, cadence, power)
+            )
+        return gpx_track_point
+
     @classmethod
     def parse_file(
         cls, workout_file: IO[bytes], segments_creation_event: str
@@ -33,128 +74,73 @@ class WorkoutTcxService(WorkoutGpxService):
         A gpx file generated from tcx file contains one track containing one
         segment per activity.
 
+        File is parsed incrementally (trackpoints are converted to gpx
+        points as soon as they are parsed), to limit memory usage with
+        large files.
+
         TODO:
         - handle multiple sports activities like Swimrun
 
         Note:
         - segments_creation_event is not used (only for .fit files)
         """
-        try:
-            tcx_dict = xmltodict.parse(workout_file)
-        except Exception as e:
-            raise WorkoutFileException(
-                "error", "error when parsing tcx file"
-            ) from e
-
-        activities = (
-            tcx_dict["TrainingCenterDatabase"]
-            .get("Activities", {})
-            .get("Activity", [])
-        )
-        if isinstance(activities, dict):
-            activities = [activities]
-
-        if not activities:
-            raise WorkoutFileException(
-                "error", "no activities in tcx file"
-            ) from None
-
         gpx_track = gpxpy.gpx.GPXTrack()
+        gpx_segment = gpxpy.gpx.GPXTrackSegment()
+        activities_count = 0
+        laps_count = 0
         has_tracks = False
-        tag_prefix = None
+        author: Optional[str] = None
         creator = ""
         calories: Optional[str] = None
+        point: Dict[str, Optional[str]] = {}
 
-        for activity in activities:
-            has_points = False
-
-            if not creator:
-                creator = activity.get("Creator", {}).get("Name", "")
-
-            gpx_segment = gpxpy.gpx.GPXTrackSegment()
-            laps = activity.get("Lap", [])
-            if isinstance(laps, dict):
-                laps = [laps]
-            if not laps:
-                continue
-
-            for index, lap in enumerate(laps):
-                if index == 0:
-                    # Get total calories (units: kcal)
-                    calories = lap.get("Calories")
-
-                tcx_tracks = lap.get("Track", [])
-                if isinstance(tcx_tracks, dict):
-                    tcx_tracks = [tcx_tracks]
-                if not tcx_tracks:
+        try:
+            for event, path, element in iterparse_xml(workout_file):
+                if event == "start":
+                    if path == ACTIVITY_PATH:
+                        activities_count += 1
+                        laps_count = 0
+                        gpx_segment = gpxpy.gpx.GPXTrackSegment()
+                    elif path == LAP_PATH:
+                        laps_count += 1
+                        if laps_count == 1:
+                            # Get total calories (units: kcal)
+                            calories = None
+                    elif path[:-1] == TRACK_PATH:
+                        has_tracks = True
+                        if path == TRACKPOINT_PATH:
+                            point = {}
                     continue
 
-                for tcx_track in tcx_tracks:
-                    has_tracks = True
-
-                    points = tcx_track.get("Trackpoint", [])
-                    if isinstance(points, dict):
-                        points = [points]
-
-                    if not points:
-                        continue
-
-                    for point in points:
-                        coordinates = point.get("Position", {})
-                        if not coordinates:
-                            continue
-
-                        gpx_track_point = gpxpy.gpx.GPXTrackPoint(
-                            longitude=float(
-                                coordinates.get("LongitudeDegrees")
-                            ),
-                            latitude=float(coordinates.get("LatitudeDegrees")),
-                            elevation=cls._get_elevation(point),
-                            time=parse_time(point.get("Time")),
+                if path[: len(TRACKPOINT_PATH)] == TRACKPOINT_PATH:
+                    if path == TRACKPOINT_PATH:
+                        gpx_track_point = cls._get_track_point(point)
+                        if gpx_track_point:
+                            gpx_segment.points.append(gpx_track_point)
+                    elif len(element) == 0:
+                        point["/".join(path[len(TRACKPOINT_PATH) :])] = (
+                            get_element_text(element)
                         )
+                elif path == ACTIVITY_PATH:
+                    if gpx_segment.points:
+                        gpx_track.segments.append(gpx_segment)
+                elif path == LAP_CALORIES_PATH:
+                    if laps_count == 1:
+                        calories = get_element_text(element)
+                elif path == ACTIVITY_CREATOR_NAME_PATH:
+                    if not creator:
+                        creator = get_element_text(element) or ""
+                elif path == AUTHOR_NAME_PATH:
+                    author = get_element_text(element)
+        except ET.XMLSyntaxError as e:
+            raise WorkoutFileException(
+                "error", "error when parsing tcx file"
+            ) from e
 
-                        heart_rate = point.get("HeartRateBpm", {}).get("Value")
-                        cadence = point.get("Cadence")
-                        power = None
-
-                        extensions = point.get("Extensions", {})
-                        tpx_tags = [
-                            key
-                            for key in extensions.keys()
-                            if re.search("TPX$", key)
-                        ]
-                        if tpx_tags:
-                            tpx_tag = tpx_tags[0]
-                            if tag_prefix is None:
-                                tag_prefix = (
-                                    f"{tpx_tag.split(':')[0]}:"
-                                    if ":" in tpx_tag
-                                    else ""
-                                )
-
-                            power = extensions.get(tpx_tag, {}).get(
-                                f"{tag_prefix}Watts"
-                            )
-
-                            if not cadence:
-                                cadence = extensions.get(
-                                    f"{tag_prefix}TPX", {}
-                                ).get(f"{tag_prefix}RunCadence")
-
-                        if (
-                            heart_rate is not None
-                            or cadence is not None
-                            or power is not None
-                        ):
-                            gpx_track_point.extensions.append(
-                                cls._get_extensions(heart_rate, cadence, power)
-                            )
-
-                        gpx_segment.points.append(gpx_track_point)
-                        has_points = True
-
-            if has_points:
-                gpx_track.segments.append(gpx_segment)
+        if not activities_count:
+            raise WorkoutFileException(
+                "error", "no activities in tcx file"
+            ) from None
 
         if not has_tracks:
             raise WorkoutFileException(
@@ -171,9 +157,6 @@ class WorkoutTcxService(WorkoutGpxService):
             gpx_track.extensions.append(extension)
 
         gpx = gpxpy.gpx.GPX()
-        author = (
-            tcx_dict["TrainingCenterDatabase"].get("Author", {}).get("Name")
-        )
         gpx.creator = creator if creator else author
         gpx.nsmap = NSMAP
         gpx.tracks.append(gpx_track)
@@ -0,0 +1,52 @@
+from typing import IO, Iterator, Optional, Tuple
+
+from lxml import etree as ET
+
+XmlPath = Tuple[str, ...]
+
+
+def get_element_text(element: "ET._Element") -> Optional[str]:
+    """
+    Return element text without surrounding whitespaces (None if empty)
+    """
+    if element.text is None:
+        return None
+    text = element.text.strip()
+    return text if text else None
+
+
+def iterparse_xml(
+    xml_file: IO[bytes],
+) -> Iterator[Tuple[str, XmlPath, "ET._Element"]]:
+    """
+    Parse XML file incrementally and yield events ('start' or 'end') with
+    element path (local names from root element, namespaces are ignored).
+
+    Elements are cleared once 'end' event is handled, to keep only the
+    current branch in memory. Element text must be read on its own 'end'
+    event (children content is no longer available on parent 'end' event).
+
+    Raises 'lxml.etree.XMLSyntaxError' if file is not a valid XML file.
+    """
+    path: XmlPath = ()
+    for event, element in ET.iterparse(
+        xml_file,
+        events=("start", "end"),
+        no_network=True,
+        remove_comments=True,
+        remove_pis=True,
+        resolve_entities=False,
+    ):
+        if event == "start":
+            # tag without namespace
+            path = (*path, element.tag.rpartition("}")[2])
+            yield event, path, element
+            continue
+
+        yield event, path, element
+        path = path[:-1]
+        element.clear(keep_tail=False)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
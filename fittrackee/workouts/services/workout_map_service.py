@@ -0,0 +1,101 @@
+import os
+import secrets
+from typing import TYPE_CHECKING, List
+
+from geoalchemy2.shape import to_shape
+from sqlalchemy.event import listens_for
+from sqlalchemy.orm.session import Session
+
+from fittrackee import db
+from fittrackee.constants import MapStatus, StorageCategory
+from fittrackee.files import get_absolute_file_path
+from fittrackee.users.storage import get_file_size, update_storage_usage
+
+from .workout_from_file.base_workout_with_segment_service import (
+    BaseWorkoutWithSegmentsCreationService,
+)
+
+if TYPE_CHECKING:
+    from fittrackee.workouts.models import Workout
+
+
+class WorkoutMapService:
+    """
+    Generate map image from workout segments geometries, once workout is
+    stored (to render map in a background task).
+    """
+
+    def __init__(self, workout: "Workout") -> None:
+        if not workout.map:
+            raise ValueError("workout has no map file path")
+        self.workout = workout
+
+    def get_coordinates(self) -> List[List[float]]:
+        coordinates: List[List[float]] = []
+        for segment in sorted(
+            self.workout.segments, key=lambda segment: segment.start_date
+        ):
+            coordinates.extend(
+                [list(point) for point in to_shape(segment.geom).coords]
+            )
+        return coordinates
+
+    @staticmethod
+    def get_temporary_map_filepath(absolute_map_filepath: str) -> str:
+        # extension is kept, since it determines image format
+        root, extension = os.path.splitext(absolute_map_filepath)
+        return f"{root}_{secrets.token_hex(8)}.tmp{extension}"
+
+    def render(self) -> None:
+        """
+        Generate map image and update map id with image hash
+
+        Image is rendered in a temporary file, that replaces existing map
+        only on success (existing map is kept when rendering fails).
+        """
+        map_filepath: str = self.workout.map  # type: ignore[assignment]
+        absolute_map_filepath = get_absolute_file_path(map_filepath)
+        # map may already exist (for instance when workout is refreshed)
+        previous_map_size = get_file_size(absolute_map_filepath)
+        temporary_map_filepath = self.get_temporary_map_filepath(
+            absolute_map_filepath
+        )
+        try:
+            BaseWorkoutWithSegmentsCreationService.generate_map_image(
+                map_filepath=temporary_map_filepath,
+                coordinates=self.get_coordinates(),
+            )
+            os.replace(temporary_map_filepath, absolute_map_filepath)
+        except Exception as e:
+            if os.path.exists(temporary_map_filepath):
+                os.remove(temporary_map_filepath)
+            raise e
+        self.workout.map_id = (
+            BaseWorkoutWithSegmentsCreationService.get_map_hash(map_filepath)
+        )
+        self.workout.map_status = MapStatus.READY
+        update_storage_usage(
+            db.session.connection(),
+            self.workout.user_id,
+            StorageCategory.MAPS,
+            get_file_size(absolute_map_filepath) - previous_map_size,
+        )
+
+    def add_rendering_task(self) -> None:
+        """
+        Set map as pending with a temporary id, and send rendering task once
+        workout is committed.
+        The task is ignored if map id changes in the meantime (for instance
+        when another rendering task is sent).
+        """
+        from fittrackee.workouts.tasks import render_workout_map
+
+        map_id = secrets.token_hex(16)
+        self.workout.map_id = map_id
+        self.workout.map_status = MapStatus.PENDING
+        db.session.flush()
+        workout_id = self.workout.id
+
+        @listens_for(db.Session, "after_commit", once=True)
+        def receive_after_commit(session: Session) -> None:
+            render_workout_map.send(workout_id=workout_id, map_id=map_id)
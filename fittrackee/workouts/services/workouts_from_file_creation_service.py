@@ -1,26 +1,50 @@
+import multiprocessing
 import os
 import secrets
 import zipfile
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from io import BytesIO
-from typing import IO, TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from itertools import islice
+from multiprocessing.reduction import ForkingPickler
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 from flask import current_app
+from lxml import etree as ET
+from sqlalchemy import func, select
 
 from fittrackee import appLog, db
+from fittrackee.constants import MapStatus, StorageCategory
 from fittrackee.equipments.exceptions import InvalidEquipmentsException
 from fittrackee.equipments.models import Equipment
 from fittrackee.files import check_mime_type, get_absolute_file_path
 from fittrackee.users.models import Notification, User, UserTask
+from fittrackee.users.storage import get_file_size, update_storage_usage
 from fittrackee.visibility_levels import get_calculated_visibility
 from fittrackee.workouts.models import (
     DESCRIPTION_MAX_CHARACTERS,
     NOTES_MAX_CHARACTERS,
+    Workout,
+    deferred_records_update,
 )
 
 from ..constants import (
+    SPORTS_WITHOUT_ELEVATION_DATA,
     WORKOUT_ALLOWED_EXTENSIONS,
     WORKOUT_FILE_DETECTED_MIMETYPES,
 )
@@ -33,14 +57,95 @@ from ..exceptions import (
 from .base_workout_service import (
     BaseWorkoutService,
 )
+from .elevation.elevation_service import ElevationService
 from .mixins import WorkoutFileMixin
 from .workout_from_file.services import WORKOUT_FROM_FILE_SERVICES
+from .workout_from_file.workout_gpx_service import (
+    GpxAnalysis,
+    GpxAnalysisSettings,
+)
+from .workout_map_service import WorkoutMapService
 
 if TYPE_CHECKING:
+    from gpxpy.gpx import GPX
     from werkzeug.datastructures import FileStorage
 
     from fittrackee.visibility_levels import VisibilityLevel
-    from fittrackee.workouts.models import Workout
+
+    from .workout_from_file.base_workout_with_segment_service import (
+        BaseWorkoutWithSegmentsCreationService,
+    )
+
+# with parallel import, workouts are inserted and progress is committed by
+# chunk of n files
+PARALLEL_IMPORT_CHUNK_SIZE = 10
+
+
+@dataclass
+class ParsedWorkoutFile:
+    gpx: Optional["GPX"] = None
+    analysis: Optional["GpxAnalysis"] = None
+    error: Optional[str] = None
+    content: bytes = b""
+
+
+@dataclass
+class PendingWorkoutMap:
+    """
+    Map to generate once workout is committed (parallel import)
+    """
+
+    workout: "Workout"
+    absolute_workout_filepath: str
+    workout_service_class: Type["BaseWorkoutWithSegmentsCreationService"]
+    coordinates: List[List[float]]
+
+
+def _reduce_lxml_element(
+    element: "ET._Element",
+) -> Tuple[Callable, Tuple[bytes]]:
+    return ET.fromstring, (ET.tostring(element),)
+
+
+def init_import_worker() -> None:
+    # parsed files may contain extensions as lxml elements, that cannot be
+    # pickled when returned by worker processes
+    ForkingPickler.register(ET._Element, _reduce_lxml_element)
+
+
+def parse_workout_file(
+    extension: str,
+    file_content: bytes,
+    segments_creation_event: str,
+    analysis_settings: GpxAnalysisSettings,
+) -> ParsedWorkoutFile:
+    """
+    Check, parse and analyse a file from archive (executed in a worker
+    process on parallel import).
+    Errors are returned as messages, since FitTrackee exceptions cannot be
+    unpickled.
+    """
+    try:
+        workout_file = BytesIO(file_content)
+        check_mime_type(
+            extension, workout_file, WORKOUT_FILE_DETECTED_MIMETYPES
+        )
+        workout_file.seek(0)
+        gpx = WORKOUT_FROM_FILE_SERVICES[extension].parse_file(
+            workout_file, segments_creation_event
+        )
+    except Exception as e:
+        return ParsedWorkoutFile(error=str(e))
+
+    try:
+        analysis = WORKOUT_FROM_FILE_SERVICES[extension].analyse_gpx(
+            gpx, analysis_settings
+        )
+    except Exception:
+        # file is parsed and processed again in main process, to get
+        # the same error as on synchronous import
+        return ParsedWorkoutFile()
+    return ParsedWorkoutFile(gpx=gpx, analysis=analysis)
 
 
 @dataclass
@@ -175,9 +280,18 @@ class AbstractWorkoutsCreationService(BaseWorkoutService, WorkoutFileMixin):
         equipments: Union[List["Equipment"], None],
         workout_file: Optional["IO[bytes]"] = None,
         get_weather: bool = True,
+        parsed_gpx: Optional["GPX"] = None,
+        gpx_analysis: Optional["GpxAnalysis"] = None,
+        new_workout_id: Optional[int] = None,
+        pending_maps: Optional[List[PendingWorkoutMap]] = None,
     ) -> "Workout":
         """
-        Return map absolute file path in order to delete file on error
+        Create workout and generate map image.
+
+        On parallel archive import, workout id is reserved and changes are
+        not committed: workout is inserted with the other workouts of the
+        chunk, and map is added to pending maps to be generated after
+        commit.
         """
         if workout_file is None and self.file is None:
             raise WorkoutNoFileException()
@@ -196,6 +310,9 @@ class AbstractWorkoutsCreationService(BaseWorkoutService, WorkoutFileMixin):
             stopped_speed_threshold=self.stopped_speed_threshold,
             get_weather=get_weather,
             workout=None,
+            parsed_gpx=parsed_gpx,
+            gpx_analysis=gpx_analysis,
+            new_workout_id=new_workout_id,
         )
 
         # extract and calculate data from provided file
@@ -262,7 +379,54 @@ class AbstractWorkoutsCreationService(BaseWorkoutService, WorkoutFileMixin):
             extension=f".{extension}",
         )
 
+        if pending_maps is not None:
+            update_storage_usage(
+                db.session.connection(),
+                self.auth_user.id,
+                StorageCategory.ORIGINAL_FILES,
+                get_file_size(absolute_workout_filepath),
+            )
+            pending_maps.append(
+                PendingWorkoutMap(
+                    workout=new_workout,
+                    absolute_workout_filepath=absolute_workout_filepath,
+                    workout_service_class=type(workout_service),
+                    coordinates=workout_service.coordinates,
+                )
+            )
+            return new_workout
+
         # generate and store map image
+        try:
+            absolute_map_filepath = self._add_workout_map(
+                new_workout,
+                type(workout_service),
+                workout_service.coordinates,
+            )
+        except WorkoutException as e:
+            if os.path.exists(absolute_workout_filepath):
+                os.remove(absolute_workout_filepath)
+            raise e
+        self._update_files_storage_usage(
+            [
+                (StorageCategory.ORIGINAL_FILES, absolute_workout_filepath),
+                (StorageCategory.MAPS, absolute_map_filepath),
+            ]
+        )
+        db.session.commit()
+        return new_workout
+
+    def _add_workout_map(
+        self,
+        new_workout: "Workout",
+        workout_service_class: Type["BaseWorkoutWithSegmentsCreationService"],
+        coordinates: List[List[float]],
+    ) -> Optional[str]:
+        """
+        Generate and store map image, or send rendering task when map is
+        rendered asynchronously.
+        Return map absolute file path when image is generated.
+        """
         map_filepath = self.get_file_path(
             workout_date=new_workout.workout_date.strftime(
                 "%Y-%m-%d_%H-%M-%S"
@@ -270,23 +434,43 @@ class AbstractWorkoutsCreationService(BaseWorkoutService, WorkoutFileMixin):
             extension=".png",
         )
         new_workout.map = map_filepath
+        if (
+            current_app.config["STATICMAP_ASYNC_RENDERING"]
+            and current_app.config["TASKS_PROCESSING_AVAILABLE"]
+        ):
+            # map image is generated in a background task
+            WorkoutMapService(new_workout).add_rendering_task()
+            return None
+
         absolute_map_filepath = get_absolute_file_path(map_filepath)
         try:
-            workout_service.generate_map_image(
+            workout_service_class.generate_map_image(
                 map_filepath=absolute_map_filepath,
-                coordinates=workout_service.coordinates,
+                coordinates=coordinates,
             )
-            new_workout.map_id = workout_service.get_map_hash(map_filepath)
+            new_workout.map_id = workout_service_class.get_map_hash(
+                map_filepath
+            )
+            new_workout.map_status = MapStatus.READY
         except Exception as e:
             if os.path.exists(absolute_map_filepath):
                 os.remove(absolute_map_filepath)
-            if os.path.exists(absolute_workout_filepath):
-                os.remove(absolute_workout_filepath)
             raise WorkoutException(
                 "error", "error when generating map image"
             ) from e
-        db.session.commit()
-        return new_workout
+        return absolute_map_filepath
+
+    def _update_files_storage_usage(
+        self, files: List[Tuple[StorageCategory, Optional[str]]]
+    ) -> None:
+        for category, file_path in files:
+            if file_path:
+                update_storage_usage(
+                    db.session.connection(),
+                    self.auth_user.id,
+                    category,
+                    get_file_size(file_path),
+                )
 
     def process_archive_content(
         self,
@@ -302,48 +486,320 @@ class AbstractWorkoutsCreationService(BaseWorkoutService, WorkoutFileMixin):
             )
         appLog.debug(" > starting archive processing...")
 
-        new_workouts = []
-        errored_workouts = {}
+        # only archives imported in tasks are processed in parallel
+        workers = (
+            current_app.config["WORKOUTS_IMPORT_WORKERS"] if upload_task else 1
+        )
+        new_workouts: List["Workout"] = []
+        errored_workouts: Dict[str, str] = {}
         total_files = len(files_to_process)
-        with zipfile.ZipFile(archive_content, "r") as zip_ref:
-            for index, file in enumerate(files_to_process, start=1):
-                appLog.debug(f"  - file {index}/{total_files}")
-                extension = self._get_file_extension(file)
-                if extension not in WORKOUT_ALLOWED_EXTENSIONS:
-                    appLog.info("invalid file extension, skipping file")
-                    continue
-                try:
-                    file_content = zip_ref.open(file)
-                    check_mime_type(
-                        extension,
-                        file_content,
-                        WORKOUT_FILE_DETECTED_MIMETYPES,
-                    )
-                    new_workout = self.create_workout_from_file(
-                        extension, equipments, file_content, get_weather
+        # records are calculated once all files are processed
+        with (
+            deferred_records_update(db.session()),
+            zipfile.ZipFile(archive_content, "r") as zip_ref,
+        ):
+            archive_files = self._get_archive_files(
+                zip_ref, files_to_process, workers
+            )
+            if upload_task is None or workers <= 1:
+                for index, file, _ in archive_files:
+                    appLog.debug(f"  - file {index}/{total_files}")
+                    self._process_archive_file(
+                        zip_ref,
+                        file,
+                        equipments,
+                        get_weather,
+                        new_workouts,
+                        errored_workouts,
                     )
-                except Exception as e:
-                    db.session.rollback()
-                    error = e.args[0]
-                    errored_workouts[file] = error
-                    appLog.debug(f"    > error occurred: {error}")
                     if upload_task:
-                        upload_task.progress = int(100 * index / total_files)
-                        db.session.commit()
-                    continue
-
-                new_workouts.append(new_workout)
-                appLog.debug("    > upload done")
-                if upload_task:
-                    upload_task.data = {
-                        **upload_task.data,
-                        "new_workouts_count": len(new_workouts),
-                    }
-                    upload_task.progress = int(100 * index / total_files)
-                    db.session.commit()
+                        self._update_upload_task_progress(
+                            upload_task,
+                            new_workouts_count=len(new_workouts),
+                            progress=int(100 * index / total_files),
+                            commit=True,
+                        )
+                return new_workouts, errored_workouts
+
+            while chunk := list(
+                islice(archive_files, PARALLEL_IMPORT_CHUNK_SIZE)
+            ):
+                appLog.debug(
+                    f"  - files {chunk[0][0]} to {chunk[-1][0]}/{total_files}"
+                )
+                self._process_archive_files_chunk(
+                    chunk,  # type: ignore[arg-type]
+                    zip_ref,
+                    equipments,
+                    get_weather,
+                    new_workouts,
+                    errored_workouts,
+                )
+                self._update_upload_task_progress(
+                    upload_task,
+                    new_workouts_count=len(new_workouts),
+                    progress=int(100 * chunk[-1][0] / total_files),
+                    commit=True,
+                )
 
         return new_workouts, errored_workouts
 
+    def _process_archive_file(
+        self,
+        zip_ref: zipfile.ZipFile,
+        file: str,
+        equipments: Union[List["Equipment"], None],
+        get_weather: bool,
+        new_workouts: List["Workout"],
+        errored_workouts: Dict[str, str],
+    ) -> None:
+        """
+        Create workout from archive file, parsed and analysed in main process
+        """
+        extension = self._get_file_extension(file)
+        try:
+            file_content = zip_ref.open(file)
+            check_mime_type(
+                extension, file_content, WORKOUT_FILE_DETECTED_MIMETYPES
+            )
+            new_workout = self.create_workout_from_file(
+                extension, equipments, file_content, get_weather
+            )
+        except Exception as e:
+            db.session.rollback()
+            error = e.args[0]
+            errored_workouts[file] = error
+            appLog.debug(f"    > error occurred: {error}")
+            return
+        new_workouts.append(new_workout)
+        appLog.debug("    > upload done")
+
+    def _process_archive_files_chunk(
+        self,
+        chunk: List[Tuple[int, str, ParsedWorkoutFile]],
+        zip_ref: zipfile.ZipFile,
+        equipments: Union[List["Equipment"], None],
+        get_weather: bool,
+        new_workouts: List["Workout"],
+        errored_workouts: Dict[str, str],
+    ) -> None:
+        """
+        Create workouts from files parsed and analysed by worker processes.
+
+        Workouts ids are reserved, in order to insert workouts and segments
+        of the chunk on a single commit. Maps are generated once workouts
+        are committed.
+        If an error occurs, changes are rolled back and chunk files are
+        processed one by one, as on sequential import.
+        """
+        parsed_files = []
+        for _, file, parsed_file in chunk:
+            if parsed_file.error:
+                errored_workouts[file] = parsed_file.error
+                appLog.debug(f"    > error occurred: {parsed_file.error}")
+                continue
+            parsed_files.append((file, parsed_file))
+        if not parsed_files:
+            return
+
+        pending_maps: List[PendingWorkoutMap] = []
+        files_by_workout_id: Dict[int, str] = {}
+        try:
+            for (file, parsed_file), workout_id in zip(
+                parsed_files,
+                self._reserve_workouts_ids(len(parsed_files)),
+                strict=True,
+            ):
+                new_workout = self.create_workout_from_file(
+                    self._get_file_extension(file),
+                    equipments,
+                    BytesIO(parsed_file.content),
+                    get_weather,
+                    parsed_file.gpx,
+                    parsed_file.analysis,
+                    new_workout_id=workout_id,
+                    pending_maps=pending_maps,
+                )
+                files_by_workout_id[new_workout.id] = file
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            appLog.debug(
+                f"    > error occurred on chunk ({e!s}), "
+                "processing files one by one"
+            )
+            for pending_map in pending_maps:
+                if os.path.exists(pending_map.absolute_workout_filepath):
+                    os.remove(pending_map.absolute_workout_filepath)
+            for file, _ in parsed_files:
+                self._process_archive_file(
+                    zip_ref,
+                    file,
+                    equipments,
+                    get_weather,
+                    new_workouts,
+                    errored_workouts,
+                )
+            return
+
+        for pending_map in pending_maps:
+            new_workout = pending_map.workout
+            try:
+                absolute_map_filepath = self._add_workout_map(
+                    new_workout,
+                    pending_map.workout_service_class,
+                    pending_map.coordinates,
+                )
+            except WorkoutException as e:
+                # workout is deleted, as on sequential import
+                error = e.args[0]
+                errored_workouts[files_by_workout_id[new_workout.id]] = error
+                appLog.debug(f"    > error occurred: {error}")
+                new_workout.map = None
+                # update equipments totals
+                new_workout.equipments = []
+                db.session.flush()
+                db.session.delete(new_workout)
+                db.session.flush()
+                continue
+            self._update_files_storage_usage(
+                [(StorageCategory.MAPS, absolute_map_filepath)]
+            )
+            new_workouts.append(new_workout)
+        db.session.commit()
+        appLog.debug("    > upload done")
+
+    @staticmethod
+    def _reserve_workouts_ids(count: int) -> List[int]:
+        return list(
+            db.session.scalars(
+                select(
+                    func.nextval(
+                        func.pg_get_serial_sequence(
+                            Workout.__tablename__, "id"
+                        )
+                    )
+                ).select_from(func.generate_series(1, count))
+            )
+        )
+
+    def _get_archive_files(
+        self,
+        zip_ref: zipfile.ZipFile,
+        files_to_process: List[str],
+        workers: int,
+    ) -> Iterator[Tuple[int, str, Optional[ParsedWorkoutFile]]]:
+        """
+        Return files from archive with a valid extension, in order.
+
+        On parallel import, files are parsed and analysed in a process pool
+        (see 'parse_workout_file'). The number of pending files is limited
+        to avoid loading the whole archive in memory.
+        """
+        files = []
+        for index, file in enumerate(files_to_process, start=1):
+            if (
+                self._get_file_extension(file)
+                not in WORKOUT_ALLOWED_EXTENSIONS
+            ):
+                appLog.info("invalid file extension, skipping file")
+                continue
+            files.append((index, file))
+
+        if workers <= 1:
+            for index, file in files:
+                yield index, file, None
+            return
+
+        pending_files: Deque[
+            Tuple[int, str, bytes, "Future[ParsedWorkoutFile]"]
+        ] = deque()
+        analysis_settings = self._get_analysis_settings()
+        # 'spawn' start method to avoid sharing database connections with
+        # worker processes
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_import_worker,
+        )
+        try:
+            for index, file in files:
+                content = b""
+                try:
+                    content = zip_ref.read(file)
+                except Exception as e:
+                    future: "Future[ParsedWorkoutFile]" = Future()
+                    future.set_result(ParsedWorkoutFile(error=str(e)))
+                else:
+                    future = executor.submit(
+                        parse_workout_file,
+                        self._get_file_extension(file),
+                        content,
+                        self.auth_user.segments_creation_event,
+                        analysis_settings,
+                    )
+                pending_files.append((index, file, content, future))
+                if len(pending_files) >= 2 * workers:
+                    yield self._get_parsed_file(*pending_files.popleft())
+            while pending_files:
+                yield self._get_parsed_file(*pending_files.popleft())
+        finally:
+            # pending files are not parsed when task is aborted
+            executor.shutdown(cancel_futures=True)
+
+    def _get_analysis_settings(self) -> GpxAnalysisSettings:
+        return GpxAnalysisSettings(
+            sport_label=self.sport.label,
+            stopped_speed_threshold=self.stopped_speed_threshold,
+            use_raw_gpx_speed=self.auth_user.use_raw_gpx_speed,
+            vectorized_processing=current_app.config[
+                "VECTORIZED_GPX_PROCESSING"
+            ],
+            fetch_missing_elevations=(
+                self.sport.label not in SPORTS_WITHOUT_ELEVATION_DATA
+                and ElevationService(
+                    self.auth_user.missing_elevations_processing
+                ).elevation_service
+                is not None
+            ),
+        )
+
+    @staticmethod
+    def _get_parsed_file(
+        index: int,
+        file: str,
+        content: bytes,
+        future: "Future[ParsedWorkoutFile]",
+    ) -> Tuple[int, str, ParsedWorkoutFile]:
+        try:
+            parsed_file = future.result()
+        except Exception as e:
+            # for instance, when a worker process is terminated abruptly
+            appLog.exception(f"exception: {e!s}")
+            parsed_file = ParsedWorkoutFile(
+                error="error when processing workout"
+            )
+        parsed_file.content = content
+        return index, file, parsed_file
+
+    @staticmethod
+    def _update_upload_task_progress(
+        upload_task: "UserTask",
+        *,
+        new_workouts_count: int,
+        progress: int,
+        commit: bool,
+    ) -> None:
+        # all values are set, since uncommitted changes are lost on rollback
+        # when an error occurs on next file
+        upload_task.data = {
+            **upload_task.data,
+            "new_workouts_count": new_workouts_count,
+        }
+        upload_task.progress = progress
+        if commit:
+            db.session.commit()
+
 
 class WorkoutsFromFileCreationService(AbstractWorkoutsCreationService):
     def __init__(
@@ -448,6 +904,12 @@ class WorkoutsFromFileCreationService(AbstractWorkoutsCreationService):
         }
         upload_task.file_size = os.path.getsize(path)
         db.session.add(upload_task)
+        update_storage_usage(
+            db.session.connection(),
+            self.auth_user.id,
+            StorageCategory.ARCHIVES,
+            upload_task.file_size,
+        )
         db.session.commit()
 
         if current_app.config["TASKS_PROCESSING_AVAILABLE"]:
@@ -575,7 +1037,14 @@ class WorkoutsFromArchiveCreationAsyncService(AbstractWorkoutsCreationService):
         db.session.commit()
 
         if os.path.exists(self.file_path):
+            archive_size = get_file_size(self.file_path)
             os.remove(self.file_path)
+            update_storage_usage(
+                db.session.connection(),
+                self.upload_task.user_id,
+                StorageCategory.ARCHIVES,
+                -archive_size,
+            )
 
         notification = Notification(
             from_user_id=self.upload_task.user_id,
@@ -106,6 +106,7 @@ class WorkoutFromFileRefreshService(WorkoutFileMixin):
                 self.workout.original_file = None
                 self.workout.map_id = None
                 self.workout.map = None
+                self.workout.map_status = None
                 db.session.commit()
                 self._log_message(
                     f"No file found for workout '{self.workout.short_id}' "
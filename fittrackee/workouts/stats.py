@@ -1,5 +1,5 @@
-from datetime import timedelta
-from typing import Dict, List, Union
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Union
 
 from flask import Blueprint, current_app, request
 from sqlalchemy import func
@@ -17,15 +17,53 @@ from fittrackee.responses import (
 )
 from fittrackee.users.models import User
 from fittrackee.users.roles import UserRole
+from fittrackee.users.storage import get_storage_usage
 
-from .models import Sport, Workout
+from .models import Sport, Workout, WorkoutsDailyStats
 from .utils.sports import get_sports_displayed_data
-from .utils.uploads import get_upload_dir_size
 from .utils.workouts import get_average_speed, get_datetime_from_request_args
 
 stats_blueprint = Blueprint("stats", __name__)
 
 
+def get_daily_stats_total_workouts(
+    user_id: int, sport_id: Optional[str] = None
+) -> int:
+    filters = [WorkoutsDailyStats.user_id == user_id]
+    if sport_id:
+        filters.append(WorkoutsDailyStats.sport_id == sport_id)
+    return (
+        db.session.query(
+            func.coalesce(func.sum(WorkoutsDailyStats.total_workouts), 0)
+        )
+        .filter(*filters)
+        .scalar()
+    )
+
+
+def can_use_daily_stats(total_workouts: int) -> bool:
+    """
+    Daily statistics can not be used when statistics are limited to last
+    workouts and user has more workouts than the limit.
+    """
+    stats_workouts_limit = current_app.config["stats_workouts_limit"]
+    return not stats_workouts_limit or total_workouts <= stats_workouts_limit
+
+
+def get_daily_stats_sum(column: str) -> Any:
+    return func.sum(getattr(WorkoutsDailyStats, f"{column}_sum"))
+
+
+def get_daily_stats_average(column: str) -> Any:
+    count = func.nullif(
+        func.sum(getattr(WorkoutsDailyStats, f"{column}_count")), 0
+    )
+    return get_daily_stats_sum(column) / (
+        # intervals can only be divided by float
+        count.cast(db.Float) if column in ["moving", "ave_pace"] else count
+    )
+
+
 def get_stats_from_row(
     row: List,
     stats_type: str,
@@ -255,67 +293,118 @@ def get_workouts_by_time(
         # For 'week' timeframe, the workaround is to add 1 day
         delta = timedelta(days=1 if time and time == "week" else 0)
 
-        calculation_method = func.avg if stats_type == "average" else func.sum
-        stats_key = func.to_char(
-            func.timezone(
-                # user has always timezone set
-                auth_user.timezone if auth_user.timezone else "UTC",
-                # workout date is stored without timezone in database
-                func.timezone("Z", Workout.workout_date),
+        if can_use_daily_stats(get_daily_stats_total_workouts(user.id)):
+            # days are already in user timezone
+            stats_key = func.to_char(
+                WorkoutsDailyStats.day + delta, time_format
             )
-            + delta,
-            time_format,
-        )
-        filters = [Workout.user_id == user.id]
-        if date_from:
-            filters.append(Workout.workout_date >= date_from)
-        if date_to:
-            filters.append(
-                Workout.workout_date < date_to + timedelta(seconds=1)
+            daily_stats_aggregate = (
+                get_daily_stats_average
+                if stats_type == "average"
+                else get_daily_stats_sum
+            )
+            daily_stats_filters = [WorkoutsDailyStats.user_id == user.id]
+            if params.get("from"):
+                daily_stats_filters.append(
+                    WorkoutsDailyStats.day
+                    >= date.fromisoformat(params["from"])
+                )
+            if params.get("to"):
+                daily_stats_filters.append(
+                    WorkoutsDailyStats.day <= date.fromisoformat(params["to"])
+                )
+            stats_query = (
+                db.session.query(
+                    WorkoutsDailyStats.sport_id,
+                    (
+                        get_daily_stats_average("ave_speed")  # type: ignore
+                        if stats_type == "average"
+                        else True
+                    ),
+                    func.sum(WorkoutsDailyStats.total_workouts),
+                    daily_stats_aggregate("distance"),
+                    daily_stats_aggregate("moving"),
+                    daily_stats_aggregate("ascent"),
+                    daily_stats_aggregate("descent"),
+                    stats_key,
+                    (
+                        get_daily_stats_average("ave_pace")  # type: ignore
+                        if stats_type == "average"
+                        else True
+                    ),
+                    (
+                        func.sum(WorkoutsDailyStats.calories_sum)  # type: ignore
+                        if stats_type == "total"
+                        else True
+                    ),
+                )
+                .filter(*daily_stats_filters)
+                .group_by(stats_key, WorkoutsDailyStats.sport_id)
+            )
+        else:
+            calculation_method = (
+                func.avg if stats_type == "average" else func.sum
             )
+            stats_key = func.to_char(
+                func.timezone(
+                    # user has always timezone set
+                    auth_user.timezone if auth_user.timezone else "UTC",
+                    # workout date is stored without timezone in database
+                    func.timezone("Z", Workout.workout_date),
+                )
+                + delta,
+                time_format,
+            )
+            filters = [Workout.user_id == user.id]
+            if date_from:
+                filters.append(Workout.workout_date >= date_from)
+            if date_to:
+                filters.append(
+                    Workout.workout_date < date_to + timedelta(seconds=1)
+                )
 
-        workouts_query = (
-            db.session.query(
-                Workout.sport_id,
-                (
-                    func.avg(Workout.ave_speed)  # type: ignore
-                    if stats_type == "average"
-                    else True
-                ),
-                func.count(Workout.id),
-                calculation_method(Workout.distance),
-                calculation_method(Workout.moving),
-                calculation_method(Workout.ascent),
-                calculation_method(Workout.descent),
-                stats_key,
-                (
-                    func.avg(Workout.ave_pace)  # type: ignore
-                    if stats_type == "average"
-                    else True
-                ),
-                (
-                    func.sum(Workout.calories)  # type: ignore
-                    if stats_type == "total"
-                    else True
-                ),
+            stats_query = (
+                db.session.query(
+                    Workout.sport_id,
+                    (
+                        func.avg(Workout.ave_speed)  # type: ignore
+                        if stats_type == "average"
+                        else True
+                    ),
+                    func.count(Workout.id),
+                    calculation_method(Workout.distance),
+                    calculation_method(Workout.moving),
+                    calculation_method(Workout.ascent),
+                    calculation_method(Workout.descent),
+                    stats_key,
+                    (
+                        func.avg(Workout.ave_pace)  # type: ignore
+                        if stats_type == "average"
+                        else True
+                    ),
+                    (
+                        func.sum(Workout.calories)  # type: ignore
+                        if stats_type == "total"
+                        else True
+                    ),
+                )
+                .filter(*filters)
+                .group_by(stats_key, Workout.sport_id)
             )
-            .filter(*filters)
-            .group_by(stats_key, Workout.sport_id)
-        )
 
-        if current_app.config["stats_workouts_limit"]:
             last_workout_ids = (
                 db.session.query(
                     Workout.id,
                 )
+                .filter(Workout.user_id == user.id)
                 .order_by(Workout.workout_date.desc())
                 .limit(current_app.config["stats_workouts_limit"])
                 .subquery()
             )
-            workouts_query = workouts_query.join(
+            stats_query = stats_query.join(
                 last_workout_ids, Workout.id == last_workout_ids.c.id
             )
-        results = workouts_query.all()
+        results = stats_query.all()
 
         sports = Sport.query.filter().all()
         sports_displayed_data = get_sports_displayed_data(sports, auth_user)
@@ -561,34 +650,59 @@ def get_workouts_by_sport(
             sports = Sport.query.filter().all()
         sports_displayed_data = get_sports_displayed_data(sports, auth_user)
 
-        workouts_query = Workout.query.filter(*filters)
-        total_workouts = workouts_query.count()
-
-        workouts_query = workouts_query.order_by(Workout.workout_date.desc())
-        if current_app.config["stats_workouts_limit"]:
-            workouts_query = workouts_query.limit(
-                current_app.config["stats_workouts_limit"]
+        total_workouts = get_daily_stats_total_workouts(user.id, sport_id)
+        if can_use_daily_stats(total_workouts):
+            daily_stats_filters = [WorkoutsDailyStats.user_id == user.id]
+            if sport_id:
+                daily_stats_filters.append(
+                    WorkoutsDailyStats.sport_id == sport_id
+                )
+            results = (
+                db.session.query(
+                    WorkoutsDailyStats.sport_id,
+                    get_daily_stats_average("ave_speed"),
+                    get_daily_stats_average("ascent"),
+                    get_daily_stats_average("descent"),
+                    get_daily_stats_average("distance"),
+                    get_daily_stats_average("moving"),
+                    get_daily_stats_sum("ascent"),
+                    get_daily_stats_sum("descent"),
+                    get_daily_stats_sum("distance"),
+                    get_daily_stats_sum("moving"),
+                    get_daily_stats_average("ave_pace"),
+                    func.sum(WorkoutsDailyStats.calories_sum),
+                    func.sum(WorkoutsDailyStats.total_workouts),
+                )
+                .filter(*daily_stats_filters)
+                .group_by(WorkoutsDailyStats.sport_id)
+                .all()
             )
-        workouts_subquery = workouts_query.subquery()
-        results = (
-            db.session.query(
-                workouts_subquery.c.sport_id,
-                func.avg(workouts_subquery.c.ave_speed),
-                func.avg(workouts_subquery.c.ascent),
-                func.avg(workouts_subquery.c.descent),
-                func.avg(workouts_subquery.c.distance),
-                func.avg(workouts_subquery.c.moving),
-                func.sum(workouts_subquery.c.ascent),
-                func.sum(workouts_subquery.c.descent),
-                func.sum(workouts_subquery.c.distance),
-                func.sum(workouts_subquery.c.moving),
-                func.avg(workouts_subquery.c.ave_pace),
-                func.sum(workouts_subquery.c.calories),
-                func.count(workouts_subquery.c.id),
+        else:
+            workouts_subquery = (
+                Workout.query.filter(*filters)
+                .order_by(Workout.workout_date.desc())
+                .limit(current_app.config["stats_workouts_limit"])
+                .subquery()
+            )
+            results = (
+                db.session.query(
+                    workouts_subquery.c.sport_id,
+                    func.avg(workouts_subquery.c.ave_speed),
+                    func.avg(workouts_subquery.c.ascent),
+                    func.avg(workouts_subquery.c.descent),
+                    func.avg(workouts_subquery.c.distance),
+                    func.avg(workouts_subquery.c.moving),
+                    func.sum(workouts_subquery.c.ascent),
+                    func.sum(workouts_subquery.c.descent),
+                    func.sum(workouts_subquery.c.distance),
+                    func.sum(workouts_subquery.c.moving),
+                    func.avg(workouts_subquery.c.ave_pace),
+                    func.sum(workouts_subquery.c.calories),
+                    func.count(workouts_subquery.c.id),
+                )
+                .group_by(workouts_subquery.c.sport_id)
+                .all()
             )
-            .group_by(workouts_subquery.c.sport_id)
-            .all()
-        )
 
         statistics = {}
         for row in results:
@@ -672,6 +786,13 @@ def get_application_stats(auth_user: User) -> Dict:
       {
         "data": {
           "sports": 3,
+          "storage_usage": {
+            "archives": 0,
+            "exports": 200,
+            "maps": 300,
+            "original_files": 400,
+            "pictures": 100
+          },
           "uploads_dir_size": 1000,
           "users": 2,
           "workouts": 3,
@@ -679,6 +800,9 @@ def get_application_stats(auth_user: User) -> Dict:
         "status": "success"
       }
 
+    Storage usage (in bytes) is updated when files are stored or deleted
+    (see ``ftcli users update_storage_usage`` to recalculate it).
+
     :reqheader Authorization: OAuth 2.0 Bearer Token
 
     :statuscode 200: ``success``
@@ -698,12 +822,14 @@ def get_application_stats(auth_user: User) -> Dict:
         .group_by(Workout.sport_id)
         .count()
     )
+    storage_usage = get_storage_usage()
     return {
         "status": "success",
         "data": {
             "workouts": total_workouts,
             "sports": nb_sports,
             "users": nb_users,
-            "uploads_dir_size": get_upload_dir_size(),
+            "storage_usage": storage_usage,
+            "uploads_dir_size": sum(storage_usage.values()),
         },
     }
@@ -1,7 +1,7 @@
 import os
 from datetime import datetime, timezone
 from logging import Logger
-from typing import Optional
+from typing import Dict, Optional
 
 import dramatiq
 from dramatiq.middleware import Shutdown, TimeLimitExceeded
@@ -9,18 +9,101 @@ from dramatiq_abort import Abort
 from humanize import naturalsize
 
 from fittrackee import db
-from fittrackee.constants import TASKS_TIME_LIMIT, TaskPriority
+from fittrackee.constants import (
+    TASKS_TIME_LIMIT,
+    MapStatus,
+    StorageCategory,
+    TaskPriority,
+)
 from fittrackee.exceptions import TaskException
 from fittrackee.users.models import Notification, UserTask
+from fittrackee.users.storage import get_file_size, update_storage_usage
 from fittrackee.utils import decode_short_id
+from fittrackee.workouts.models import Workout
+from fittrackee.workouts.services.workout_from_file.base_workout_with_segment_service import (  # noqa
+    BaseWorkoutWithSegmentsCreationService,
+)
+from fittrackee.workouts.services.workout_from_file.workout_point import (
+    WorkoutPoint,
+)
+from fittrackee.workouts.services.workout_map_service import (
+    WorkoutMapService,
+)
 from fittrackee.workouts.services.workouts_from_file_creation_service import (
     WorkoutsFromArchiveCreationAsyncService,
 )
 
 GENERIC_ERROR = "error during archive processing"
+MAP_RENDERING_MAX_RETRIES = 3
 ABORT_ERROR = "task execution aborted"
 
 
+@dramatiq.actor(
+    queue_name="fittrackee_workouts",
+    priority=TaskPriority.LOW,
+    time_limit=TASKS_TIME_LIMIT,
+    max_retries=0,
+)
+def update_workout_weather(
+    workout_id: int, start_point: Dict, end_point: Dict
+) -> None:
+    workout = db.session.get(Workout, workout_id)
+    if not workout:
+        return
+
+    BaseWorkoutWithSegmentsCreationService.update_weather(
+        workout,
+        *[
+            WorkoutPoint(
+                longitude=point["longitude"],
+                latitude=point["latitude"],
+                time=datetime.fromisoformat(point["time"]),
+            )
+            for point in [start_point, end_point]
+        ],
+    )
+    db.session.commit()
+
+
+@dramatiq.actor(
+    queue_name="fittrackee_workouts",
+    priority=TaskPriority.LOW,
+)
+def mark_workout_map_as_errored(message_data: Dict, retries: Dict) -> None:
+    workout = db.session.get(Workout, message_data["kwargs"]["workout_id"])
+    if (
+        not workout
+        or workout.map_id != message_data["kwargs"]["map_id"]
+        or workout.map_status != MapStatus.PENDING
+    ):
+        return
+    workout.map_status = MapStatus.ERROR
+    db.session.commit()
+
+
+@dramatiq.actor(
+    queue_name="fittrackee_workouts",
+    priority=TaskPriority.MEDIUM,
+    time_limit=TASKS_TIME_LIMIT,
+    max_retries=MAP_RENDERING_MAX_RETRIES,
+    # in milliseconds
+    min_backoff=10_000,
+    max_backoff=300_000,
+    on_retry_exhausted=mark_workout_map_as_errored.actor_name,
+)
+def render_workout_map(workout_id: int, map_id: str) -> None:
+    workout = db.session.get(Workout, workout_id)
+    # map already rendered or another rendering task has been sent
+    if (
+        not workout
+        or workout.map_id != map_id
+        or workout.map_status != MapStatus.PENDING
+    ):
+        return
+    WorkoutMapService(workout).render()
+    db.session.commit()
+
+
 def update_task_and_clean(
     *,
     error: str,
@@ -62,7 +145,15 @@ def update_task_and_clean(
         db.session.commit()
 
     if upload_task.file_path and os.path.exists(upload_task.file_path):
+        archive_size = get_file_size(upload_task.file_path)
         os.remove(upload_task.file_path)
+        update_storage_usage(
+            db.session.connection(),
+            upload_task.user_id,
+            StorageCategory.ARCHIVES,
+            -archive_size,
+        )
+        db.session.commit()
 
 
 @dramatiq.actor(
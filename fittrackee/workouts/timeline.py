@@ -6,9 +6,14 @@ from sqlalchemy import and_, or_
 from fittrackee.oauth2.server import require_auth
 from fittrackee.responses import HttpResponse, handle_error_and_return_response
 from fittrackee.users.models import User
+from fittrackee.users.social_graph import (
+    get_blocked_by_ids,
+    get_blocked_ids,
+    get_following_ids,
+)
 from fittrackee.visibility_levels import VisibilityLevel
 
-from .models import Workout
+from .models import Workout, serialize_workouts
 
 timeline_blueprint = Blueprint("timeline", __name__)
 
@@ -66,6 +71,7 @@ def get_user_timeline(auth_user: User) -> Union[Dict, HttpResponse]:
                 "equipments": [],
                 "id": "kjxavSTUrJvoAh2wvCeGEF",
                 "map": null,
+                "map_status": null,
                 "max_alt": null,
                 "max_cadence": null,
                 "max_hr": null,
@@ -171,9 +177,11 @@ def get_user_timeline(auth_user: User) -> Union[Dict, HttpResponse]:
     try:
         params = request.args.copy()
         page = int(params.get("page", 1))
-        following_ids = auth_user.get_following_user_ids()
-        blocked_users = auth_user.get_blocked_user_ids()
-        blocked_by_users = auth_user.get_blocked_by_user_ids()
+        # suspended users are excluded by query
+        following_ids = get_following_ids(auth_user.id)
+        excluded_user_ids = get_blocked_ids(auth_user.id) | get_blocked_by_ids(
+            auth_user.id
+        )
         workouts_pagination = (
             Workout.query.join(
                 User,
@@ -189,9 +197,7 @@ def get_user_timeline(auth_user: User) -> Union[Dict, HttpResponse]:
                         Workout.suspended_at == None,  # noqa
                         and_(
                             Workout.user_id.in_(following_ids),
-                            Workout.user_id.not_in(
-                                blocked_users + blocked_by_users
-                            ),
+                            Workout.user_id.not_in(excluded_user_ids),
                             Workout.workout_visibility.in_(
                                 [
                                     VisibilityLevel.FOLLOWERS,
@@ -213,11 +219,7 @@ def get_user_timeline(auth_user: User) -> Union[Dict, HttpResponse]:
         workouts = workouts_pagination.items
         return {
             "status": "success",
-            "data": {
-                "workouts": [
-                    workout.serialize(user=auth_user) for workout in workouts
-                ]
-            },
+            "data": {"workouts": serialize_workouts(workouts, user=auth_user)},
             "pagination": {
                 "has_next": workouts_pagination.has_next,
                 "has_prev": workouts_pagination.has_prev,
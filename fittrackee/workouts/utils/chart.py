@@ -1,5 +1,9 @@
-from typing import TYPE_CHECKING, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from dataclasses import astuple
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional
 
+import numpy as np
 from sqlalchemy.sql import text
 
 from fittrackee import db
@@ -8,11 +12,160 @@ from fittrackee.workouts.exceptions import WorkoutGPXException
 from fittrackee.workouts.utils.geometry import (
     get_chart_data_from_segment_points,
 )
+from fittrackee.workouts.utils.points import get_segment_points_reader
+from fittrackee.workouts.utils.sports import get_sport_displayed_data
 
 if TYPE_CHECKING:
     from fittrackee.users.models import User
     from fittrackee.workouts.models import Workout
 
+CHART_DATA_CHANNELS = [
+    "cadence",
+    "distance",
+    "duration",
+    "elevation",
+    "heart_rate",
+    "latitude",
+    "longitude",
+    "pace",
+    "power",
+    "speed",
+    "time",
+]
+# chart data values used to select points when downsampling
+DOWNSAMPLING_CHANNELS = [
+    "cadence",
+    "elevation",
+    "hr",
+    "pace",
+    "power",
+    "speed",
+]
+# LTTB algorithm needs at least first point, last point and one bucket
+MIN_CHART_DATA_RESOLUTION = 3
+DOWNSAMPLED_CHART_DATA_CACHE_MAXSIZE = 32
+
+
+class DownsampledChartDataCache:
+    """
+    In-memory LRU cache for downsampled chart data, to avoid reading all
+    segments points on each request.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._cache: "OrderedDict[Hashable, List]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[List]:
+        with self._lock:
+            chart_data = self._cache.get(key)
+            if chart_data is not None:
+                self._cache.move_to_end(key)
+            return chart_data
+
+    def set(self, key: Hashable, chart_data: List) -> None:
+        with self._lock:
+            self._cache[key] = chart_data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+downsampled_chart_data_cache = DownsampledChartDataCache(
+    DOWNSAMPLED_CHART_DATA_CACHE_MAXSIZE
+)
+
+
+def normalize_values(values: "np.ndarray") -> "np.ndarray":
+    values_range = values.max() - values.min()
+    if values_range == 0:
+        return np.zeros(len(values))
+    return (values - values.min()) / values_range
+
+
+def get_lttb_indices(
+    x: "np.ndarray", y: "np.ndarray", threshold: int
+) -> "np.ndarray":
+    """
+    Return indices of points selected with Largest-Triangle-Three-Buckets
+    algorithm.
+    'y' contains one column per channel. In each bucket, the selected point
+    is the one forming the largest triangles for all channels (values must
+    be normalized).
+    """
+    points_count = len(x)
+    if threshold >= points_count or threshold < MIN_CHART_DATA_RESOLUTION:
+        return np.arange(points_count)
+
+    # first and last points are always selected, other points are split
+    # into 'threshold - 2' buckets
+    buckets_edges = np.linspace(1, points_count - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = points_count - 1
+    selected_index = 0
+    for bucket in range(threshold - 2):
+        start, end = buckets_edges[bucket], buckets_edges[bucket + 1]
+        if bucket < threshold - 3:
+            next_end = buckets_edges[bucket + 2]
+            next_x = x[end:next_end].mean()
+            next_y = y[end:next_end].mean(axis=0)
+        else:
+            next_x = x[-1]
+            next_y = y[-1]
+        areas = np.abs(
+            (x[selected_index] - next_x) * (y[start:end] - y[selected_index])
+            - (x[selected_index] - x[start:end, np.newaxis])
+            * (next_y - y[selected_index])
+        ).sum(axis=1)
+        selected_index = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected_index
+    return indices
+
+
+def downsample_chart_data(chart_data: List[Dict], resolution: int) -> List:
+    """
+    Return chart data downsampled to 'resolution' points, preserving
+    shapes of displayed values.
+    Missing values are interpolated to select points.
+    """
+    points_count = len(chart_data)
+    if points_count <= resolution:
+        return chart_data
+
+    distances = np.array(
+        [point["distance"] for point in chart_data], dtype=float
+    )
+    x = (
+        normalize_values(distances)
+        if distances.max() > distances.min()
+        else normalize_values(np.arange(points_count, dtype=float))
+    )
+    columns = []
+    for channel in DOWNSAMPLING_CHANNELS:
+        values = np.array(
+            [point.get(channel) for point in chart_data], dtype=float
+        )
+        valid_values = ~np.isnan(values)
+        if not valid_values.any():
+            continue
+        columns.append(
+            normalize_values(
+                np.interp(
+                    np.arange(points_count),
+                    np.flatnonzero(valid_values),
+                    values[valid_values],
+                )
+            )
+        )
+    y = np.column_stack(columns) if columns else np.zeros((points_count, 1))
+    return [chart_data[index] for index in get_lttb_indices(x, y, resolution)]
+
 
 def get_chart_data(
     workout: "Workout",
@@ -20,13 +173,29 @@ def get_chart_data(
     user: Optional["User"],
     can_see_heart_rate: bool,
     segment_short_id: Optional[str] = None,
+    resolution: Optional[int] = None,
 ) -> Optional[List]:
     """
     Get chart data from segments points if the segments have points, otherwise
     from the gpx file.
+    If resolution is provided, chart data are downsampled and cached.
     """
+    cache_key = None
+    if resolution is not None:
+        cache_key = (
+            workout.uuid,
+            workout.modification_date or workout.creation_date,
+            segment_short_id,
+            resolution,
+            can_see_heart_rate,
+            astuple(get_sport_displayed_data(workout.sport, user)),
+        )
+        chart_data = downsampled_chart_data_cache.get(cache_key)
+        if chart_data is not None:
+            return chart_data
+
     sql = """
-        SELECT workout_segments.points
+        SELECT workout_segments.points_data, workout_segments.points
         FROM workout_segments
         WHERE workout_segments.workout_id  = :workout_id"""
     values: Dict = {"workout_id": workout.id}
@@ -50,13 +219,24 @@ def get_chart_data(
             None,
         )
 
-    if segments_points[0].points:
-        return get_chart_data_from_segment_points(
-            [segment["points"] for segment in segments_points],
-            workout.sport,
-            user=user,
-            workout_ave_cadence=workout.ave_cadence,
-            can_see_heart_rate=can_see_heart_rate,
-        )
+    segments_points_readers = [
+        get_segment_points_reader(segment["points_data"], segment["points"])
+        for segment in segments_points
+    ]
+    if len(segments_points_readers[0]) == 0:
+        return []
 
-    return []
+    chart_data = get_chart_data_from_segment_points(
+        [
+            reader.get_points(CHART_DATA_CHANNELS)
+            for reader in segments_points_readers
+        ],
+        workout.sport,
+        user=user,
+        workout_ave_cadence=workout.ave_cadence,
+        can_see_heart_rate=can_see_heart_rate,
+    )
+    if resolution is not None and cache_key is not None:
+        chart_data = downsample_chart_data(chart_data, resolution)
+        downsampled_chart_data_cache.set(cache_key, chart_data)
+    return chart_data
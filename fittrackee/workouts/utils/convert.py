@@ -2,8 +2,6 @@ import re
 from datetime import timedelta
 from typing import Optional, Union
 
-import pandas as pd
-
 from ..exceptions import InvalidDurationException
 
 
@@ -50,9 +48,9 @@ def convert_speed_into_pace_duration(
         return None
     if not speed:
         return timedelta(seconds=0)
-    return (
-        pd.Timedelta(timedelta(minutes=60 / speed)).round("s").to_pytimedelta()
-    )
+    # rounded to the nearest second (half to even)
+    pace = timedelta(minutes=60 / speed)
+    return timedelta(seconds=round(pace.total_seconds()))
 
 
 def convert_speed_into_pace_in_sec_per_meter(
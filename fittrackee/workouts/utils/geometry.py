@@ -1,25 +1,30 @@
 import json
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-import geopandas as gpd
 from shapely import Point
 from sqlalchemy import func, select
 
 from fittrackee import db
-from fittrackee.utils import decode_short_id
+from fittrackee.utils import decode_short_id, encode_uuid
 from fittrackee.workouts.constants import (
+    GLOBAL_MAP_CLUSTER_SIZE,
+    MAX_ZOOM,
     WGS84_CRS,
 )
 from fittrackee.workouts.exceptions import (
+    InvalidBboxException,
     InvalidCoordinatesException,
     InvalidRadiusException,
+    InvalidZoomException,
 )
-from fittrackee.workouts.models import WorkoutSegment
+from fittrackee.workouts.models import Workout, WorkoutSegment
 from fittrackee.workouts.utils.sports import get_sport_displayed_data
 
 if TYPE_CHECKING:
+    from sqlalchemy.sql import ColumnElement
+
     from fittrackee.users.models import User
-    from fittrackee.workouts.models import Sport, Workout
+    from fittrackee.workouts.models import Sport
 
 
 def get_geojson_from_segments(
@@ -119,8 +124,11 @@ def get_chart_data_from_segment_points(
     return chart_data
 
 
-def get_buffered_location(coordinates: str, radius_str: str) -> str:
+def get_location_filter(coordinates: str, radius_str: str) -> "ColumnElement":
     """
+    Return filter on segments within given distance from location, using
+    geodesic distance (index on segments geography).
+
     coordinates: latitude,longitude
     radius: distance in kilometers
     """
@@ -137,8 +145,127 @@ def get_buffered_location(coordinates: str, radius_str: str) -> str:
     except ValueError as e:
         raise InvalidCoordinatesException() from e
 
-    gdf = gpd.GeoDataFrame(geometry=[point], crs=WGS84_CRS)
-    gdf_in_meters = gdf.to_crs(gdf.estimate_utm_crs())
-    buffered_gdf_in_meters = gdf_in_meters.buffer(radius * 1000)
-    buffered_gdf = buffered_gdf_in_meters.to_crs(WGS84_CRS)
-    return f"SRID={WGS84_CRS};{buffered_gdf.loc[0]}"
+    return func.ST_DWithin(
+        # same expression as 'ix_workout_segments_geom_geography' index
+        func.geography(WorkoutSegment.geom),
+        func.ST_GeogFromText(f"SRID={WGS84_CRS};{point}"),
+        radius * 1000,
+    )
+
+
+def get_start_points_clusters(
+    filters: List["ColumnElement"],
+    zoom: int,
+    bbox: Optional[List[float]] = None,
+) -> Tuple[List[Dict], List[float]]:
+    """
+    Return workouts start points grouped in grid cells depending on zoom
+    level, as features (cell centroids with workouts count and bounds),
+    and bounding box of all start points.
+
+    If bounding box is provided, only clusters of start points within it are
+    returned.
+    Clusters containing only one workout also return workout properties.
+    """
+    if zoom < 0 or zoom > MAX_ZOOM:
+        raise InvalidZoomException()
+    if bbox is not None and len(bbox) != 4:
+        raise InvalidBboxException()
+    # cell size in degrees, at equator
+    cell_size = 360 / (256 * 2**zoom) * GLOBAL_MAP_CLUSTER_SIZE
+    cell = func.ST_SnapToGrid(Workout.start_point_geom, cell_size)
+    centroid = func.ST_Centroid(func.ST_Collect(Workout.start_point_geom))
+    extent = func.ST_Extent(Workout.start_point_geom)
+    clusters_filters = list(filters)
+    if bbox is not None:
+        clusters_filters.append(
+            func.ST_Intersects(
+                Workout.start_point_geom,
+                func.ST_MakeEnvelope(*bbox, WGS84_CRS),
+            )
+        )
+    clusters = (
+        db.session.query(
+            func.count(Workout.id),
+            func.ST_X(centroid),
+            func.ST_Y(centroid),
+            func.ST_XMin(extent),
+            func.ST_YMin(extent),
+            func.ST_XMax(extent),
+            func.ST_YMax(extent),
+            # only used for clusters with one workout
+            func.min(Workout.id),
+        )
+        .filter(*clusters_filters)
+        .group_by(func.ST_X(cell), func.ST_Y(cell))
+        .all()
+    )
+    single_workouts_ids = [
+        cluster[7] for cluster in clusters if cluster[0] == 1
+    ]
+    single_workouts = (
+        {
+            workout[0]: {
+                "bounds": workout[1],
+                "id": encode_uuid(workout[2]),
+                "sport_id": workout[3],
+                "title": workout[4],
+                "workout_visibility": workout[5],
+            }
+            for workout in db.session.query(
+                Workout.id,
+                Workout.bounds,
+                Workout.uuid,
+                Workout.sport_id,
+                Workout.title,
+                Workout.workout_visibility,
+            ).filter(Workout.id.in_(single_workouts_ids))
+        }
+        if single_workouts_ids
+        else {}
+    )
+    features = [
+        {
+            "type": "Feature",
+            "properties": {
+                # same order as workouts bounds
+                "bounds": [cluster[4], cluster[3], cluster[6], cluster[5]],
+                "count": cluster[0],
+                **single_workouts.get(cluster[7], {}),
+            },
+            "geometry": {
+                "coordinates": [cluster[1], cluster[2]],
+                "type": "Point",
+            },
+        }
+        for cluster in clusters
+    ]
+
+    if bbox is None:
+        start_points_bbox = (
+            [
+                min(cluster[3] for cluster in clusters),
+                min(cluster[4] for cluster in clusters),
+                max(cluster[5] for cluster in clusters),
+                max(cluster[6] for cluster in clusters),
+            ]
+            if clusters
+            else []
+        )
+    else:
+        start_points_extent = (
+            db.session.query(
+                func.ST_XMin(extent),
+                func.ST_YMin(extent),
+                func.ST_XMax(extent),
+                func.ST_YMax(extent),
+            )
+            .filter(*filters)
+            .one()
+        )
+        start_points_bbox = (
+            list(start_points_extent)
+            if start_points_extent[0] is not None
+            else []
+        )
+    return features, start_points_bbox
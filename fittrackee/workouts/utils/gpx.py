@@ -26,6 +26,13 @@ VALID_EXTENSIONS = {
     "heart_rate": "{gpxtpx}hr",
     "power": "{gpxtpx}power",
 }
+GPX_CHANNELS = [
+    "elevation",
+    "latitude",
+    "longitude",
+    "time",
+    *VALID_EXTENSIONS.keys(),
+]
 
 
 def get_track_extension(calories: Union[int, str]) -> "ET.Element":
@@ -66,7 +73,7 @@ def generate_gpx(workout: "Workout") -> str:
     for segment in workout.segments:
         gpx_segment = gpxpy.gpx.GPXTrackSegment()
 
-        for point in segment.points:
+        for point in segment.points_reader.get_points(GPX_CHANNELS):
             gpx_point = gpxpy.gpx.GPXTrackPoint(
                 point.get("latitude"),
                 point.get("longitude"),
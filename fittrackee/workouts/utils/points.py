@@ -0,0 +1,283 @@
+import json
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Segment points are stored as one typed array per channel (i.e. key in
+# point dict), each channel being compressed separately, in order to decode
+# only the channels requested by the caller.
+#
+# Layout:
+# - magic (4 bytes) and format version (1 byte)
+# - header: points count (uint32), channels count (uint16)
+# - for each channel: name length (uint8), name (utf-8), kind (uint8),
+#   dtype (uint8), payload length (uint32)
+# - channels payloads, zlib-compressed: point states (uint8 per point)
+#   followed by values of points with a value.
+
+POINTS_MAGIC = b"FTPT"
+POINTS_FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<IH")
+CHANNEL_HEADER = struct.Struct("<BBI")
+
+# point states for a given channel
+ABSENT = 0  # key not present in point
+NULL = 1  # value is None
+VALUE = 2
+INT_VALUE = 3
+
+# channel kinds
+NUMERIC = 0
+TIME = 1  # datetime string, stored as delta-encoded microseconds since epoch
+RAW = 2  # values not fitting into typed arrays, stored in JSON
+
+DTYPES = ["int16", "int32", "int64", "float32", "float64"]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class InvalidPointsDataException(Exception):
+    pass
+
+
+def _get_int_dtype(values: "np.ndarray") -> str:
+    for dtype in ["int16", "int32"]:
+        info = np.iinfo(dtype)
+        if values.min() >= info.min and values.max() <= info.max:
+            return dtype
+    return "int64"
+
+
+def _get_time_in_microseconds(value: Any) -> Optional[int]:
+    """
+    Return microseconds since epoch if the value can be restored as an
+    identical string, otherwise None.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        point_time = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if point_time.tzinfo is None or point_time.utcoffset() != timedelta(0):
+        return None
+    microseconds = (point_time - EPOCH) // timedelta(microseconds=1)
+    if _get_time_string(microseconds) != value:
+        return None
+    return microseconds
+
+
+def _get_time_string(microseconds: int) -> str:
+    return str(EPOCH + timedelta(microseconds=microseconds))
+
+
+def _encode_numeric_channel(
+    states: "np.ndarray", values: List
+) -> Tuple[int, bytes]:
+    if not values:
+        return DTYPES.index("int16"), b""
+    if (states != VALUE).all():
+        int_values = np.array(values, dtype="int64")
+        dtype = _get_int_dtype(int_values)
+        return DTYPES.index(dtype), int_values.astype(dtype).tobytes()
+
+    float_values = np.array(values, dtype="float64")
+    float32_values = float_values.astype("float32")
+    if np.array_equal(float32_values.astype("float64"), float_values):
+        return DTYPES.index("float32"), float32_values.tobytes()
+    return DTYPES.index("float64"), float_values.tobytes()
+
+
+def _encode_channel(
+    name: str, points: List[Dict]
+) -> Tuple[int, int, "np.ndarray", bytes]:
+    states = np.full(len(points), ABSENT, dtype="uint8")
+    values = []
+    kind = NUMERIC
+    for index, point in enumerate(points):
+        if name not in point:
+            continue
+        value = point[name]
+        if value is None:
+            states[index] = NULL
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            kind = TIME if name == "time" else RAW
+        states[index] = INT_VALUE if isinstance(value, int) else VALUE
+        values.append(value)
+
+    if kind == TIME:
+        microseconds = [_get_time_in_microseconds(value) for value in values]
+        if None in microseconds:
+            kind = RAW
+        else:
+            deltas = np.diff(np.array(microseconds, dtype="int64"), prepend=0)
+            return kind, DTYPES.index("int64"), states, deltas.tobytes()
+
+    if kind == RAW:
+        return kind, 0, states, json.dumps(values).encode()
+
+    dtype, encoded_values = _encode_numeric_channel(states, values)
+    return kind, dtype, states, encoded_values
+
+
+def encode_points(points: List[Dict]) -> bytes:
+    """
+    Encode segment points into compressed typed arrays per channel.
+
+    Decoded points are identical to provided points (same keys and values).
+    """
+    channels: List[str] = []
+    for point in points:
+        for key in point:
+            if key not in channels:
+                channels.append(key)
+
+    directory = b""
+    payloads = b""
+    for name in channels:
+        kind, dtype, states, encoded_values = _encode_channel(name, points)
+        payload = zlib.compress(states.tobytes() + encoded_values)
+        encoded_name = name.encode()
+        directory += (
+            struct.pack("<B", len(encoded_name))
+            + encoded_name
+            + CHANNEL_HEADER.pack(kind, dtype, len(payload))
+        )
+        payloads += payload
+
+    return (
+        POINTS_MAGIC
+        + struct.pack("<B", POINTS_FORMAT_VERSION)
+        + HEADER.pack(len(points), len(channels))
+        + directory
+        + payloads
+    )
+
+
+class SegmentPointsReader:
+    """
+    Read segment points stored with 'encode_points'.
+
+    Only channels header is parsed on init, channels values are decompressed
+    and decoded on first access.
+    """
+
+    def __init__(self, data: Optional[bytes]) -> None:
+        self._channels: Dict[str, Tuple[int, int, int, int]] = {}
+        self._decoded: Dict[str, List] = {}
+        self._states: Dict[str, "np.ndarray"] = {}
+        self._data = b"" if data is None else bytes(data)
+        self.points_count = 0
+        if self._data:
+            self._parse_header()
+
+    def _parse_header(self) -> None:
+        if (
+            self._data[:4] != POINTS_MAGIC
+            or self._data[4] != POINTS_FORMAT_VERSION
+        ):
+            raise InvalidPointsDataException("invalid points data")
+        offset = 5
+        self.points_count, channels_count = HEADER.unpack_from(
+            self._data, offset
+        )
+        offset += HEADER.size
+        channels = []
+        for _ in range(channels_count):
+            name_length = self._data[offset]
+            offset += 1
+            name = self._data[offset : offset + name_length].decode()
+            offset += name_length
+            kind, dtype, payload_length = CHANNEL_HEADER.unpack_from(
+                self._data, offset
+            )
+            offset += CHANNEL_HEADER.size
+            channels.append((name, kind, dtype, payload_length))
+        for name, kind, dtype, payload_length in channels:
+            self._channels[name] = (kind, dtype, offset, payload_length)
+            offset += payload_length
+
+    @property
+    def channels(self) -> List[str]:
+        return list(self._channels.keys())
+
+    def __len__(self) -> int:
+        return self.points_count
+
+    def _decode_channel(self, name: str) -> None:
+        kind, dtype, offset, length = self._channels[name]
+        payload = zlib.decompress(self._data[offset : offset + length])
+        states = np.frombuffer(payload, dtype="uint8", count=self.points_count)
+        encoded_values = payload[self.points_count :]
+
+        values: List
+        if kind == RAW:
+            values = json.loads(encoded_values)
+        elif kind == TIME:
+            microseconds = np.cumsum(np.frombuffer(encoded_values, "int64"))
+            values = [
+                _get_time_string(value) for value in microseconds.tolist()
+            ]
+        else:
+            values = np.frombuffer(encoded_values, DTYPES[dtype]).tolist()
+            if DTYPES[dtype].startswith("float"):
+                values = [
+                    int(value) if state == INT_VALUE else value
+                    for value, state in zip(
+                        values, states[states >= VALUE], strict=True
+                    )
+                ]
+
+        decoded: List = [None] * self.points_count
+        for index, value in zip(
+            np.flatnonzero(states >= VALUE).tolist(), values, strict=True
+        ):
+            decoded[index] = value
+        self._states[name] = states
+        self._decoded[name] = decoded
+
+    def get_channel(self, name: str) -> List:
+        """
+        Return channel values, None when value is missing.
+        """
+        if name not in self._channels:
+            return [None] * self.points_count
+        if name not in self._decoded:
+            self._decode_channel(name)
+        return self._decoded[name]
+
+    def get_points(
+        self, channels: Optional[Iterable[str]] = None
+    ) -> List[Dict]:
+        """
+        Return points as dicts, only with given channels if provided.
+        """
+        names = [
+            name
+            for name in (self.channels if channels is None else channels)
+            if name in self._channels
+        ]
+        points: List[Dict] = [{} for _ in range(self.points_count)]
+        for name in names:
+            values = self.get_channel(name)
+            states = self._states[name]
+            for index in np.flatnonzero(states != ABSENT).tolist():
+                points[index][name] = values[index]
+        return points
+
+
+def get_segment_points_reader(
+    points_data: Optional[bytes], legacy_points: Optional[List[Dict]] = None
+) -> SegmentPointsReader:
+    """
+    Return reader for stored points, encoding on the fly points stored in
+    JSON if segment has not been converted yet.
+    """
+    if points_data is None and legacy_points:
+        points_data = encode_points(legacy_points)
+    return SegmentPointsReader(points_data)
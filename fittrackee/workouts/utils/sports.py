@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from datetime import timedelta
 from decimal import Decimal
-from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from flask import g, has_request_context
 
 from fittrackee.constants import PaceSpeedDisplay
 from fittrackee.workouts.constants import (
@@ -28,6 +30,91 @@ class SportDisplayedData:
     display_rpm_cadence: bool
 
 
+class SportsDisplayedDataResolver:
+    """
+    Resolve sports display config for a given user.
+
+    All user sports preferences are loaded with one query on first access
+    and displayed data are memoized per sport.
+    """
+
+    def __init__(self, user: Optional["User"]) -> None:
+        self.user = user
+        self._pace_speed_displays: Optional[Dict[int, PaceSpeedDisplay]] = None
+        self._sports_displayed_data: Dict[
+            Tuple[int, bool], SportDisplayedData
+        ] = {}
+
+    def _get_pace_speed_displays(self) -> Dict[int, PaceSpeedDisplay]:
+        if self._pace_speed_displays is None:
+            from fittrackee.users.models import UserSportPreference
+
+            self._pace_speed_displays = (
+                {
+                    sport_id: pace_speed_display
+                    for sport_id, pace_speed_display in (
+                        UserSportPreference.query.with_entities(
+                            UserSportPreference.sport_id,
+                            UserSportPreference.pace_speed_display,
+                        )
+                        .filter_by(user_id=self.user.id)
+                        .all()
+                    )
+                }
+                if self.user
+                else {}
+            )
+        return self._pace_speed_displays
+
+    def get(
+        self, sport: "Sport", force_display_speed: bool = False
+    ) -> SportDisplayedData:
+        key = (sport.id, force_display_speed)
+        if key not in self._sports_displayed_data:
+            pace_speed_display = self._get_pace_speed_displays().get(
+                sport.id, sport.pace_speed_display
+            )
+            self._sports_displayed_data[key] = SportDisplayedData(
+                display_elevation=(
+                    sport.label not in SPORTS_WITHOUT_ELEVATION_DATA
+                ),
+                display_pace=pace_speed_display != PaceSpeedDisplay.SPEED,
+                display_speed=force_display_speed
+                or pace_speed_display != PaceSpeedDisplay.PACE,
+                display_power=sport.label in POWER_SPORTS,
+                display_cadence=sport.label in CADENCE_SPORTS,
+                display_spm_cadence=sport.label in SPM_CADENCE_SPORTS,
+                display_rpm_cadence=sport.label in RPM_CADENCE_SPORTS,
+            )
+        return self._sports_displayed_data[key]
+
+
+def get_sports_displayed_data_resolver(
+    user: Optional["User"],
+) -> SportsDisplayedDataResolver:
+    """
+    Return resolver for given user.
+
+    Within a request, resolvers are stored in application context globals
+    (reset before each request), to avoid querying user preferences for each
+    serialized workout.
+    """
+    if not has_request_context():
+        return SportsDisplayedDataResolver(user)
+
+    resolvers: Dict[Optional[int], SportsDisplayedDataResolver] = g.setdefault(
+        "sports_displayed_data_resolvers", {}
+    )
+    user_id = user.id if user else None
+    if user_id not in resolvers:
+        resolvers[user_id] = SportsDisplayedDataResolver(user)
+    return resolvers[user_id]
+
+
+def reset_sports_displayed_data_resolvers() -> None:
+    g.pop("sports_displayed_data_resolvers", None)
+
+
 def get_sports_displayed_data(
     sports: List["Sport"],
     user: Optional["User"],
@@ -41,41 +128,18 @@ def get_sports_displayed_data(
     'force_display_speed' allows to display speed in Workout list regardless
     sport preferences
     """
-    from fittrackee.users.models import UserSportPreference
-
-    sports_data_visibility = {}
-    for sport in sports:
-        sport_preferences = (
-            UserSportPreference.query.filter_by(
-                sport_id=sport.id, user_id=user.id
-            ).first()
-            if user
-            else None
-        )
-        pace_speed_display = (
-            sport_preferences.pace_speed_display
-            if sport_preferences
-            else sport.pace_speed_display
-        )
-        sports_data_visibility[sport.id] = SportDisplayedData(
-            display_elevation=sport.label not in SPORTS_WITHOUT_ELEVATION_DATA,
-            display_pace=pace_speed_display != PaceSpeedDisplay.SPEED,
-            display_speed=force_display_speed
-            or pace_speed_display != PaceSpeedDisplay.PACE,
-            display_power=sport.label in POWER_SPORTS,
-            display_cadence=sport.label in CADENCE_SPORTS,
-            display_spm_cadence=sport.label in SPM_CADENCE_SPORTS,
-            display_rpm_cadence=sport.label in RPM_CADENCE_SPORTS,
-        )
-    return sports_data_visibility
+    resolver = get_sports_displayed_data_resolver(user)
+    return {
+        sport.id: resolver.get(sport, force_display_speed) for sport in sports
+    }
 
 
 def get_sport_displayed_data(
     sport: "Sport", user: Optional["User"], force_display_speed: bool = False
 ) -> "SportDisplayedData":
-    return get_sports_displayed_data([sport], user, force_display_speed)[
-        sport.id
-    ]
+    return get_sports_displayed_data_resolver(user).get(
+        sport, force_display_speed
+    )
 
 
 def get_pace(
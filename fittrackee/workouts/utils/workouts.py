@@ -1,3 +1,4 @@
+import math
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
@@ -6,7 +7,12 @@ import pytz
 from fittrackee.utils import decode_short_id
 from fittrackee.visibility_levels import can_view
 
-from ..exceptions import WorkoutForbiddenException
+from ..constants import MAX_ZOOM
+from ..exceptions import (
+    InvalidBboxException,
+    InvalidZoomException,
+    WorkoutForbiddenException,
+)
 from ..models import Workout
 
 if TYPE_CHECKING:
@@ -74,6 +80,41 @@ def get_datetime_from_request_args(
     return date_from, date_to
 
 
+def get_zoom_from_request_args(params: Dict) -> Optional[int]:
+    zoom_str = params.get("zoom")
+    if zoom_str is None:
+        return None
+    try:
+        zoom = int(zoom_str)
+    except ValueError as e:
+        raise InvalidZoomException() from e
+    if zoom < 0 or zoom > MAX_ZOOM:
+        raise InvalidZoomException()
+    return zoom
+
+
+def get_bbox_from_request_args(params: Dict) -> Optional[List[float]]:
+    """
+    Return bounding box (min. longitude, min. latitude, max. longitude,
+    max. latitude) from request args.
+    """
+    bbox_str = params.get("bbox")
+    if bbox_str is None:
+        return None
+    try:
+        bbox = [float(value) for value in bbox_str.split(",")]
+    except ValueError as e:
+        raise InvalidBboxException() from e
+    if (
+        len(bbox) != 4
+        or not all(math.isfinite(value) for value in bbox)
+        or bbox[0] > bbox[2]
+        or bbox[1] > bbox[3]
+    ):
+        raise InvalidBboxException()
+    return bbox
+
+
 def get_average_speed(
     total_workouts: int,
     total_average_speed: float,
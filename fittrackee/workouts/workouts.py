@@ -3,8 +3,7 @@ from datetime import timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import geopandas as gpd
-import requests
+import shapely
 from dramatiq_abort import abort
 from flask import (
     Blueprint,
@@ -19,7 +18,8 @@ from sqlalchemy.exc import IntegrityError
 from werkzeug.exceptions import NotFound, RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 
-from fittrackee import abortable, appLog, db, limiter
+from fittrackee import VERSION, abortable, appLog, db, limiter
+from fittrackee.constants import MapStatus
 from fittrackee.equipments.exceptions import (
     InvalidEquipmentException,
     InvalidEquipmentsException,
@@ -39,6 +39,8 @@ from fittrackee.responses import (
     InvalidPayloadErrorResponse,
     NotFoundErrorResponse,
     PayloadTooLargeErrorResponse,
+    conditional_response,
+    generate_etag,
     get_error_response_if_file_is_invalid,
     handle_error_and_return_response,
 )
@@ -62,30 +64,40 @@ from .constants import (
 )
 from .decorators import check_workout
 from .exceptions import (
+    InvalidBboxException,
     InvalidDurationException,
     InvalidRadiusException,
     InvalidVisibilityException,
+    InvalidZoomException,
     WorkoutExceedingValueException,
     WorkoutException,
     WorkoutFileException,
     WorkoutGPXException,
     WorkoutRefreshException,
 )
-from .models import Sport, Workout, WorkoutLike, WorkoutSegment
+from .models import (
+    Sport,
+    Workout,
+    WorkoutLike,
+    WorkoutSegment,
+    serialize_workouts,
+)
 from .services import (
     WorkoutCreationService,
     WorkoutsFromFileCreationService,
     WorkoutUpdateService,
 )
+from .services.map_tiles import tile_cache
 from .services.workout_from_file.workout_gpx_service import remove_microseconds
 from .services.workouts_from_file_refresh_service import (
     WorkoutFromFileRefreshService,
 )
-from .utils.chart import get_chart_data
+from .utils.chart import MIN_CHART_DATA_RESOLUTION, get_chart_data
 from .utils.convert import convert_in_duration, convert_pace_in_duration
 from .utils.geometry import (
-    get_buffered_location,
     get_geojson_from_segments,
+    get_location_filter,
+    get_start_points_clusters,
 )
 from .utils.gpx import generate_gpx
 from .utils.sports import (
@@ -93,8 +105,13 @@ from .utils.sports import (
     get_pace,
     get_speed,
     get_sport_displayed_data,
+    get_sports_displayed_data,
+)
+from .utils.workouts import (
+    get_bbox_from_request_args,
+    get_datetime_from_request_args,
+    get_zoom_from_request_args,
 )
-from .utils.workouts import get_datetime_from_request_args
 
 if TYPE_CHECKING:
     from flask_sqlalchemy.query import Query
@@ -334,7 +351,11 @@ def get_user_workouts_query(
 
     if as_feature_collection:
         geom_subquery = (
-            select(WorkoutSegment.geom)
+            select(
+                WorkoutSegment.get_geometry_for_zoom(
+                    get_zoom_from_request_args(params)
+                )
+            )
             .filter(WorkoutSegment.workout_id == Workout.id)
             .order_by(WorkoutSegment.start_date)
             .scalar_subquery()
@@ -409,10 +430,9 @@ def get_user_workouts_query(
         workouts_query = workouts_query.outerjoin(WorkoutEquipment)
         filters.append(WorkoutEquipment.c.equipment_id == equipment_id)
     if coordinates:
-        buffer = get_buffered_location(coordinates, radius)
         subquery = (
             db.session.query(WorkoutSegment.workout_id)
-            .filter(func.ST_Intersects(buffer, WorkoutSegment.geom))
+            .filter(get_location_filter(coordinates, radius))
             .subquery()
         )
         filters.append(Workout.id.in_(select(subquery)))  # type: ignore[arg-type]
@@ -490,6 +510,7 @@ def get_workouts(auth_user: User) -> Union[Dict, HttpResponse]:
                 "liked": false,
                 "likes_count": 0,
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": null,
                 "max_cadence": null,
@@ -794,15 +815,13 @@ def get_workouts(auth_user: User) -> Union[Dict, HttpResponse]:
         return {
             "status": "success",
             "data": {
-                "workouts": [
-                    workout.serialize(
-                        user=auth_user,
-                        params=params,
-                        with_equipments=with_equipments,
-                        force_display_speed=force_display_speed,
-                    )
-                    for workout in workouts
-                ],
+                "workouts": serialize_workouts(
+                    workouts,
+                    user=auth_user,
+                    params=params,
+                    with_equipments=with_equipments,
+                    force_display_speed=force_display_speed,
+                ),
                 **statistics,
             },
             "pagination": {
@@ -1066,6 +1085,9 @@ def get_workouts_feature_collection(
                         (latitude, longitude)
     :query integer radius: radius in km, only used when location is provided
                         (default: 10)
+    :query integer zoom: map zoom level, to return simplified geometries
+                        (if not provided, full resolution geometries are
+                        returned)
 
     :reqheader Authorization: OAuth 2.0 Bearer Token
 
@@ -1074,6 +1096,7 @@ def get_workouts_feature_collection(
         - ``invalid duration``
         - ``invalid value for visibility``
         - ``invalid radius, must be an float greater than zero``
+        - ``invalid zoom, must be an integer between 0 and 22``
     :statuscode 401:
         - ``provide a valid auth token``
         - ``signature expired, please log in again``
@@ -1110,8 +1133,15 @@ def get_workouts_feature_collection(
         ]
 
         if features:
-            df = gpd.GeoDataFrame.from_features(features)
-            bbox = list(df.total_bounds)
+            bbox = shapely.total_bounds(
+                shapely.from_geojson(
+                    [
+                        workout[5]
+                        for workout in workouts
+                        if workout[5] is not None
+                    ]
+                )
+            ).tolist()
         else:
             bbox = []
 
@@ -1134,6 +1164,7 @@ def get_workouts_feature_collection(
         InvalidDurationException,
         InvalidRadiusException,
         InvalidVisibilityException,
+        InvalidZoomException,
     ) as e:
         return InvalidPayloadErrorResponse(str(e))
     except Exception as e:
@@ -1147,6 +1178,11 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
     Get all workouts with start point geometry for the authenticated user
     as a feature collection, in order to display workouts on the global map.
 
+    If zoom level is provided, start points are grouped in clusters
+    depending on zoom level (workouts limit does not apply). Clusters
+    containing only one workout also return workout properties.
+    Bounding box allows to return only clusters within the map view.
+
     **Scope**: ``workouts:read``
 
     **Example requests**:
@@ -1163,6 +1199,12 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
 
       GET /api/workouts?from=2019-07-02&to=2019-07-31&sport_ids=1,2  HTTP/1.1
 
+    - with zoom level and bounding box (clusters):
+
+    .. sourcecode:: http
+
+      GET /api/workouts/global-map?zoom=5&bbox=-5.2,41.3,9.6,51.1  HTTP/1.1
+
     **Example responses**:
 
     - returning at least one workout:
@@ -1210,6 +1252,48 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
           "status": "success"
         }
 
+    - returning clusters (with zoom level):
+
+    .. sourcecode:: http
+
+      HTTP/1.1 200 OK
+      Content-Type: application/json
+
+        {
+          "data": {
+            "bbox": [
+              6.07367,
+              44.68095,
+              6.07367,
+              44.68095
+            ],
+            "features": [
+              {
+                "geometry": {
+                  "coordinates": [
+                    6.07367,
+                    44.68095
+                  ],
+                  "type": "Point"
+                },
+                "properties": {
+                  "bounds": [
+                      44.68095,
+                      6.07367,
+                      44.68095,
+                      6.07367
+                  ],
+                  "count": 2
+                },
+                "type": "Feature"
+              }
+            ],
+            "limit_exceeded": false,
+            "type": "FeatureCollection"
+          }
+          "status": "success"
+        }
+
     - returning no workouts
 
     .. sourcecode:: http
@@ -1230,6 +1314,11 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
     :query string from: start date (format: ``%Y-%m-%d``)
     :query string to: end date (format: ``%Y-%m-%d``)
     :query string sport_ids: ids of sports, separated by a comma
+    :query integer zoom: map zoom level, to return start points clusters
+    :query string bbox: bounding box (min. longitude, min. latitude,
+                        max. longitude and max. latitude, separated by a
+                        comma), to return only clusters within it (only
+                        used when zoom is provided)
 
     :reqheader Authorization: OAuth 2.0 Bearer Token
 
@@ -1237,6 +1326,9 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
     :statuscode 400:
         - ``invalid date format, expecting '%Y-%m-%d'``
         - ``invalid sport_ids``
+        - ``invalid zoom, must be an integer between 0 and 22``
+        - ``invalid bbox, must be a string with min. longitude, min.
+          latitude, max. longitude and max. latitude, separated by a comma``
     :statuscode 401:
         - ``provide a valid auth token``
         - ``signature expired, please log in again``
@@ -1265,6 +1357,12 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
     except ValueError:
         return InvalidPayloadErrorResponse("invalid sport_ids")
 
+    try:
+        zoom = get_zoom_from_request_args(params)
+        bbox = get_bbox_from_request_args(params)
+    except (InvalidBboxException, InvalidZoomException) as e:
+        return InvalidPayloadErrorResponse(str(e))
+
     try:
         filters = [
             Workout.user_id == auth_user.id,
@@ -1281,6 +1379,20 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
         if sport_ids:
             filters.append(Workout.sport_id.in_(sport_ids))
 
+        if zoom is not None:
+            features, start_points_bbox = get_start_points_clusters(
+                filters, zoom, bbox
+            )
+            return {
+                "status": "success",
+                "data": {
+                    "bbox": start_points_bbox,
+                    "features": features,
+                    "limit_exceeded": False,
+                    "type": "FeatureCollection",
+                },
+            }
+
         workouts = (
             db.session.query(
                 Workout.bounds,
@@ -1288,41 +1400,49 @@ def get_workouts_for_global_map(auth_user: User) -> Union[Dict, HttpResponse]:
                 Workout.sport_id,
                 Workout.title,
                 Workout.workout_visibility,
-                func.ST_AsGeoJSON(Workout.start_point_geom),
+                func.ST_X(Workout.start_point_geom),
+                func.ST_Y(Workout.start_point_geom),
+                # total count before limit
+                func.count().over(),
             )
             .filter(*filters)
             .order_by(Workout.workout_date.desc())
+            .limit(current_app.config["global_map_workouts_limit"])
+            .all()
         )
-        total_workouts_count = workouts.count()
-
-        features = []
-        for workout in workouts.limit(
-            current_app.config["global_map_workouts_limit"]
-        ).all():
-            features.append(
-                {
-                    "type": "Feature",
-                    "properties": {
-                        "bounds": workout[0],
-                        "id": encode_uuid(workout[1]),
-                        "sport_id": workout[2],
-                        "title": workout[3],
-                        "workout_visibility": workout[4],
-                    },
-                    "geometry": json.loads(workout[5]),
-                }
-            )
 
-        if features:
-            df = gpd.GeoDataFrame.from_features(features)
-            bbox = list(df.total_bounds)
-        else:
-            bbox = []
+        features = [
+            {
+                "type": "Feature",
+                "properties": {
+                    "bounds": workout[0],
+                    "id": encode_uuid(workout[1]),
+                    "sport_id": workout[2],
+                    "title": workout[3],
+                    "workout_visibility": workout[4],
+                },
+                "geometry": {
+                    "coordinates": [workout[5], workout[6]],
+                    "type": "Point",
+                },
+            }
+            for workout in workouts
+        ]
+        total_workouts_count = workouts[0][7] if workouts else 0
 
         return {
             "status": "success",
             "data": {
-                "bbox": bbox,
+                "bbox": (
+                    [
+                        min(workout[5] for workout in workouts),
+                        min(workout[6] for workout in workouts),
+                        max(workout[5] for workout in workouts),
+                        max(workout[6] for workout in workouts),
+                    ]
+                    if workouts
+                    else []
+                ),
                 "features": features,
                 "limit_exceeded": total_workouts_count > len(features),
                 "type": "FeatureCollection",
@@ -1382,6 +1502,7 @@ def get_workout(
                 "liked": false,
                 "likes_count": 0,
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": null,
                 "max_cadence": null,
@@ -1459,6 +1580,91 @@ def get_workout(
     }
 
 
+def get_workout_data_etag(
+    auth_user: Optional[User],
+    workout_short_id: str,
+    data_type: str,
+    segment_short_id: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Get ETag from workout and segments versions, and data depending on
+    user (only if user can access workout data).
+    Returns None when data cannot be returned, to get error response.
+    """
+    workout_uuid = decode_short_id(workout_short_id)
+    workout = Workout.query.filter_by(uuid=workout_uuid).first()
+    if (
+        not workout
+        or not workout.original_file
+        or not can_view(
+            workout,
+            "calculated_analysis_visibility"
+            if data_type == "chart_data"
+            else "calculated_map_visibility",
+            auth_user,
+        )
+    ):
+        return None
+
+    segments_uuids = db.session.scalars(
+        select(WorkoutSegment.uuid)
+        .filter(WorkoutSegment.workout_id == workout.id)
+        .order_by(WorkoutSegment.start_date)
+    ).all()
+    etag_values = [
+        VERSION,
+        data_type,
+        workout.uuid,
+        workout.modification_date or workout.creation_date,
+        ",".join(str(segment_uuid) for segment_uuid in segments_uuids),
+        segment_short_id,
+    ]
+    if data_type == "chart_data":
+        etag_values.extend(
+            [
+                can_view_workout_data("hr", workout.user, auth_user),
+                get_sports_displayed_data([workout.sport], auth_user)[
+                    workout.sport_id
+                ],
+                request.args.get("resolution"),
+            ]
+        )
+    return generate_etag(*etag_values)
+
+
+def get_workout_chart_data_etag(
+    auth_user: Optional[User],
+    workout_short_id: str,
+    segment_short_id: Optional[str] = None,
+) -> Optional[str]:
+    return get_workout_data_etag(
+        auth_user, workout_short_id, "chart_data", segment_short_id
+    )
+
+
+def get_workout_geojson_etag(
+    auth_user: Optional[User],
+    workout_short_id: str,
+    segment_short_id: Optional[str] = None,
+) -> Optional[str]:
+    return get_workout_data_etag(
+        auth_user, workout_short_id, "geojson", segment_short_id
+    )
+
+
+def get_map_etag(map_id: str) -> Optional[str]:
+    # map id is a hash of map image (temporary id while image is pending)
+    workout_exists = db.session.scalar(
+        select(Workout.id)
+        .filter(
+            Workout.map_id == map_id,
+            Workout.map_status.is_distinct_from(MapStatus.PENDING),
+        )
+        .limit(1)
+    )
+    return map_id if workout_exists else None
+
+
 def get_workout_data(
     auth_user: Optional[User],
     workout_short_id: str,
@@ -1466,6 +1672,18 @@ def get_workout_data(
     segment_short_id: Optional[str] = None,
 ) -> Union[Dict, HttpResponse]:
     """Get data from workout gpx file"""
+    resolution = None
+    if data_type == "chart_data" and "resolution" in request.args:
+        try:
+            resolution = int(request.args["resolution"])
+        except ValueError:
+            resolution = 0
+        if resolution < MIN_CHART_DATA_RESOLUTION:
+            return InvalidPayloadErrorResponse(
+                "resolution must be an integer greater than or equal to "
+                f"{MIN_CHART_DATA_RESOLUTION}"
+            )
+
     not_found_response = DataNotFoundErrorResponse(
         data_type=data_type,
         message=f"workout not found (id: {workout_short_id})",
@@ -1500,6 +1718,7 @@ def get_workout_data(
                     user=auth_user,
                     can_see_heart_rate=can_see_heart_rate,
                     segment_short_id=segment_short_id,
+                    resolution=resolution,
                 )
             }
         else:  # data_type == "geojson"
@@ -1563,6 +1782,7 @@ def get_workout_gpx(
     "/workouts/<string:workout_short_id>/chart_data", methods=["GET"]
 )
 @require_auth(scopes=["workouts:read"], optional_auth_user=True)
+@conditional_response(get_workout_chart_data_etag)
 def get_workout_chart_data(
     auth_user: Optional[User], workout_short_id: str
 ) -> Union[Dict, HttpResponse]:
@@ -1612,10 +1832,17 @@ def get_workout_chart_data(
 
     :param string workout_short_id: workout short id
 
+    :query integer resolution: maximum number of points returned (must be
+           greater than or equal to 3). If provided, chart data are
+           downsampled with Largest-Triangle-Three-Buckets algorithm.
+
     :reqheader Authorization: OAuth 2.0 Bearer Token for workout with
                ``private`` or ``followers_only`` map visibility
+    :reqheader If-None-Match: ETag returned in a previous response
 
     :statuscode 200: ``success``
+    :statuscode 304: ``not modified``
+    :statuscode 400: ``resolution must be an integer greater than or equal to 3``
     :statuscode 401:
         - ``provide a valid auth token``
         - ``signature expired, please log in again``
@@ -1673,6 +1900,7 @@ def get_segment_gpx(
     methods=["GET"],
 )
 @require_auth(scopes=["workouts:read"], optional_auth_user=True)
+@conditional_response(get_workout_chart_data_etag)
 def get_segment_chart_data(
     auth_user: Optional[User], workout_short_id: str, segment_short_id: str
 ) -> Union[Dict, HttpResponse]:
@@ -1723,11 +1951,19 @@ def get_segment_chart_data(
     :param string workout_short_id: workout short id
     :param string segment_short_id: segment short id
 
+    :query integer resolution: maximum number of points returned (must be
+           greater than or equal to 3). If provided, chart data are
+           downsampled with Largest-Triangle-Three-Buckets algorithm.
+
     :reqheader Authorization: OAuth 2.0 Bearer Token for workout with
                ``private`` or ``followers_only`` map visibility
+    :reqheader If-None-Match: ETag returned in a previous response
 
     :statuscode 200: ``success``
-    :statuscode 400: ``no gpx file for this workout``
+    :statuscode 304: ``not modified``
+    :statuscode 400:
+        - ``no gpx file for this workout``
+        - ``resolution must be an integer greater than or equal to 3``
     :statuscode 401:
         - ``provide a valid auth token``
         - ``signature expired, please log in again``
@@ -1748,6 +1984,7 @@ def get_segment_chart_data(
     "/workouts/<string:workout_short_id>/geojson", methods=["GET"]
 )
 @require_auth(scopes=["workouts:read"], optional_auth_user=True)
+@conditional_response(get_workout_geojson_etag)
 def get_workout_geojson(
     auth_user: Optional[User], workout_short_id: str
 ) -> Union[Dict, HttpResponse]:
@@ -1796,8 +2033,10 @@ def get_workout_geojson(
 
     :reqheader Authorization: OAuth 2.0 Bearer Token for workout with
                ``private`` or ``followers_only`` map visibility
+    :reqheader If-None-Match: ETag returned in a previous response
 
     :statuscode 200: ``success``
+    :statuscode 304: ``not modified``
     :statuscode 401:
         - ``provide a valid auth token``
         - ``signature expired, please log in again``
@@ -1819,6 +2058,7 @@ def get_workout_geojson(
     methods=["GET"],
 )
 @require_auth(scopes=["workouts:read"], optional_auth_user=True)
+@conditional_response(get_workout_geojson_etag)
 def get_segment_geojson(
     auth_user: Optional[User], workout_short_id: str, segment_short_id: str
 ) -> Union[Dict, HttpResponse]:
@@ -1860,8 +2100,10 @@ def get_segment_geojson(
 
     :reqheader Authorization: OAuth 2.0 Bearer Token for workout with
                ``private`` or ``followers_only`` map visibility
+    :reqheader If-None-Match: ETag returned in a previous response
 
     :statuscode 200: ``success``
+    :statuscode 304: ``not modified``
     :statuscode 400: ``no gpx file for this workout``
     :statuscode 401:
         - ``provide a valid auth token``
@@ -1965,6 +2207,7 @@ def download_workout_original_file(
 
 @workouts_blueprint.route("/workouts/map/<map_id>", methods=["GET"])
 @limiter.exempt
+@conditional_response(get_map_etag)
 def get_map(map_id: int) -> Union[HttpResponse, Response]:
     """
     Get map image for workouts with gpx.
@@ -1983,9 +2226,25 @@ def get_map(map_id: int) -> Union[HttpResponse, Response]:
       HTTP/1.1 200 OK
       Content-Type: image/png
 
+    **Example response when map image is not generated yet**:
+
+    .. sourcecode:: http
+
+      HTTP/1.1 202 ACCEPTED
+      Content-Type: application/json
+
+      {
+        "message": "map image is being generated",
+        "status": "pending"
+      }
+
     :param string map_id: workout map id
 
+    :reqheader If-None-Match: ETag returned in a previous response
+
     :statuscode 200: ``success``
+    :statuscode 202: ``map image is being generated``
+    :statuscode 304: ``not modified``
     :statuscode 401:
         - ``provide a valid auth token``
         - ``signature expired, please log in again``
@@ -2000,6 +2259,14 @@ def get_map(map_id: int) -> Union[HttpResponse, Response]:
         workout = Workout.query.filter_by(map_id=map_id).first()
         if not workout:
             return NotFoundErrorResponse("Map does not exist.")
+        if workout.map_status == MapStatus.PENDING:
+            return HttpResponse(
+                {
+                    "status": "pending",
+                    "message": "map image is being generated",
+                },
+                status_code=202,
+            )
         return send_from_directory(
             current_app.config["UPLOAD_FOLDER"],
             workout.map,
@@ -2029,6 +2296,7 @@ def get_map_tile(s: str, z: str, x: str, y: str) -> Tuple[Response, int]:
     .. sourcecode:: http
 
       HTTP/1.1 200 OK
+      Cache-Control: public, max-age=604800
       Content-Type: image/png
 
     :param string s: subdomain
@@ -2036,24 +2304,34 @@ def get_map_tile(s: str, z: str, x: str, y: str) -> Tuple[Response, int]:
     :param string x: index of the tile along the map's x axis
     :param string y: index of the tile along the map's y axis
 
+    Tiles are stored in cache (see ``TILE_CACHE_MAX_SIZE``).
+
     Status codes are status codes returned by tile server
 
     """
-    url = current_app.config["TILE_SERVER"]["URL"].format(
+    tile_server_url = current_app.config["TILE_SERVER"]["URL"]
+    url = tile_server_url.format(
         s=secure_filename(s),
         z=secure_filename(z),
         x=secure_filename(x),
         y=secure_filename(y),
     )
     headers = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:88.0)"}
-    response = requests.get(url, headers=headers, timeout=30)
-    return (
-        Response(
-            response.content,
-            content_type=response.headers["content-type"],
-        ),
-        response.status_code,
-    )
+    if z.isdigit() and x.isdigit() and y.isdigit():
+        tile = tile_cache.get_tile(
+            url,
+            tile_server_url=tile_server_url,
+            z=int(z),
+            x=int(x),
+            y=int(y),
+            headers=headers,
+        )
+    else:
+        tile = tile_cache.get_tile_without_cache(url, headers=headers)
+    response = Response(tile.content, content_type=tile.content_type)
+    if tile.max_age:
+        response.headers["Cache-Control"] = f"public, max-age={tile.max_age}"
+    return response, tile.status_code
 
 
 @workouts_blueprint.route("/workouts", methods=["POST"])
@@ -2110,6 +2388,7 @@ def post_workout(auth_user: User) -> Union[Tuple[Dict, int], HttpResponse]:
                 "liked": false,
                 "likes_count": 0,
                 "map": "ac075ec36dc25dcc20c270d2005f0398",
+                "map_status": "ready",
                 "map_visibility": "private",
                 "max_alt": 158.41,
                 "max_cadence": null,
@@ -2424,6 +2703,7 @@ def post_workout_no_gpx(
                 "elevation_data_source": "file",
                 "equipments": [],
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": null,
                 "max_cadence": null,
@@ -2652,6 +2932,7 @@ def update_workout(
                 "liked": false,
                 "likes_count": 0,
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": null,
                 "max_cadence": null,
@@ -2747,8 +3028,8 @@ def update_workout(
         (only for workout without gpx)
     :<json string elevation_data_source: source and method for elevations,
               depending on application configuration
-              (``file``, ``open_elevation``, ``open_elevation_smooth``,
-              ``valhalla``)
+              (``file``, ``dem``, ``open_elevation``,
+              ``open_elevation_smooth``, ``valhalla``)
     :<json array of strings equipment_ids:
         the id of the equipment to associate with this workout (any existing
         equipment for this workout will be replaced).
@@ -2979,6 +3260,7 @@ def like_workout(
                 "liked": true,
                 "likes_count": 1,
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": 104.44,
                 "max_cadence": null,
@@ -3097,6 +3379,7 @@ def undo_workout_like(
                 "liked": false,
                 "likes_count": 0,
                 "map": null,
+                "map_status": null,
                 "map_visibility": "private",
                 "max_alt": 104.44,
                 "max_cadence": null,
@@ -3699,6 +3982,7 @@ def refresh_workout(
                 "liked": false,
                 "likes_count": 0,
                 "map": "ac075ec36dc25dcc20c270d2005f0398",
+                "map_status": "ready",
                 "map_visibility": "private",
                 "max_alt": 158.41,
                 "max_cadence": null,
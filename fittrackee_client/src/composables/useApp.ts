@@ -29,6 +29,9 @@ export default function useApp() {
   const darkTheme: ComputedRef<boolean> = computed(() => getDarkTheme())
   const elevationServices: ComputedRef<string[]> = computed(() => {
     const services = []
+    if (appConfig.value.elevation_services.dem) {
+      services.push('DEM')
+    }
     if (appConfig.value.elevation_services.open_elevation) {
       services.push('Open Elevation')
     }
@@ -39,6 +42,9 @@ export default function useApp() {
   })
   const elevationsProcessingItems: ComputedRef<string[]> = computed(() => {
     let items = ['file']
+    if (elevationServices.value.includes('DEM')) {
+      items.push('dem')
+    }
     if (elevationServices.value.includes('Open Elevation')) {
       items = items.concat(['open_elevation', 'open_elevation_smooth'])
     }
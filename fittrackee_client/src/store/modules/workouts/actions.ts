@@ -14,6 +14,7 @@ import type {
   IWorkoutsActions,
   IWorkoutsState,
 } from '@/store/modules/workouts/types'
+import type { IClusterFeature, IWorkoutFeature } from '@/types/geojson'
 import type {
   ICommentForm,
   IWorkout,
@@ -176,9 +177,21 @@ export const actions: ActionTree<IWorkoutsState, IRootState> &
       })
       .then((res) => {
         if (res.data.status === 'success') {
+          // when zoom is provided, features are clusters, and clusters
+          // containing only one workout return workout properties
+          const features: (IWorkoutFeature | IClusterFeature)[] =
+            res.data.data.features
           context.commit(
             WORKOUTS_STORE.MUTATIONS.SET_USER_WORKOUTS_COLLECTION,
-            res.data.data
+            {
+              ...res.data.data,
+              features: features.filter(
+                (feature) => 'id' in feature.properties
+              ),
+              clusters: features.filter(
+                (feature) => !('id' in feature.properties)
+              ),
+            }
           )
         } else {
           handleError(context, null)
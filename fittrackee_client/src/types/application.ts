@@ -8,6 +8,7 @@ export interface IAppStatistics {
 }
 
 export interface IElevationService {
+  dem: boolean
   open_elevation: boolean
   valhalla: boolean
 }
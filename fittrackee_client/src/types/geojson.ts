@@ -1,6 +1,6 @@
 import type { MultiLineString, Point } from 'geojson'
 
-import type { IMapWorkout } from '@/types/workouts.ts'
+import type { IMapCluster, IMapWorkout } from '@/types/workouts.ts'
 
 export interface IWorkoutFeature {
   properties: IMapWorkout
@@ -8,9 +8,16 @@ export interface IWorkoutFeature {
   type: 'Feature'
 }
 
+export interface IClusterFeature {
+  properties: IMapCluster
+  geometry: Point
+  type: 'Feature'
+}
+
 export interface IWorkoutsFeatureCollection {
   bbox: number[]
   features: IWorkoutFeature[]
+  clusters?: IClusterFeature[]
   limit_exceeded?: boolean
   type: 'FeatureCollection'
 }
@@ -9,6 +9,11 @@ export interface ILeafletObject {
   leafletObject: Map
 }
 
+export interface IMapView {
+  zoom: number
+  bbox: string
+}
+
 export interface IGeoJsonOptions {
   weight?: number
 }
@@ -17,6 +17,7 @@ export type TVisibilityLevels = 'private' | 'followers_only' | 'public'
 export type TSegmentsCreationEvent = 'all' | 'none' | 'only_manual'
 export type TElevationDataSource =
   | 'file'
+  | 'dem'
   | 'open_elevation'
   | 'open_elevation_smooth'
   | 'valhalla'
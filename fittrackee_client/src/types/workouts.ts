@@ -14,6 +14,8 @@ import type {
 
 export type TFileExtension = 'fit' | 'gpx' | 'kml' | 'tcx'
 
+export type TMapStatus = 'pending' | 'ready' | 'error'
+
 export interface IWorkoutSegment {
   ascent: number
   ave_cadence: number | null
@@ -78,8 +80,14 @@ export interface IWeather {
   windBearing?: number
 }
 
+export interface IMapCluster {
+  bounds: number[]
+  count: number
+}
+
 export interface IMapWorkout {
   bounds: number[]
+  count?: number
   id: string
   sport_id: number
   title: string
@@ -108,6 +116,7 @@ export interface IWorkout {
   liked: boolean
   likes_count: number
   map: string | null
+  map_status: TMapStatus | null
   map_visibility?: TVisibilityLevels
   max_alt: number | null
   max_cadence: number | null
@@ -242,11 +251,15 @@ export type TWorkoutsPayload = TPaginationPayload & {
   duration_from?: string
   duration_to?: string
   sport_id?: string
+  zoom?: number
 }
 
 export type TMapParamsKeys = 'to' | 'from' | 'sport_ids'
 export type TWorkoutsMapPayload = {
   [key in TMapParamsKeys]?: string
+} & {
+  zoom?: number
+  bbox?: string
 }
 
 export interface IWorkoutApiChartData {